@@ -15,6 +15,8 @@ class Compressor(object):
         self.rpi = rpi
         self.name = name
         self.pin = pin
+        # IO object of the pin, resolved once instead of on every access
+        self.io = rpi.io['O_' + str(pin)]
         self.state = 'Off'
 
         self.getState()     # First reading of the actual state
@@ -23,7 +25,7 @@ class Compressor(object):
         return self.name
     
     def getState(self) -> bool:
-        state = self.rpi.io['O_' + str(self.pin)].value
+        state = self.io.value
         if state == True:
             self.state = 'On'
         else: 
@@ -32,8 +34,8 @@ class Compressor(object):
     
     def turn_on(self) -> None:
         self.state = 'On'
-        self.rpi.io['O_' + str(self.pin)].value = self.state
+        self.io.value = self.state
 
     def turn_off(self) -> None:
         self.state = 'Off'
-        self.rpi.io['O_' + str(self.pin)].value = self.state
+        self.io.value = self.state
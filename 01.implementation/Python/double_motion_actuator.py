@@ -21,6 +21,9 @@ class DoubleMotionActuator(object):
         self.name = name
         self.pin_dir_A = pin_A
         self.pin_dir_B = pin_B
+        # IO objects of the pins, resolved once instead of on every access
+        self.io_A = rpi.io['O_' + str(pin_A)]
+        self.io_B = rpi.io['O_' + str(pin_B)]
         self.state = 'Off'
 
         self.getState()     # First reading of the actual state
@@ -29,8 +32,8 @@ class DoubleMotionActuator(object):
         return self.name
     
     def getState(self) -> bool:
-        state_A = self.rpi.io['O_' + str(self.pin_dir_A)].value
-        state_B = self.rpi.io['O_' + str(self.pin_dir_B)].value
+        state_A = self.io_A.value
+        state_B = self.io_B.value
         if (state_A == True and state_B == False):
             self.state = 'Towards A'
         elif (state_A == False and state_B == True): 
@@ -49,8 +52,8 @@ class DoubleMotionActuator(object):
         O_7: vacuum carrier towards oven
         """
         self.state = 'Towards A'
-        self.rpi.io['O_' + str(self.pin_dir_A)].value = True
-        self.rpi.io['O_' + str(self.pin_dir_B)].value = False
+        self.io_A.value = True
+        self.io_B.value = False
 
     def move_towards_B(self) -> None:
         """
@@ -60,10 +63,10 @@ class DoubleMotionActuator(object):
         O_8: vacuum carrier towards turntable
         """
         self.state = 'Towards B'
-        self.rpi.io['O_' + str(self.pin_dir_A)].value = False
-        self.rpi.io['O_' + str(self.pin_dir_B)].value = True
+        self.io_A.value = False
+        self.io_B.value = True
 
     def turn_off(self) -> None:
         self.state = 'Off'
-        self.rpi.io['O_' + str(self.pin_dir_A)].value = False
-        self.rpi.io['O_' + str(self.pin_dir_B)].value = False
+        self.io_A.value = False
+        self.io_B.value = False
@@ -9,7 +9,15 @@ blocking, with a personalised while loop next to the event system.
 """
 
 
+import os
+import sys
+from time import perf_counter
 import revpimodio2
+# Checkpoint, RealTime, Anticipator and the dwell calibration are shared with
+# the controllers in _backup, which keep the one implementation
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                             '..', '..', '_backup'))
+from Checkpoint import Checkpoint
 from compressor import Compressor
 from light_barrier import LightBarrier
 from reference_switch import ReferenceSwitch
@@ -17,12 +25,49 @@ from single_motion_actuator import SingleMotionActuator
 from double_motion_actuator import DoubleMotionActuator
 from vacuum_actuator import VacuumActuator
 from oven_station import OvenStation
+from RealTime import RealTime
+from Anticipation import Anticipator
+from VacuumDwell import DwellTimes, DwellCalibration
 
 
 class CycleEventManager():
     """Entry point for Fischertechnik Multiprocess Station with Oven control 
     over RevPi."""
-    def __init__(self):
+    # Station state persisted in the checkpoint
+    CHECKPOINT_STATES = ('time_sens_saw_count',
+                         'time_sens_saw_spin_up_count', 'time_sens_oven_count',
+                         'time_sens_vacuum_count',
+                         'time_sens_turntable_pusher_count', 'counter',
+                         'prod_on_oven_carrier', 'prod_on_vacuum_carrier',
+                         'prod_on_turntable', 'prod_on_conveyor',
+                         'bool_oven_proc_completed',
+                         'bool_vacuum_carrier_proc_completed',
+                         'bool_turntable_proc_completed',
+                         'bool_saw_proc_completed',
+                         'bool_conveyor_proc_completed')
+    # Cycles between two checkpoints
+    CHECKPOINT_CYCLES = 10
+    # Seconds the loop waits between two cycles
+    CYCLE_TIME = 0.05
+    # Seconds the saw needs to spin up, it is started this long before the
+    # turntable is predicted to arrive under it
+    SAW_LEAD = 0.25
+    # Seconds before the product is predicted at the conveyor barrier the
+    # empty turntable returns to the vacuum carrier
+    TURNTABLE_RETURN_LEAD = 0.5
+    # Seconds before the next product is predicted at the oven barrier the
+    # vacuum carrier starts towards the oven
+    VACUUM_CARRIER_LEAD = 1.0
+    # Cycles the vacuum gripper dwells lowered, gripping and lifting when it
+    # picks the product from the oven carrier, known to work
+    DEFAULT_DWELL = DwellTimes(lower=10, grip=5, lift=10)
+    # File the calibrated dwell times are kept in, by station
+    DWELL_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'oven.dwell')
+
+    def __init__(self, real_time: RealTime = None, calibrate: bool = False):
+        # Real-time settings of the loop, None for a normal process
+        self.real_time = real_time
         # Instantiate RevPiModIO controlling library
         self.rpi = revpimodio2.RevPiModIO(autorefresh=True)
         # Handle SIGINT / SIGTERM to exit program cleanly
@@ -80,6 +125,8 @@ class CycleEventManager():
         # TODO: evaluate if is worth to use all those vars or only one is enough
         # Saw process time counter
         self.time_sens_saw_count = 0
+        # Saw cycles before the turntable arrived under it
+        self.time_sens_saw_spin_up_count = 0
         # Oven process time counter
         self.time_sens_oven_count = 0
         # Vacuum process time counter
@@ -102,6 +149,47 @@ class CycleEventManager():
         self.bool_saw_proc_completed = False            # Saw
         self.bool_conveyor_proc_completed = False       # Conveyor
 
+        # Actions started ahead of the sensor event they wait for, predicted
+        # from the measured travel times
+        self.anticipator = Anticipator()
+        self.saw_spin_up = self.anticipator.declare(
+            'saw spin-up before turntable under saw', self.SAW_LEAD)
+        self.turntable_return = self.anticipator.declare(
+            'turntable return before conveyor barrier',
+            self.TURNTABLE_RETURN_LEAD)
+        self.vacuum_carrier_start = self.anticipator.declare(
+            'vacuum carrier to oven before oven barrier',
+            self.VACUUM_CARRIER_LEAD)
+
+        # Dwell times of the vacuum gripper, calibrated ones if there are
+        # any. With calibrate, every pick is a trial of the calibration until
+        # the shortest reliable dwell times are found and written
+        self.dwell = DwellTimes.load(self.DWELL_FILE, 'oven')
+        if self.dwell is None:
+            print('Vacuum gripper not calibrated, using %s'
+                  % (self.DEFAULT_DWELL, ))
+            self.dwell = self.DEFAULT_DWELL
+        self.calibration = (DwellCalibration(self.DEFAULT_DWELL,
+                                             filename=self.DWELL_FILE,
+                                             station='oven')
+                            if calibrate else None)
+        self.dwell_trial = None     # Dwell times of the running trial
+        self.dwell_retry = False    # Pick repeated after a failed trial
+        self.product_lifted = False # Oven barrier cleared in this pick
+
+        # Checkpoint of the station state, written on a background thread
+        self.checkpoint = Checkpoint(os.path.join(
+            os.path.dirname(os.path.abspath(__file__)), 'oven.checkpoint'))
+        self.checkpoint_count = 0
+        # Sensors that must read as in the checkpoint to restore it
+        self.checkpoint_sensors = (
+            self.turntab_under_vacuum_switch,
+            self.turntab_towards_conveyor_switch, self.conveyor_barrier,
+            self.turntab_under_saw_switch,
+            self.vacuum_carrier_towards_turntable_switch,
+            self.inside_oven_switch, self.outside_oven_switch,
+            self.vacuum_carrier_towards_oven_switch, self.oven_barrier)
+
     def cleanup_revpi(self):
         """Cleanup function to leave the RevPi in a defined state."""
         # Switch of LED and outputs before exit program
@@ -121,6 +209,9 @@ class CycleEventManager():
         self.rpi.io['O_12'].value = False
         self.rpi.io['O_13'].value = False
         self.rpi.io['O_14'].value = False
+        # Persisting the station state before it is cleaned
+        self.checkpoint.save(self.station_snapshot())
+        self.checkpoint.stop()
         # Cleaning the object support states
         self.reset_station_states()
     
@@ -134,6 +225,7 @@ class CycleEventManager():
         
         # Support time sensors
         self.time_sens_saw_count = 0
+        self.time_sens_saw_spin_up_count = 0
         self.time_sens_oven_count = 0
         self.time_sens_vacuum_count = 0
         self.time_sens_delivery_count = 0 
@@ -147,6 +239,362 @@ class CycleEventManager():
         self.bool_saw_proc_completed = False
         self.bool_conveyor_proc_completed = False
 
+    def start_pick(self):
+        # Takes the dwell times of the pick that starts, the next trial while
+        # calibrating
+        self.product_lifted = False
+        if self.dwell_retry == True:
+            # The failed trial is repeated with the default dwell times
+            self.dwell_retry = False
+        elif self.calibration is not None:
+            self.dwell = self.calibration.next()
+            if self.calibration.done:
+                self.calibration = None
+            else:
+                self.dwell_trial = self.dwell
+
+    def confirm_pick(self) -> bool:
+        # Whether the oven barrier cleared during the pick, that is the
+        # product was lifted. If it did not, the pick is repeated with the
+        # default dwell times, which are kept from then on unless it was a
+        # trial of the calibration
+        picked = self.product_lifted
+        if self.dwell_trial is not None:
+            self.calibration.report(self.dwell_trial, picked)
+            self.dwell_trial = None
+        if picked == False:
+            if self.calibration is not None:
+                self.dwell_retry = True
+            else:
+                print('Grip failed with %s, falling back to %s'
+                      % (self.dwell, self.DEFAULT_DWELL))
+            self.dwell = self.DEFAULT_DWELL
+            # Release the vacuum and pick the product again
+            self.vacuum_valve_grip.turn_off()
+            self.time_sens_vacuum_count = 0
+        return picked
+
+    def station_snapshot(self) -> dict:
+        # The station state and the sensor states it was taken with
+        return {'states': {name: getattr(self, name)
+                           for name in self.CHECKPOINT_STATES},
+                'sensors': {sensor.getName(): sensor.getState()
+                            for sensor in self.checkpoint_sensors}}
+
+    def restore_station_states(self) -> bool:
+        # Restores the checkpoint if no sensor changed since it was written,
+        # e.g. a part is still in the oven after a software restart
+        snapshot = self.checkpoint.load()
+        if snapshot is None:
+            return False
+        for sensor in self.checkpoint_sensors:
+            if snapshot['sensors'].get(sensor.getName()) != sensor.getState():
+                return False
+        for name in self.CHECKPOINT_STATES:
+            setattr(self, name, snapshot['states'][name])
+        return True
+
+    def tick(self):
+        """One cycle of the process description, run by start() every
+        CYCLE_TIME."""
+        # Follows the process description ###############################
+        # The next product is expected at the oven barrier while the
+        # vacuum carrier is free, it starts towards the oven once the
+        # product is predicted VACUUM_CARRIER_LEAD seconds away
+        oven_product_due = self.vacuum_carrier_start.update(
+            self.prod_on_oven_carrier == False
+            and self.prod_on_vacuum_carrier == False,
+            self.oven_barrier.getState() == False)
+        # The empty turntable returns to the vacuum carrier once the
+        # product on the conveyor is predicted TURNTABLE_RETURN_LEAD
+        # seconds away from the conveyor barrier
+        turntable_return_due = self.turntable_return.update(
+            self.prod_on_conveyor == True,
+            self.conveyor_barrier.getState() == False)
+
+        # If the oven-light sensor is False, that is there is the product
+        # So, set the self.prod_on_oven_carrier to True
+        if (self.oven_barrier.getState() == False):
+            self.prod_on_oven_carrier = True
+        
+        # If there is the product on the oven carrier, or it is about to
+        # arrive, move the vacuum carrier towards the oven
+        if (self.bool_oven_proc_completed == False and 
+            (self.prod_on_oven_carrier == True or
+             oven_product_due == True)):
+            # Move the carrier towards the oven
+            if (self.vacuum_carrier_towards_oven_switch.getState() == False):
+                # Activate it towards the oven
+                self.vacuum_carrier.move_towards_A()
+            else:
+                # Deactivate it towards the oven
+                self.vacuum_carrier.turn_off()
+                
+        # If the oven is not ready and the vacuum carrier grip is at the 
+        # oven and the product is on the oven carrier: 
+        if (self.bool_oven_proc_completed == False and
+            self.prod_on_oven_carrier == True and 
+            self.vacuum_carrier_towards_oven_switch.getState() == True):
+            # Move inside the oven the oven carrier
+            if (self.inside_oven_switch.getState() == False):
+                # TODO: FROM HERE WRAP INTO A SINGLE FUNCTION
+                """
+                # Open the door
+                self.oven_door_opening.turn_on()
+                # Move the feeder in the oven
+                self.oven_carrier.move_towards_A()
+            # If the oven feeder is inside the oven
+            else:
+                # Deactivate the inward oven
+                self.oven_carrier.turn_off()
+                # Close the door
+                self.oven_door_opening.turn_off()
+                """
+                self.oven.move_carrier_inward()
+            else:
+                # TODO: modify so that the light flashes only AFTER the door is completely closed
+                #haha, flashing lights go brrrr - For light flashing
+                if (self.time_sens_oven_count % 2 == 1):
+                    # Activate the process light
+                    #self.oven_proc_light.turn_on()
+                    self.oven.activate_process_light()
+                else:
+                    # Deactivate the process light
+                    #self.oven_proc_light.turn_off()
+                    self.oven.deactivate_process_light()
+                # Time counter
+                self.time_sens_oven_count += 1            
+
+            # If the counter reaches 30, stop the oven process
+            if (self.time_sens_oven_count >= 30):       
+                # Deactivate the light
+                self.oven_proc_light.turn_off()
+                # Set the oven process var to True
+                self.bool_oven_proc_completed = True
+                # Set the oven counter to 0
+                self.time_sens_oven_count = 0
+        # If the oven is ready
+        elif (self.bool_oven_proc_completed == True and 
+              self.prod_on_oven_carrier == True):
+            # If oven_feeder_out sensor is False = the carrier is not 
+            # out
+            if (self.outside_oven_switch.getState() == False):
+                # Open the door
+                self.oven_door_opening.turn_on()
+                # Move the oven outside
+                self.oven_carrier.move_towards_B()
+            else:
+                # Stop moving the oven carrier
+                self.oven_door_opening.turn_off()
+                # Close the door
+                self.oven_carrier.turn_off()
+                    
+        # Take the product with the carrier grip
+        # Lower the vacuum gripper
+        # If oven feeder sensor is True and oven ready is True and the
+        # vacuum gripper variable is True and vacuum counter is less
+        # than 10, that is if the oven feeder is out from the oven and
+        # the oven is in ready state and the vacuum carrieer gripper 
+        # is at the oven and the vacuum counter is less than 10
+        # The counter is needed in order to wait for the vacuum gripper
+        # to be completely lowered  
+        if (self.outside_oven_switch.getState() == True 
+            and self.bool_oven_proc_completed == True
+            and self.vacuum_carrier_towards_oven_switch.getState() == True 
+            and self.prod_on_oven_carrier == True):
+            # The oven barrier clears once the product is lifted
+            if (self.time_sens_vacuum_count > 0
+                and self.oven_barrier.getState() == True):
+                self.product_lifted = True
+            if (self.time_sens_vacuum_count == 0):
+                self.start_pick()
+            if (self.time_sens_vacuum_count < self.dwell.lower):
+                # Lower the carrier vacuum gripper
+                self.vacuum_grip_lowering.turn_on()
+                # Add 1 to the vacuum counter
+                self.time_sens_vacuum_count += 1
+        
+            # Grip the product 
+            # If vacuum count is between the lowering and the lifting
+            if (self.time_sens_vacuum_count >= self.dwell.lower and 
+                self.time_sens_vacuum_count <
+                    self.dwell.lower + self.dwell.grip):
+                # Activate the carrier vacuum gripper
+                self.vacuum_valve_grip.turn_on()
+                # Add 1 to the vacuum count
+                self.time_sens_vacuum_count += 1
+
+            # Raise the vacuum gripper 
+            # If vacuum count is between the gripping and the lifted
+            # gripper
+            if (self.time_sens_vacuum_count >=
+                    self.dwell.lower + self.dwell.grip and 
+                    self.time_sens_vacuum_count < self.dwell.pick):
+                # Upper the carrier vacuum gripper
+                self.vacuum_grip_lowering.turn_off()
+                # Add 1 to the vacuum counter
+                self.time_sens_vacuum_count += 1
+        
+            if(self.vacuum_carrier_towards_oven_switch.getState() == True
+                and self.vacuum_grip_lowering.getState() == False
+                and self.vacuum_valve_grip.getState() == True
+                and self.time_sens_vacuum_count >= self.dwell.pick
+                and self.confirm_pick() == True):
+                self.time_sens_vacuum_count = 0
+                self.prod_on_oven_carrier = False
+                self.prod_on_vacuum_carrier = True
+        
+        # Move the carrier to the turnta#ble
+        if (self.prod_on_vacuum_carrier == True and 
+            self.vacuum_carrier_towards_turntable_switch.getState() == False):
+            # Bring the carrier vacuum gripper to the turn-table
+            self.vacuum_carrier.move_towards_B()
+        elif (self.prod_on_vacuum_carrier == True and 
+            self.vacuum_carrier_towards_turntable_switch.getState() == True):
+            # Stop the vacuum carrier
+            self.vacuum_carrier.turn_off()
+        
+        # Release the product
+        # Lower the carrier vacuum gripper
+        if (self.vacuum_carrier_towards_turntable_switch.getState() == True 
+            and self.prod_on_vacuum_carrier == True
+            and self.vacuum_valve_grip.getState() == True
+            and self.time_sens_vacuum_count < 15):
+                self.vacuum_grip_lowering.turn_on()
+                self.time_sens_vacuum_count += 1
+        # Release the product on the turntable
+        elif (self.vacuum_carrier_towards_turntable_switch.getState() == True 
+            and self.vacuum_grip_lowering.getState() == True
+            and self.time_sens_vacuum_count >= 15 
+            and self.time_sens_vacuum_count < 30):
+                self.vacuum_valve_grip.turn_off()
+                self.time_sens_vacuum_count += 1
+        # Raise the carrier vacuum gripper
+        elif (self.vacuum_carrier_towards_turntable_switch.getState() == True 
+            and self.vacuum_grip_lowering.getState() == True
+            and self.vacuum_valve_grip.getState() == False
+            and self.time_sens_vacuum_count >= 30):
+                self.time_sens_vacuum_count = 0
+                self.vacuum_grip_lowering.turn_off()
+                self.prod_on_vacuum_carrier = False
+                self.bool_vacuum_carrier_proc_completed = True
+                self.prod_on_turntable = True
+
+        # Turn the turntable towards the saw
+        if (self.prod_on_turntable == True and
+            self.bool_turntable_proc_completed == False):
+            # Activate the turntable until it reaches the saw
+            if (self.turntab_under_saw_switch.getState() == False and
+                self.bool_saw_proc_completed == False):
+                self.turntable.move_towards_A()
+            elif(self.turntab_under_saw_switch.getState() == True and
+                self.bool_saw_proc_completed == False):
+                self.turntable.turn_off()
+            # The saw spins up once the turntable is predicted SAW_LEAD
+            # seconds away from it
+            saw_spin_up_due = self.saw_spin_up.update(
+                self.turntable.state == 'Towards A' and
+                self.bool_saw_proc_completed == False,
+                self.turntab_under_saw_switch.getState() == True)
+
+            # Activate the saw for the design processing time, up to
+            # SAW_LEAD of the spin-up before the turntable arrived
+            # included
+            if (self.turntab_under_saw_switch.getState() == True and 
+                self.bool_saw_proc_completed == False and
+                self.time_sens_saw_count
+                + self.time_sens_saw_spin_up_count < 40):
+                self.saw.turn_on()
+                self.time_sens_saw_count += 1
+            elif (self.turntab_under_saw_switch.getState() == True and 
+                self.time_sens_saw_count
+                + self.time_sens_saw_spin_up_count >= 40):
+                self.saw.turn_off()
+                self.bool_saw_proc_completed = True
+                self.time_sens_saw_count = 0
+                self.time_sens_saw_spin_up_count = 0
+            elif (saw_spin_up_due == True and
+                self.turntab_under_saw_switch.getState() == False and
+                self.bool_saw_proc_completed == False and
+                self.time_sens_saw_count == 0):
+                self.saw.turn_on()
+                if (self.time_sens_saw_spin_up_count * self.CYCLE_TIME
+                        < self.SAW_LEAD):
+                    self.time_sens_saw_spin_up_count += 1
+            # If the turntable stalled or stopped short of the saw, stop
+            # the saw, the spin-up is lost
+            elif (self.turntab_under_saw_switch.getState() == False and
+                self.time_sens_saw_count == 0):
+                self.saw.turn_off()
+                self.time_sens_saw_spin_up_count = 0
+        
+            # Activate the turntable until it reaches the conveyor                
+            if (self.bool_saw_proc_completed == True and
+                self.turntab_towards_conveyor_switch.getState() == False):
+                self.turntable.move_towards_A()
+            elif (self.bool_saw_proc_completed == True and
+                self.turntab_towards_conveyor_switch.getState() == True): 
+                self.turntable.turn_off()
+        
+            # Activate the pusher
+            if (self.turntab_towards_conveyor_switch.getState() == True and
+                self.time_sens_turntable_pusher_count < 20):
+                self.turntable_pusher.turn_on()
+                self.time_sens_turntable_pusher_count += 1
+            elif(self.turntab_towards_conveyor_switch.getState() == True and
+                self.time_sens_turntable_pusher_count >= 20):
+                self.turntable_pusher.turn_off()
+                self.prod_on_turntable = False
+                self.prod_on_conveyor = True
+                self.time_sens_turntable_pusher_count = 0
+        
+        # Activate the conveyor
+        if (self.prod_on_conveyor == True):
+            if (self.conveyor_barrier.getState() == True):
+                self.conveyor.turn_on()
+            elif (self.conveyor_barrier.getState() == False): 
+                self.conveyor.turn_off()
+            # The pusher is done, the turntable is empty
+            if (turntable_return_due == True and
+                self.conveyor_barrier.getState() == True):
+                if (self.turntab_under_vacuum_switch.getState() == False):
+                    self.turntable.move_towards_B()
+                else:
+                    self.turntable.turn_off()
+
+        #################################################################
+        # Otherwise, if there is the product in front of the light sensor
+        if(self.conveyor_barrier.getState() == False):
+            # Turn off the services
+            self.compressor.turn_off()
+            
+            # Turn off the valve feeder
+            self.turntable_pusher.turn_off()
+
+            # Turn off the conveyor belt
+            self.conveyor.turn_off()
+            
+            # Turn the turn-table towards the carrier
+            # If the turntable_pos_vacuum sensor is False, that is 
+            # if the turntable is not at the vacuum gripper carrier
+            if (self.turntab_under_vacuum_switch.getState() == False):
+                # Activate the conveyor rotation clockwise
+                self.turntable.move_towards_B()
+            # Otherwise, if the turntable_pos_vacuum sensor is True, that 
+            # is if the turntable is at the vacuum gripper carrier
+            else:
+                # Deactivate the conveyor rotation clockwise
+                self.turntable.turn_off()
+
+            # Finally, reset the counters
+            self.reset_station_states()
+
+        # Checkpoint the station state every CHECKPOINT_CYCLES cycles
+        self.checkpoint_count += 1
+        if self.checkpoint_count >= self.CHECKPOINT_CYCLES:
+            self.checkpoint_count = 0
+            self.checkpoint.save(self.station_snapshot())
+
     def start(self):
         """Start event system and own cyclic loop."""
         print('start')
@@ -154,6 +602,11 @@ class CycleEventManager():
         # https://revpimodio.org/en/events-in-the-mainloop/
         self.rpi.mainloop(blocking=False)
 
+        # Continue from the checkpoint if the station did not change
+        if self.restore_station_states():
+            print('Station state restored from checkpoint')
+        self.checkpoint.start()
+
         # Sets the Rpi a1 light: switch on / off green part of LED A1 | or 
         # do other things
         self.rpi.core.a1green.value = not self.rpi.core.a1green.value
@@ -162,250 +615,43 @@ class CycleEventManager():
         #self.act_compressor = True
         self.compressor.turn_on()
         
+        # Reporting every real-time setting before the loop starts
+        if self.real_time is None:
+            print('Real-time mode off')
+        else:
+            for setting, result in self.real_time.enter().items():
+                print('Real-time %s: %s' % (setting, result))
+
         # My own loop to do some work next to the event system. We will stay
         # here till self.rpi.exitsignal.wait returns True after SIGINT/SIGTERM
         # The loop does 2 things, continuously: 
         #   1. Sets the Rpi a1 light
         #   2. Follows the process description
-        while (self.rpi.exitsignal.wait(0.05) == False):
-            # Follows the process description ###############################
-            # If the oven-light sensor is False, that is there is the product
-            # So, set the self.prod_on_oven_carrier to True
-            if (self.oven_barrier.getState() == False):
-                self.prod_on_oven_carrier = True
-            
-            # If there is the product on the oven carrier, move the vacuum 
-            # carrier towards the oven
-            if (self.bool_oven_proc_completed == False and 
-                self.prod_on_oven_carrier == True):
-                # Move the carrier towards the oven
-                if (self.vacuum_carrier_towards_oven_switch.getState() == False):
-                    # Activate it towards the oven
-                    self.vacuum_carrier.move_towards_A()
-                else:
-                    # Deactivate it towards the oven
-                    self.vacuum_carrier.turn_off()
-                    
-            # If the oven is not ready and the vacuum carrier grip is at the 
-            # oven and the product is on the oven carrier: 
-            if (self.bool_oven_proc_completed == False and
-                self.prod_on_oven_carrier == True and 
-                self.vacuum_carrier_towards_oven_switch.getState() == True):
-                # Move inside the oven the oven carrier
-                if (self.inside_oven_switch.getState() == False):
-                    # TODO: FROM HERE WRAP INTO A SINGLE FUNCTION
-                    """
-                    # Open the door
-                    self.oven_door_opening.turn_on()
-                    # Move the feeder in the oven
-                    self.oven_carrier.move_towards_A()
-                # If the oven feeder is inside the oven
-                else:
-                    # Deactivate the inward oven
-                    self.oven_carrier.turn_off()
-                    # Close the door
-                    self.oven_door_opening.turn_off()
-                    """
-                    self.oven.move_carrier_inward()
-                else:
-                    # TODO: modify so that the light flashes only AFTER the door is completely closed
-                    #haha, flashing lights go brrrr - For light flashing
-                    if (self.time_sens_oven_count % 2 == 1):
-                        # Activate the process light
-                        #self.oven_proc_light.turn_on()
-                        self.oven.activate_process_light()
-                    else:
-                        # Deactivate the process light
-                        #self.oven_proc_light.turn_off()
-                        self.oven.deactivate_process_light()
-                    # Time counter
-                    self.time_sens_oven_count += 1            
-
-                # If the counter reaches 30, stop the oven process
-                if (self.time_sens_oven_count >= 30):       
-                    # Deactivate the light
-                    self.oven_proc_light.turn_off()
-                    # Set the oven process var to True
-                    self.bool_oven_proc_completed = True
-                    # Set the oven counter to 0
-                    self.time_sens_oven_count = 0
-            # If the oven is ready
-            elif (self.bool_oven_proc_completed == True and 
-                  self.prod_on_oven_carrier == True):
-                # If oven_feeder_out sensor is False = the carrier is not 
-                # out
-                if (self.outside_oven_switch.getState() == False):
-                    # Open the door
-                    self.oven_door_opening.turn_on()
-                    # Move the oven outside
-                    self.oven_carrier.move_towards_B()
-                else:
-                    # Stop moving the oven carrier
-                    self.oven_door_opening.turn_off()
-                    # Close the door
-                    self.oven_carrier.turn_off()
-                        
-            # Take the product with the carrier grip
-            # Lower the vacuum gripper
-            # If oven feeder sensor is True and oven ready is True and the
-            # vacuum gripper variable is True and vacuum counter is less
-            # than 10, that is if the oven feeder is out from the oven and
-            # the oven is in ready state and the vacuum carrieer gripper 
-            # is at the oven and the vacuum counter is less than 10
-            # The counter is needed in order to wait for the vacuum gripper
-            # to be completely lowered  
-            if (self.outside_oven_switch.getState() == True 
-                and self.bool_oven_proc_completed == True
-                and self.vacuum_carrier_towards_oven_switch.getState() == True 
-                and self.prod_on_oven_carrier == True):
-                if (self.time_sens_vacuum_count < 10):
-                    # Lower the carrier vacuum gripper
-                    self.vacuum_grip_lowering.turn_on()
-                    # Add 1 to the vacuum counter
-                    self.time_sens_vacuum_count += 1
-            
-                # Grip the product 
-                # If vacuum count is greater than 10 and less than 15
-                if (self.time_sens_vacuum_count >= 10 and 
-                    self.time_sens_vacuum_count < 15):
-                    # Activate the carrier vacuum gripper
-                    self.vacuum_valve_grip.turn_on()
-                    # Add 1 to the vacuum count
-                    self.time_sens_vacuum_count += 1
-
-                # Raise the vacuum gripper 
-                # If vacuum count is greater than 15 and less than 25
-                if (self.time_sens_vacuum_count >= 15 and 
-                        self.time_sens_vacuum_count < 25):
-                    # Upper the carrier vacuum gripper
-                    self.vacuum_grip_lowering.turn_off()
-                    # Add 1 to the vacuum counter
-                    self.time_sens_vacuum_count += 1
-            
-                if(self.vacuum_carrier_towards_oven_switch.getState() == True
-                    and self.vacuum_grip_lowering.getState() == False
-                    and self.vacuum_valve_grip.getState() == True
-                    and self.time_sens_vacuum_count >= 25):
-                    self.time_sens_vacuum_count = 0
-                    self.prod_on_oven_carrier = False
-                    self.prod_on_vacuum_carrier = True
-            
-            # Move the carrier to the turnta#ble
-            if (self.prod_on_vacuum_carrier == True and 
-                self.vacuum_carrier_towards_turntable_switch.getState() == False):
-                # Bring the carrier vacuum gripper to the turn-table
-                self.vacuum_carrier.move_towards_B()
-            elif (self.prod_on_vacuum_carrier == True and 
-                self.vacuum_carrier_towards_turntable_switch.getState() == True):
-                # Stop the vacuum carrier
-                self.vacuum_carrier.turn_off()
-            
-            # Release the product
-            # Lower the carrier vacuum gripper
-            if (self.vacuum_carrier_towards_turntable_switch.getState() == True 
-                and self.prod_on_vacuum_carrier == True
-                and self.vacuum_valve_grip.getState() == True
-                and self.time_sens_vacuum_count < 15):
-                    self.vacuum_grip_lowering.turn_on()
-                    self.time_sens_vacuum_count += 1
-            # Release the product on the turntable
-            elif (self.vacuum_carrier_towards_turntable_switch.getState() == True 
-                and self.vacuum_grip_lowering.getState() == True
-                and self.time_sens_vacuum_count >= 15 
-                and self.time_sens_vacuum_count < 30):
-                    self.vacuum_valve_grip.turn_off()
-                    self.time_sens_vacuum_count += 1
-            # Raise the carrier vacuum gripper
-            elif (self.vacuum_carrier_towards_turntable_switch.getState() == True 
-                and self.vacuum_grip_lowering.getState() == True
-                and self.vacuum_valve_grip.getState() == False
-                and self.time_sens_vacuum_count >= 30):
-                    self.time_sens_vacuum_count = 0
-                    self.vacuum_grip_lowering.turn_off()
-                    self.prod_on_vacuum_carrier = False
-                    self.bool_vacuum_carrier_proc_completed = True
-                    self.prod_on_turntable = True
-
-            # Turn the turntable towards the saw
-            if (self.prod_on_turntable == True and
-                self.bool_turntable_proc_completed == False):
-                # Activate the turntable until it reaches the saw
-                if (self.turntab_under_saw_switch.getState() == False and
-                    self.bool_saw_proc_completed == False):
-                    self.turntable.move_towards_A()
-                elif(self.turntab_under_saw_switch.getState() == True and
-                    self.bool_saw_proc_completed == False):
-                    self.turntable.turn_off()
-
-                # Activate the saw for the design processing time
-                if (self.turntab_under_saw_switch.getState() == True and 
-                    self.bool_saw_proc_completed == False and
-                    self.time_sens_saw_count < 40):
-                    self.saw.turn_on()
-                    self.time_sens_saw_count += 1
-                elif (self.turntab_under_saw_switch.getState() == True and 
-                    self.time_sens_saw_count >= 40): 
-                    self.saw.turn_off()
-                    self.bool_saw_proc_completed = True
-                    self.time_sens_saw_count = 0
-            
-                # Activate the turntable until it reaches the conveyor                
-                if (self.bool_saw_proc_completed == True and
-                    self.turntab_towards_conveyor_switch.getState() == False):
-                    self.turntable.move_towards_A()
-                elif (self.bool_saw_proc_completed == True and
-                    self.turntab_towards_conveyor_switch.getState() == True): 
-                    self.turntable.turn_off()
-            
-                # Activate the pusher
-                if (self.turntab_towards_conveyor_switch.getState() == True and
-                    self.time_sens_turntable_pusher_count < 20):
-                    self.turntable_pusher.turn_on()
-                    self.time_sens_turntable_pusher_count += 1
-                elif(self.turntab_towards_conveyor_switch.getState() == True and
-                    self.time_sens_turntable_pusher_count >= 20):
-                    self.turntable_pusher.turn_off()
-                    self.prod_on_turntable = False
-                    self.prod_on_conveyor = True
-                    self.time_sens_turntable_pusher_count = 0
-            
-            # Activate the conveyor
-            if (self.prod_on_conveyor == True):
-                if (self.conveyor_barrier.getState() == True):
-                    self.conveyor.turn_on()
-                elif (self.conveyor_barrier.getState() == False): 
-                    self.conveyor.turn_off()
-
-            #################################################################
-            # Otherwise, if there is the product in front of the light sensor
-            if(self.conveyor_barrier.getState() == False):
-                # Turn off the services
-                self.compressor.turn_off()
-                
-                # Turn off the valve feeder
-                self.turntable_pusher.turn_off()
-
-                # Turn off the conveyor belt
-                self.conveyor.turn_off()
-                
-                # Turn the turn-table towards the carrier
-                # If the turntable_pos_vacuum sensor is False, that is 
-                # if the turntable is not at the vacuum gripper carrier
-                if (self.turntab_under_vacuum_switch.getState() == False):
-                    # Activate the conveyor rotation clockwise
-                    self.turntable.move_towards_B()
-                # Otherwise, if the turntable_pos_vacuum sensor is True, that 
-                # is if the turntable is at the vacuum gripper carrier
-                else:
-                    # Deactivate the conveyor rotation clockwise
-                    self.turntable.turn_off()
+        wait = self.CYCLE_TIME
+        try:
+            while (self.rpi.exitsignal.wait(wait) == False):
+                cycle_start = perf_counter()
+                self.tick()
 
-                # Finally, reset the counters
-                self.reset_station_states()
+                # Collecting garbage in the slack of the cycle only, the next
+                # cycle then waits for what is left of the slack
+                if self.real_time is not None:
+                    self.real_time.idle(self.CYCLE_TIME
+                                        - (perf_counter() - cycle_start))
+                    wait = max(0.0, self.CYCLE_TIME
+                               - (perf_counter() - cycle_start))
+        finally:
+            # Restoring the settings also after an error in the loop
+            if self.real_time is not None:
+                self.real_time.exit()
 
 
 if __name__ == "__main__":
-    # Instantiating the controlling class
-    root = CycleEventManager()
+    # Instantiating the controlling class, --realtime pins it to a CPU,
+    # requests SCHED_FIFO, locks its memory and controls the collector,
+    # --calibrate calibrates the dwell times of the vacuum gripper
+    root = CycleEventManager(RealTime() if '--realtime' in sys.argv
+                             else None,
+                             calibrate='--calibrate' in sys.argv)
     # Launch the start function of the RevPi event control system
     root.start()
@@ -21,6 +21,8 @@ class ReferenceSwitch(object):
         self.rpi = rpi
         self.name = name
         self.pin = pin
+        # IO object of the pin, resolved once instead of on every access
+        self.io = rpi.io['I_' + str(pin)]
         self.state = False
         
         self.getState()     # First reading of the actual state
@@ -29,7 +31,7 @@ class ReferenceSwitch(object):
         return self.name
     
     def getState(self) -> bool:
-        state = self.rpi.io['I_' + str(self.pin)].value
+        state = self.io.value
         if state == True:
             self.state = True
         else: 
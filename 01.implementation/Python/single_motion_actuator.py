@@ -18,6 +18,8 @@ class SingleMotionActuator(object):
         self.rpi = rpi
         self.name = name
         self.pin = pin
+        # IO object of the pin, resolved once instead of on every access
+        self.io = rpi.io['O_' + str(pin)]
         # TODO: put pin validity check - it should be between 1 and 14
         self.state = False
         self.getState()     # First reading of the actual state
@@ -26,13 +28,13 @@ class SingleMotionActuator(object):
         return self.name
     
     def getState(self) -> bool:
-        state = self.rpi.io['O_' + str(self.pin)].value
+        state = self.io.value
         return state
     
     def turn_on(self) -> None:
         self.state = True
-        self.rpi.io['O_' + str(self.pin)].value = self.state
+        self.io.value = self.state
 
     def turn_off(self) -> None:
         self.state = False
-        self.rpi.io['O_' + str(self.pin)].value = self.state
+        self.io.value = self.state
@@ -0,0 +1,153 @@
+import contextlib
+import gc
+import io
+import os
+import sys
+import unittest
+from types import ModuleType, SimpleNamespace
+from unittest import mock
+
+from CellSimulation import CELLS
+from OvenStationPlant import OvenStationPlant
+from Robot import Robot
+from SimRevPi import SimRevPi, SimIo
+
+# the entry point of the oven station next to this tree
+IMPLEMENTATION = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '01.implementation', 'Python')
+
+# ints above 256 are objects, a value moving out of the small int range keeps a block alive until it moves back, so a
+# few blocks may be left over at the end of a window without anything piling up
+VALUE_BLOCKS = 16
+
+
+class RefreshedIo(SimIo):
+    """An input the control busy-waits on, the plant moves on while it is read as with an autorefreshed RevPi"""
+
+    def __init__(self, motor: str):
+        """
+        :param str motor: the output driving the plant towards the input
+        """
+        self.motor = motor
+        self.plant = None
+        self.__value = 0
+        self.__stepping = False
+        super().__init__()
+
+    @property
+    def value(self):
+        if self.plant is not None and not self.__stepping and self.plant.io[self.motor].value:
+            self.__stepping = True
+            self.plant.step()
+            self.__stepping = False
+        return self.__value
+
+    @value.setter
+    def value(self, value):
+        self.__value = value
+
+
+class MyTestCase(unittest.TestCase):
+
+    def steadyState(self, tick, ticks: int, machines=(), step=None) -> tuple:
+        """Runs ticks, returns the GC tracked objects and the memory blocks they left allocated and the ticks left out
+
+        Ticks in which a machine starts a job and builds its move list are left out. The simulated plant is stepped
+        between the ticks, it is not part of the control path.
+        """
+        jobs = []
+        for machine in machines:
+            generate = machine.generateTransferMoveList
+            machine.generateTransferMoveList = lambda start, fin, generate=generate: jobs.append(start) or \
+                generate(start, fin)
+        gc.collect()
+        gc.disable()
+        try:
+            # the first tick after a collection refills the free lists
+            tick()
+            objects = blocks = skipped = 0
+            for i in range(ticks):
+                jobs.clear()
+                # the objects in the youngest generation, the allocation count of gc is thrown off by free lists
+                count = len(gc.get_objects(0))
+                allocated = sys.getallocatedblocks()
+                tick()
+                if jobs:
+                    skipped += 1
+                else:
+                    objects += len(gc.get_objects(0)) - count
+                    blocks += sys.getallocatedblocks() - allocated
+                if step is not None:
+                    step()
+        finally:
+            gc.enable()
+        return objects, blocks, skipped
+
+    def testSortingStirringTick(self):
+        cell, plant, cycleTime = CELLS['sortingStirring'](SimRevPi(), {})
+        # warmed up once every station ran and two packages went through
+        while plant.produced < 2:
+            cell.tick()
+            plant.step()
+        objects, blocks, skipped = self.steadyState(cell.tick, 4000, (cell.robot1, cell.vacuum1, cell.warehouse1,
+                                                                      cell.robot2), plant.step)
+        # a move list is built once per job, not every tick
+        self.assertLess(skipped, 20)
+        self.assertEqual(0, objects)
+        self.assertLessEqual(blocks, VALUE_BLOCKS)
+
+    def testOvenTick(self):
+        cell, plant, cycleTime = CELLS['oven'](SimRevPi(), {})
+        for i in range(2000):
+            cell.tick()
+            plant.step()
+        objects, blocks, skipped = self.steadyState(cell.tick, 2000, step=plant.step)
+        self.assertEqual(0, objects)
+        self.assertLessEqual(blocks, VALUE_BLOCKS)
+
+    def testMainReadWrite(self):
+        pixtend = ModuleType('pixtendlib.pixtendv2l')
+        pixtend.PiXtendV2L = SimpleNamespace
+        with mock.patch.dict(sys.modules, {'pixtendlib': ModuleType('pixtendlib'), 'pixtendlib.pixtendv2l': pixtend}):
+            import main
+            main.p = SimpleNamespace(**{'digital_in%d' % i: False for i in range(16)})
+            main.robot1 = Robot(1, [])
+
+            def tick():
+                main.read()
+                main.write()
+            for i in range(10):
+                tick()
+            objects, blocks, skipped = self.steadyState(tick, 1000)
+        self.assertEqual(0, objects)
+        self.assertEqual(16, len(main.inputs))
+        self.assertLessEqual(blocks, VALUE_BLOCKS)
+
+    def testProcessActuatorTick(self):
+        rpi = SimRevPi()
+        # the control waits for the oven carrier to get inside within one cycle
+        rpi.io.I_6 = RefreshedIo('O_5')
+        revpimodio2 = ModuleType('revpimodio2')
+        revpimodio2.RevPiModIO = lambda autorefresh=True: rpi
+        sys.path.insert(0, IMPLEMENTATION)
+        try:
+            with mock.patch.dict(sys.modules, {'revpimodio2': revpimodio2}), contextlib.redirect_stdout(io.StringIO()):
+                import process_actuator
+                station = process_actuator.CycleEventManager()
+        finally:
+            sys.path.remove(IMPLEMENTATION)
+        # the checkpoint is handed a new snapshot by design, every CHECKPOINT_CYCLES only
+        station.CHECKPOINT_CYCLES = sys.maxsize
+        plant = OvenStationPlant(rpi)
+        rpi.io.I_6.plant = plant
+        for i in range(2000):
+            station.tick()
+            plant.step()
+        produced = plant.produced
+        objects, blocks, skipped = self.steadyState(station.tick, 2000, step=plant.step)
+        self.assertGreater(plant.produced, produced)
+        self.assertEqual(0, objects)
+        self.assertLessEqual(blocks, VALUE_BLOCKS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+from time import monotonic
+
+
+class Anticipation:
+    """Starts an action a lead time before the sensor event it waits for, e.g. a saw spinning up while the turntable is
+    still on its way to it.
+
+    The time from the start of a motion to its sensor event is measured every time it runs and learned as a moving
+    average. While the motion runs, the event is predicted at that average after the start. Until the first travel time
+    is measured, the action waits for the event itself, as without anticipation. The prediction ends if the motion stops
+    short of the event, which is then not timed, or if the event did not happen lead seconds after it was predicted,
+    e.g. as the motion stalled or got slower, which is still timed until the event.
+    """
+
+    def __init__(self, name: str, lead: float, clock=monotonic, weight: float = 0.25):
+        """
+        :param str name: the action and the event it anticipates, for reports
+        :param float lead: seconds before the predicted event the action starts
+        :param clock: returns the current time in seconds
+        :param float weight: the weight of a new measurement in the learned travel time
+        """
+        self.name = name
+        self.lead = lead
+        self.clock = clock
+        self.weight = weight
+        # the learned seconds from the start of the motion to the event, None until measured
+        self.travelTime = None
+        self.measurements = 0
+        # the motions that stalled or stopped short of the event after the action was due
+        self.stalls = 0
+        self.__start = None
+        self.__overdue = False
+        self.__moving = self.__arrived = False
+
+    def update(self, moving: bool, arrived: bool) -> bool:
+        """Runs once per cycle, returns whether the action is due
+
+        :param bool moving: whether the motion towards the event runs, it is timed from the cycle this becomes True
+        :param bool arrived: whether the sensor of the event fired
+        :return bool: True once the event is predicted within lead seconds, or has happened, False again once the
+            prediction ended
+        """
+        if moving and not self.__moving and not arrived:
+            self.__start = self.clock()
+            self.__overdue = False
+        self.__moving = moving
+        if arrived and not self.__arrived and self.__start is not None:
+            self.learn(self.clock() - self.__start)
+            self.__start = None
+        self.__arrived = arrived
+        if arrived:
+            return True
+        if self.__start is None or self.travelTime is None or self.__overdue:
+            return False
+        remaining = self.travelTime - (self.clock() - self.__start)
+        if not moving:
+            # stopped short, the motion is not timed
+            if remaining <= self.lead:
+                self.stalls += 1
+            self.__start = None
+            return False
+        if remaining < -self.lead:
+            # stalled, the action waits for the event again
+            self.stalls += 1
+            self.__overdue = True
+            return False
+        return remaining <= self.lead
+
+    def learn(self, travelTime: float):
+        """Adds a measured travel time"""
+        if self.travelTime is None:
+            self.travelTime = travelTime
+        else:
+            self.travelTime += self.weight * (travelTime - self.travelTime)
+        self.measurements += 1
+
+
+class Anticipator:
+    """The anticipated actions of a station, each declared as "start the action lead seconds before the event"."""
+
+    def __init__(self, clock=monotonic):
+        """
+        :param clock: returns the current time in seconds, shared by all declared actions
+        """
+        self.clock = clock
+        self.anticipations = []
+
+    def declare(self, name: str, lead: float) -> Anticipation:
+        """Returns a new anticipated action, update() it every cycle"""
+        anticipation = Anticipation(name, lead, self.clock)
+        self.anticipations.append(anticipation)
+        return anticipation
+
+    def travelTimes(self) -> dict:
+        """Returns the learned travel times by name, None where none was measured yet"""
+        return {anticipation.name: anticipation.travelTime for anticipation in self.anticipations}
@@ -0,0 +1,101 @@
+import unittest
+
+from Anticipation import Anticipation, Anticipator
+from CellSimulation import CELLS
+from SimRevPi import SimRevPi
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.anticipator = Anticipator(lambda: self.now)
+        self.anticipation = self.anticipator.declare('start before arrival', 1.0)
+
+    def travel(self, seconds: float) -> float:
+        """Runs a motion taking seconds in steps of 0.5 s, returns the seconds before the arrival the action was due"""
+        due = None
+        self.anticipation.update(False, False)
+        for step in range(int(seconds / 0.5) + 1):
+            arrived = step * 0.5 >= seconds
+            if self.anticipation.update(True, arrived) and due is None:
+                due = seconds - step * 0.5
+            self.now += 0.5
+        self.anticipation.update(False, True)
+        return due
+
+    def testLearnTravelTime(self):
+        #without a measured travel time the action waits for the event
+        self.assertEqual(0.0, self.travel(4.0))
+        self.assertEqual(4.0, self.anticipation.travelTime)
+        self.assertEqual(1.0, self.travel(4.0))
+        self.assertEqual(5.0, self.travel(8.0))
+        self.assertEqual(5.0, self.anticipation.travelTime)
+        self.assertEqual({'start before arrival': 5.0}, self.anticipator.travelTimes())
+        self.assertEqual(3, self.anticipation.measurements)
+
+    def testNotTimedFromEvent(self):
+        #a motion started while the event is on is not measured
+        self.anticipation.update(False, True)
+        self.anticipation.update(True, True)
+        self.now += 3.0
+        self.anticipation.update(True, False)
+        self.anticipation.update(False, True)
+        self.assertIsNone(self.anticipation.travelTime)
+
+    def testStall(self):
+        self.travel(4.0)
+        #the motion stalls, the action is due for lead seconds before and after the predicted event, then no more
+        self.anticipation.update(False, False)
+        due = []
+        for step in range(14):
+            due.append(self.anticipation.update(True, False))
+            self.now += 0.5
+        self.assertEqual([False] * 6 + [True] * 5 + [False] * 3, due)
+        self.assertEqual(1, self.anticipation.stalls)
+        #the motion is still timed until the event finally happens
+        self.anticipation.update(True, True)
+        self.assertEqual(4.75, self.anticipation.travelTime)
+        #a motion stopping short of the event ends the prediction at once
+        self.anticipation.update(False, False)
+        for step in range(8):
+            self.anticipation.update(True, False)
+            self.now += 0.5
+        self.assertFalse(self.anticipation.update(False, False))
+        self.assertEqual(2, self.anticipation.stalls)
+
+    def testSawStopsWhenTurntableStalls(self):
+        cell, plant, cycleTime = CELLS['oven'](SimRevPi(), {})
+        group = cell.machine_group
+        while group.saw_spin_up.measurements < 2:
+            cell.tick()
+            plant.step()
+        #the turntable stalls on its next way to the saw
+        while not group.act_rot_clockwise or group.saw_count or group.turntable_pos_saw:
+            cell.tick()
+            plant.step()
+        plant.turntable.speed = 0
+        sawing = []
+        for i in range(200):
+            cell.tick()
+            plant.step()
+            sawing.append(bool(group.act_saw))
+        self.assertTrue(any(sawing))
+        self.assertFalse(any(sawing[100:]))
+        self.assertEqual(1, group.saw_spin_up.stalls)
+        self.assertEqual(0, group.saw_spin_up_count)
+
+    def testSawSpinsUpAhead(self):
+        cell, plant, cycleTime = CELLS['oven'](SimRevPi(), {})
+        group = cell.machine_group
+        early = 0
+        for i in range(1000):
+            cell.tick()
+            plant.step()
+            early += group.act_saw and not group.turntable_pos_saw
+        self.assertGreater(group.saw_spin_up.measurements, 1)
+        self.assertGreater(early, 0)
+        self.assertGreater(plant.produced, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,6 +2,9 @@ from enum import Enum
 from PlusMinusStop import PlusMinusStop
 from ImpulseCounter import ImpulseCounter
 from Counter import Counter
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('Axis')
 
 
 class AxisType(Enum):
@@ -11,6 +14,18 @@ class AxisType(Enum):
 
 #TODO ensure no negative values are accepted for counter goal
 class Axis:
+    """A motor driven axis moved to a counter goal or to its end switch.
+
+    An encoder axis estimates its velocity from the encoder delta of every tick and learns how far it coasts after its
+    motor stopped, per step per tick of the velocity it had, so short pulses at a low velocity do not shorten the coast
+    predicted for a full speed approach. Moving to a counter goal, it stops the motor in the tick that lets it coast
+    closest to the goal, so most moves end within tolerance without a correction. Until the first coast is measured,
+    and for impulse counter axes, whose impulses are only counted while the motor runs, the motor stops within
+    tolerance of the goal.
+    """
+
+    # weight of a new measurement in the learned coast ratio
+    coastWeight = 0.25
 
     def __init__(self, typ: AxisType, tolerance):
         """constructor creates ImpulseCounter object if necessary"""
@@ -26,6 +41,14 @@ class Axis:
         self.__counterinput = 0
         self.__outputplus = 0
         self.__outputminus = 0
+        #encoder steps per tick, negative towards the end switch
+        self.__velocity = 0
+        #learned steps the axis coasts after its motor stopped per step per tick of its velocity, None until measured
+        self.__coastRatio = None
+        #counter, direction (1 or -1) and speed the motor was stopped at, None once the axis is at rest
+        self.__stoppedAt = None
+        self.__stoppedSign = 0
+        self.__stoppedSpeed = 0
 
     @property
     def counterValueCurrent(self):
@@ -35,6 +58,10 @@ class Axis:
     def counterValueCurrent(self, value):
         self.__counter.counter = value
 
+    @property
+    def tolerance(self):
+        return self.__tolerance
+
     @property
     def endpos(self):
         return self.__endpos
@@ -51,10 +78,69 @@ class Axis:
     def outputminus(self):
         return self.__outputminus
 
+    @property
+    def velocity(self):
+        """Returns the encoder steps moved in the last tick, negative towards the end switch"""
+        return self.__velocity
+
+    @property
+    def coastRatio(self):
+        """Returns the learned steps the axis coasts after its motor stopped per step per tick of its velocity, None
+        until measured"""
+        return self.__coastRatio
+
     def update(self, endpos, counterinput):
+        if self.__type == AxisType.Encoder:
+            self.__velocity = counterinput - self.__counterinput
+            if self.__stoppedAt is not None and self.__velocity == 0:
+                self.learnCoast((counterinput - self.__stoppedAt) * self.__stoppedSign, self.__stoppedSpeed)
         self.__endpos = endpos
         self.__counterinput = counterinput
 
+    def learnCoast(self, coast, speed):
+        """Adds the steps the axis coasted after its motor was stopped at speed steps per tick"""
+        self.__stoppedAt = None
+        # a reset encoder or a reversed axis tell nothing about the coast, nor does a motor stopped before it moved
+        if coast < 0 or speed <= 0:
+            return
+        ratio = coast / speed
+        if self.__coastRatio is None:
+            self.__coastRatio = ratio
+        else:
+            self.__coastRatio += self.coastWeight * (ratio - self.__coastRatio)
+        log.debug('coast %d at speed %d, learned ratio %.2f', coast, speed, self.__coastRatio)
+
+    def predictStop(self, counterGoal, direction):
+        """Returns the direction an encoder axis moves in towards counterGoal, None to stop the motor short of it
+
+        The motor is stopped early if coasting from here ends closer to the goal than coasting from one tick further
+        on, and kept off while the axis coasts. Once at rest, an axis outside tolerance is corrected as before.
+        """
+        if self.__stoppedAt is not None:
+            return None
+        sign = 1 if direction == PlusMinusStop.PLUS else -1
+        speed = self.__velocity * sign
+        if self.__coastRatio is None or speed <= 0:
+            return direction
+        remaining = (counterGoal - self.__counter.counter) * sign
+        if remaining - self.__coastRatio * speed <= speed / 2:
+            return None
+        return direction
+
+    def snapshot(self) -> dict:
+        """Returns the counter state of the axis, impulse counters also keep the raw input they last counted"""
+        state = {'counter': self.__counter.counter, 'first': self.__first}
+        if isinstance(self.__counter, ImpulseCounter):
+            state['numalt'] = self.__counter.numalt
+        return state
+
+    def restore(self, state: dict):
+        """Restores the counter state from a snapshot"""
+        self.__counter.counter = state['counter']
+        self.__first = state['first']
+        if isinstance(self.__counter, ImpulseCounter):
+            self.__counter.numalt = state['numalt']
+
     @staticmethod
     def howtoCounterPos(counterGoal, counterCurrent, tolerance):
         """method to determine which way the axis needs to rotate"""
@@ -78,46 +164,59 @@ class Axis:
         if endpos:
             if not self.__endpos:
                 self.__outputminus = True
+                self.__stoppedAt = None
                 if isinstance(self.__counter, ImpulseCounter):
                     self.__counter.counter = self.__counter.compute(self.__counterinput, PlusMinusStop.MINUS)
-                    print(self.__counter.counter)
+                    log.debug('counter %d', self.__counter.counter)
                 d = PlusMinusStop.MINUS
             else:
                 self.__outputminus = False
+                if isinstance(self.__counter, ImpulseCounter):
+                    # the end switch is the zero of an impulse counter, impulses not yet counted on the way in are dropped
+                    self.__counter.counter = 0
+                    self.__counter.numalt = self.__counterinput
                 t = True
         else:
             #calls compute methods for axis with impulse counters based on (previous) motor direction, not necessary for encoder
             if isinstance(self.__counter, ImpulseCounter):
                 if self.outputplus:
                     self.__counter.counter = self.__counter.compute(self.__counterinput, PlusMinusStop.PLUS)
-                    print(self.__counter.counter)
+                    log.debug('counter %d', self.__counter.counter)
                     #print("compute counter")
                     if self.__first or self.endpos:
                         self.__first = False
-                        print("Reset arm counter here here here here here here")
+                        log.debug('reset counter')
                         self.__counter.counter = 0
                 elif self.outputminus:
                     self.__counter.counter = self.__counter.compute(self.__counterinput, PlusMinusStop.MINUS)
-                    print(self.__counter.counter)
+                    log.debug('counter %d', self.__counter.counter)
                     if self.__first or self.endpos:
                         self.__first = False
-                        print("Reset arm counter here here here here here here")
+                        log.debug('reset counter')
                         self.__counter.counter = 0
 
             else:
                 self.__counter.counter = self.__counterinput
-            if self.howtoCounterPos(counterGoal, self.__counter.counter, self.__tolerance) == PlusMinusStop.PLUS:
+            direction = self.howtoCounterPos(counterGoal, self.__counter.counter, self.__tolerance)
+            if direction != PlusMinusStop.STOP and self.__type == AxisType.Encoder:
+                direction = self.predictStop(counterGoal, direction)
+            if direction == PlusMinusStop.PLUS:
                 self.__outputminus = False
                 self.__outputplus = True
                 d = PlusMinusStop.PLUS
-            elif self.howtoCounterPos(counterGoal, self.__counter.counter, self.__tolerance) == PlusMinusStop.MINUS:
+            elif direction == PlusMinusStop.MINUS:
                 self.__outputminus = True
                 self.__outputplus = False
                 d = PlusMinusStop.MINUS
-            elif self.howtoCounterPos(counterGoal, self.__counter.counter, self.__tolerance) == PlusMinusStop.STOP:
+            else:
+                if self.__type == AxisType.Encoder and (self.__outputplus or self.__outputminus):
+                    # the coast is measured from here until the axis is at rest
+                    self.__stoppedAt = self.__counter.counter
+                    self.__stoppedSign = 1 if self.__outputplus else -1
+                    self.__stoppedSpeed = self.__velocity * self.__stoppedSign
                 self.__outputminus = False
                 self.__outputplus = False
-                t = True
+                t = direction == PlusMinusStop.STOP
         if isinstance(self.__counter, ImpulseCounter):
             return t, d
         return t
@@ -2,6 +2,29 @@ import unittest
 
 from DeleteAfterTests import RobotTester
 from Axis import Axis, AxisType
+from PlantModel import MotorAxis
+from SimRevPi import SimIo
+
+
+class RampedMotor:
+    """An encoder axis needing a tick at half its speed to get to speed, it coasts ratio ticks of the speed it had"""
+
+    def __init__(self, speed: int, ratio: int):
+        self.top = speed
+        self.ratio = ratio
+        self.position = self.speed = self.drift = 0
+
+    def step(self, plus: bool, minus: bool):
+        direction = plus - minus
+        if direction:
+            self.speed = direction * min(self.top, abs(self.speed) + self.top // 2)
+            self.drift = self.speed * self.ratio
+            self.position += self.speed
+        else:
+            self.speed = 0
+            moved = max(-self.top, min(self.drift, self.top))
+            self.drift -= moved
+            self.position += moved
 
 
 class MyTestCase(unittest.TestCase):
@@ -18,5 +41,72 @@ class MyTestCase(unittest.TestCase):
     def testCounter(self):
         pass
 
+    def testEndSwitchZeroesImpulseCounter(self):
+        # an axis that has moved before, driving in the last impulses arrive together with the end switch
+        self.axis.restore({'counter': 0, 'first': False, 'numalt': 0})
+        self.axis.update(False, 0)
+        self.axis.gotoConfig(True, 0)
+        self.axis.update(False, 8)
+        self.axis.gotoConfig(True, 0)
+        self.assertEqual(-8, self.axis.counterValueCurrent)
+        self.axis.update(True, 10)
+        self.assertEqual((True, None), self.axis.gotoConfig(True, 0))
+        self.assertEqual(0, self.axis.counterValueCurrent)
+        # driving out again only counts the impulses from the end switch on
+        self.axis.gotoConfig(False, 6)
+        self.axis.update(False, 13)
+        self.axis.gotoConfig(False, 6)
+        self.assertEqual(3, self.axis.counterValueCurrent)
+
+    def move(self, axis: Axis, motor: MotorAxis, goal: int) -> list:
+        """Moves an encoder axis to goal until it reached it and is at rest, returns the directions the motor ran in"""
+        directions = []
+        for tick in range(1000):
+            axis.update(False, motor.counter.value)
+            reached = axis.gotoConfig(False, goal)
+            motor.plus.value, motor.minus.value = axis.outputplus, axis.outputminus
+            if axis.outputplus or axis.outputminus:
+                direction = 1 if axis.outputplus else -1
+                if not directions or directions[-1] != direction:
+                    directions.append(direction)
+            elif reached and not motor.moved:
+                return directions
+            motor.step()
+        self.fail('axis did not reach %d' % goal)
+
+    def testPredictiveStop(self):
+        motor = MotorAxis(SimIo(), SimIo(), counter=SimIo(), speed=10, limit=5000, coast=45)
+        axis = Axis(AxisType.Encoder, 20)
+        # the first move stops within tolerance and learns the coast
+        self.move(axis, motor, 1000)
+        self.assertEqual(4.5, axis.coastRatio)
+        self.assertEqual(0, axis.velocity)
+        # a stop within tolerance coming down would coast out of it, these moves stop early instead
+        for goal in (2000, 500, 3333, 1234, 1300):
+            directions = self.move(axis, motor, goal)
+            self.assertLessEqual(len(directions), 1)
+            self.assertLessEqual(abs(motor.position - goal), 5)
+
+    def testCorrectionPulse(self):
+        motor = RampedMotor(10, 4)
+        axis = Axis(AxisType.Encoder, 20)
+
+        def move(goal):
+            for tick in range(1000):
+                axis.update(False, motor.position)
+                reached = axis.gotoConfig(False, goal)
+                if reached and not axis.outputplus and not axis.outputminus and not axis.velocity:
+                    return
+                motor.step(axis.outputplus, axis.outputminus)
+            self.fail('axis did not reach %d' % goal)
+        move(1000)
+        self.assertEqual(4, axis.coastRatio)
+        # short pulses stop the motor before it got to speed, they coast less but at the same ratio
+        for goal in (1025, 1050, 1075):
+            move(goal)
+        self.assertEqual(4, axis.coastRatio)
+        move(3000)
+        self.assertLessEqual(abs(motor.position - 3000), 5)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,57 @@
+"""Runs the control of one cell against its simulated plant, without hardware and without waiting for the cycle time.
+
+Every tick the cell reads, processes and writes as on the RevPi, then the plant moves for one cycle. simulate() is the
+unit of work of SimulationRunner, it only takes and returns plain values so it can run in a worker process.
+"""
+
+from time import perf_counter
+
+from SimRevPi import SimRevPi
+
+
+def ovenStation(rpi, params: dict):
+    """Returns the multiprocess station with oven and its plant"""
+    from cycle_event_manager import CycleEventManager
+    from OvenStationPlant import OvenStationPlant
+    cell = CycleEventManager(rpi)
+    return cell, OvenStationPlant(rpi, **params), cell.cycle_time
+
+
+def sortingStirring(rpi, params: dict):
+    """Returns the sorting/stirring cell and its plant"""
+    from CycleEventManagerRevPiSortingStirring import CycleEventManagerRevPiTestSetup
+    from SortingStirringPlant import SortingStirringPlant
+    cell = CycleEventManagerRevPiTestSetup(rpi=rpi)
+    return cell, SortingStirringPlant(rpi, cell, **params), cell.cycleTime
+
+
+# the cells that can be simulated, by kind
+CELLS = {'oven': ovenStation,
+         'sortingStirring': sortingStirring}
+
+
+def simulate(job: dict) -> dict:
+    """Simulates one cell for a number of cycles
+
+    :param dict job: 'kind' of the cell (see CELLS), 'ticks' to run and optional 'params' of the plant, e.g. speed
+    :return dict: the job and the 'produced' and 'dropped' packages, the 'simulatedSeconds' the ticks take on the
+        RevPi, the 'wallSeconds' the simulation took and the 'productsPerHour' of the cell
+    :raises KeyError: if the kind is unknown
+    """
+    params = job.get('params', {})
+    rpi = SimRevPi()
+    cell, plant, cycleTime = CELLS[job['kind']](rpi, params)
+    start = perf_counter()
+    for i in range(job['ticks']):
+        cell.tick()
+        plant.step()
+    wallSeconds = perf_counter() - start
+    simulatedSeconds = job['ticks'] * cycleTime
+    return {'kind': job['kind'],
+            'params': params,
+            'ticks': job['ticks'],
+            'produced': plant.produced,
+            'dropped': getattr(plant, 'dropped', 0),
+            'simulatedSeconds': simulatedSeconds,
+            'wallSeconds': wallSeconds,
+            'productsPerHour': plant.produced * 3600 / simulatedSeconds if simulatedSeconds else 0.0}
@@ -0,0 +1,75 @@
+import json
+import os
+import threading
+
+
+class Checkpoint:
+    """Persists a compact snapshot of the station state, so a software restart can continue without homing.
+
+    The control loop hands a snapshot over with save(), which only swaps a reference. A background thread writes the
+    latest snapshot at most every interval seconds, older ones it has not written yet are skipped. The file is replaced
+    atomically, a crash while writing leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, filename: str, interval: float = 0.5):
+        """
+        :param str filename: the file the checkpoint is written to
+        :param float interval: minimum seconds between two writes
+        """
+        self.__filename = filename
+        self.__interval = interval
+        self.__state = None
+        self.__pending = threading.Event()
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__run, name='checkpoint', daemon=True)
+
+    def start(self):
+        """Starts the thread writing the checkpoints"""
+        self.__thread.start()
+        return self
+
+    def save(self, state: dict):
+        """Hands a snapshot over to the writer, the snapshot must not be changed afterwards"""
+        self.__state = state
+        self.__pending.set()
+
+    def stop(self):
+        """Writes the last snapshot handed over and stops the thread"""
+        self.__stopped.set()
+        self.__pending.set()
+        if self.__thread.is_alive():
+            self.__thread.join()
+        elif self.__state is not None:
+            self.write(self.__state)
+
+    def load(self):
+        """Returns the last written snapshot, None if there is none or it can not be read"""
+        try:
+            with open(self.__filename) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def write(self, state: dict):
+        """Writes a snapshot synchronously, replacing the previous checkpoint"""
+        temp = self.__filename + '.tmp'
+        with open(temp, 'w') as f:
+            json.dump(state, f, separators=(',', ':'))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp, self.__filename)
+
+    def __run(self):
+        written = None
+        while True:
+            self.__pending.wait()
+            self.__pending.clear()
+            state = self.__state
+            if state is not None and state is not written:
+                self.write(state)
+                written = state
+            if self.__stopped.wait(self.__interval):
+                state = self.__state
+                if state is not None and state is not written:
+                    self.write(state)
+                return
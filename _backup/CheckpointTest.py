@@ -0,0 +1,93 @@
+import json
+import os
+import tempfile
+import unittest
+
+from Checkpoint import Checkpoint
+from Robot import Robot
+from SequenceManager import SequenceManager
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'test.checkpoint')
+        self.robot1 = Robot(1, [[2600,3550,25], [2000,100,100]])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def homedRobot(self):
+        robot = Robot(1, [[2600,3550,25], [2000,100,100]])
+        robot.robotSensRotEnd = robot.robotSensArmEndIn = robot.robotSensGripperOpen = robot.robotSensVerticalEndUp = True
+        robot.execute(0,1)
+        return robot
+
+    def testWriterKeepsLatest(self):
+        checkpoint = Checkpoint(self.filename, interval=10).start()
+        for i in range(100):
+            checkpoint.save({'cycle': i})
+        checkpoint.stop()
+        self.assertEqual(checkpoint.load(), {'cycle': 99})
+        self.assertFalse(os.path.exists(self.filename + '.tmp'))
+
+    def testLoadMissingOrBroken(self):
+        checkpoint = Checkpoint(self.filename)
+        self.assertIsNone(checkpoint.load())
+        with open(self.filename, 'w') as f:
+            f.write('{"cycle": ')
+        self.assertIsNone(checkpoint.load())
+
+    def testRestoreConsistent(self):
+        robot = self.homedRobot()
+        state = json.loads(json.dumps(robot.snapshot()))
+        self.assertTrue(state['setupFinished'])
+        #restart with the same sensor values
+        restarted = Robot(1, [[2600,3550,25], [2000,100,100]])
+        restarted.robotSensRotEnd = restarted.robotSensArmEndIn = restarted.robotSensGripperOpen = restarted.robotSensVerticalEndUp = True
+        self.assertTrue(restarted.isConsistent(state))
+        restarted.restore(state)
+        self.assertEqual(restarted.pc, robot.pc)
+        #no homing run and no encoder reset
+        restarted.execute(0,1)
+        robot.execute(0,1)
+        self.assertFalse(restarted.setupFinishedHelper)
+        self.assertEqual(restarted.pc, robot.pc)
+
+    def testInterruptedMoveIsRepeated(self):
+        robot = self.homedRobot()
+        robot.execute(0,1)
+        robot.execute(0,1)
+        state = robot.snapshot()
+        self.assertFalse(state['configReached'])
+        restarted = Robot(1, [[2600,3550,25], [2000,100,100]])
+        restarted.robotSensRotEnd = restarted.robotSensArmEndIn = restarted.robotSensGripperOpen = restarted.robotSensVerticalEndUp = True
+        restarted.restore(state)
+        self.assertEqual(restarted.pc, state['pc'] - 1)
+
+    def testInconsistent(self):
+        robot = self.homedRobot()
+        state = robot.snapshot()
+        restarted = Robot(1, [[2600,3550,25], [2000,100,100]])
+        #not homed: end switches not pressed
+        self.assertFalse(restarted.isConsistent(state))
+        #encoder moved while the program was down
+        restarted.robotSensRotEnd = restarted.robotSensArmEndIn = restarted.robotSensGripperOpen = restarted.robotSensVerticalEndUp = True
+        restarted.robotSensRotEncoderCounter = 500
+        self.assertFalse(restarted.isConsistent(state))
+        #snapshot taken before the homing run finished
+        self.assertFalse(restarted.isConsistent(Robot(1, []).snapshot()))
+
+    def testSequenceProgress(self):
+        stations = [Robot(i, []) for i in range(8)]
+        sequence = SequenceManager(1, *stations)
+        sequence.executeSortingStirring()
+        sequence.executeSortingStirring()
+        restored = SequenceManager(1, *stations)
+        restored.restore(json.loads(json.dumps(sequence.snapshot())))
+        self.assertEqual(restored.go, sequence.go)
+        self.assertEqual(restored.snapshot(), sequence.snapshot())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+"""Colour classification of the sorting line, see ColourClassifier. Run as a script to calibrate it from readings
+recorded on the cell, a JSON object of the readings by colour name:
+
+    python ColourClassifier.py readings.json sortingstirring.colours
+"""
+
+import argparse
+import json
+from bisect import bisect
+
+from Checkpoint import Checkpoint
+from Colour import Colour
+
+
+class ColourClassifier:
+    """Classifies the reading of the analog colour sensor of the sorting line with calibrated thresholds.
+
+    The colours are calibrated from recorded readings of pieces of known colour. Ordered by their mean reading, each two
+    neighbouring colours are told apart by the midpoint between their means. A reading is classified with one binary
+    search over these thresholds, far within one cycle. Readings above the highest mean by more than a margin are the
+    belt, not a piece. The calibration is kept in a file, so it is only recorded once.
+    """
+
+    def __init__(self, thresholds: list, colours: list, limit: float = None):
+        """
+        :param list thresholds: the ascending readings a colour ends at, one less than colours
+        :param list colours: the colours ordered by their readings
+        :param float limit: the highest reading of a piece, None to take every reading for one
+        """
+        self.thresholds = thresholds
+        self.colours = colours
+        self.limit = limit
+
+    @classmethod
+    def fromSamples(cls, samples: dict, margin: float = 200):
+        """Calibrates the thresholds from recorded readings
+
+        :param dict samples: the readings of pieces of known colour by Colour
+        :param float margin: how far above the highest mean a reading is still a piece
+        :raises ValueError: if a colour has no readings
+        """
+        means = []
+        for colour, readings in samples.items():
+            if not readings:
+                raise ValueError('no readings of ' + colour.name)
+            means.append((sum(readings) / len(readings), colour))
+        means.sort(key=lambda mean: mean[0])
+        thresholds = [(low[0] + high[0]) / 2 for low, high in zip(means, means[1:])]
+        return cls(thresholds, [colour for mean, colour in means], means[-1][0] + margin)
+
+    def classify(self, reading: float) -> Colour:
+        """Returns the colour of a reading"""
+        return self.colours[bisect(self.thresholds, reading)]
+
+    def isPiece(self, reading: float) -> bool:
+        """Returns whether a reading is one of a piece, not of the belt"""
+        return self.limit is None or reading <= self.limit
+
+    def save(self, filename: str):
+        """Writes the calibration to a file"""
+        Checkpoint(filename).write({'thresholds': self.thresholds, 'colours': [colour.name for colour in self.colours],
+                                    'limit': self.limit})
+
+    @classmethod
+    def load(cls, filename: str):
+        """Returns the calibration written to a file, None if there is none"""
+        state = Checkpoint(filename).load()
+        if state is None:
+            return None
+        return cls(state['thresholds'], [Colour[name] for name in state['colours']], state.get('limit'))
+
+
+class ColourStage:
+    """Measures the colour of a piece passing the colour sensor.
+
+    The sensor is sampled every cycle the piece is in front of it. A piece reads lower than the belt, so the lowest
+    reading is the one of the piece. If even that one is the belt's, the piece was not seen.
+    """
+
+    def __init__(self, classifier: ColourClassifier):
+        self.classifier = classifier
+        self.lowest = None
+
+    def sample(self, reading: int):
+        """Adds the reading of this cycle"""
+        if self.lowest is None or reading < self.lowest:
+            self.lowest = reading
+
+    def classify(self):
+        """Returns the colour and the reading of the piece measured since the last call, (None, None) if nothing or only
+        the belt was sampled, and starts measuring again
+        """
+        reading = self.lowest
+        self.lowest = None
+        if reading is None or not self.classifier.isPiece(reading):
+            return None, None
+        return self.classifier.classify(reading), reading
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Calibrates the colour classification of the sorting line')
+    parser.add_argument('readings', help='JSON file of the recorded readings by colour name, e.g. {"RED": [1290, 1310]}')
+    parser.add_argument('calibration', help='file the calibration is written to')
+    parser.add_argument('--margin', type=float, default=200,
+                        help='how far above the highest mean a reading is still a piece, default 200')
+    args = parser.parse_args()
+
+    with open(args.readings) as f:
+        readings = json.load(f)
+    classifier = ColourClassifier.fromSamples({Colour[name]: values for name, values in readings.items()}, args.margin)
+    classifier.save(args.calibration)
+    for colour, low, high in zip(classifier.colours, [None] + classifier.thresholds, classifier.thresholds + [None]):
+        print('%-5s %s to %s' % (colour.name, low if low is not None else '', high if high is not None else ''))
+    print('belt  above %s' % classifier.limit)
@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+from time import perf_counter
+
+from Colour import Colour
+from ColourClassifier import ColourClassifier, ColourStage
+from SortingLine import SortingLine
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.classifier = ColourClassifier.fromSamples({Colour.RED: [1280, 1320], Colour.WHITE: [790, 810],
+                                                        Colour.BLUE: [1590, 1610]})
+
+    def testCalibrate(self):
+        self.assertEqual([1050, 1450], self.classifier.thresholds)
+        self.assertEqual([Colour.WHITE, Colour.RED, Colour.BLUE], self.classifier.colours)
+        self.assertEqual(Colour.WHITE, self.classifier.classify(600))
+        self.assertEqual(Colour.RED, self.classifier.classify(1100))
+        self.assertEqual(Colour.BLUE, self.classifier.classify(1900))
+        self.assertEqual(1800, self.classifier.limit)
+        self.assertTrue(self.classifier.isPiece(1800))
+        self.assertFalse(self.classifier.isPiece(1900))
+        with self.assertRaises(ValueError):
+            ColourClassifier.fromSamples({Colour.RED: []})
+
+    def testWithinTick(self):
+        start = perf_counter()
+        for reading in range(0, 2000, 2):
+            self.classifier.classify(reading)
+        #a thousand classifications fit into one cycle of 30 ms
+        self.assertLess(perf_counter() - start, 0.03)
+
+    def testCache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'colours')
+            self.assertIsNone(ColourClassifier.load(filename))
+            self.classifier.save(filename)
+            loaded = ColourClassifier.load(filename)
+        self.assertEqual(self.classifier.thresholds, loaded.thresholds)
+        self.assertEqual(self.classifier.colours, loaded.colours)
+        self.assertEqual(self.classifier.limit, loaded.limit)
+
+    def testStage(self):
+        stage = ColourStage(self.classifier)
+        self.assertEqual((None, None), stage.classify())
+        for reading in (1900, 1700, 1620, 1900):
+            stage.sample(reading)
+        self.assertEqual((Colour.BLUE, 1620), stage.classify())
+        stage.sample(1900)
+        stage.sample(800)
+        self.assertEqual((Colour.WHITE, 800), stage.classify())
+        #a piece only the belt was seen of
+        stage.sample(1900)
+        self.assertEqual((None, None), stage.classify())
+
+    def testSortingLineTwoPieces(self):
+        #a blue piece A and a white piece B five impulses behind it, B passes the colour sensor while A is still on its
+        #way to the middle light barrier
+        line = SortingLine(3, self.classifier)
+        for raw in range(14):
+            positions = (raw, raw - 5)
+            line.sortingLineSensImpulseCounterRaw = raw
+            line.sortingLineSensInputLightBarrier = not any(0 <= position <= 2 for position in positions)
+            line.sortingLineSensMiddleLightBarrier = not any(10 <= position <= 12 for position in positions)
+            readings = [reading for position, reading in zip(positions, (1600, 800)) if 4 <= position <= 8]
+            line.sortingLineSensColour = readings[0] if readings else 1900
+            line.ejectColour(Colour.RED)
+        self.assertEqual(2, len(line.pieces))
+        self.assertEqual((Colour.BLUE, 1600), (line.pieces[0].colour, line.pieces[0].reading))
+        self.assertIsNone(line.pieces[1].colour)
+        self.assertEqual(800, line.pieces[1].stage.lowest)
+
+    def testSortingLineUnseenPiece(self):
+        #only the belt was seen in front of the colour sensor, the piece gets the fallback colour
+        line = SortingLine(3, self.classifier)
+        line.sortingLineSensColour = 1900
+        line.sortingLineSensInputLightBarrier = False
+        line.ejectColour(Colour.WHITE)
+        line.sortingLineSensInputLightBarrier = True
+        for raw in range(1, 11):
+            line.sortingLineSensImpulseCounterRaw = raw
+            line.sortingLineSensMiddleLightBarrier = raw != 10
+            line.ejectColour(Colour.WHITE)
+        self.assertEqual((Colour.WHITE, None), (line.pieces[0].colour, line.pieces[0].reading))
+
+    def testSortingLineEjectsMeasuredColour(self):
+        line = SortingLine(3, self.classifier)
+        line.sortingLineSensColour = 1900
+        line.ejectColour(Colour.RED)
+        line.sortingLineSensInputLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 2
+        line.ejectColour(Colour.RED)
+        line.sortingLineSensInputLightBarrier = True
+        line.sortingLineSensColour = 1600
+        line.sortingLineSensImpulseCounterRaw = 6
+        line.ejectColour(Colour.RED)
+        line.sortingLineSensColour = 1900
+        line.sortingLineSensMiddleLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 10
+        line.ejectColour(Colour.RED)
+        self.assertEqual(Colour.BLUE, line.pieces[0].colour)
+        self.assertEqual(1600, line.pieces[0].reading)
+        line.sortingLineSensImpulseCounterRaw = 20
+        line.ejectColour(Colour.RED)
+        self.assertEqual(line.sortingLineActBlueEjector, True)
+        self.assertEqual(line.sortingLineActRedEjector, False)
+
+
+if __name__ == '__main__':
+    unittest.main()
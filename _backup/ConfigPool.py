@@ -0,0 +1,25 @@
+class ConfigPool:
+    """Bounded intern table for immutable config objects.
+
+    Identical configs share one instance, so building a move list every cycle does not allocate new configs and
+    equality of pooled configs is decided by identity. Configs built from live encoder values are rarely identical,
+    so the table is cleared once it is full instead of growing with every new value.
+    """
+
+    def __init__(self, size: int = 1024):
+        self.__size = size
+        self.__configs = {}
+
+    def get(self, key: tuple):
+        """Returns the pooled config for key, None if there is none"""
+        return self.__configs.get(key)
+
+    def add(self, key: tuple, config):
+        """Adds config to the pool and returns it"""
+        if len(self.__configs) >= self.__size:
+            self.__configs.clear()
+        self.__configs[key] = config
+        return config
+
+    def __len__(self):
+        return len(self.__configs)
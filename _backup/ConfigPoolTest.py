@@ -0,0 +1,58 @@
+import unittest
+from copy import deepcopy
+
+from ConfigPool import ConfigPool
+from ThreeDRobotConfig import ThreeDRobotConfig
+from WarehouseConfig import WarehouseConfig
+from VacuumGripperConfig import VacuumGripperConfig
+
+
+class MyTestCase(unittest.TestCase):
+
+    def testInterning(self):
+        config1 = ThreeDRobotConfig(2800,350,0,0,False,False,False,False)
+        config2 = ThreeDRobotConfig(2800,350,0,0)
+        self.assertIs(config1, config2)
+        self.assertEqual(config1, config2)
+        config3 = ThreeDRobotConfig(2800,350,0,23)
+        self.assertIsNot(config1, config3)
+        self.assertNotEqual(config1, config3)
+        self.assertEqual(config3.counterGripper, 23)
+        self.assertEqual(len({config1, config2, config3}), 2)
+
+    def testTypesDiffer(self):
+        #same values, but a warehouse config is never equal to a robot config
+        self.assertNotEqual(ThreeDRobotConfig(1,2,False,False,False,False), WarehouseConfig(1,2,False,False,False,False))
+        self.assertNotEqual(VacuumGripperConfig(1,2,3,False), None)
+
+    def testImmutable(self):
+        config = VacuumGripperConfig(100,200,300,True)
+        with self.assertRaises(AttributeError):
+            config.counterArm = 5
+        with self.assertRaises(AttributeError):
+            config.foo = 5
+
+    def testDeepcopy(self):
+        confList = [ThreeDRobotConfig(2800,350,0,0), WarehouseConfig(1500,30,True,False,False,False)]
+        copied = deepcopy(confList)
+        self.assertIs(copied[0], confList[0])
+        self.assertEqual(copied, confList)
+
+    def testValidation(self):
+        with self.assertRaises(ValueError):
+            WarehouseConfig(1500,30,True,True,False,False)
+        with self.assertRaises(ValueError):
+            WarehouseConfig(1500,30,True,False,True,True)
+
+    def testPoolBounded(self):
+        pool = ConfigPool(2)
+        pool.add((1,), 'a')
+        pool.add((2,), 'b')
+        self.assertEqual(pool.get((1,)), 'a')
+        pool.add((3,), 'c')
+        self.assertEqual(len(pool), 1)
+        self.assertIsNone(pool.get((1,)))
+        self.assertEqual(pool.get((3,)), 'c')
+
+if __name__ == '__main__':
+    unittest.main()
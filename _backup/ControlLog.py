@@ -0,0 +1,95 @@
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Puts records into a bounded queue without blocking, records that do not fit are counted and dropped"""
+
+    def __init__(self, recordQueue):
+        super().__init__(recordQueue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # the message is built on the loop thread, arguments like the go lists of SequenceManager change in the next
+        # tick. Formatting the time, level and name is left to the listener thread
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class DrainingQueueListener(QueueListener):
+    """Writes the queued records to the target handler, stopping waits until the queue has room for the sentinel"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+class ControlLog:
+    """Asynchronous, level-gated logging for the control loop.
+
+    The machines log through ControlLog.getLogger(name). A disabled level costs one cached level check per call, the
+    arguments are only formatted when the message is enabled, then on the calling thread, so a record shows the state
+    of the tick it was logged in. Enabled records go into a bounded queue, a background
+    thread drains it to a file or stdout, so a tick never waits on terminal I/O. If the queue is full the record is
+    dropped and counted instead.
+    """
+
+    name = 'fischertechnik'
+
+    def __init__(self, level=logging.INFO, filename: str = None, size: int = 4096,
+                 fmt: str = '%(asctime)s %(levelname)s %(name)s: %(message)s'):
+        """
+        :param level: the lowest level that is logged
+        :param str filename: the file the records are written to, stdout if None
+        :param int size: the number of records the queue holds
+        :param str fmt: the format of a record
+        """
+        self.__level = level
+        self.__queue = queue.Queue(size)
+        self.__handler = DroppingQueueHandler(self.__queue)
+        if filename is None:
+            target = logging.StreamHandler(sys.stdout)
+        else:
+            target = logging.FileHandler(filename)
+        target.setFormatter(logging.Formatter(fmt))
+        self.__target = target
+        self.__listener = DrainingQueueListener(self.__queue, target)
+
+    @classmethod
+    def getLogger(cls, name: str) -> logging.Logger:
+        """Returns the logger of a module, e.g. ControlLog.getLogger('Axis')"""
+        return logging.getLogger(cls.name + '.' + name)
+
+    def start(self):
+        """Attaches the queue to the logger tree and starts the thread draining it"""
+        logger = logging.getLogger(self.name)
+        logger.setLevel(self.__level)
+        logger.addHandler(self.__handler)
+        logger.propagate = False
+        self.__listener.start()
+        return self
+
+    def stop(self):
+        """Detaches the queue, writes the records still queued and stops the thread"""
+        logger = logging.getLogger(self.name)
+        logger.removeHandler(self.__handler)
+        logger.setLevel(logging.NOTSET)
+        self.__listener.stop()
+        self.__target.close()
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of records dropped because the queue was full"""
+        return self.__handler.dropped
+
+
+# without a started ControlLog nothing is printed, not even the last resort handler for warnings
+logging.getLogger(ControlLog.name).addHandler(logging.NullHandler())
@@ -0,0 +1,83 @@
+import logging
+import os
+import tempfile
+import threading
+import unittest
+
+from ControlLog import ControlLog
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.filename = tempfile.mkstemp()
+        os.close(fd)
+        self.log = ControlLog.getLogger('ControlLogTest')
+
+    def tearDown(self):
+        os.remove(self.filename)
+
+    def read(self):
+        with open(self.filename) as f:
+            return f.read()
+
+    def testLevelGating(self):
+        controlLog = ControlLog(logging.INFO, self.filename).start()
+        self.log.debug('counter %d', 1)
+        self.log.info('counter %d', 2)
+        controlLog.stop()
+        content = self.read()
+        self.assertNotIn('counter 1', content)
+        self.assertIn('counter 2', content)
+        self.assertIn('fischertechnik.ControlLogTest', content)
+
+    def testDisabledWithoutStart(self):
+        self.assertFalse(self.log.isEnabledFor(logging.DEBUG))
+        self.log.warning('nobody listens')
+        self.assertEqual(self.read(), '')
+
+    def testMessageOfItsTick(self):
+        controlLog = ControlLog(logging.DEBUG, self.filename)
+        #block the listener thread so the record is written after the list changed
+        blocked = threading.Event()
+        release = threading.Event()
+        original = controlLog._ControlLog__listener.handle
+        def handle(record):
+            blocked.set()
+            release.wait()
+            original(record)
+        controlLog._ControlLog__listener.handle = handle
+        controlLog.start()
+        go = [True, False]
+        self.log.debug('go %s', go)
+        blocked.wait()
+        go[0] = False
+        release.set()
+        controlLog.stop()
+        self.assertIn('go [True, False]', self.read())
+
+    def testDropsWhenFull(self):
+        controlLog = ControlLog(logging.DEBUG, self.filename, size=2)
+        #block the listener thread so nothing is drained while the loop logs
+        blocked = threading.Event()
+        release = threading.Event()
+        original = controlLog._ControlLog__listener.handle
+        def handle(record):
+            blocked.set()
+            release.wait()
+            original(record)
+        controlLog._ControlLog__listener.handle = handle
+        controlLog.start()
+        self.log.debug('first')
+        blocked.wait()
+        for i in range(5):
+            self.log.debug('tick %d', i)
+        self.assertEqual(controlLog.dropped, 3)
+        release.set()
+        controlLog.stop()
+        content = self.read()
+        self.assertIn('tick 1', content)
+        self.assertNotIn('tick 2', content)
+
+if __name__ == '__main__':
+    unittest.main()
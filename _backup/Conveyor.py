@@ -1,86 +1,161 @@
+from collections import deque
+
 from IllegalValueCombination import IllegalValueCombination
 from Machine import Machine
 from ImpulseCounter import ImpulseCounter
 from PlusMinusStop import PlusMinusStop
+from ControlLog import ControlLog
+from ProcessImage import ImageBit, ImageWord
+
+log = ControlLog.getLogger('Conveyor')
+
+
+class BufferedPart:
+    """A part held in the buffer of a conveyor, tracked by the impulse counter from the entry sensor on"""
+
+    __slots__ = ('entry', 'arrival')
+
+    def __init__(self, entry: int):
+        """
+        :param int entry: the counter value the part was put onto the conveyor at
+        """
+        self.entry = entry
+        # the counter value the part reached the exit sensor at, None until then
+        self.arrival = None
 
 
 class Conveyor(Machine):
 
+    # sensors and actuators, views onto bits and words of a process image
+    conveyorSensLeft = ImageBit()
+    conveyorSensRight = ImageBit()
+    conveyorSensImpulse = ImageWord()
+    conveyorActForward = ImageBit()
+    conveyorActBackward = ImageBit()
+
     #TODO create reset for self.once from execute
 
     @property
     def isExecuting(self) -> bool:
         return not self.arrived
 
-    def __init__(self, id1):
+    @property
+    def isDone(self) -> bool:
+        """Returns whether the package has left the conveyor since the last stop"""
+        return self.__packageLeft
+
+    def __init__(self, id1, capacity: int = 3, spacing: int = 8, bufferBackward: bool = True):
+        """
+        :param id1: the machine id
+        :param int capacity: the parts the conveyor holds in buffer mode
+        :param int spacing: the impulses a part in buffer mode has to move away from the entry sensor before the next
+            part may be put down
+        :param bool bufferBackward: whether the buffer moves its parts from the right sensor to the left one, False for
+            the other way round
+        """
         super().__init__(id1)
-        self.__conveyorSensImpulseCounterRaw = 0
-        self.__conveyorSensLeft = self.__conveyorSensRight = True
-        self.__conveyorActForward = self.__conveyorActBackward = False
+        self.conveyorSensImpulse = 0
+        self.conveyorSensLeft = self.conveyorSensRight = True
+        self.conveyorActForward = self.conveyorActBackward = False
         self.__counter = ImpulseCounter()
         self.current = 0
         self.arrived = False
         self.once = True
+        self.__packageLeft = False
+        self.capacity = capacity
+        self.spacing = spacing
+        self.bufferBackward = bufferBackward
+        # steps a part moves on from the exit sensor until it has left the conveyor, as in forwardLeaveConveyor()
+        self.leaveSteps = 10
+        # parts in buffer mode in the order they were put down, the counter keeps running, each part holds its own
+        # positions
+        self.__parts = deque()
+        self.__releases = 0
+        self.__entryFree = self.__exitFree = True
 
     @property
-    def conveyorSensLeft(self) -> bool:
-        return self.__conveyorSensLeft
-
-    @conveyorSensLeft.setter
-    def conveyorSensLeft(self, value: bool):
-        self.__conveyorSensLeft = value
+    def conveyorCounterValue(self):
+        return self.__counter.counter
 
     @property
-    def conveyorSensRight(self) -> bool:
-        return self.__conveyorSensRight
-
-    @conveyorSensRight.setter
-    def conveyorSensRight(self, value: bool):
-        self.__conveyorSensRight = value
+    def fillLevel(self) -> int:
+        """Returns the number of parts held in buffer mode"""
+        return len(self.__parts)
 
     @property
-    def conveyorSensImpulse(self):
-        return self.__conveyorSensImpulseCounterRaw
-
-    @conveyorSensImpulse.setter
-    def conveyorSensImpulse(self, value):
-        self.__conveyorSensImpulseCounterRaw = value
+    def parts(self) -> tuple:
+        """Returns the parts held in buffer mode, the first one leaves first"""
+        return tuple(self.__parts)
 
     @property
-    def conveyorActForward(self) -> bool:
-        return self.__conveyorActForward
-
-    @conveyorActForward.setter
-    def conveyorActForward(self, value: bool):
-        self.__conveyorActForward = value
+    def canAccept(self) -> bool:
+        """Returns whether a part may be put down at the entry sensor in buffer mode"""
+        entryFree = self.conveyorSensRight if self.bufferBackward else self.conveyorSensLeft
+        if not entryFree or len(self.__parts) >= self.capacity:
+            return False
+        return not self.__parts or self.__counter.counter - self.__parts[-1].entry >= self.spacing
 
-    @property
-    def conveyorActBackward(self) -> bool:
-        return self.__conveyorActBackward
+    def release(self) -> bool:
+        """Requests the next part of the buffer to leave, returns False if every part is requested already"""
+        if self.__releases >= len(self.__parts):
+            return False
+        self.__releases += 1
+        return True
 
-    @conveyorActBackward.setter
-    def conveyorActBackward(self, value: bool):
-        self.__conveyorActBackward = value
+    def accumulate(self):
+        """Runs one cycle of the buffer mode
 
-    @property
-    def conveyorCounterValue(self):
-        return self.__counter.counter
+        Parts put down at the entry sensor move on to the exit sensor, the first one stops there and the ones behind it
+        stop at their distance from it. A released part moves on leaveSteps impulses until it has left the conveyor, the
+        next one then moves up to the exit sensor.
+        """
+        if self.bufferBackward:
+            entryFree, exitFree = self.conveyorSensRight, self.conveyorSensLeft
+        else:
+            entryFree, exitFree = self.conveyorSensLeft, self.conveyorSensRight
+        current = self.countSteps()
+        parts = self.__parts
+        if not entryFree and self.__entryFree:
+            parts.append(BufferedPart(current))
+            log.debug('part put down, fill level %d', len(parts))
+        self.__entryFree = entryFree
+        if not exitFree and self.__exitFree:
+            for part in parts:
+                if part.arrival is None:
+                    break
+            else:
+                # the part was put down unseen, e.g. straight in front of the exit sensor
+                part = BufferedPart(current)
+                parts.append(part)
+            part.arrival = current
+        self.__exitFree = exitFree
+        if parts and self.__releases > 0 and parts[0].arrival is not None \
+                and current - parts[0].arrival >= self.leaveSteps:
+            parts.popleft()
+            self.__releases -= 1
+            self.__packageLeft = True
+            log.debug('part left, fill level %d', len(parts))
+        run = len(parts) > 0 and (parts[0].arrival is None or self.__releases > 0)
+        if self.bufferBackward:
+            self.conveyorActBackward = run
+        else:
+            self.conveyorActForward = run
 
     def forward(self):
         """Moves the package from left sensor to right sensor"""
-        if not self.__conveyorSensLeft:
-            self.__conveyorActForward = True
-        if not self.__conveyorSensRight:
-            self.__conveyorActForward = False
+        if not self.conveyorSensLeft:
+            self.conveyorActForward = True
+        if not self.conveyorSensRight:
+            self.conveyorActForward = False
             return True
         return False
 
     def backward(self):
         """Moves the package from right sensor to left sensor"""
-        if not self.__conveyorSensRight:
-            self.__conveyorActBackward = True
-        if not self.__conveyorSensLeft:
-            self.__conveyorActBackward = False
+        if not self.conveyorSensRight:
+            self.conveyorActBackward = True
+        if not self.conveyorSensLeft:
+            self.conveyorActBackward = False
             return True
         return False
 
@@ -88,9 +163,9 @@ class Conveyor(Machine):
     def forwardFromAnywhere(self):
         """Moves the package from any place on the conveyor to the right sensor"""
         #if self.once:
-        self.__conveyorActForward = True
-        if not self.__conveyorSensRight:
-            self.__conveyorActForward = False
+        self.conveyorActForward = True
+        if not self.conveyorSensRight:
+            self.conveyorActForward = False
             #self.once = False
             return True
         return False
@@ -99,9 +174,9 @@ class Conveyor(Machine):
     def backwardFromAnywhere(self):
         """Moves the package from any place on the conveyor to the left sensor"""
         #if self.once:
-        self.__conveyorActBackward = True
-        if not self.__conveyorSensLeft:
-            self.__conveyorActBackward = False
+        self.conveyorActBackward = True
+        if not self.conveyorSensLeft:
+            self.conveyorActBackward = False
             #self.once = False
             return True
         return False
@@ -116,11 +191,12 @@ class Conveyor(Machine):
             self.__counter.counter = 0
         if self.arrived:
             self.current = self.countSteps()
-            self.__conveyorActForward = True
+            self.conveyorActForward = True
             if self.current >= 10:
-                self.__conveyorActForward = False
+                self.conveyorActForward = False
                 self.arrived = False
                 self.current = 0
+                self.__packageLeft = True
 
     def backwardLeaveConveyor(self):
         """moves the package from anywhere on the line to the right, until it leaves the conveyor"""
@@ -130,50 +206,51 @@ class Conveyor(Machine):
         if self.current == 0:
             self.arrived = self.backwardFromAnywhere()
             self.__counter.counter = 0
-        print(self.arrived)
+        log.debug('arrived %s', self.arrived)
         if self.arrived:
             self.current = self.countSteps()
-            self.__conveyorActBackward = True
+            self.conveyorActBackward = True
             if self.current >= 10:
-                self.__conveyorActBackward = False
+                self.conveyorActBackward = False
                 self.arrived = False
                 #print("self.current = 0")
                 self.current = 0
+                self.__packageLeft = True
 
     def forwardHalfway(self):
         """moves the package to the middle of the conveyor starting from the left sensor"""
         self.current = self.countSteps()
-        if not self.__conveyorSensLeft:
+        if not self.conveyorSensLeft:
             self.__counter.counter = 0
-            self.__conveyorActForward = True
+            self.conveyorActForward = True
         elif self.current >= 8:
-            self.__conveyorActForward = False
+            self.conveyorActForward = False
             self.current = 0
 
     def backwardHalfway(self):
         """moves the package to the middle of the conveyor starting from the right sensor"""
         self.current = self.countSteps()
-        if not self.__conveyorSensRight:
+        if not self.conveyorSensRight:
             self.__counter.counter = 0
-            self.__conveyorActBackward = True
+            self.conveyorActBackward = True
         elif self.current >= 8:
-            self.__conveyorActBackward = False
+            self.conveyorActBackward = False
             self.current = 0
 
     def countSteps(self):
-        steps = self.__counter.compute(self.__conveyorSensImpulseCounterRaw, PlusMinusStop.PLUS)
-        print(steps)
+        steps = self.__counter.compute(self.conveyorSensImpulse, PlusMinusStop.PLUS)
+        log.debug('steps %d', steps)
         return steps
 
     def stop(self):
-        self.__conveyorActForward = self.__conveyorActBackward = False
-
+        self.conveyorActForward = self.conveyorActBackward = False
+        self.__packageLeft = False
 
     def execute(self):
         self.backwardLeaveConveyor()
 
 #            self.__conveyorCounterRef = self.__conveyorCounter
-#            self.__conveyorActForward = True
+#            self.conveyorActForward = True
 #        if self.__conveyorCounter - self.__conveyorCounterRef >= 10:
-#            self.__conveyorActForward = False
+#            self.conveyorActForward = False
 
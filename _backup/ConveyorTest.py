@@ -19,5 +19,56 @@ class MyTestCase(unittest.TestCase):
         #TODO how to avoid following action?
         self.conveyor1.conveyorActForward = 10
 
+    def testBuffer(self):
+        conveyor = self.conveyor1
+        conveyor.accumulate()
+        self.assertEqual(conveyor.conveyorActBackward, False)
+        self.assertEqual(conveyor.canAccept, True)
+        #first part is put down at the right sensor
+        conveyor.conveyorSensRight = False
+        conveyor.accumulate()
+        self.assertEqual(conveyor.conveyorActBackward, True)
+        self.assertEqual(conveyor.canAccept, False)
+        conveyor.conveyorSensRight = True
+        conveyor.conveyorSensImpulse = 5
+        conveyor.accumulate()
+        self.assertEqual(conveyor.canAccept, False)
+        conveyor.conveyorSensImpulse = 8
+        conveyor.accumulate()
+        self.assertEqual(conveyor.canAccept, True)
+        #second part 9 impulses behind the first one
+        conveyor.conveyorSensRight = False
+        conveyor.conveyorSensImpulse = 9
+        conveyor.accumulate()
+        conveyor.conveyorSensRight = True
+        #first part stops at the left sensor, the second one waits behind it
+        conveyor.conveyorSensLeft = False
+        conveyor.conveyorSensImpulse = 20
+        conveyor.accumulate()
+        self.assertEqual(conveyor.conveyorActBackward, False)
+        self.assertEqual(conveyor.fillLevel, 2)
+        self.assertEqual(conveyor.isDone, False)
+        self.assertEqual(conveyor.release(), True)
+        self.assertEqual(conveyor.release(), True)
+        self.assertEqual(conveyor.release(), False)
+        conveyor.accumulate()
+        self.assertEqual(conveyor.conveyorActBackward, True)
+        conveyor.conveyorSensLeft = True
+        conveyor.conveyorSensImpulse = 30
+        conveyor.accumulate()
+        self.assertEqual(conveyor.fillLevel, 1)
+        self.assertEqual(conveyor.isDone, True)
+        self.assertEqual(conveyor.conveyorActBackward, True)
+        #second part reaches the left sensor and leaves as it was released already
+        conveyor.conveyorSensLeft = False
+        conveyor.conveyorSensImpulse = 31
+        conveyor.accumulate()
+        self.assertEqual(conveyor.conveyorActBackward, True)
+        conveyor.conveyorSensLeft = True
+        conveyor.conveyorSensImpulse = 41
+        conveyor.accumulate()
+        self.assertEqual(conveyor.fillLevel, 0)
+        self.assertEqual(conveyor.conveyorActBackward, False)
+
 if __name__ == '__main__':
     unittest.main()
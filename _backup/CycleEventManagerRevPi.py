@@ -4,6 +4,9 @@ import revpimodio2
 from Robot import Robot
 from ThreeDRobotConfig import ThreeDRobotConfig
 from PunchingMachine import PunchingMachine
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('CycleEventManagerRevPi')
 
 
 class CycleEventManagerRevPi():
@@ -79,7 +82,7 @@ class CycleEventManagerRevPi():
         self.robot1.robotSensVerticalEndUp = self.rpi.io.I_5.value
         self.robot1.robotSensRotEnd = self.rpi.io.I_6.value
         self.robot1.robotSensVerticalEncoderCounter = self.rpi.io.Counter_7.value
-        print(self.robot1.robotSensVerticalEncoderCounter)
+        log.debug('robot1 vertical encoder %d', self.robot1.robotSensVerticalEncoderCounter)
         self.robot1.robotSensRotEncoderCounter = self.rpi.io.Counter_9.value
         #print(self.robot1.robotSensRotEncoderCounter)
 
@@ -96,13 +99,16 @@ class CycleEventManagerRevPi():
     def reset(self, flagEncoderRot, flagEncoderVertical):
         if flagEncoderRot:
             self.rpi.io.Counter_9.reset()
-            print("resetRot")
+            log.debug('resetRot')
         if flagEncoderVertical:
             self.rpi.io.Counter_7.reset()
-            print("resetVertical")
+            log.debug('resetVertical')
 
 
 if __name__ == "__main__":
+    # log from a background thread, the loop never waits on the console
+    controlLog = ControlLog().start()
     # Start RevPiApp app
     root = CycleEventManagerRevPi()
     root.start()
+    controlLog.stop()
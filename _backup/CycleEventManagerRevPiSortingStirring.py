@@ -1,26 +1,60 @@
 #!/usr/bin/env python
 
-import revpimodio2
+import os
+import sys
+from time import perf_counter
 from Robot import Robot
 from Warehouse import Warehouse
 from Conveyor import Conveyor
 from ThreeDRobotConfig import ThreeDRobotConfig
 from VacuumGripper import VacuumGripper
 from SortingLine import SortingLine
+from ColourClassifier import ColourClassifier
 from DummyMachine import DummyMachine
 from SequenceManager import SequenceManager
 from IndexedLine import IndexedLine
+from IoMap import IoMap
+from ProcessImage import ProcessImage
+from PiControl import PiControl
+from EdgeDetector import EdgeDetector
+import SortingStirringIoMap
+from ControlLog import ControlLog
+from Checkpoint import Checkpoint
+from HomingCoordinator import HomingCoordinator
+from CyclicWaiter import CyclicWaiter
+from Kpi import KpiEngine
+from StateServer import StatePublisher, StateServer
+from TickBudget import TickBudget, CRITICAL, NORMAL, LOW
+from RealTime import RealTime
+
+log = ControlLog.getLogger('CycleEventManagerRevPiSortingStirring')
 
 
 class CycleEventManagerRevPiTestSetup():
 
     """Mainapp for RevPi."""
 
-    def __init__(self):
-        """Init MyRevPiApp class."""
+    # seconds the loop waits between two cycles
+    cycleTime = 0.03
+    # seconds of work per cycle, beyond them checkpoints, the state for readers and the LED are shed
+    tickBudget = 0.02
 
-        # Instantiate RevPiModIO
-        self.rpi = revpimodio2.RevPiModIO(autorefresh=True)
+    def __init__(self, piControl: PiControl = None, rpi=None, realTime: RealTime = None):
+        """Init MyRevPiApp class.
+
+        :param PiControl piControl: copy the process image as one block from this file instead of through the IO
+            objects of revpimodio2
+        :param rpi: the IOs to use instead of a RevPiModIO instance, e.g. a simulated plant
+        :param RealTime realTime: the real-time settings the loop runs with, None for a normal process
+        """
+        self.realTime = realTime
+
+        # Instantiate RevPiModIO, with a PiControl it must not write its own copy of the outputs
+        self.piControl = piControl
+        if rpi is None:
+            import revpimodio2
+            rpi = revpimodio2.RevPiModIO(autorefresh=piControl is None)
+        self.rpi = rpi
 
         # Handle SIGINT / SIGTERM to exit program cleanly
         self.rpi.handlesignalend(self.cleanup_revpi)
@@ -49,12 +83,21 @@ class CycleEventManagerRevPiTestSetup():
 
         self.robot1 = Robot(1, placeListrobot1)
         self.conveyor1 = Conveyor(2)
-        self.sortingLine1 = SortingLine(3)
+        # colour calibration recorded on the cell, without one all pieces are sorted as red
+        classifier = ColourClassifier.load(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sortingstirring.colours'))
+        if classifier is None:
+            log.info('no colour calibration, all pieces are sorted as red')
+        self.sortingLine1 = SortingLine(3, classifier)
         self.vacuum1 = VacuumGripper(4, placeListrobot2)
         self.warehouse1 = Warehouse(5)
         self.indexedLine = IndexedLine(6)
         self.robot2 = Robot(7, placeListrobot3)
         self.conveyor2 = Conveyor(8)
+        # live key metrics of the stations and the line, ideal seconds per part as measured at full speed in the
+        # simulated cell, the vacuum gripper and the warehouse work twice per package
+        self.kpi = KpiEngine({'Robot1': 21.9, 'Conveyor2': 0.84, 'SortingLine3': 0.6, 'VacuumGripper4': 19.7,
+                              'Warehouse5': 11.1, 'IndexedLine6': 4.3, 'Robot7': 12.6, 'Conveyor8': 0.84},
+                             last='Conveyor8', lineIdealCycleTime=101.7)
         self.sortingstirringSequence = SequenceManager(1, self.robot1,
                                                        self.conveyor1,
                                                        self.sortingLine1,
@@ -62,11 +105,57 @@ class CycleEventManagerRevPiTestSetup():
                                                        self.warehouse1,
                                                        self.indexedLine,
                                                        self.robot2,
-                                                       self.conveyor2)
+                                                       self.conveyor2,
+                                                       # the package dropped by the vacuum gripper (position 1 of
+                                                       # list 2) needs time to reach the loading sensor of the
+                                                       # indexed line, its drop into the warehouse does not
+                                                       settleCycles={(2, 1): 15},
+                                                       kpi=self.kpi)
+        # all sensor and actuator fields of the machines in one bit-packed image, attached before the IoMap binds them,
+        # laid out like the RevPi process image if it is copied as one block
+        mapping = SortingStirringIoMap.INPUTS + SortingStirringIoMap.OUTPUTS
+        if piControl is None:
+            self.image = ProcessImage.fromLayout(self, ProcessImage.layout(mapping))
+        else:
+            self.image = ProcessImage.fromLayout(self, piControl.layout(mapping))
+        # compile the IO mapping once, read and write then copy the whole process image in one pass
+        self.ioMap = IoMap(self.rpi, self, SortingStirringIoMap.INPUTS, SortingStirringIoMap.OUTPUTS)
+        # edges of all digital inputs, query with e.g. self.edges.rising(self.mask('indexedLine', 'pushButton1Front'))
+        self.edges = EdgeDetector()
+        # station state is checkpointed every 10 cycles, so a software restart can skip the homing runs
+        self.checkpoint = Checkpoint(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'sortingstirring.checkpoint'))
+        self.checkpointWaiter = CyclicWaiter(10)
+        self.movingMachines = {'robot1': self.robot1, 'vacuum1': self.vacuum1, 'warehouse1': self.warehouse1,
+                               'robot2': self.robot2}
+        # all moving machines home at the same time before the sequence starts
+        self.homing = HomingCoordinator(self.movingMachines)
+        # a copy of the process image is published every tick for readers on other threads, see StateServer
+        self.state = StatePublisher(self.decodeState)
+        # the key metrics published with the state, queried when there is budget left
+        self.kpis = self.kpi.query()
+        # the work of one cycle by priority, the IO, the sequence and publishing the state always run, so the metrics
+        # of the budget reach the readers during overruns as well
+        self.budget = TickBudget(self.tickBudget)
+        self.budget.every('read', self.read, CRITICAL)
+        self.budget.every('sequence', self.sequence, CRITICAL)
+        self.budget.every('write', self.output, CRITICAL)
+        self.budget.every('publish', self.publish, CRITICAL)
+        self.budget.every('checkpoint', self.saveCheckpoint, NORMAL)
+        self.budget.every('kpi', self.queryKpis, LOW)
+        self.budget.every('led', self.toggleLed, LOW)
 
     def cleanup_revpi(self):
         """Cleanup function to leave the RevPi in a defined state."""
 
+        # Persist the state of the stations before the outputs are switched off
+        self.checkpoint.save(self.snapshot())
+        self.checkpoint.stop()
+
+        if self.piControl is not None:
+            self.piControl.clearOutputs()
+            self.piControl.close()
+            return
+
         # Switch of LED and outputs before exit program
         self.rpi.core.a1green.value = False
         self.rpi.io.dio1_O_1.value = False
@@ -143,181 +232,154 @@ class CycleEventManagerRevPiTestSetup():
     def start(self):
         """Start event system and own cyclic loop."""
 
-        # Start event system without blocking here
-        self.rpi.mainloop(blocking=False)
+        # Start event system without blocking here, it would refresh the process image next to the PiControl
+        if self.piControl is None:
+            self.rpi.mainloop(blocking=False)
+
+        # Continue from the checkpoint if the stations did not move since it was written
+        self.read()
+        if self.warmStart():
+            log.info('warm start from checkpoint, homing skipped')
+        self.checkpoint.start()
 
         # My own loop to do some work next to the event system. We will stay
         # here till self.rpi.exitsignal.wait returns True after SIGINT/SIGTERM
-        while not self.rpi.exitsignal.wait(0.03):
-            # Switch on / off green part of LED A1 | or do other things
-            self.rpi.core.a1green.value = not self.rpi.core.a1green.value
-
-            # READ   READ   READ   READ
-            self.read()
-
-            # NEW
-
-            #TheSortingSequence
-            #self.indexedLine.processPackage()
+        if self.realTime is None:
+            log.info('real-time mode off')
+        else:
+            for setting, result in self.realTime.enter().items():
+                log.info('real-time %s: %s', setting, result)
+        wait = self.cycleTime
+        try:
+            while not self.rpi.exitsignal.wait(wait):
+                start = perf_counter()
+                self.budget.run()
+                if self.realTime is not None:
+                    # the next cycle only waits the slack idle() left, so collecting does not lengthen the cycle
+                    self.realTime.idle(self.cycleTime - (perf_counter() - start))
+                    wait = max(0.0, self.cycleTime - (perf_counter() - start))
+        finally:
+            if self.realTime is not None:
+                self.realTime.exit()
+
+    def toggleLed(self):
+        # Switch on / off green part of LED A1 | or do other things
+        self.rpi.core.a1green.value = not self.rpi.core.a1green.value
+
+    def saveCheckpoint(self):
+        """Hands a snapshot to the checkpoint every 10 cycles"""
+        if self.checkpointWaiter.wait():
+            self.checkpointWaiter.reset()
+            self.checkpoint.save(self.snapshot())
+
+    def publish(self):
+        """Publishes a copy of the process image, the metrics of the tick budget and the last key metrics of the minute
+        for the StateServer"""
+        # the metrics are taken in the same tick as the image, a reader decoding later must not mix in newer counters,
+        # nor read the windows of the KpiEngine while the loop moves them on. The work shed after publishing is counted
+        # in the metrics of the next tick
+        self.state.publish((bytes(self.image), self.budget.metrics(), self.kpis))
+
+    def queryKpis(self):
+        """Takes the key metrics of the minute, published with the state from the next tick on"""
+        self.kpis = self.kpi.query()
+
+    def decodeState(self, state: tuple) -> dict:
+        """Returns the fields of a published process image, the metrics of the tick budget and the key metrics
+        published with it"""
+        image, budget, kpi = state
+        fields = self.image.decode(image)
+        fields['budget'] = budget
+        fields['kpi'] = kpi
+        return fields
+
+    def tick(self):
+        """Runs one cycle of the cell: read, sequence, write and reset the encoder counters of homed axes"""
+        # READ   READ   READ   READ
+        self.read()
+        self.sequence()
+        self.output()
+
+    def sequence(self):
+        """Steps the homing or the sequence, the key metrics and the helpers of the moving machines"""
+        # NEW
+
+        #TheSortingSequence
+        #self.indexedLine.processPackage()
+        if self.homing.execute():
             self.sortingstirringSequence.executeSortingStirring()
-
-            # EXECUTE   EXECUTE   EXECUTE    EXECUTE
-            #self.sortingLine1.execute()
-            #self.conveyor1.execute()
-            #self.robot1.execute(0,1)
-            #self.warehouse1.execute(0,1)
-            #self.vacuum1.execute(4,0)
-            #
-            # HELPER   HELPER   HELPER    HELPER
-            flagEncoderHorizontal, flagEncoderVertical = self.warehouse1.executeHelper()
-            flagEncoderRot, flagEncoderVertical2 = self.robot1.executeHelper()
-            flagEncoder1, flagEncoder2, flagEncoder3 = self.vacuum1.executeHelper()
-            flagEncoderRot3, flagEncoderVertical3 = self.robot2.executeHelper()
-
-            # WRITE   WRITE   WRITE   WRITE
-            self.write()
-
-            # RESET   RESET   RESET   RESET
-
-            self.reset(flagEncoderHorizontal, flagEncoderVertical)
-            self.reset1(flagEncoderRot, flagEncoderVertical2)
-            self.reset2(flagEncoder1, flagEncoder2, flagEncoder3)
-            self.reset3(flagEncoderRot3, flagEncoderVertical3)
-
-        
+        # the windows of idle stations move on every tick as well
+        self.kpi.update()
+
+        # EXECUTE   EXECUTE   EXECUTE    EXECUTE
+        #self.sortingLine1.execute()
+        #self.conveyor1.execute()
+        #self.robot1.execute(0,1)
+        #self.warehouse1.execute(0,1)
+        #self.vacuum1.execute(4,0)
+        #
+        # HELPER   HELPER   HELPER    HELPER
+        # the flags of the encoders to reset, reset by output() after the write
+        self.warehouse1Flags = self.warehouse1.executeHelper()
+        self.robot1Flags = self.robot1.executeHelper()
+        self.vacuum1Flags = self.vacuum1.executeHelper()
+        self.robot2Flags = self.robot2.executeHelper()
+
+    def output(self):
+        """Writes the actuators desired states and resets the encoder counters the helpers flagged"""
+        # WRITE   WRITE   WRITE   WRITE
+        self.write()
+
+        # RESET   RESET   RESET   RESET
+
+        self.reset(*self.warehouse1Flags)
+        self.reset1(*self.robot1Flags)
+        self.reset2(*self.vacuum1Flags)
+        self.reset3(*self.robot2Flags)
+
+    def snapshot(self) -> dict:
+        """Returns the state of the moving machines and the sequence progress"""
+        return {'machines': {name: machine.snapshot() for name, machine in self.movingMachines.items()},
+                'sequence': self.sortingstirringSequence.snapshot()}
+
+    def warmStart(self) -> bool:
+        """Restores the checkpoint if every moving machine is consistent with it, otherwise all machines home
+
+        :return bool: True if the checkpoint was restored
+        """
+        state = self.checkpoint.load()
+        if state is None:
+            return False
+        machines = state['machines']
+        for name, machine in self.movingMachines.items():
+            if name not in machines or not machine.isConsistent(machines[name]):
+                log.info('checkpoint not consistent with %s, homing', name)
+                return False
+        for name, machine in self.movingMachines.items():
+            machine.restore(machines[name])
+        self.sortingstirringSequence.restore(state['sequence'])
+        return True
 
     def read(self):
-
-        #warehouse
-        self.warehouse1.warehouseSensHorizontalEnd = self.rpi.io.dio2_I_7.value
-        self.warehouse1.warehouseSensLightBarrierIn = self.rpi.io.dio2_I_8.value
-        self.warehouse1.warehouseSensLightBarrierOut = self.rpi.io.dio2_I_9.value
-        self.warehouse1.warehouseSensVerticalEnd = self.rpi.io.dio2_I_10.value
-        self.warehouse1.warehouseSensEncoderHorizontal = self.rpi.io.dio2_Counter_11.value
-        self.warehouse1.warehouseSensEncoderVertical = self.rpi.io.dio2_Counter_13.value
-        self.warehouse1.warehouseSensArmOut = self.rpi.io.dio3_I_1.value
-        self.warehouse1.warehouseSensArmIn = self.rpi.io.dio3_I_2.value
-        #sortingLine
-        self.sortingLine1.sortingLineSensImpulseCounterRaw = self.rpi.io.dio2_Counter_1.value
-        self.sortingLine1.sortingLineSensInputLightBarrier = self.rpi.io.dio2_I_2.value
-        self.sortingLine1.sortingLineSensMiddleLightBarrier = self.rpi.io.dio2_I_3.value
-        self.sortingLine1.sortingLineSensWhiteLightBarrier = self.rpi.io.dio2_I_4.value
-        self.sortingLine1.sortingLineSensRedLightBarrier = self.rpi.io.dio2_I_5.value
-        self.sortingLine1.sortingLineSensBlueLightBarrier = self.rpi.io.dio2_I_6.value
-        #conveyor - Anfang
-        self.conveyor1.conveyorSensLeft = self.rpi.io.dio1_I_11.value
-        self.conveyor1.conveyorSensRight = self.rpi.io.dio1_I_12.value
-        self.conveyor1.conveyorSensImpulse = self.rpi.io.dio1_Counter_13.value
-
-        #3DRobot - Anfang
-        self.robot1.robotSensGripperOpen = self.rpi.io.dio1_I_1.value
-        self.robot1.robotSensGripperImpulseCounterRaw = self.rpi.io.dio1_Counter_2.value
-        self.robot1.robotSensArmEndIn = self.rpi.io.dio1_I_3.value
-        self.robot1.robotSensArmImpulseCounterRaw = self.rpi.io.dio1_Counter_4.value
-        print(self.robot1.robotSensArmImpulseCounterRaw)
-        self.robot1.robotSensVerticalEndUp = self.rpi.io.dio1_I_5.value
-        self.robot1.robotSensRotEnd = self.rpi.io.dio1_I_6.value
-        self.robot1.robotSensVerticalEncoderCounter = self.rpi.io.dio1_Counter_7.value
-        self.robot1.robotSensRotEncoderCounter = self.rpi.io.dio1_Counter_9.value
-
-        #VacuumGripper
-        self.vacuum1.vacuumSensVerticalEndUp = self.rpi.io.dio3_I_3.value
-        self.vacuum1.vacuumSensArmEndIn = self.rpi.io.dio3_I_4.value
-        self.vacuum1.vacuumSensRotEnd = self.rpi.io.dio3_I_5.value
-        self.vacuum1.vacuumSensVerticalEncoderCounter = self.rpi.io.dio3_Counter_7.value
-        self.vacuum1.vacuumSensArmEncoderCounter = self.rpi.io.dio3_Counter_9.value
-        self.vacuum1.vacuumSensRotEncoderCounter = self.rpi.io.dio3_Counter_11.value
-        #conveyor - Ende
-        self.conveyor2.conveyorSensLeft = self.rpi.io.dio3_I_13.value
-        self.conveyor2.conveyorSensRight = self.rpi.io.dio3_I_14.value
-        self.conveyor2.conveyorSensImpulse = self.rpi.io.dio3_Counter_6.value
-        #indexedLine
-        #Warning: backward and forward slider are swapped on the sheet.
-        self.indexedLine.pushButton1Front = self.rpi.io.dio4_I_1.value
-        self.indexedLine.pushButton1Back = self.rpi.io.dio4_I_2.value
-        self.indexedLine.pushButton2Front = self.rpi.io.dio4_I_3.value
-        self.indexedLine.pushButton2Back = self.rpi.io.dio4_I_4.value
-
-        self.indexedLine.indexSensSlider1 = self.rpi.io.dio4_I_5.value
-        self.indexedLine.indexSensMilling = self.rpi.io.dio4_I_6.value
-        self.indexedLine.indexSensLoading = self.rpi.io.dio4_I_7.value
-        self.indexedLine.indexSensDrilling = self.rpi.io.dio4_I_8.value
-        self.indexedLine.indexSensConveyorSwap = self.rpi.io.dio4_I_9.value
-        #3DRobot - Ende
-        self.robot2.robotSensGripperOpen = self.rpi.io.dio5_I_1.value
-        self.robot2.robotSensGripperImpulseCounterRaw = self.rpi.io.dio5_Counter_2.value
-        self.robot2.robotSensArmEndIn = self.rpi.io.dio5_I_3.value
-        self.robot2.robotSensArmImpulseCounterRaw = self.rpi.io.dio5_Counter_4.value
-        #print(self.robot2.robotSensArmImpulseCounterRaw)
-        self.robot2.robotSensVerticalEndUp = self.rpi.io.dio5_I_5.value
-        self.robot2.robotSensRotEnd = self.rpi.io.dio5_I_6.value
-        self.robot2.robotSensVerticalEncoderCounter = self.rpi.io.dio5_Counter_7.value
-        self.robot2.robotSensRotEncoderCounter = self.rpi.io.dio5_Counter_9.value
-
+        if self.piControl is None:
+            self.ioMap.read()
+            self.edges.update(self.ioMap.inputWord)
+        else:
+            self.piControl.read(self.image)
+            self.edges.update(self.image.word)
+        log.debug('robot1 arm impulse counter %d', self.robot1.robotSensArmImpulseCounterRaw)
 
     def write(self):
+        if self.piControl is None:
+            self.ioMap.write()
+        else:
+            self.piControl.write(self.image)
 
-        #warehouse
-        self.rpi.io.dio2_O_7.value = self.warehouse1.warehouseActConveyorOut
-        self.rpi.io.dio2_O_8.value = self.warehouse1.warehouseActConveyorIn
-        self.rpi.io.dio2_O_9.value = self.warehouse1.warehouseActHorizontalToRack
-        self.rpi.io.dio2_O_10.value = self.warehouse1.warehouseActHorizontalToConveyor
-        self.rpi.io.dio2_O_11.value = self.warehouse1.warehouseActVerticalDown
-        self.rpi.io.dio2_O_12.value = self.warehouse1.warehouseActVerticalUp
-        self.rpi.io.dio2_O_13.value = self.warehouse1.warehouseActArmOut
-        self.rpi.io.dio2_O_14.value = self.warehouse1.warehouseActArmIn
-        #sortingLine
-        self.rpi.io.dio2_O_1.value = self.sortingLine1.sortingLineActMotorConveyor
-        self.rpi.io.dio2_O_2.value = self.sortingLine1.sortingLineActCompressorOn
-        self.rpi.io.dio2_O_3.value = self.sortingLine1.sortingLineActWhiteEjector
-        self.rpi.io.dio2_O_4.value = self.sortingLine1.sortingLineActRedEjector
-        self.rpi.io.dio2_O_5.value = self.sortingLine1.sortingLineActBlueEjector
-        #conveyor
-        self.rpi.io.dio1_O_9.value = self.conveyor1.conveyorActForward
-        self.rpi.io.dio1_O_10.value = self.conveyor1.conveyorActBackward
-
-        #3DRobot - Anfang
-        self.rpi.io.dio1_O_1.value = self.robot1.robotActGripperOpen
-        self.rpi.io.dio1_O_2.value = self.robot1.robotActGripperClose
-        self.rpi.io.dio1_O_3.value = self.robot1.robotActArmOut
-        self.rpi.io.dio1_O_4.value = self.robot1.robotActArmIn
-        self.rpi.io.dio1_O_5.value = self.robot1.robotActVerticalDown
-        self.rpi.io.dio1_O_6.value = self.robot1.robotActVerticalUp
-        self.rpi.io.dio1_O_7.value = self.robot1.robotActRotRight
-        self.rpi.io.dio1_O_8.value = self.robot1.robotActRotLeft
-
-        #VacuumGripper
-        self.rpi.io.dio3_O_1.value = self.vacuum1.vacuumActVerticalUp
-        self.rpi.io.dio3_O_2.value = self.vacuum1.vacuumActVerticalDown
-        self.rpi.io.dio3_O_3.value = self.vacuum1.vacuumActArmIn
-        self.rpi.io.dio3_O_4.value = self.vacuum1.vacuumActArmOut
-        self.rpi.io.dio3_O_5.value = self.vacuum1.vacuumActRotRight
-        self.rpi.io.dio3_O_6.value = self.vacuum1.vacuumActRotLeft
-        self.rpi.io.dio3_O_7.value = self.vacuum1.vacuumActCompressorOn
-        self.rpi.io.dio3_O_8.value = self.vacuum1.vacuumActValve
-        #conveyor - Ende
-        self.rpi.io.dio3_O_9.value = self.conveyor2.conveyorActForward
-        self.rpi.io.dio3_O_10.value = self.conveyor2.conveyorActBackward
-        #indexedLine
-        self.rpi.io.dio4_O_2.value = self.indexedLine.motorSlider1Backward
-        self.rpi.io.dio4_O_1.value = self.indexedLine.motorSlider1Forward
-        self.rpi.io.dio4_O_4.value = self.indexedLine.motorSlider2Backward
-        self.rpi.io.dio4_O_3.value = self.indexedLine.motorSlider2Forward
-        self.rpi.io.dio4_O_5.value = self.indexedLine.conveyorBeltFeed
-        self.rpi.io.dio4_O_6.value = self.indexedLine.conveyorBeltMilling
-        self.rpi.io.dio4_O_7.value = self.indexedLine.millingMachine
-        self.rpi.io.dio4_O_8.value = self.indexedLine.conveyorBeltDrilling
-        self.rpi.io.dio4_O_9.value = self.indexedLine.drillingMachine
-        self.rpi.io.dio4_O_10.value = self.indexedLine.conveyorBeltSwap
-        #3DRobot - Ende
-        self.rpi.io.dio5_O_1.value = self.robot2.robotActGripperOpen
-        self.rpi.io.dio5_O_2.value = self.robot2.robotActGripperClose
-        self.rpi.io.dio5_O_3.value = self.robot2.robotActArmOut
-        self.rpi.io.dio5_O_4.value = self.robot2.robotActArmIn
-        self.rpi.io.dio5_O_5.value = self.robot2.robotActVerticalDown
-        self.rpi.io.dio5_O_6.value = self.robot2.robotActVerticalUp
-        self.rpi.io.dio5_O_7.value = self.robot2.robotActRotRight
-        self.rpi.io.dio5_O_8.value = self.robot2.robotActRotLeft
+    def mask(self, machine: str, field: str) -> int:
+        """Returns the bit of a digital input in the words handed to self.edges"""
+        if self.piControl is None:
+            return self.ioMap.mask(machine, field)
+        return self.image.mask(machine, field)
 
 
     def reset(self, flagEncoderHorizontal, flagEncoderVertical):
@@ -347,6 +409,15 @@ class CycleEventManagerRevPiTestSetup():
 
 
 if __name__ == "__main__":
+    # log from a background thread, the loop never waits on the console
+    controlLog = ControlLog().start()
     # Start RevPiApp app
-    root = CycleEventManagerRevPiTestSetup()
+    # --picontrol: copy the process image as one block from /dev/piControl0
+    # --realtime: pin to a CPU, SCHED_FIFO, lock memory and collect garbage only in the slack of a cycle
+    root = CycleEventManagerRevPiTestSetup(PiControl() if '--picontrol' in sys.argv else None,
+                                           realTime=RealTime() if '--realtime' in sys.argv else None)
+    # the state of every machine on http://localhost:8080/state and ws://localhost:8080/ws
+    stateServer = StateServer(root.state).start()
     root.start()
+    stateServer.stop()
+    controlLog.stop()
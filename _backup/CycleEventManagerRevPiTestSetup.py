@@ -6,6 +6,9 @@ from Warehouse import Warehouse
 from ThreeDRobotConfig import ThreeDRobotConfig
 from VacuumGripper import VacuumGripper
 from SortingLine import SortingLine
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('CycleEventManagerRevPiTestSetup')
 
 
 class CycleEventManagerRevPiTestSetup():
@@ -157,10 +160,10 @@ class CycleEventManagerRevPiTestSetup():
     def reset(self, flagEncoderRot, flagEncoderVertical):
         if flagEncoderRot:
             self.rpi.io.dio2_Counter_9.reset()
-            print("resetRot")
+            log.debug('resetRot')
         if flagEncoderVertical:
             self.rpi.io.dio2_Counter_7.reset()
-            print("resetVertical")
+            log.debug('resetVertical')
 
     def reset2(self, flagEncoder1, flagEncoder2, flagEncoder3):
         if flagEncoder1:
@@ -170,6 +173,9 @@ class CycleEventManagerRevPiTestSetup():
 
 
 if __name__ == "__main__":
+    # log from a background thread, the loop never waits on the console
+    controlLog = ControlLog().start()
     # Start RevPiApp app
     root = CycleEventManagerRevPiTestSetup()
     root.start()
+    controlLog.stop()
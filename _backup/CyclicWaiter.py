@@ -1,3 +1,8 @@
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('CyclicWaiter')
+
+
 class CyclicWaiter:
     def __init__(self, cycles):
         self.__count = 0
@@ -11,8 +16,7 @@ class CyclicWaiter:
         """
         if self.__count < self.__cycles:
             self.__count += 1
-            print("waiter count")
-            print(self.__count)
+            log.debug('waiter count %d', self.__count)
             return False
         else:
             return True
@@ -1,4 +1,7 @@
 from Machine import Machine
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('DummyMachine')
 
 
 class DummyMachine(Machine):
@@ -16,5 +19,5 @@ class DummyMachine(Machine):
         self.__isExecuting = value
 
     def execute(self, *args):
-        print("dummy machine executing " + str(self.id))
+        log.debug('dummy machine executing %d', self.id)
         return 1
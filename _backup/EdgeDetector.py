@@ -0,0 +1,47 @@
+class EdgeDetector:
+    """Detects rising and falling edges of all digital inputs at once.
+
+    The inputs are handed over as one packed integer per tick (see IoMap.inputWord), the edges of every input are then
+    computed with one XOR and two ANDs. Single inputs or groups of inputs are queried with their masks, several masks can
+    be or-ed together to ask whether any of them changed.
+    """
+
+    def __init__(self):
+        self.__word = 0
+        self.__rising = 0
+        self.__falling = 0
+
+    def update(self, word: int):
+        """Computes the edges between the previous and this word, call once per tick after reading the inputs"""
+        changed = word ^ self.__word
+        self.__rising = changed & word
+        self.__falling = changed & self.__word
+        self.__word = word
+
+    def rising(self, mask: int) -> bool:
+        """Returns whether an input of mask went from False to True in the last tick"""
+        return self.__rising & mask != 0
+
+    def falling(self, mask: int) -> bool:
+        """Returns whether an input of mask went from True to False in the last tick"""
+        return self.__falling & mask != 0
+
+    def changed(self, mask: int) -> bool:
+        """Returns whether an input of mask changed in the last tick"""
+        return (self.__rising | self.__falling) & mask != 0
+
+    def isSet(self, mask: int) -> bool:
+        """Returns whether all inputs of mask are True"""
+        return self.__word & mask == mask
+
+    @property
+    def word(self) -> int:
+        return self.__word
+
+    @property
+    def risingWord(self) -> int:
+        return self.__rising
+
+    @property
+    def fallingWord(self) -> int:
+        return self.__falling
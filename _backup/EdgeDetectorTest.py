@@ -0,0 +1,35 @@
+import unittest
+
+from EdgeDetector import EdgeDetector
+
+
+class MyTestCase(unittest.TestCase):
+
+    def testEdges(self):
+        edges = EdgeDetector()
+        edges.update(0b0101)
+        self.assertEqual(edges.risingWord, 0b0101)
+        self.assertEqual(edges.fallingWord, 0)
+        edges.update(0b0110)
+        self.assertTrue(edges.rising(0b0010))
+        self.assertTrue(edges.falling(0b0001))
+        self.assertFalse(edges.changed(0b0100))
+        self.assertTrue(edges.isSet(0b0110))
+        self.assertFalse(edges.isSet(0b0011))
+        #any of several inputs
+        self.assertTrue(edges.changed(0b1001))
+        #no change, no edge
+        edges.update(0b0110)
+        self.assertFalse(edges.changed(0b1111))
+
+    def testWideWord(self):
+        #more inputs than fit into a machine word
+        edges = EdgeDetector()
+        edges.update(1 << 69)
+        self.assertTrue(edges.rising(1 << 69))
+        edges.update(1)
+        self.assertTrue(edges.falling(1 << 69))
+        self.assertTrue(edges.rising(1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import heapq
+from collections import deque
+from itertools import count
+
+
+class Buffer:
+    """A place packages wait at between two processes, e.g. a belt end or the feeder of the oven
+
+    A process yields buffer.get() to take the oldest package, it waits while the buffer is empty. It yields
+    buffer.put(package) to put one down, it waits while the buffer holds capacity packages.
+    """
+
+    def __init__(self, simulation, capacity: int = 1, packages=()):
+        """
+        :param EventSimulation simulation: the simulation the buffer belongs to
+        :param int capacity: the number of packages the buffer holds at most
+        :param packages: the packages the buffer holds at the start
+        """
+        self.simulation = simulation
+        self.capacity = capacity
+        self.packages = deque(packages)
+        self.__getters = deque()
+        self.__putters = deque()
+
+    def get(self):
+        return BufferRequest(self, None, True)
+
+    def put(self, package):
+        return BufferRequest(self, package, False)
+
+    def __len__(self):
+        return len(self.packages)
+
+    def request(self, process, request):
+        """Serves a get or put of a process now, or queues the process until it can be served"""
+        if request.get:
+            self.__getters.append(process)
+        else:
+            self.__putters.append((process, request.package))
+        # a put can make room for a waiting getter and a get for a waiting putter, serve both until nothing changes
+        served = True
+        while served:
+            served = False
+            if self.__putters and len(self.packages) < self.capacity:
+                putter, package = self.__putters.popleft()
+                self.packages.append(package)
+                self.simulation.schedule(0, putter)
+                served = True
+            if self.__getters and self.packages:
+                self.simulation.schedule(0, self.__getters.popleft(), self.packages.popleft())
+                served = True
+
+
+class BufferRequest:
+    __slots__ = ('buffer', 'package', 'get')
+
+    def __init__(self, buffer: Buffer, package, get: bool):
+        self.buffer = buffer
+        self.package = package
+        self.get = get
+
+
+class EventSimulation:
+    """A discrete-event simulation, jumps from event to event instead of stepping through every cycle.
+
+    A process is a generator. It yields a number of cycles to wait for, e.g. until its next sensor transition, or a get
+    or put of a Buffer to wait for a package or for room. The events are kept on a heap ordered by their cycle, events
+    of the same cycle run in the order they were scheduled.
+    """
+
+    def __init__(self):
+        self.now = 0
+        # number of events processed, a measure for the work the simulation did
+        self.events = 0
+        self.__heap = []
+        self.__sequence = count()
+
+    def process(self, generator):
+        """Starts a process in the current cycle"""
+        self.schedule(0, generator)
+        return generator
+
+    def schedule(self, delay, process, value=None):
+        """Resumes a process after delay cycles, the yield it waits at returns value"""
+        heapq.heappush(self.__heap, (self.now + delay, next(self.__sequence), process, value))
+
+    def run(self, until):
+        """Processes all events up to and including cycle until, then sets the clock to until"""
+        heap = self.__heap
+        while heap and heap[0][0] <= until:
+            self.now, sequence, process, value = heapq.heappop(heap)
+            self.events += 1
+            try:
+                command = process.send(value)
+            except StopIteration:
+                continue
+            if isinstance(command, BufferRequest):
+                command.buffer.request(process, command)
+            else:
+                self.schedule(command, process)
+        self.now = until
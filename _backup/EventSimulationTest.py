@@ -0,0 +1,84 @@
+import unittest
+
+from EventSimulation import EventSimulation, Buffer
+from PlantEvents import simulateShift, OVEN_TIMING, SORTING_STIRRING_TIMING
+
+
+class MyTestCase(unittest.TestCase):
+
+    def testEventsInOrder(self):
+        simulation = EventSimulation()
+        log = []
+
+        def process(name, delays):
+            for delay in delays:
+                yield delay
+                log.append((simulation.now, name))
+
+        simulation.process(process('a', [5, 5]))
+        simulation.process(process('b', [3, 7]))
+        simulation.run(100)
+        # b waits for cycle 10 since cycle 3, before a scheduled it in cycle 5
+        self.assertEqual([(3, 'b'), (5, 'a'), (10, 'b'), (10, 'a')], log)
+        self.assertEqual(100, simulation.now)
+
+    def testBufferBlocks(self):
+        simulation = EventSimulation()
+        buffer = Buffer(simulation, capacity=1)
+        log = []
+
+        def producer():
+            for package in range(3):
+                yield buffer.put(package)
+                log.append((simulation.now, 'put', package))
+
+        def consumer():
+            while True:
+                package = yield buffer.get()
+                log.append((simulation.now, 'got', package))
+                yield 10
+
+        simulation.process(producer())
+        simulation.process(consumer())
+        simulation.run(50)
+        self.assertEqual([(0, 'put', 0), (0, 'got', 0), (0, 'put', 1), (10, 'got', 1), (10, 'put', 2),
+                          (20, 'got', 2)], log)
+
+    def testShiftUnderASecond(self):
+        for kind in ('oven', 'sortingStirring'):
+            result = simulateShift({'kind': kind, 'hours': 8})
+            self.assertGreater(result['produced'], 0)
+            self.assertLess(result['wallSeconds'], 1.0)
+
+    def testOvenRunsOnePartAtATime(self):
+        # the next part enters the oven after the last one reached the light barrier and the carrier is back
+        t = OVEN_TIMING
+        period = (t['carrier'] + t['feederIn'] + t['oven'] + t['feederOut'] + t['vacuumLower'] + t['vacuumGrip']
+                  + t['vacuumRaise'] + t['carrier'] + t['releaseLower'] + t['release'] + t['turntableToSaw'] + t['saw']
+                  + t['turntableToConveyor'] + t['pusher'] + t['conveyor'])
+        result = simulateShift({'kind': 'oven', 'hours': 1})
+        self.assertAlmostEqual(3600 / 0.05 / period, result['produced'], delta=1)
+
+    def testSortingStirringMatchesTickSimulation(self):
+        # the tick simulation of the cell needs 3392 cycles per product
+        result = simulateShift({'kind': 'sortingStirring', 'hours': 8})
+        self.assertAlmostEqual(8 * 3600 / 0.03 / 3392, result['produced'], delta=3)
+
+    def testMorePackagesInTheCell(self):
+        serial = simulateShift({'kind': 'sortingStirring', 'hours': 1})
+        overlapped = simulateShift({'kind': 'sortingStirring', 'hours': 1, 'params': {'wip': 3}})
+        self.assertGreater(overlapped['produced'], serial['produced'])
+
+    def testTiming(self):
+        slow = simulateShift({'kind': 'sortingStirring', 'hours': 1,
+                              'params': {'timing': {'warehouseRetrieve': SORTING_STIRRING_TIMING['warehouseRetrieve']
+                                                                         + 1000}}})
+        self.assertLess(slow['produced'], simulateShift({'kind': 'sortingStirring', 'hours': 1})['produced'])
+
+    def testUnknownKind(self):
+        with self.assertRaises(KeyError):
+            simulateShift({'kind': 'unknown'})
+
+
+if __name__ == '__main__':
+    unittest.main()
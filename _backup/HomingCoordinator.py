@@ -0,0 +1,45 @@
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('HomingCoordinator')
+
+
+class HomingCoordinator:
+    """Homes all moving machines of a cell at the same time before production starts.
+
+    Without it a machine only homes once the sequence reaches it, so the homing runs of a cell add up. Each tick the
+    coordinator runs one homing cycle of every machine that is not home yet. When all are home the time every axis
+    needed is logged, the slowest axis is the startup bottleneck.
+    """
+
+    def __init__(self, machines: dict):
+        """
+        :param dict machines: the moving machines of the cell by name
+        """
+        self.__machines = machines
+        self.__done = False
+
+    def execute(self) -> bool:
+        """Performs one homing cycle of all machines not yet home
+
+        :return bool: True once all machines are home
+        """
+        if self.__done:
+            return True
+        done = True
+        for machine in self.__machines.values():
+            if not machine.home():
+                done = False
+        if done:
+            self.__done = True
+            for name, axes in self.report().items():
+                for axis, seconds in axes.items():
+                    log.info('%s %s homed in %.2f s', name, axis, seconds)
+        return done
+
+    @property
+    def isDone(self) -> bool:
+        return self.__done
+
+    def report(self) -> dict:
+        """Returns the homing time of every axis in seconds, by machine name and axis name"""
+        return {name: machine.homingTimes for name, machine in self.__machines.items()}
@@ -0,0 +1,54 @@
+import unittest
+
+from HomingCoordinator import HomingCoordinator
+from Robot import Robot
+from Warehouse import Warehouse
+from VacuumGripper import VacuumGripper
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.robot1 = Robot(1, [])
+        self.warehouse1 = Warehouse(5)
+        self.vacuum1 = VacuumGripper(4, [])
+        self.homing = HomingCoordinator({'robot1': self.robot1, 'warehouse1': self.warehouse1, 'vacuum1': self.vacuum1})
+
+    def testInterlock(self):
+        self.assertFalse(self.homing.execute())
+        #only the arms retract, everything else waits for its interlock
+        self.assertTrue(self.robot1.robotActArmIn)
+        self.assertFalse(self.robot1.robotActVerticalUp or self.robot1.robotActRotRight or self.robot1.robotActGripperOpen)
+        self.assertTrue(self.warehouse1.warehouseActArmIn)
+        self.assertFalse(self.warehouse1.warehouseActVerticalUp or self.warehouse1.warehouseActHorizontalToConveyor)
+        self.assertTrue(self.vacuum1.vacuumActArmIn)
+        self.assertFalse(self.vacuum1.vacuumActVerticalUp or self.vacuum1.vacuumActRotRight)
+        #arm in, the other axes move together
+        self.robot1.robotSensArmEndIn = True
+        self.assertFalse(self.homing.execute())
+        self.assertFalse(self.robot1.robotActArmIn)
+        self.assertTrue(self.robot1.robotActVerticalUp and self.robot1.robotActRotRight and self.robot1.robotActGripperOpen)
+
+    def testParallel(self):
+        self.robot1.robotSensArmEndIn = self.robot1.robotSensVerticalEndUp = self.robot1.robotSensRotEnd = self.robot1.robotSensGripperOpen = True
+        self.assertFalse(self.homing.execute())
+        self.assertTrue(self.robot1.setupFinishedHelper)
+        self.warehouse1.warehouseSensArmIn = self.warehouse1.warehouseSensVerticalEnd = self.warehouse1.warehouseSensHorizontalEnd = True
+        self.vacuum1.vacuumSensArmEndIn = self.vacuum1.vacuumSensVerticalEndUp = True
+        self.assertFalse(self.homing.execute())
+        self.assertTrue(self.vacuum1.vacuumActRotRight)
+        self.vacuum1.vacuumSensRotEnd = True
+        self.assertTrue(self.homing.execute())
+        self.assertTrue(self.homing.isDone)
+        self.assertFalse(self.vacuum1.vacuumActRotRight)
+
+    def testReport(self):
+        self.robot1.robotSensArmEndIn = self.robot1.robotSensVerticalEndUp = self.robot1.robotSensRotEnd = self.robot1.robotSensGripperOpen = True
+        self.homing.execute()
+        report = self.homing.report()
+        self.assertEqual(set(report['robot1']), {'arm', 'vertical', 'rot', 'gripper'})
+        self.assertEqual(report['warehouse1'], {})
+        self.assertTrue(all(seconds >= 0 for seconds in report['robot1'].values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -18,6 +18,15 @@ class ImpulseCounter(Counter):
     def dirBackward(self):
         return self.__dirBackward
 
+    @property
+    def numalt(self):
+        """Returns the raw input value the counter was last computed with"""
+        return self.__numalt
+
+    @numalt.setter
+    def numalt(self, value):
+        self.__numalt = value
+
     def compute(self, num, direction):
         if direction == PlusMinusStop.PLUS:
             self.counter += (num - self.__numalt)
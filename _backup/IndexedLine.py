@@ -1,12 +1,43 @@
 from IllegalValueCombination import IllegalValueCombination
 from Machine import Machine
+from ControlLog import ControlLog
+from ProcessImage import ImageBit
+
+log = ControlLog.getLogger('IndexedLine')
+
 
 class IndexedLine(Machine):
 
+    # the positions a package passes, each holds at most one package
+    positions = ('loading', 'milling', 'drilling', 'swap')
+    LOADING, MILLING, DRILLING, SWAP = range(4)
+
+    # sensors and actuators, views onto bits of a process image
+    pushButton1Front = ImageBit()
+    pushButton1Back = ImageBit()
+    pushButton2Front = ImageBit()
+    pushButton2Back = ImageBit()
+    indexSensSlider1 = ImageBit()
+    indexSensMilling = ImageBit()
+    indexSensLoading = ImageBit()
+    indexSensDrilling = ImageBit()
+    indexSensConveyorSwap = ImageBit()
+    motorSlider1Backward = ImageBit()
+    motorSlider1Forward = ImageBit()
+    motorSlider2Backward = ImageBit()
+    motorSlider2Forward = ImageBit()
+    conveyorBeltFeed = ImageBit()
+    conveyorBeltMilling = ImageBit()
+    millingMachine = ImageBit()
+    conveyorBeltDrilling = ImageBit()
+    drillingMachine = ImageBit()
+    conveyorBeltSwap = ImageBit()
+
     @property
     def isExecuting(self) -> bool:
-        print(self.motorSlider1Forward or self.motorSlider2Forward or self.motorSlider1Backward or self.motorSlider2Backward or self.conveyorBeltSwap or self.conveyorBeltDrilling or self.conveyorBeltMilling or self.conveyorBeltFeed or self.millingMachine or self.drillingMachine)
-        return self.motorSlider1Forward or self.motorSlider2Forward or self.motorSlider1Backward or self.motorSlider2Backward or self.conveyorBeltSwap or self.conveyorBeltDrilling or self.conveyorBeltMilling or self.conveyorBeltFeed or self.millingMachine or self.drillingMachine
+        executing = self.motorSlider1Forward or self.motorSlider2Forward or self.motorSlider1Backward or self.motorSlider2Backward or self.conveyorBeltSwap or self.conveyorBeltDrilling or self.conveyorBeltMilling or self.conveyorBeltFeed or self.millingMachine or self.drillingMachine
+        log.debug('isExecuting %s', executing)
+        return executing
 
     def __init__(self, id1):
         super().__init__(id1)
@@ -23,6 +54,24 @@ class IndexedLine(Machine):
         
         self.millingCount = self.drillingCount = self.deliveryCount = 0;
         self.deliveryReady = False
+        # the number of the package at each position, None where there is none, packages are numbered as received
+        self.__parts = [None] * len(self.positions)
+        self.received = 0
+
+    @property
+    def isReady(self) -> bool:
+        """Returns whether a package can be put down at the loading sensor"""
+        return self.__parts[self.LOADING] is None and self.indexSensLoading
+
+    @property
+    def occupancy(self) -> dict:
+        """Returns whether a package is at each position, by position name"""
+        return {name: part is not None for name, part in zip(self.positions, self.__parts)}
+
+    @property
+    def parts(self) -> tuple:
+        """Returns the number of the package at each position, None where there is none"""
+        return tuple(self.__parts)
         
     #Brings both sliders to the front button as it is the starting position.
     def startPosition(self):
@@ -35,80 +84,107 @@ class IndexedLine(Machine):
         else:
             self.motorSlider1Forward= False
 
-#Brings a package from start of the indexed line onto the main conveyor.      
+#Brings a package from start of the indexed line onto the milling belt.
+#A package put down at the loading sensor is carried to slider 1, which pushes
+#it onto the milling belt as soon as the milling position is free.
     def receivePackage(self):
-            if not self.indexSensLoading:
-                self.conveyorBeltFeed = True
-            if not self.indexSensSlider1:
+        parts = self.__parts
+        if parts[self.LOADING] is None and not self.indexSensLoading:
+            self.received += 1
+            parts[self.LOADING] = self.received
+            log.debug('part %d received', self.received)
+        if parts[self.LOADING] is not None:
+            if self.motorSlider1Backward:
+                if self.pushButton1Back:
+                    self.motorSlider1Backward = False
+                    self.motorSlider1Forward = True
+                    self.handOver(self.LOADING, self.MILLING)
+            elif not self.indexSensSlider1 and parts[self.MILLING] is None and not self.motorSlider1Forward:
                 self.motorSlider1Backward = True
-            if self.pushButton1Back:
-                self.motorSlider1Backward = False
-                self.motorSlider1Forward = True
-                self.conveyorBeltMilling = True
-            if self.pushButton1Front:
-                self.motorSlider1Forward = False
-                
+        if self.pushButton1Front:
+            self.motorSlider1Forward = False
+        self.conveyorBeltFeed = parts[self.LOADING] is not None and self.indexSensSlider1 and not self.motorSlider1Backward
+
 #The package undergoes milling.
 #The millingCount is an arbitrary value.
 #Change it to fit the desired number of machine rotations.
+#Once milled, the package is carried to the drilling sensor as soon as the
+#drilling position is free, it holds the milling position until it arrives there.
     def milling(self):
-        if not self.indexSensMilling:
-            if self.millingCount < 20:
-                self.conveyorBeltFeed = False
+        parts = self.__parts
+        if parts[self.MILLING] is None:
+            self.conveyorBeltMilling = False
+            return
+        if self.millingCount < 20:
+            if not self.indexSensMilling:
                 self.conveyorBeltMilling = False
                 self.millingMachine = True
                 self.millingCount += 1
             else:
-                self.millingMachine = False
                 self.conveyorBeltMilling = True
-                self.conveyorBeltDrilling = True
-                
+        else:
+            self.millingMachine = False
+            if parts[self.DRILLING] is not None:
+                self.conveyorBeltMilling = False
+            elif not self.indexSensDrilling:
+                self.millingCount = 0
+                self.handOver(self.MILLING, self.DRILLING)
+                self.conveyorBeltMilling = False
+            else:
+                self.conveyorBeltMilling = self.conveyorBeltDrilling = True
+
 #The package undergoes drilling.
 #The drillingCount is an arbitrary value.
 #Change it to fit the desired number of machine rotations.
-#resets the milling count.
     def drilling(self):
-        if not self.indexSensDrilling:
-            if self.drillingCount < 20:
-                self.conveyorBeltMilling = False
-                self.conveyorBeltDrilling = False
-                self.drillingMachine = True
-                self.drillingCount += 1
-            else:
-                self.drillingMachine = False
-                self.conveyorBeltDrilling= True
-                self.millingCount = 0
-            
+        if self.__parts[self.DRILLING] is None:
+            return
+        if self.drillingCount < 20:
+            self.conveyorBeltDrilling = False
+            self.drillingMachine = True
+            self.drillingCount += 1
+        else:
+            self.drillingMachine = False
+            self.conveyorBeltDrilling = True
+
 #Brings the package from the drilling machine to
-#the conveyor belt at the end of the indexed line.
+#the conveyor belt at the end of the indexed line
+#as soon as the swap position is free.
 #resets the drilling count.
     def deliverPackage(self):
-        if not self.indexSensDrilling and self.drillingCount >= 20:
-            self.motorSlider2Backward = True
-            self.conveyorBeltSwap = True
-        if self.pushButton2Back:
-            self.motorSlider2Backward = False
-            self.motorSlider2Forward = True
+        parts = self.__parts
+        if parts[self.DRILLING] is not None and self.drillingCount >= 20:
+            if self.motorSlider2Backward:
+                if self.pushButton2Back:
+                    self.motorSlider2Backward = False
+                    self.motorSlider2Forward = True
+                    self.conveyorBeltDrilling = False
+                    self.conveyorBeltSwap = True
+                    self.drillingCount = 0
+                    self.handOver(self.DRILLING, self.SWAP)
+            elif parts[self.SWAP] is None and not self.motorSlider2Forward:
+                self.motorSlider2Backward = True
         if self.pushButton2Front:
             self.motorSlider2Forward = False
-        if not self.indexSensConveyorSwap:
-            self.conveyorBeltDrilling= False
+        if parts[self.SWAP] is not None and self.conveyorBeltSwap and not self.indexSensConveyorSwap:
             self.deliveryReady = True
-            self.drillingCount = 0
-            
+
 #Brings the package from the start of the indexed line.
 #The package is drilled and milled by the respecting machines.
 #Then the package is brought to the end of the indexed line.
+#Every position holds its own package, one package is milled
+#while the one in front of it is drilled.
     def processPackage(self):
             self.receivePackage()
             self.milling()
             self.drilling()
             self.deliverPackage()
             self.finishDelivery()
-            
+
 #Stops the belt at the end of the indexed line.
 #Condition is activated upon reaching the sensor
 #at the swap conveyer.
+#The swap position is free again once the package was taken from it.
     def finishDelivery(self):
         if self.deliveryReady:
             self.deliveryCount += 1
@@ -116,6 +192,16 @@ class IndexedLine(Machine):
                 self.conveyorBeltSwap = False
                 self.deliveryReady = False
                 self.deliveryCount = 0
+        elif self.__parts[self.SWAP] is not None and not self.conveyorBeltSwap and self.indexSensConveyorSwap:
+            log.debug('part %d taken', self.__parts[self.SWAP])
+            self.__parts[self.SWAP] = None
+
+#Moves the package of one position to the next one.
+    def handOver(self, position: int, nextPosition: int):
+        parts = self.__parts
+        parts[nextPosition] = parts[position]
+        parts[position] = None
+        log.debug('part %d to %s', parts[nextPosition], self.positions[nextPosition])
 
     def execute(self, *args):
         self.processPackage()
@@ -0,0 +1,44 @@
+import unittest
+
+from CellSimulation import CELLS
+from IndexedLine import IndexedLine
+from SimRevPi import SimRevPi
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.line = IndexedLine(6)
+
+    def testOccupancy(self):
+        self.assertEqual({'loading': False, 'milling': False, 'drilling': False, 'swap': False}, self.line.occupancy)
+        self.line.indexSensLoading = False
+        self.line.indexSensSlider1 = True
+        self.line.execute()
+        self.assertEqual((1, None, None, None), self.line.parts)
+        self.assertEqual(self.line.conveyorBeltFeed, True)
+        self.assertEqual(self.line.isReady, False)
+
+    def testPipelining(self):
+        cell, plant, cycleTime = CELLS['sortingStirring'](SimRevPi(), {})
+        line = cell.indexedLine
+        plant.feed.put('first', 0)
+        overlapped = False
+        for i in range(300):
+            cell.read()
+            # the second package is put down as soon as the first one left the loading position
+            if line.received == 1 and line.isReady:
+                plant.feed.put('second', 0)
+            line.execute()
+            cell.write()
+            plant.step()
+            overlapped = overlapped or (line.millingMachine and line.drillingMachine) or \
+                (line.parts[1] == 2 and line.parts[2] == 1)
+            if line.parts[3] == 1 and not line.conveyorBeltSwap:
+                plant.swap.take(0, 10)
+        self.assertTrue(overlapped)
+        self.assertEqual(['second'], [package for position, package in plant.swap.packages])
+        self.assertEqual((None, None, None, 2), line.parts)
+
+
+if __name__ == '__main__':
+    unittest.main()
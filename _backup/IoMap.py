@@ -0,0 +1,139 @@
+from ProcessImage import ImageBit, ImageWord
+
+
+class IoMap:
+    """Copies the process image between the RevPi IOs and the machine fields in one pass.
+
+    The mapping is declared once as data, one (module, pin, machine, field) tuple per IO, e.g.
+    ('dio1', 'I_3', 'robot1', 'robotSensArmEndIn'). On construction it is compiled into a copy plan holding the IO
+    objects and the dicts the machine fields are stored in, so a read or write does no name lookups and no property
+    dispatch. Fields whose storage can not be resolved (properties not backed by an equally named private field) are
+    still copied through the property. Fields stored in a ProcessImage (ImageBit, ImageWord) are copied straight into
+    their bit or word of the image.
+
+    While reading, the digital inputs (pins I_n) are packed into one integer, inputWord, one bit per input in the order
+    of the mapping. mask() returns the bit of an input, e.g. for an EdgeDetector.
+    """
+
+    def __init__(self, rpi, owner, inputs: list, outputs: list):
+        """Compiles the copy plans
+
+        :param rpi: the RevPiModIO instance
+        :param owner: the object holding the machines as attributes, usually the cycle event manager
+        :param list inputs: (module, pin, machine, field) tuples copied from the IOs into the machines
+        :param list outputs: (module, pin, machine, field) tuples copied from the machines into the IOs
+        """
+        self.__masks = {}
+        for module, pin, machineName, field in inputs:
+            if pin.startswith('I_'):
+                self.__masks[(machineName, field)] = 1 << len(self.__masks)
+        self.__inputWord = 0
+        self.__inputs, self.__inputBits, self.__inputWords, self.__inputsDispatched = self.compile(rpi, owner, inputs)
+        self.__outputs, self.__outputBits, self.__outputWords, self.__outputsDispatched = \
+            self.compile(rpi, owner, outputs)
+
+    @staticmethod
+    def ioName(module: str, pin: str) -> str:
+        """Returns the name of the IO in the piCtory configuration, e.g. dio1_I_3, or just the pin for module ''
+        (a RevPi with a single IO module, e.g. the oven station)"""
+        return module + '_' + pin if module else pin
+
+    @staticmethod
+    def storage(machine, field: str):
+        """Returns the key the value behind field is stored at in the instance dict of machine
+
+        :return: the key, None if the field is not stored in the instance dict
+        """
+        fields = vars(machine)
+        if field in fields:
+            return field
+        for cls in type(machine).__mro__:
+            if field in cls.__dict__:
+                key = '_' + cls.__name__.lstrip('_') + '__' + field
+                if isinstance(cls.__dict__[field], property) and key in fields:
+                    return key
+                return None
+        return None
+
+    def compile(self, rpi, owner, mapping: list):
+        """Compiles a mapping into a plan of (io, dict, key, mask) entries, a plan of (io, buffer, byte, bit, mask)
+        entries for ImageBit fields, a plan of (io, view, mask) entries for ImageWord fields and a plan of
+        (io, machine, field, mask) entries for the fields that have to be copied through their property, mask is 0 for
+        IOs not in inputWord
+        """
+        plan = []
+        bits = []
+        words = []
+        dispatched = []
+        for module, pin, machineName, field in mapping:
+            io = getattr(rpi.io, self.ioName(module, pin))
+            machine = getattr(owner, machineName)
+            if not hasattr(machine, field):
+                raise AttributeError(machineName + " has no field " + field)
+            mask = self.__masks.get((machineName, field), 0)
+            descriptor = getattr(type(machine), field, None)
+            if isinstance(descriptor, ImageBit):
+                buffer, byte, bit = descriptor.binding(machine)
+                bits.append((io, buffer, byte, bit, mask))
+                continue
+            if isinstance(descriptor, ImageWord):
+                words.append((io, descriptor.binding(machine), mask))
+                continue
+            key = self.storage(machine, field)
+            if key is None:
+                dispatched.append((io, machine, field, mask))
+            else:
+                plan.append((io, vars(machine), key, mask))
+        return plan, bits, words, dispatched
+
+    def read(self):
+        """Copies all inputs from the IOs into the machines and packs the digital inputs into inputWord"""
+        word = 0
+        for io, fields, key, mask in self.__inputs:
+            value = fields[key] = io.value
+            if value and mask:
+                word |= mask
+        for io, buffer, byte, bit, mask in self.__inputBits:
+            if io.value:
+                buffer[byte] |= bit
+                word |= mask
+            else:
+                buffer[byte] &= ~bit
+        for io, view, mask in self.__inputWords:
+            view[0] = io.value
+        for io, machine, field, mask in self.__inputsDispatched:
+            value = io.value
+            setattr(machine, field, value)
+            if value and mask:
+                word |= mask
+        self.__inputWord = word
+
+    def write(self):
+        """Copies all outputs from the machines into the IOs"""
+        for io, fields, key, mask in self.__outputs:
+            io.value = fields[key]
+        for io, buffer, byte, bit, mask in self.__outputBits:
+            io.value = buffer[byte] & bit != 0
+        for io, view, mask in self.__outputWords:
+            io.value = view[0]
+        for io, machine, field, mask in self.__outputsDispatched:
+            io.value = getattr(machine, field)
+
+    @property
+    def inputWord(self) -> int:
+        """Returns the digital inputs of the last read packed into one integer"""
+        return self.__inputWord
+
+    def mask(self, machine: str, field: str) -> int:
+        """Returns the bit of a digital input in inputWord, e.g. mask('sortingLine1', 'sortingLineSensInputLightBarrier')
+
+        :raises KeyError: if the field is not mapped to a digital input
+        """
+        return self.__masks[(machine, field)]
+
+    @property
+    def size(self) -> int:
+        """Returns the number of mapped IOs"""
+        return sum(len(plan) for plan in (self.__inputs, self.__inputBits, self.__inputWords, self.__inputsDispatched,
+                                          self.__outputs, self.__outputBits, self.__outputWords,
+                                          self.__outputsDispatched))
@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+
+"""Compares the compiled IoMap copy plan with the hand-written per-field read()/write() of the sorting/stirring cell.
+
+Runs without hardware, the RevPi IOs are replaced by plain objects holding a value.
+"""
+
+from timeit import repeat
+from types import SimpleNamespace
+
+from Robot import Robot
+from Warehouse import Warehouse
+from Conveyor import Conveyor
+from VacuumGripper import VacuumGripper
+from SortingLine import SortingLine
+from IndexedLine import IndexedLine
+from IoMap import IoMap
+import SortingStirringIoMap
+
+
+class FakeIo:
+    def __init__(self):
+        self.value = 0
+
+
+def buildCell():
+    """Creates the machines of the sorting/stirring cell and an rpi object holding all mapped IOs"""
+    cell = SimpleNamespace()
+    cell.robot1 = Robot(1, [])
+    cell.conveyor1 = Conveyor(2)
+    cell.sortingLine1 = SortingLine(3)
+    cell.vacuum1 = VacuumGripper(4, [])
+    cell.warehouse1 = Warehouse(5)
+    cell.indexedLine = IndexedLine(6)
+    cell.robot2 = Robot(7, [])
+    cell.conveyor2 = Conveyor(8)
+    cell.rpi = SimpleNamespace(io=SimpleNamespace())
+    for module, pin, machine, field in SortingStirringIoMap.INPUTS + SortingStirringIoMap.OUTPUTS:
+        setattr(cell.rpi.io, IoMap.ioName(module, pin), FakeIo())
+    return cell
+
+
+def handWritten(inputs, outputs):
+    """Generates read() and write() the way they were written by hand, one attribute assignment per IO"""
+    source = "def read(self):\n"
+    for module, pin, machine, field in inputs:
+        source += "    self.%s.%s = self.rpi.io.%s.value\n" % (machine, field, IoMap.ioName(module, pin))
+    source += "def write(self):\n"
+    for module, pin, machine, field in outputs:
+        source += "    self.rpi.io.%s.value = self.%s.%s\n" % (IoMap.ioName(module, pin), machine, field)
+    namespace = {}
+    exec(source, namespace)
+    return namespace['read'], namespace['write']
+
+
+def best(stmt, number):
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == '__main__':
+    number = 20000
+    cell = buildCell()
+    read, write = handWritten(SortingStirringIoMap.INPUTS, SortingStirringIoMap.OUTPUTS)
+    ioMap = IoMap(cell.rpi, cell, SortingStirringIoMap.INPUTS, SortingStirringIoMap.OUTPUTS)
+
+    print("%d IOs mapped" % ioMap.size)
+    print("hand-written read:  %6.2f us" % best(lambda: read(cell), number))
+    print("compiled read:      %6.2f us" % best(ioMap.read, number))
+    print("hand-written write: %6.2f us" % best(lambda: write(cell), number))
+    print("compiled write:     %6.2f us" % best(ioMap.write, number))
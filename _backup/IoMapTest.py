@@ -0,0 +1,82 @@
+import unittest
+from types import SimpleNamespace
+
+from IoMap import IoMap
+from EdgeDetector import EdgeDetector
+from Robot import Robot
+from Conveyor import Conveyor
+from IndexedLine import IndexedLine
+
+
+class FakeIo:
+    def __init__(self, value=False):
+        self.value = value
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.rpi = SimpleNamespace(io=SimpleNamespace(dio1_I_3=FakeIo(), dio1_Counter_4=FakeIo(0),
+                                                      dio1_Counter_13=FakeIo(0), dio4_I_7=FakeIo(),
+                                                      dio1_O_3=FakeIo(), dio1_O_9=FakeIo(), dio4_O_5=FakeIo()))
+        self.robot1 = Robot(1, [])
+        self.conveyor1 = Conveyor(2)
+        self.indexedLine = IndexedLine(3)
+        inputs = [('dio1', 'I_3', 'robot1', 'robotSensArmEndIn'),
+                  ('dio1', 'Counter_4', 'robot1', 'robotSensArmImpulseCounterRaw'),
+                  ('dio1', 'Counter_13', 'conveyor1', 'conveyorSensImpulse'),
+                  ('dio4', 'I_7', 'indexedLine', 'indexSensLoading')]
+        outputs = [('dio1', 'O_3', 'robot1', 'robotActArmOut'),
+                   ('dio1', 'O_9', 'conveyor1', 'conveyorActForward'),
+                   ('dio4', 'O_5', 'indexedLine', 'conveyorBeltFeed')]
+        self.ioMap = IoMap(self.rpi, self, inputs, outputs)
+
+    def testRead(self):
+        self.rpi.io.dio1_I_3.value = True
+        self.rpi.io.dio1_Counter_4.value = 25
+        self.rpi.io.dio1_Counter_13.value = 7
+        self.rpi.io.dio4_I_7.value = True
+        self.ioMap.read()
+        self.assertEqual(self.robot1.robotSensArmEndIn, True)
+        self.assertEqual(self.robot1.robotSensArmImpulseCounterRaw, 25)
+        #conveyorSensImpulse is an ImageWord and copied straight into its word
+        self.assertEqual(self.conveyor1.conveyorSensImpulse, 7)
+        self.assertEqual(self.indexedLine.indexSensLoading, True)
+
+    def testWrite(self):
+        self.robot1.robotActArmOut = True
+        self.conveyor1.conveyorActForward = True
+        self.indexedLine.conveyorBeltFeed = True
+        self.ioMap.write()
+        self.assertEqual(self.rpi.io.dio1_O_3.value, True)
+        self.assertEqual(self.rpi.io.dio1_O_9.value, True)
+        self.assertEqual(self.rpi.io.dio4_O_5.value, True)
+        self.assertEqual(self.ioMap.size, 7)
+
+    def testInputWord(self):
+        armEndIn = self.ioMap.mask('robot1', 'robotSensArmEndIn')
+        loading = self.ioMap.mask('indexedLine', 'indexSensLoading')
+        self.assertEqual((armEndIn, loading), (1, 2))
+        with self.assertRaises(KeyError):
+            self.ioMap.mask('robot1', 'robotSensArmImpulseCounterRaw')
+        edges = EdgeDetector()
+        self.rpi.io.dio1_Counter_4.value = 25
+        self.rpi.io.dio4_I_7.value = True
+        self.ioMap.read()
+        edges.update(self.ioMap.inputWord)
+        self.assertEqual(self.ioMap.inputWord, loading)
+        self.assertTrue(edges.rising(loading))
+        self.assertFalse(edges.changed(armEndIn))
+        self.rpi.io.dio1_I_3.value = True
+        self.rpi.io.dio4_I_7.value = False
+        self.ioMap.read()
+        edges.update(self.ioMap.inputWord)
+        self.assertTrue(edges.rising(armEndIn))
+        self.assertTrue(edges.falling(loading))
+        self.assertFalse(edges.rising(loading))
+
+    def testUnknownField(self):
+        with self.assertRaises(AttributeError):
+            IoMap(self.rpi, self, [('dio1', 'I_3', 'robot1', 'robotSensArmEnd')], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,202 @@
+from array import array
+from time import monotonic
+
+# states of a station, a station is starved while it waits for a package and blocked while it can not hand one over
+WORKING, STARVED, BLOCKED, DOWN = range(4)
+# fields of a bucket: seconds per state, then parts and good parts
+PARTS, GOOD = 4, 5
+FIELDS = 6
+
+# rolling windows in seconds, by name
+WINDOWS = {'minute': 60, 'quarter': 15 * 60, 'shift': 8 * 3600}
+
+
+class RollingWindow:
+    """Totals of the last seconds, kept in a ring of buckets.
+
+    Time and parts are added to the newest bucket, when the window moves on the oldest bucket is subtracted from the
+    totals and reused. Memory is fixed and a query only reads the totals, the window is exact to one bucket width.
+    Buckets and totals are arrays of doubles, so adding time stores the value in place instead of allocating a new
+    float object that outlives the tick.
+    """
+
+    def __init__(self, seconds: float, buckets: int = 60, start: float = 0.0):
+        """
+        :param float seconds: the length of the window
+        :param int buckets: the number of buckets the window is split into
+        :param float start: the time the window starts at
+        """
+        self.seconds = seconds
+        self.width = seconds / buckets
+        self.__totals = array('d', bytes(8 * FIELDS))
+        self.__ring = [array('d', bytes(8 * FIELDS)) for i in range(buckets)]
+        self.__index = 0
+        self.__end = start + self.width
+        self.__last = start
+
+    def advance(self, now: float, state: int):
+        """Adds the seconds since the last call to the state, moving the window on to now"""
+        ring = self.__ring
+        totals = self.__totals
+        if now - self.__end >= self.seconds:
+            # nothing of the window is left, all of it was spent in the state
+            for bucket in ring:
+                for field in range(FIELDS):
+                    bucket[field] = 0.0
+                bucket[state] = self.width
+            ring[self.__index][state] = 0.0
+            for field in range(FIELDS):
+                totals[field] = 0.0
+            totals[state] = self.seconds - self.width
+            self.__last = self.__end + (now - self.__end) // self.width * self.width
+            self.__end = self.__last + self.width
+        while now >= self.__end:
+            seconds = self.__end - self.__last
+            ring[self.__index][state] += seconds
+            totals[state] += seconds
+            self.__last = self.__end
+            self.__end += self.width
+            self.__index = (self.__index + 1) % len(ring)
+            bucket = ring[self.__index]
+            for field in range(FIELDS):
+                totals[field] -= bucket[field]
+                bucket[field] = 0.0
+        seconds = now - self.__last
+        ring[self.__index][state] += seconds
+        totals[state] += seconds
+        self.__last = now
+
+    def count(self, good: bool):
+        """Adds a part to the newest bucket"""
+        bucket = self.__ring[self.__index]
+        bucket[PARTS] += 1
+        self.__totals[PARTS] += 1
+        if good:
+            bucket[GOOD] += 1
+            self.__totals[GOOD] += 1
+
+    @property
+    def totals(self) -> list:
+        """Returns the seconds per state, the parts and the good parts of the window"""
+        return self.__totals.tolist()
+
+
+class StationKpi:
+    """Key metrics of one station or the line, updated on every state transition and part"""
+
+    def __init__(self, name: str, idealCycleTime: float = None, start: float = 0.0):
+        """
+        :param str name: the name of the station
+        :param float idealCycleTime: seconds the station needs per part at full speed, None if unknown, then there is
+            no OEE
+        :param float start: the time the station starts at
+        """
+        self.name = name
+        self.idealCycleTime = idealCycleTime
+        self.state = STARVED
+        self.windows = {window: RollingWindow(seconds, start=start) for window, seconds in WINDOWS.items()}
+
+    def transition(self, state: int, now: float):
+        """Changes the state, nothing happens if the station already is in the state"""
+        if state != self.state:
+            self.update(now)
+            self.state = state
+
+    def part(self, now: float, good: bool = True):
+        self.update(now)
+        for window in self.windows.values():
+            window.count(good)
+
+    def update(self, now: float):
+        """Moves the windows on to now, call it regularly if the state does not change for long"""
+        for window in self.windows.values():
+            window.advance(now, self.state)
+
+    def kpis(self, window: str) -> dict:
+        """Returns the metrics of a window up to the last update
+
+        :param str window: the name of the window, see WINDOWS
+        :return dict: 'partsPerHour', 'cycleTime' in seconds per part, 'utilization', 'blocked' and 'starved' seconds,
+            'availability', 'performance', 'quality' and 'oee', the last three None if there are no parts or no ideal
+            cycle time
+        """
+        totals = self.windows[window].totals
+        covered = sum(totals[:PARTS])
+        parts = totals[PARTS]
+        running = covered - totals[DOWN]
+        availability = running / covered if covered else 1.0
+        quality = totals[GOOD] / parts if parts else None
+        performance = min(1.0, self.idealCycleTime * parts / running) \
+            if self.idealCycleTime is not None and running else None
+        return {'partsPerHour': parts * 3600 / covered if covered else 0.0,
+                'cycleTime': covered / parts if parts else None,
+                'utilization': totals[WORKING] / covered if covered else 0.0,
+                'blocked': totals[BLOCKED],
+                'starved': totals[STARVED],
+                'availability': availability,
+                'performance': performance,
+                'quality': quality,
+                'oee': availability * performance * quality
+                if performance is not None and quality is not None else None}
+
+
+class KpiEngine:
+    """Key metrics of the stations and the whole line, computed incrementally from the state transitions.
+
+    Every transition and part costs the same, however long the control runs, and memory is fixed. The line is working
+    while any station works, down while any station is down and produces the parts of the last station.
+    """
+
+    def __init__(self, idealCycleTimes: dict, last: str, lineIdealCycleTime: float = None, clock=monotonic):
+        """
+        :param dict idealCycleTimes: seconds per part at full speed by station name, None for unknown
+        :param str last: the name of the station the parts leave the line from
+        :param float lineIdealCycleTime: seconds per part of the whole line at full speed, None for unknown
+        :param clock: returns the current time in seconds
+        """
+        self.clock = clock
+        start = clock()
+        self.stations = {name: StationKpi(name, seconds, start) for name, seconds in idealCycleTimes.items()}
+        self.line = StationKpi('line', lineIdealCycleTime, start)
+        self.last = last
+        # number of stations in each state
+        self.__states = [0] * 4
+        self.__states[STARVED] = len(self.stations)
+
+    def transition(self, name: str, state: int, now: float = None):
+        """Changes the state of a station
+
+        :raises KeyError: if the station is unknown
+        """
+        station = self.stations[name]
+        if state == station.state:
+            return
+        now = self.clock() if now is None else now
+        self.__states[station.state] -= 1
+        self.__states[state] += 1
+        station.transition(state, now)
+        states = self.__states
+        self.line.transition(DOWN if states[DOWN] else WORKING if states[WORKING] else BLOCKED if states[BLOCKED]
+                             else STARVED, now)
+
+    def part(self, name: str, good: bool = True, now: float = None):
+        """Counts a part a station finished, the parts of the last station leave the line
+
+        :raises KeyError: if the station is unknown
+        """
+        now = self.clock() if now is None else now
+        self.stations[name].part(now, good)
+        if name == self.last:
+            self.line.part(now, good)
+
+    def update(self, now: float = None):
+        """Moves all windows on to now, e.g. once per cycle so idle stations are up to date"""
+        now = self.clock() if now is None else now
+        for station in self.stations.values():
+            station.update(now)
+        self.line.update(now)
+
+    def query(self, window: str = 'minute') -> dict:
+        """Returns the metrics of the line and of every station, see StationKpi.kpis()"""
+        return {'line': self.line.kpis(window),
+                'stations': {name: station.kpis(window) for name, station in self.stations.items()}}
@@ -0,0 +1,79 @@
+import unittest
+
+from Kpi import KpiEngine, RollingWindow, WORKING, STARVED, BLOCKED, DOWN
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = KpiEngine({'a': 10.0, 'b': 5.0}, last='b', lineIdealCycleTime=20.0, clock=lambda: 0.0)
+
+    def testWindowForgetsOldBuckets(self):
+        window = RollingWindow(60, buckets=6)
+        window.advance(30, WORKING)
+        window.count(True)
+        window.advance(60, STARVED)
+        # the window is exact to one bucket, the first bucket already left it
+        self.assertEqual([20, 30, 0, 0, 1], window.totals[:5])
+        window.advance(100, STARVED)
+        self.assertEqual([0, 50, 0, 0, 0], window.totals[:5])
+
+    def testWindowSkipsLongIdle(self):
+        window = RollingWindow(60, buckets=6)
+        window.advance(10, WORKING)
+        window.count(True)
+        window.advance(10000, DOWN)
+        self.assertEqual([0, 0, 0, 50, 0], window.totals[:5])
+        window.advance(10005, WORKING)
+        self.assertEqual([5, 0, 0, 50, 0], window.totals[:5])
+        window.advance(10025, WORKING)
+        self.assertEqual([25, 0, 0, 30, 0], window.totals[:5])
+
+    def testStationKpis(self):
+        engine = self.engine
+        engine.transition('a', WORKING, now=0)
+        engine.part('a', now=10)
+        engine.transition('a', STARVED, now=10)
+        engine.transition('a', WORKING, now=20)
+        engine.part('a', good=False, now=30)
+        engine.transition('a', DOWN, now=30)
+        engine.update(now=40)
+        kpis = engine.stations['a'].kpis('minute')
+        self.assertEqual(2 * 3600 / 40, kpis['partsPerHour'])
+        self.assertEqual(20, kpis['cycleTime'])
+        self.assertEqual(0.5, kpis['utilization'])
+        self.assertEqual(10, kpis['starved'])
+        self.assertEqual(0.75, kpis['availability'])
+        self.assertAlmostEqual(20 / 30, kpis['performance'])
+        self.assertEqual(0.5, kpis['quality'])
+        self.assertAlmostEqual(0.75 * 20 / 30 * 0.5, kpis['oee'])
+
+    def testLine(self):
+        engine = self.engine
+        engine.transition('a', WORKING, now=0)
+        engine.transition('a', STARVED, now=10)
+        engine.transition('b', WORKING, now=10)
+        engine.transition('b', BLOCKED, now=15)
+        engine.part('a', now=15)
+        engine.part('b', now=20)
+        engine.update(now=20)
+        kpis = engine.query()['line']
+        self.assertEqual(15, 20 * kpis['utilization'])
+        self.assertEqual(5, kpis['blocked'])
+        self.assertEqual(20, kpis['cycleTime'])
+        self.assertEqual(1.0, kpis['oee'])
+
+    def testNoPartsNoOee(self):
+        self.engine.update(now=5)
+        kpis = self.engine.query('shift')['stations']['a']
+        self.assertIsNone(kpis['cycleTime'])
+        self.assertIsNone(kpis['oee'])
+        self.assertEqual(5, kpis['starved'])
+
+    def testUnknownStation(self):
+        with self.assertRaises(KeyError):
+            self.engine.transition('c', WORKING, now=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+
+"""Measures the memory per motion config and the allocations of the robot transfer-list path.
+
+The move list time is dominated by the deep copies of the place list, the allocations are not.
+
+Compares the pooled, slotted configs with the dict-backed configs they replaced. The unpooled case is simulated by a
+pool of size one, so every config of a move list is created anew.
+"""
+
+import sys
+import tracemalloc
+from timeit import repeat
+
+from ConfigPool import ConfigPool
+from Robot import Robot
+from ThreeDRobotConfig import ThreeDRobotConfig
+
+
+class DictConfig:
+    """The previous representation, one instance dict per config"""
+    def __init__(self, counterVertical, counterRot, counterArm, counterGripper, refVertical, refRot, refArm, refGripper):
+        self.__counterVertical = counterVertical
+        self.__counterRot = counterRot
+        self.__counterArm = counterArm
+        self.__counterGripper = counterGripper
+        self.__refVertical = refVertical
+        self.__refRot = refRot
+        self.__refArm = refArm
+        self.__refGripper = refGripper
+
+
+def bytesPerConfig(factory, number):
+    """Returns the memory held per config when number distinct configs are alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    configs = [factory(i, i, i, 6, False, False, False, False) for i in range(number)]
+    size = tracemalloc.get_traced_memory()[0] - before - sys.getsizeof(configs)
+    tracemalloc.stop()
+    return size / number
+
+
+def bytesPerMoveList(robot, number):
+    """Returns the peak memory allocated while building one transfer move list"""
+    robot.generateTransferMoveList(0, 1)
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    current = tracemalloc.get_traced_memory()[0]
+    for i in range(number):
+        robot.generateTransferMoveList(0, 1)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak - current
+
+
+def best(stmt, number):
+    return min(repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+if __name__ == '__main__':
+    number = 10000
+    print("dict config:           %6.1f bytes per config" % bytesPerConfig(DictConfig, number))
+    ThreeDRobotConfig.pool = ConfigPool(1)
+    print("slotted config:        %6.1f bytes per config" % bytesPerConfig(ThreeDRobotConfig, number))
+    ThreeDRobotConfig.pool = ConfigPool(number)
+    print("slotted + pool entry:  %6.1f bytes per config" % bytesPerConfig(ThreeDRobotConfig, number))
+
+    robot = Robot(1, [[2800, 350, 0], [1500, 2300, 20]])
+    ThreeDRobotConfig.pool = ConfigPool()
+    print("pooled move list:   %6.2f us, %5d bytes peak" % (best(lambda: robot.generateTransferMoveList(0, 1), number), bytesPerMoveList(robot, 100)))
+    ThreeDRobotConfig.pool = ConfigPool(1)
+    print("unpooled move list: %6.2f us, %5d bytes peak" % (best(lambda: robot.generateTransferMoveList(0, 1), number), bytesPerMoveList(robot, 100)))
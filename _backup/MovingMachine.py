@@ -1,12 +1,19 @@
 from abc import abstractmethod
+from time import time
 from Machine import Machine
-from copy import deepcopy
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('MovingMachine')
 
 
 # this class should be used for all machines, that have no strict movement path, but can follow various paths
 # examples: Warehouse, 3D Robot
 class MovingMachine(Machine):
 
+    # axes driven to their end switch by the homing run, as (axis, end switch field, actuator field, interlock), an axis
+    # only moves once all axes named in its interlock are home
+    homingAxes = ()
+
     @property
     @abstractmethod
     def isExecuting(self) -> bool:
@@ -19,22 +26,27 @@ class MovingMachine(Machine):
         :param list placeList: the list of places
         """
         super().__init__(id1)
-        self.__placeList = placeList
+        # the places never change, so they are kept immutable and handed out without copying
+        self.__placeList = tuple(tuple(place) for place in placeList)
         self.__configGoal = None
         self.__configReached = False
         self.__setupFinished = self.setupFinishedHelper = False
         self.__pc = 0
         self.__moveList = []
+        # the move list is only generated again once the job changes or starts over
+        self.__moveListStale = True
         self.start = self.fin = 0
+        self.__homingStart = None
+        self.__homingTimes = {}
 
     @property
-    def placeList(self) -> list:
+    def placeList(self) -> tuple:
         """Returns the list of all specified places the machine uses
 
-        :returns: a deepcopy of the list
-        :rtype: list
+        :returns: the places, each a tuple of coordinates
+        :rtype: tuple
         """
-        return deepcopy(self.__placeList)
+        return self.__placeList
 
     @abstractmethod
     def generateTransferMoveList(self, numPickup: int, numPlace: int) -> list:
@@ -49,11 +61,40 @@ class MovingMachine(Machine):
         pass
 
     def setup(self) -> bool:
-        """Performs the setup of the machine to ensure all counters are correctly set
+        """Performs one cycle of the homing run to ensure all counters are correctly set
+
+        All axes of homingAxes move at the same time, except where an interlock holds an axis back until the axes it
+        names are home. The time each axis needed to get home is kept in homingTimes.
 
         :return bool: True if the setup is finished
         """
-        pass
+        if self.__homingStart is None:
+            self.__homingStart = time()
+        home = {name: bool(getattr(self, sensor)) for name, sensor, actuator, interlock in self.homingAxes}
+        for name, sensor, actuator, interlock in self.homingAxes:
+            if home[name]:
+                setattr(self, actuator, False)
+                if name not in self.__homingTimes:
+                    self.__homingTimes[name] = time() - self.__homingStart
+            else:
+                setattr(self, actuator, all(home[other] for other in interlock))
+        return all(home.values())
+
+    def home(self) -> bool:
+        """Performs one cycle of the homing run, does nothing once the machine is homed
+
+        :return bool: True if the machine is homed
+        """
+        if not self.__setupFinished:
+            self.__setupFinished = self.setup()
+            self.setupFinishedHelper = self.__setupFinished
+            self.__configReached = True
+        return self.__setupFinished
+
+    @property
+    def homingTimes(self) -> dict:
+        """Returns the seconds each axis needed to get home in the last homing run, by axis name"""
+        return dict(self.__homingTimes)
 
     def gotoConfig(self, config) -> bool:
         """Takes all necessary actions to ensure the machine reaches the specified config
@@ -74,30 +115,88 @@ class MovingMachine(Machine):
             self.start = start
             self.fin = fin
             self.__pc = 0
+            self.__moveListStale = True
         #TODO pc auch zurücksetzen wenn erneute Ausführung
         if not self.__setupFinished:
-            self.__setupFinished = self.setup()
-            self.setupFinishedHelper = self.__setupFinished
-            self.__configReached = True
+            self.home()
         else:
-            self.__moveList = []
-            self.__moveList.extend(self.generateTransferMoveList(start,fin))
+            #move list nur bei neuem Auftrag erzeugen, nicht in jedem Zyklus
+            if self.__moveListStale:
+                self.__moveList = self.generateTransferMoveList(start,fin)
+                self.__moveListStale = False
             #print(self.__moveList)
             #fahre zur position
             if self.__configReached:
-                print("config reached")
+                log.debug('config reached')
                 self.__configReached = False
                 #weitere moves vorhanden
                 if self.__pc < len(self.__moveList):
-                    print("next move")
                     self.__configGoal = self.__moveList[self.__pc]
                     self.__pc += 1
-                    print(self.__pc)
+                    log.debug('next move %d', self.__pc)
                 else:
                     #TODO reactivate if necessary self.__pc = 0
                     pass
             self.__configReached = self.gotoConfig(self.__configGoal)
 
+    @property
+    def axes(self) -> dict:
+        """Returns the axes of the machine by name, each with its live end switch and counter input
+
+        :return dict: name -> (axis, endpos, counterinput)
+        """
+        return {}
+
+    def snapshot(self) -> dict:
+        """Returns the state needed to continue after a software restart without a homing run
+
+        :return dict: the state, only built from plain values
+        """
+        axes = self.axes
+        return {'setupFinished': self.__setupFinished,
+                'configReached': self.__configReached,
+                'pc': self.__pc,
+                'start': self.start,
+                'fin': self.fin,
+                'axes': {name: axis.snapshot() for name, (axis, endpos, counterinput) in axes.items()},
+                'sensors': {name: [endpos, counterinput] for name, (axis, endpos, counterinput) in axes.items()}}
+
+    def isConsistent(self, state: dict) -> bool:
+        """Returns whether a snapshot matches the live sensors, i.e. no axis moved since it was taken
+
+        Encoder and impulse counters keep counting in the IO modules while the program is down, they only start from
+        zero after a power loss. A snapshot taken before the homing run finished is never consistent.
+        """
+        if not state.get('setupFinished'):
+            return False
+        for name, (axis, endpos, counterinput) in self.axes.items():
+            savedEndpos, savedCounterinput = state['sensors'][name]
+            if bool(endpos) != bool(savedEndpos) or abs(counterinput - savedCounterinput) > axis.tolerance:
+                return False
+        return True
+
+    def restore(self, state: dict) -> None:
+        """Restores a consistent snapshot, the homing run is skipped
+
+        A move that was interrupted is started again, so the machine first drives to the goal it had not reached.
+        """
+        for name, (axis, endpos, counterinput) in self.axes.items():
+            axis.restore(state['axes'][name])
+        self.start = state['start']
+        self.fin = state['fin']
+        self.__pc = state['pc'] if state['configReached'] else max(state['pc'] - 1, 0)
+        self.__moveListStale = True
+        self.__configReached = True
+        self.__setupFinished = True
+
+    @property
+    def isDone(self) -> bool:
+        """Returns whether the last config of the current move list has been reached
+
+        :return bool: the done signal
+        """
+        return self.__setupFinished and self.__configReached and 0 < len(self.__moveList) <= self.__pc
+
     @property
     def pc(self) -> int:
         """Returns the pc indicating the current executing position in the move list
@@ -110,4 +209,6 @@ class MovingMachine(Machine):
 
     @pc.setter
     def pc(self, value):
+        if value == 0 and self.__pc != 0:
+            self.__moveListStale = True
         self.__pc = value
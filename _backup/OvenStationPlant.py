@@ -0,0 +1,96 @@
+from PlantModel import MotorAxis, Belt
+
+
+class OvenStationPlant:
+    """Simulated hardware of the multiprocess station with oven, driven through the IOs of a SimRevPi.
+
+    The station is wired as in cycle_event_manager.py. A workpiece is put on the oven feeder by the operator loadTicks
+    after the feeder came out empty, the vacuum gripper carries it to the turntable, the pusher moves it onto the
+    conveyor and the operator takes it from the light barrier at the end of the conveyor after removalTicks. The vacuum
+    gripper needs lowerTicks to get down onto the workpiece and holds it once its valve was open for gripTicks while down.
+    """
+
+    # turntable positions, the vacuum switch closes at 0 and the conveyor switch at the end of the axis
+    TURNTABLE_SAW = 10
+    TURNTABLE_CONVEYOR = 20
+
+    def __init__(self, rpi, speed: int = 1, loadTicks: int = 10, removalTicks: int = 60, lowerTicks: int = 6,
+                 gripTicks: int = 3):
+        """
+        :param rpi: the SimRevPi the station is controlled through
+        :param int speed: steps per tick of all axes and the conveyor
+        :param int loadTicks: ticks the operator needs to put a new workpiece on the empty oven feeder
+        :param int removalTicks: ticks the operator needs to take a finished workpiece from the conveyor, the control only starts the next
+            workpiece if the turntable is back at the vacuum gripper by then
+        :param int lowerTicks: ticks the vacuum gripper is lowered until it is down
+        :param int gripTicks: ticks the valve of the vacuum gripper has to be open while it is down to hold a workpiece
+        """
+        io = rpi.io
+        self.io = io
+        self.loadTicks = loadTicks
+        self.removalTicks = removalTicks
+        self.lowerTicks = lowerTicks
+        self.gripTicks = gripTicks
+        # ticks the gripper has been lowered and ticks its valve was open since it is down
+        self.lowered = self.suction = 0
+        # O_1 clockwise towards the saw and the conveyor, O_2 counter-clockwise towards the vacuum gripper
+        self.turntable = MotorAxis(io['O_2'], io['O_1'], end=io['I_1'], farEnd=io['I_2'], speed=speed,
+                                   limit=self.TURNTABLE_CONVEYOR)
+        self.carrier = MotorAxis(io['O_8'], io['O_7'], end=io['I_5'], farEnd=io['I_8'], speed=speed, limit=30)
+        self.feeder = MotorAxis(io['O_6'], io['O_5'], end=io['I_7'], farEnd=io['I_6'], speed=speed, limit=12)
+        self.conveyor = Belt(10, speed)
+        self.feederPackage = 0
+        self.gripperPackage = None
+        self.turntablePackage = None
+        self.loadWait = 0
+        self.removalWait = 0
+        self.packages = 1
+        self.produced = 0
+        self.update()
+
+    def step(self):
+        """Simulates one tick, call after the control wrote its outputs"""
+        io = self.io
+        self.turntable.step()
+        self.carrier.step()
+        self.feeder.step()
+        lowered = io['O_12'].value
+        self.lowered = self.lowered + 1 if lowered else 0
+        down = self.lowered >= self.lowerTicks
+        self.suction = self.suction + 1 if io['O_11'].value and down else 0
+        if io['O_11'].value and lowered:
+            if self.gripperPackage is None and self.carrier.farEnd.value and self.feeder.end.value \
+                    and self.suction >= self.gripTicks:
+                self.gripperPackage, self.feederPackage = self.feederPackage, None
+        elif self.gripperPackage is not None and lowered and self.carrier.end.value \
+                and self.turntablePackage is None:
+            self.turntablePackage, self.gripperPackage = self.gripperPackage, None
+        if io['O_14'].value and self.turntable.farEnd.value and self.turntablePackage is not None:
+            self.conveyor.put(self.turntablePackage, 0)
+            self.turntablePackage = None
+        self.conveyor.step(1 if io['O_3'].value else 0)
+        self.operate()
+        self.update()
+
+    def operate(self):
+        """The operator loads the empty feeder and takes finished workpieces off the conveyor"""
+        if self.feederPackage is None and self.feeder.end.value:
+            self.loadWait += 1
+            if self.loadWait >= self.loadTicks:
+                self.loadWait = 0
+                self.feederPackage = self.packages
+                self.packages += 1
+        if self.conveyor.occupied(self.conveyor.length - 1, self.conveyor.length):
+            self.removalWait += 1
+            if self.removalWait >= self.removalTicks:
+                self.removalWait = 0
+                self.conveyor.take(self.conveyor.length - 1, self.conveyor.length)
+                self.produced += 1
+
+    def update(self):
+        """Writes the sensors not belonging to an axis, the light barriers are interrupted by a workpiece"""
+        io = self.io
+        position = self.turntable.position
+        io['I_4'].value = self.TURNTABLE_SAW <= position <= self.TURNTABLE_SAW + 1
+        io['I_3'].value = not self.conveyor.occupied(self.conveyor.length - 1, self.conveyor.length)
+        io['I_9'].value = self.feederPackage is None
@@ -0,0 +1,139 @@
+import json
+import mmap
+import os
+
+from IoMap import IoMap
+
+
+class PiControl:
+    """Reads and writes the whole process image of the RevPi as one block, bypassing the IO objects of revpimodio2.
+
+    The process image file (/dev/piControl0 on a RevPi, any regular file of the right size elsewhere) is memory-mapped
+    and the places of the IOs are taken from the piCtory configuration. read() copies the image into a ProcessImage
+    laid out with layout() in one slice assignment, write() copies back only the output range of every device, so the
+    inputs written by the IO modules are never overwritten. Where the file can not be mapped, both fall back to one
+    pread/pwrite per block.
+    """
+
+    def __init__(self, filename: str = '/dev/piControl0', config='/etc/revpi/config.rsc'):
+        """
+        :param str filename: the process image file
+        :param config: the piCtory configuration, a file name or the parsed dict
+        :raises ValueError: if a regular file is smaller than the process image of the configuration
+        """
+        if isinstance(config, str):
+            with open(config) as f:
+                config = json.load(f)
+        self.__offsets = self.offsets(config)
+        self.__outputRanges = self.outputRanges(config)
+        self.__size = max(byte + (length + 7) // 8 for byte, bit, length in self.__offsets.values())
+        self.__fd = os.open(filename, os.O_RDWR)
+        fileSize = os.fstat(self.__fd).st_size
+        if fileSize and fileSize < self.__size:
+            os.close(self.__fd)
+            raise ValueError(filename + " is smaller than the process image of " + str(self.__size) + " bytes")
+        try:
+            self.__map = mmap.mmap(self.__fd, self.__size)
+            self.__view = memoryview(self.__map)
+        except (OSError, ValueError):
+            # the piControl driver of older images does not support mmap
+            self.__map = self.__view = None
+
+    @staticmethod
+    def place(base: int, entry: list) -> tuple:
+        """Returns the (byte, bit, bit length) of a piCtory IO entry of a device at offset base
+
+        An entry is [name, default, bit length, byte offset, exported, sort order, comment, bit position], bit is None
+        for IOs longer than one bit.
+        """
+        length, byte = int(entry[2]), base + int(entry[3])
+        if length != 1:
+            return byte, None, length
+        bit = int(entry[7] or 0)
+        return byte + bit // 8, bit % 8, length
+
+    @staticmethod
+    def offsets(config: dict) -> dict:
+        """Returns the place of every IO of a piCtory configuration
+
+        An IO is found by its name and by its name prefixed with the name of its device, e.g. dio1_I_3.
+
+        :return dict: IO name -> (byte, bit, bit length), bit is None for IOs longer than one bit
+        """
+        offsets = {}
+        for device in config['Devices']:
+            base = int(device['offset'])
+            for section in ('inp', 'out', 'mem'):
+                for entry in device.get(section, {}).values():
+                    place = PiControl.place(base, entry)
+                    offsets.setdefault(device['name'] + '_' + entry[0], place)
+                    offsets[entry[0]] = place
+        return offsets
+
+    @staticmethod
+    def outputRanges(config: dict) -> list:
+        """Returns the (start, end) byte range of the outputs of every device of a piCtory configuration"""
+        ranges = []
+        for device in config['Devices']:
+            base = int(device['offset'])
+            places = [PiControl.place(base, entry) for entry in device.get('out', {}).values()]
+            if places:
+                ranges.append((min(byte for byte, bit, length in places),
+                               max(byte + (length + 7) // 8 for byte, bit, length in places)))
+        return ranges
+
+    def layout(self, mapping: list) -> dict:
+        """Returns the place of every field of an IoMap mapping in the process image, see ProcessImage.layout()
+
+        :param list mapping: (module, pin, machine, field) tuples
+        :raises KeyError: if an IO of the mapping is not in the piCtory configuration
+        """
+        layout = {}
+        for module, pin, machineName, field in mapping:
+            byte, bit, length = self.__offsets[IoMap.ioName(module, pin)]
+            layout[(machineName, field)] = (byte, bit)
+        return layout
+
+    @property
+    def size(self) -> int:
+        """Returns the size of the process image in bytes"""
+        return self.__size
+
+    @property
+    def mapped(self) -> bool:
+        """Returns whether the process image file is memory-mapped"""
+        return self.__view is not None
+
+    def read(self, image):
+        """Copies the process image into a ProcessImage, one block copy"""
+        if self.__view is not None:
+            image.buffer[:] = self.__view[:image.size]
+        else:
+            os.preadv(self.__fd, [image.buffer], 0)
+
+    def write(self, image):
+        """Copies the outputs of a ProcessImage into the process image, one block copy per device"""
+        buffer = memoryview(image.buffer)
+        for start, end in self.__outputRanges:
+            end = min(end, image.size)
+            if start >= end:
+                continue
+            if self.__view is not None:
+                self.__view[start:end] = buffer[start:end]
+            else:
+                os.pwrite(self.__fd, buffer[start:end], start)
+
+    def clearOutputs(self):
+        """Switches off all outputs of the process image"""
+        for start, end in self.__outputRanges:
+            if self.__view is not None:
+                self.__view[start:end] = bytes(end - start)
+            else:
+                os.pwrite(self.__fd, bytes(end - start), start)
+
+    def close(self):
+        if self.__view is not None:
+            self.__view.release()
+            self.__map.close()
+            self.__view = self.__map = None
+        os.close(self.__fd)
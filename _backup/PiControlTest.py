@@ -0,0 +1,84 @@
+import os
+import tempfile
+import unittest
+
+from PiControl import PiControl
+from ProcessImage import ProcessImage
+from Robot import Robot
+
+
+def dio(name: str, offset: int) -> dict:
+    """Returns a piCtory device entry of a DIO module, 14 inputs, 14 outputs and counters like the real one"""
+    inp = {str(n): [name + '_I_' + str(n + 1), '0', '1', '0', True, '', '', str(n)] for n in range(14)}
+    inp.update({str(14 + n): [name + '_Counter_' + str(n + 1), '0', '32', str(4 + 4 * n), True, '', '', '']
+                for n in range(14)})
+    out = {str(n): [name + '_O_' + str(n + 1), '0', '1', '60', True, '', '', str(n)] for n in range(14)}
+    return {'name': name, 'offset': offset, 'inp': inp, 'out': out}
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.config = {'Devices': [{'name': 'core', 'offset': 0,
+                                    'inp': {'0': ['Core_Temperature', '0', '8', '0', True, '', '', '']},
+                                    'out': {'0': ['RevPiLED', '0', '16', '1', True, '', '', '']}},
+                                   dio('dio1', 11)]}
+        f, self.filename = tempfile.mkstemp()
+        os.write(f, bytes(200))
+        os.close(f)
+        self.piControl = PiControl(self.filename, self.config)
+        self.robot1 = Robot(1, [])
+        mapping = [('dio1', 'I_3', 'robot1', 'robotSensArmEndIn'),
+                   ('dio1', 'I_10', 'robot1', 'robotSensRotEnd'),
+                   ('dio1', 'Counter_4', 'robot1', 'robotSensArmImpulseCounterRaw'),
+                   ('dio1', 'O_3', 'robot1', 'robotActArmOut')]
+        self.image = ProcessImage.fromLayout(self, self.piControl.layout(mapping))
+
+    def tearDown(self):
+        self.piControl.close()
+        os.remove(self.filename)
+
+    def testOffsets(self):
+        offsets = PiControl.offsets(self.config)
+        self.assertEqual(offsets['dio1_I_3'], (11, 2, 1))
+        self.assertEqual(offsets['dio1_I_10'], (12, 1, 1))
+        self.assertEqual(offsets['dio1_Counter_4'], (27, None, 32))
+        self.assertEqual(offsets['dio1_O_3'], (71, 2, 1))
+        #devices not renamed in piCtory are found with their device name
+        self.assertEqual(offsets['core_Core_Temperature'], (0, None, 8))
+        self.assertEqual(PiControl.outputRanges(self.config), [(1, 3), (71, 73)])
+        self.assertEqual(self.piControl.size, 73)
+
+    def testRead(self):
+        with open(self.filename, 'r+b') as f:
+            f.seek(11)
+            f.write(bytes([0b100, 0b10]))
+            f.seek(27)
+            f.write((1234).to_bytes(4, 'little'))
+        self.assertTrue(self.piControl.mapped)
+        self.piControl.read(self.image)
+        self.assertEqual(self.robot1.robotSensArmEndIn, True)
+        self.assertEqual(self.robot1.robotSensRotEnd, True)
+        self.assertEqual(self.robot1.robotSensArmImpulseCounterRaw, 1234)
+
+    def testWriteOutputsOnly(self):
+        self.robot1.robotActArmOut = True
+        #an input set in the image must not reach the file
+        self.robot1.robotSensArmEndIn = True
+        self.piControl.write(self.image)
+        with open(self.filename, 'rb') as f:
+            data = f.read()
+        self.assertEqual(data[71], 0b100)
+        self.assertEqual(data[11], 0)
+        self.piControl.clearOutputs()
+        with open(self.filename, 'rb') as f:
+            self.assertEqual(f.read()[71], 0)
+
+    def testFileTooSmall(self):
+        with open(self.filename, 'r+b') as f:
+            f.truncate(20)
+        with self.assertRaises(ValueError):
+            PiControl(self.filename, self.config)
+
+
+if __name__ == '__main__':
+    unittest.main()
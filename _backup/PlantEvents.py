@@ -0,0 +1,254 @@
+"""The stations of the plant as processes of an EventSimulation, for simulating whole shifts in a fraction of a second.
+
+Every station waits for a package, then for the sensor transitions of its work, e.g. the gripper closing and opening,
+and hands the package over to the next station. The durations are in control cycles and taken from the controls and the
+tick simulation (see CellSimulation): the oven station follows the timings of process_actuator.py and the travel times of
+OvenStationPlant, the sorting/stirring cell the cycles measured on SortingStirringPlant at speed 1.
+"""
+
+from time import perf_counter
+
+from EventSimulation import EventSimulation, Buffer
+
+# cycles of the oven station, the timers of process_actuator.py and the travel times of OvenStationPlant
+OVEN_TIMING = {'load': 10,            # operator puts a part on the oven feeder
+               'feederIn': 12,        # oven feeder drives in until the inside switch
+               'oven': 30,
+               'feederOut': 12,       # oven feeder drives out until the outside switch
+               'vacuumLower': 10,     # vacuum gripper lowers at the oven
+               'vacuumGrip': 5,       # valve on, until 15
+               'vacuumRaise': 10,     # raises until 25
+               'carrier': 30,         # vacuum carrier between oven and turntable
+               'releaseLower': 15,    # lowers at the turntable
+               'release': 15,         # valve off, until 30
+               'turntableToSaw': 10,
+               'saw': 40,
+               'turntableToConveyor': 10,
+               'pusher': 20,
+               'conveyor': 10,        # until the light barrier
+               'turntableBack': 20,   # from the conveyor back to the vacuum position
+               'removal': 60}         # operator takes the part from the light barrier
+
+# cycles of the sorting/stirring cell, measured on SortingStirringPlant, the stations run one after the other as in
+# SequenceManager
+SORTING_STIRRING_TIMING = {'robot1Take': 292, 'robot1Put': 381, 'robot1Back': 58,   # supply to conveyor 1
+                           'conveyor1': 28,
+                           'sortingLine': 20,
+                           'vacuumStoreTake': 218, 'vacuumStorePut': 368, 'vacuumStoreBack': 32,  # chute to warehouse
+                           'warehouseStore': 238,
+                           'warehouseRetrieve': 499,
+                           'vacuumRetrieveTake': 290, 'vacuumRetrievePut': 312, 'vacuumRetrieveBack': 32,
+                           'settle': 15,    # settle cycles of SequenceManager after the drop onto the indexed line
+                           'indexedFeed': 18, 'milling': 20, 'millingTransport': 14, 'drilling': 20,
+                           'drillingTransport': 12, 'delivery': 50, 'indexedEject': 8,
+                           'robot2Take': 156, 'robot2Put': 207, 'robot2Back': 58,   # indexed line to conveyor 2
+                           'conveyor2': 28}
+
+# seconds per control cycle, cycle_time of CycleEventManager and cycleTime of CycleEventManagerRevPiTestSetup
+CYCLE_TIMES = {'oven': 0.05,
+               'sortingStirring': 0.03}
+
+
+class Plant:
+    """The buffers and processes of one simulated cell"""
+
+    def __init__(self, simulation: EventSimulation, timing: dict):
+        self.simulation = simulation
+        self.timing = timing
+        # packages that left the cell
+        self.produced = 0
+
+
+class OvenStation(Plant):
+    """The multiprocess station with oven, one part is processed at a time as in process_actuator.py"""
+
+    def __init__(self, simulation: EventSimulation, timing: dict = None):
+        super().__init__(simulation, dict(OVEN_TIMING, **(timing or {})))
+        self.feeder = Buffer(simulation)
+        # the feeder is out and empty, the operator can load
+        self.feederFree = Buffer(simulation, packages=[True])
+        self.turntable = Buffer(simulation)
+        self.lightBarrier = Buffer(simulation)
+        # the station states are reset, the oven may start the next part
+        self.reset = Buffer(simulation, packages=[True])
+        for process in (self.operatorLoad(), self.ovenLine(), self.turntableLine(), self.operatorRemoval()):
+            simulation.process(process)
+
+    def operatorLoad(self):
+        part = 0
+        while True:
+            yield self.feederFree.get()
+            yield self.timing['load']
+            part += 1
+            yield self.feeder.put(part)
+
+    def ovenLine(self):
+        t = self.timing
+        carrierAtOven = True
+        while True:
+            part = yield self.feeder.get()
+            yield self.reset.get()
+            if not carrierAtOven:
+                yield t['carrier']
+            yield t['feederIn']
+            yield t['oven']
+            yield t['feederOut']
+            yield t['vacuumLower']
+            yield t['vacuumGrip']
+            yield t['vacuumRaise']
+            yield self.feederFree.put(True)
+            yield t['carrier']
+            carrierAtOven = False
+            yield t['releaseLower']
+            yield t['release']
+            yield self.turntable.put(part)
+
+    def turntableLine(self):
+        t = self.timing
+        while True:
+            part = yield self.turntable.get()
+            yield t['turntableToSaw']
+            yield t['saw']
+            yield t['turntableToConveyor']
+            yield t['pusher']
+            yield t['conveyor']
+            yield self.lightBarrier.put(part)
+            # the light barrier resets the station states, then the turntable turns back
+            yield self.reset.put(True)
+            yield t['turntableBack']
+
+    def operatorRemoval(self):
+        while True:
+            yield self.lightBarrier.get()
+            yield self.timing['removal']
+            self.produced += 1
+
+
+class SortingStirring(Plant):
+    """The sorting/stirring cell, the vacuum gripper and the warehouse are shared by storing and retrieving"""
+
+    def __init__(self, simulation: EventSimulation, timing: dict = None, wip: int = 1):
+        """
+        :param int wip: packages in the cell at the same time, SequenceManager runs one at a time
+        """
+        super().__init__(simulation, dict(SORTING_STIRRING_TIMING, **(timing or {})))
+        self.supply = Buffer(simulation, capacity=wip, packages=range(wip))
+        self.vacuum = Buffer(simulation, packages=[True])
+        self.warehouse = Buffer(simulation, packages=[True])
+        self.conveyor1 = Buffer(simulation)
+        self.sortingLine = Buffer(simulation)
+        self.chute = Buffer(simulation)
+        self.warehouseBelt = Buffer(simulation)
+        self.rack = Buffer(simulation, capacity=9)
+        self.retrieved = Buffer(simulation)
+        self.indexedLine = Buffer(simulation)
+        self.swap = Buffer(simulation)
+        self.conveyor2 = Buffer(simulation)
+        for process in (self.robot('robot1', self.supply, self.conveyor1),
+                        self.belt('conveyor1', self.conveyor1, self.sortingLine),
+                        self.belt('sortingLine', self.sortingLine, self.chute),
+                        self.vacuumGripper('vacuumStore', self.chute, self.warehouseBelt),
+                        self.warehouseStore(),
+                        self.warehouseRetrieve(),
+                        self.vacuumGripper('vacuumRetrieve', self.retrieved, self.indexedLine, settle=True),
+                        self.indexedLineProcess(),
+                        self.robot('robot2', self.swap, self.conveyor2),
+                        self.conveyor2Process()):
+            simulation.process(process)
+
+    def robot(self, name: str, source: Buffer, target: Buffer):
+        t = self.timing
+        while True:
+            package = yield source.get()
+            yield t[name + 'Take']
+            yield t[name + 'Put']
+            yield t[name + 'Back']
+            yield target.put(package)
+
+    def vacuumGripper(self, name: str, source: Buffer, target: Buffer, settle: bool = False):
+        t = self.timing
+        while True:
+            package = yield source.get()
+            yield self.vacuum.get()
+            yield t[name + 'Take']
+            yield t[name + 'Put']
+            yield t[name + 'Back']
+            yield self.vacuum.put(True)
+            if settle:
+                yield t['settle']
+            yield target.put(package)
+
+    def belt(self, name: str, source: Buffer, target: Buffer):
+        while True:
+            package = yield source.get()
+            yield self.timing[name]
+            yield target.put(package)
+
+    def warehouseStore(self):
+        while True:
+            package = yield self.warehouseBelt.get()
+            yield self.warehouse.get()
+            yield self.timing['warehouseStore']
+            yield self.warehouse.put(True)
+            yield self.rack.put(package)
+
+    def warehouseRetrieve(self):
+        while True:
+            package = yield self.rack.get()
+            yield self.warehouse.get()
+            yield self.timing['warehouseRetrieve']
+            yield self.warehouse.put(True)
+            yield self.retrieved.put(package)
+
+    def indexedLineProcess(self):
+        t = self.timing
+        while True:
+            package = yield self.indexedLine.get()
+            yield t['indexedFeed']
+            yield t['milling']
+            yield t['millingTransport']
+            yield t['drilling']
+            yield t['drillingTransport']
+            yield t['delivery']
+            yield t['indexedEject']
+            yield self.swap.put(package)
+
+    def conveyor2Process(self):
+        while True:
+            package = yield self.conveyor2.get()
+            yield self.timing['conveyor2']
+            self.produced += 1
+            # the package left the cell, the next one may enter
+            yield self.supply.put(package)
+
+
+# the cells that can be simulated, by kind
+PLANTS = {'oven': OvenStation,
+          'sortingStirring': SortingStirring}
+
+
+def simulateShift(job: dict) -> dict:
+    """Simulates one cell for a number of hours, the event based counterpart of CellSimulation.simulate()
+
+    :param dict job: 'kind' of the cell (see PLANTS), 'hours' to run, default 8, and optional 'params' of the plant,
+        e.g. 'timing' or 'wip'
+    :return dict: the job and the 'produced' packages, the 'events' processed, the 'simulatedSeconds', the
+        'wallSeconds' the simulation took and the 'productsPerHour' of the cell
+    :raises KeyError: if the kind is unknown
+    """
+    params = job.get('params', {})
+    hours = job.get('hours', 8)
+    cycleTime = CYCLE_TIMES[job['kind']]
+    simulation = EventSimulation()
+    plant = PLANTS[job['kind']](simulation, **params)
+    start = perf_counter()
+    simulation.run(round(hours * 3600 / cycleTime))
+    wallSeconds = perf_counter() - start
+    return {'kind': job['kind'],
+            'params': params,
+            'hours': hours,
+            'produced': plant.produced,
+            'events': simulation.events,
+            'simulatedSeconds': hours * 3600.0,
+            'wallSeconds': wallSeconds,
+            'productsPerHour': plant.produced / hours if hours else 0.0}
@@ -0,0 +1,251 @@
+class MotorAxis:
+    """Simulates a motor driven axis with an end switch at position 0, used by the plant models.
+
+    The motor is driven by two outputs, minus towards the end switch and plus away from it. An optional far end switch
+    closes at limit, an optional counter input either follows the position (encoder, zeroed by its reset()) or counts
+    every step in both directions (impulse counter). After its motor stopped, the axis coasts on for coast steps in the
+    direction it moved, at most speed of them per tick.
+    """
+
+    def __init__(self, minus, plus, end=None, counter=None, speed: int = 1, limit: int = 10000, position: int = 0,
+                 impulse: bool = False, farEnd=None, coast: int = 0):
+        """
+        :param minus: the output moving the axis towards its end switch
+        :param plus: the output moving the axis away from its end switch
+        :param end: the input of the end switch at position 0, None if the axis has none
+        :param counter: the counter input, None if the axis has none
+        :param int speed: steps per tick
+        :param int limit: the highest position, the axis stops there
+        :param int position: the position the axis starts at
+        :param bool impulse: whether the counter counts steps in both directions instead of following the position
+        :param farEnd: the input of the end switch at limit, None if the axis has none
+        :param int coast: steps the axis moves on after its motor stopped
+        """
+        self.minus = minus
+        self.plus = plus
+        self.end = end
+        self.counter = counter
+        self.speed = speed
+        self.limit = limit
+        self.position = position
+        self.impulse = impulse
+        self.farEnd = farEnd
+        self.coast = coast
+        # steps moved in the last tick, negative towards the end switch
+        self.moved = 0
+        # steps left to coast, negative towards the end switch
+        self.__drift = 0
+        self.__zero = 0
+        if counter is not None and not impulse:
+            counter.onReset = self.zero
+        self.update()
+
+    def zero(self):
+        """Zeroes the encoder at the current position, called when the counter input is reset"""
+        self.__zero = self.position
+        self.update()
+
+    def step(self) -> int:
+        """Moves the axis for one tick as the outputs say
+
+        :return int: the steps moved, negative towards the end switch
+        """
+        if self.minus.value and not self.plus.value:
+            target = max(self.position - self.speed, 0)
+            self.__drift = -self.coast
+        elif self.plus.value and not self.minus.value:
+            target = min(self.position + self.speed, self.limit)
+            self.__drift = self.coast
+        else:
+            drift = max(-self.speed, min(self.__drift, self.speed))
+            self.__drift -= drift
+            target = max(0, min(self.position + drift, self.limit))
+        moved = target - self.position
+        self.position = target
+        self.moved = moved
+        if self.impulse and self.counter is not None:
+            self.counter.value += abs(moved)
+        self.update()
+        return moved
+
+    def update(self):
+        """Writes the switches and the encoder for the current position"""
+        if self.end is not None:
+            self.end.value = self.position <= 0
+        if self.farEnd is not None:
+            self.farEnd.value = self.position >= self.limit
+        if self.counter is not None and not self.impulse:
+            self.counter.value = self.position - self.__zero
+
+
+class Slot:
+    """A place a package can be put down at and picked up from"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.package = None
+
+    def put(self, package) -> bool:
+        """Puts a package down, returns False if the slot is occupied"""
+        if self.package is not None:
+            return False
+        self.package = package
+        return True
+
+    def take(self):
+        """Picks the package up, None if there is none"""
+        package, self.package = self.package, None
+        return package
+
+
+class Belt:
+    """A belt moving packages along positions 0 to length, packages leaving an end are handed to that end's exit.
+
+    An end without an exit is a stop the packages pile up against.
+    """
+
+    def __init__(self, length: int, speed: int = 1, exitLow=None, exitHigh=None):
+        """
+        :param int length: the highest position on the belt
+        :param int speed: positions per tick
+        :param exitLow: called with a package leaving below position 0, None for a stop
+        :param exitHigh: called with a package leaving above length, None for a stop
+        """
+        self.length = length
+        self.speed = speed
+        self.exitLow = exitLow
+        self.exitHigh = exitHigh
+        self.packages = []
+
+    def put(self, package, position: int):
+        self.packages.append([position, package])
+
+    def step(self, direction: int):
+        """Moves all packages one tick, direction is 1 towards length, -1 towards 0 and 0 for standing still"""
+        if not direction or not self.packages:
+            return
+        remaining = []
+        for entry in self.packages:
+            entry[0] += direction * self.speed
+            if entry[0] < 0 and self.exitLow is not None:
+                self.exitLow(entry[1])
+            elif entry[0] > self.length and self.exitHigh is not None:
+                self.exitHigh(entry[1])
+            else:
+                entry[0] = min(max(entry[0], 0), self.length)
+                remaining.append(entry)
+        self.packages = remaining
+
+    def occupied(self, low: int, high: int) -> bool:
+        """Returns whether a package is between low and high, e.g. in front of a light barrier"""
+        return any(low <= position <= high for position, package in self.packages)
+
+    def take(self, low: int, high: int):
+        """Removes and returns the first package between low and high, None if there is none"""
+        for entry in self.packages:
+            if low <= entry[0] <= high:
+                self.packages.remove(entry)
+                return entry[1]
+        return None
+
+
+class Places:
+    """Finds the place of a place list a machine is at, from the positions of its axes"""
+
+    def __init__(self, axes: list, places: list, tolerances: list):
+        """
+        :param list axes: the MotorAxis per coordinate of a place
+        :param list places: the places, one coordinate per axis, e.g. the placeList of a machine
+        :param list tolerances: the largest difference per coordinate still counted as at the place
+        """
+        self.axes = axes
+        self.places = places
+        self.tolerances = tolerances
+
+    def index(self):
+        """Returns the index of the place the axes are at, None if they are at none"""
+        for index, place in enumerate(self.places):
+            if all(abs(axis.position - coordinate) <= tolerance
+                   for axis, coordinate, tolerance in zip(self.axes, place, self.tolerances)):
+                return index
+        return None
+
+
+class BeltEnd:
+    """A slot on a belt, packages are put down at position and picked up between low and high"""
+
+    def __init__(self, belt: Belt, low: int, high: int, position: int):
+        self.belt = belt
+        self.low = low
+        self.high = high
+        self.position = position
+
+    def put(self, package) -> bool:
+        if self.belt.occupied(self.low, self.high):
+            return False
+        self.belt.put(package, self.position)
+        return True
+
+    def take(self):
+        return self.belt.take(self.low, self.high)
+
+
+class Supply(Slot):
+    """A slot a new package is put into every ticks ticks after the last one was taken, e.g. by an operator"""
+
+    def __init__(self, name: str, ticks: int):
+        super().__init__(name)
+        self.ticks = ticks
+        self.wait = ticks
+        self.supplied = 0
+
+    def step(self):
+        if self.package is None:
+            self.wait += 1
+            if self.wait >= self.ticks:
+                self.wait = 0
+                self.supplied += 1
+                self.package = self.supplied
+
+
+class Sink(Slot):
+    """A slot packages leave the plant through, e.g. finished products, only counts them"""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.count = 0
+
+    def put(self, package) -> bool:
+        self.count += 1
+        return True
+
+
+class Gripper:
+    """Picks packages up and puts them down at the places of a machine, what the gripper does is read from the plant"""
+
+    def __init__(self, places: Places, slots: list, gripping):
+        """
+        :param Places places: the places of the machine
+        :param list slots: the slot at each place, None where nothing can be picked up or put down
+        :param gripping: returns True while the gripper grips, False while it releases and None if it does neither,
+            e.g. reads the vacuum valve
+        """
+        self.places = places
+        self.slots = slots
+        self.gripping = gripping
+        self.package = None
+        self.dropped = 0
+
+    def step(self):
+        gripping = self.gripping()
+        if gripping is None or bool(gripping) == (self.package is not None):
+            return
+        index = self.places.index()
+        slot = self.slots[index] if index is not None else None
+        if gripping:
+            if slot is not None:
+                self.package = slot.take()
+        else:
+            if slot is None or not slot.put(self.package):
+                self.dropped += 1
+            self.package = None
@@ -3,6 +3,10 @@ from math import sqrt
 
 
 class PositionCartesian:
+
+    # positions are mutable, so they are slotted but not pooled like the motion configs
+    __slots__ = ('__x', '__y', '__z')
+
     def __init__(self, x, y, z):
         self.__x = x
         self.__y = y
@@ -32,6 +36,16 @@ class PositionCartesian:
     def z(self, value):
         self.__z = value
 
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, PositionCartesian):
+            return NotImplemented
+        return self.__x == other.__x and self.__y == other.__y and self.__z == other.__z
+
+    # equal positions compare by value but may change, so they are not hashable
+    __hash__ = None
+
     def distFrom(self, x, y, z) -> float:
         dist = sqrt(pow(self.__x - x, 2) + pow(self.__y - y, 2) + pow(self.__z - z, 2))
         return dist
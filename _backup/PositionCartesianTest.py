@@ -9,5 +9,10 @@ class PositionCartesianTest(unittest.TestCase):
     def testDist(self):
         self.assertEqual(self.pos.distFrom(10,20,10), 10)
 
+    def testEqual(self):
+        self.assertEqual(self.pos, PositionCartesian(10,20,20))
+        self.assertNotEqual(self.pos, PositionCartesian(10,20,10))
+        self.assertRaises(TypeError, hash, self.pos)
+
 if __name__ == '__main__':
     unittest.main()
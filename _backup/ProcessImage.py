@@ -0,0 +1,200 @@
+from struct import calcsize
+
+
+class ImageBit:
+    """A bool field of a machine stored as one bit of a process image.
+
+    Each instance keeps its own (buffer, byte, mask) view in its dict. Until the machine is attached to a shared
+    ProcessImage the bit lives in a private one-byte buffer, afterwards reads and writes go straight to the shared
+    buffer, so copying that buffer copies the field.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.key = '_bit_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            buffer, byte, mask = instance.__dict__[self.key]
+        except KeyError:
+            return False
+        return buffer[byte] & mask != 0
+
+    def __set__(self, instance, value):
+        try:
+            buffer, byte, mask = instance.__dict__[self.key]
+        except KeyError:
+            buffer, byte, mask = instance.__dict__[self.key] = (bytearray(1), 0, 1)
+        if value:
+            buffer[byte] |= mask
+        else:
+            buffer[byte] &= ~mask
+
+    def binding(self, instance) -> tuple:
+        """Returns the (buffer, byte, mask) the field of instance is stored at"""
+        if self.key not in instance.__dict__:
+            self.__set__(instance, False)
+        return instance.__dict__[self.key]
+
+    def bind(self, instance, buffer, byte: int, bit: int):
+        """Moves the field of instance to a bit of buffer, keeping its value"""
+        value = self.__get__(instance)
+        instance.__dict__[self.key] = (buffer, byte, 1 << bit)
+        self.__set__(instance, value)
+
+
+class ImageWord:
+    """An int field of a machine stored as a word of a process image, e.g. a 32 bit counter.
+
+    Each instance keeps a one-element memoryview onto the word in its dict, see ImageBit.
+    """
+
+    def __init__(self, fmt: str = 'I'):
+        """
+        :param str fmt: the struct format of the word, 'I' for an unsigned 32 bit counter, 'i' for an encoder that counts
+            in both directions and goes below zero
+        """
+        self.fmt = fmt
+        self.size = memoryview(bytearray(8)).cast(fmt).itemsize
+
+    def __set_name__(self, owner, name):
+        self.name = name
+        self.key = '_word_' + name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.key][0]
+        except KeyError:
+            return 0
+
+    def __set__(self, instance, value):
+        try:
+            instance.__dict__[self.key][0] = value
+        except KeyError:
+            view = instance.__dict__[self.key] = memoryview(bytearray(self.size)).cast(self.fmt)
+            view[0] = value
+
+    def binding(self, instance) -> memoryview:
+        """Returns the one-element view the field of instance is stored at"""
+        if self.key not in instance.__dict__:
+            self.__set__(instance, 0)
+        return instance.__dict__[self.key]
+
+    def bind(self, instance, buffer, byte: int):
+        """Moves the field of instance to the word at byte of buffer, keeping its value"""
+        value = self.__get__(instance)
+        view = memoryview(buffer)[byte:byte + self.size].cast(self.fmt)
+        instance.__dict__[self.key] = view
+        view[0] = value
+
+
+class ProcessImage:
+    """One contiguous, bit-packed process image shared by the machines of a cell.
+
+    The sensor and actuator fields of the machines are ImageBit and ImageWord descriptors. attach() moves them into
+    this image, so the state of the whole cell is one bytearray: it is read and written with one copy, and a digital
+    input is addressed by a single bit of it.
+    """
+
+    # bytes per IO module in layout(): 2 bytes digital inputs, 2 bytes digital outputs, 14 counters of 4 bytes
+    moduleSize = 60
+
+    def __init__(self, size: int):
+        self.__buffer = bytearray(size)
+        self.__layout = {}
+        self.__formats = {}
+
+    @property
+    def buffer(self) -> bytearray:
+        return self.__buffer
+
+    @property
+    def size(self) -> int:
+        return len(self.__buffer)
+
+    @staticmethod
+    def layout(mapping: list) -> dict:
+        """Assigns every IO of an IoMap mapping a place in the image, one block of moduleSize bytes per module
+
+        :param list mapping: (module, pin, machine, field) tuples
+        :return dict: (machine, field) -> (byte, bit), bit is None for counters
+        """
+        modules = []
+        layout = {}
+        for module, pin, machineName, field in mapping:
+            if module not in modules:
+                modules.append(module)
+            base = modules.index(module) * ProcessImage.moduleSize
+            kind, number = pin.split('_')
+            number = int(number) - 1
+            if kind == 'I':
+                layout[(machineName, field)] = (base + number // 8, number % 8)
+            elif kind == 'O':
+                layout[(machineName, field)] = (base + 2 + number // 8, number % 8)
+            else:
+                layout[(machineName, field)] = (base + 4 + 4 * number, None)
+        return layout
+
+    @classmethod
+    def fromLayout(cls, owner, layout: dict):
+        """Creates an image large enough for layout and attaches the machines of owner to it"""
+        size = max(byte + (1 if bit is not None else 4) for byte, bit in layout.values())
+        image = cls(size)
+        image.attach(owner, layout)
+        return image
+
+    def attach(self, owner, layout: dict):
+        """Moves the fields of the machines held by owner to their place in the image
+
+        :param owner: the object holding the machines as attributes, usually the cycle event manager
+        :param dict layout: (machine, field) -> (byte, bit), bit is None for words
+        :raises AttributeError: if a field is not stored in a process image
+        """
+        for (machineName, field), (byte, bit) in layout.items():
+            machine = getattr(owner, machineName)
+            descriptor = getattr(type(machine), field, None)
+            if bit is None and isinstance(descriptor, ImageWord):
+                descriptor.bind(machine, self.__buffer, byte)
+                self.__formats[(machineName, field)] = descriptor.fmt
+            elif bit is not None and isinstance(descriptor, ImageBit):
+                descriptor.bind(machine, self.__buffer, byte, bit)
+            else:
+                raise AttributeError(machineName + "." + field + " can not be stored in a process image")
+            self.__layout[(machineName, field)] = (byte, bit)
+
+    def mask(self, machine: str, field: str) -> int:
+        """Returns the bit of a bool field in word, e.g. for an EdgeDetector"""
+        byte, bit = self.__layout[(machine, field)]
+        return 1 << (8 * byte + bit)
+
+    @property
+    def word(self) -> int:
+        """Returns the whole image as one integer, byte 0 being the lowest"""
+        return int.from_bytes(self.__buffer, 'little')
+
+    def decode(self, data: bytes) -> dict:
+        """Returns the fields of a copy of the image, e.g. bytes(image) taken by the control loop
+
+        :return dict: machine -> field -> bool, or int for words
+        """
+        view = memoryview(data)
+        fields = {}
+        for (machineName, field), (byte, bit) in self.__layout.items():
+            if bit is None:
+                fmt = self.__formats[(machineName, field)]
+                value = view[byte:byte + calcsize(fmt)].cast(fmt)[0]
+            else:
+                value = data[byte] >> bit & 1 == 1
+            fields.setdefault(machineName, {})[field] = value
+        return fields
+
+    def read(self, source):
+        """Copies a whole image from source, e.g. bytes read from the IO modules"""
+        self.__buffer[:] = source
+
+    def __bytes__(self):
+        return bytes(self.__buffer)
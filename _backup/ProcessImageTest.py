@@ -0,0 +1,103 @@
+import unittest
+
+from ProcessImage import ProcessImage, ImageBit, ImageWord
+from Robot import Robot
+from Conveyor import Conveyor
+from SimRevPi import SimRevPi
+from cycle_event_manager import CycleEventManager
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.robot1 = Robot(1, [])
+        self.conveyor1 = Conveyor(2)
+        self.mapping = [('dio1', 'I_3', 'robot1', 'robotSensArmEndIn'),
+                        ('dio1', 'I_11', 'conveyor1', 'conveyorSensLeft'),
+                        ('dio1', 'Counter_13', 'conveyor1', 'conveyorSensImpulse'),
+                        ('dio1', 'O_3', 'robot1', 'robotActArmOut'),
+                        ('dio2', 'I_1', 'robot1', 'robotSensRotEnd')]
+
+    def testDescriptors(self):
+        self.assertIsInstance(Robot.robotSensArmEndIn, ImageBit)
+        self.assertIsInstance(Conveyor.conveyorSensImpulse, ImageWord)
+        #unbound fields live in a private buffer per machine
+        robot2 = Robot(3, [])
+        self.robot1.robotActArmOut = True
+        self.assertEqual(self.robot1.robotActArmOut, True)
+        self.assertEqual(robot2.robotActArmOut, False)
+
+    def testLayout(self):
+        layout = ProcessImage.layout(self.mapping)
+        self.assertEqual(layout[('robot1', 'robotSensArmEndIn')], (0, 2))
+        self.assertEqual(layout[('conveyor1', 'conveyorSensLeft')], (1, 2))
+        self.assertEqual(layout[('conveyor1', 'conveyorSensImpulse')], (52, None))
+        self.assertEqual(layout[('robot1', 'robotActArmOut')], (2, 2))
+        self.assertEqual(layout[('robot1', 'robotSensRotEnd')], (ProcessImage.moduleSize, 0))
+
+    def testAttach(self):
+        self.robot1.robotActArmOut = True
+        self.conveyor1.conveyorSensImpulse = 12
+        image = ProcessImage.fromLayout(self, ProcessImage.layout(self.mapping))
+        #values set before attaching are kept
+        self.assertEqual(self.robot1.robotActArmOut, True)
+        self.assertEqual(self.conveyor1.conveyorSensImpulse, 12)
+        self.assertEqual(image.buffer[2], 0b100)
+        self.robot1.robotSensArmEndIn = True
+        self.assertEqual(image.buffer[0], 0b100)
+        self.assertEqual(image.word & image.mask('robot1', 'robotSensArmEndIn'), 1 << 2)
+        self.robot1.robotSensArmEndIn = False
+        self.assertEqual(image.buffer[0], 0)
+
+    def testRead(self):
+        image = ProcessImage.fromLayout(self, ProcessImage.layout(self.mapping))
+        source = bytearray(image.size)
+        source[1] = 0b100
+        source[52:56] = (300).to_bytes(4, 'little')
+        image.read(source)
+        self.assertEqual(self.conveyor1.conveyorSensLeft, True)
+        self.assertEqual(self.conveyor1.conveyorSensImpulse, 300)
+        self.assertEqual(self.robot1.robotSensArmEndIn, False)
+        self.assertEqual(bytes(image), bytes(source))
+
+    def testDecode(self):
+        image = ProcessImage.fromLayout(self, ProcessImage.layout(self.mapping))
+        self.conveyor1.conveyorSensImpulse = 300
+        self.robot1.robotActArmOut = True
+        copy = bytes(image)
+        self.robot1.robotActArmOut = False
+        fields = image.decode(copy)
+        self.assertEqual(fields['conveyor1'], {'conveyorSensLeft': self.conveyor1.conveyorSensLeft,
+                                               'conveyorSensImpulse': 300})
+        self.assertEqual(fields['robot1']['robotActArmOut'], True)
+        self.assertEqual(fields['robot1']['robotSensRotEnd'], False)
+
+    def testSignedEncoder(self):
+        image = ProcessImage.fromLayout(self, ProcessImage.layout(self.mapping + [
+            ('dio1', 'Counter_7', 'robot1', 'robotSensVerticalEncoderCounter')]))
+        self.robot1.robotSensVerticalEncoderCounter = -5
+        self.assertEqual(self.robot1.robotSensVerticalEncoderCounter, -5)
+        self.assertEqual(image.decode(bytes(image))['robot1']['robotSensVerticalEncoderCounter'], -5)
+
+    def testOvenStation(self):
+        #the machine group of the oven station is read and written through one image
+        rpi = SimRevPi()
+        cell = CycleEventManager(rpi)
+        rpi.io['I_4'].value = True
+        cell.read()
+        self.assertEqual(cell.machine_group.turntable_pos_saw, True)
+        self.assertEqual(cell.image.word & cell.image.mask('machine_group', 'turntable_pos_saw'), 1 << 3)
+        cell.machine_group.act_saw = True
+        cell.write()
+        self.assertEqual(rpi.io['O_4'].value, True)
+        cell.publish()
+        state = cell.state.latest()['state']
+        self.assertEqual((state['turntable_pos_saw'], state['act_saw'], state['sens_oven']), (True, True, False))
+
+    def testAttachNonImageField(self):
+        image = ProcessImage(4)
+        with self.assertRaises(AttributeError):
+            image.attach(self, {('robot1', 'isExecuting'): (0, 0)})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,21 @@
+from time import monotonic
+
 from Machine import Machine
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('PunchingMachine')
 
 
 class PunchingMachine(Machine):
 
-    def __init__(self, id1):
+    # the phases of punchCycle() in the order a package passes them
+    phases = ('receive', 'punch', 'return', 'deliver')
+
+    def __init__(self, id1, clock=monotonic):
+        """
+        :param id1: the machine id
+        :param clock: returns the current time in seconds, the phases of punchCycle() are timed with it
+        """
         super().__init__(id1)
         self.__punchingSensLeft = False
         self.__punchingSensRight = False
@@ -14,6 +26,13 @@ class PunchingMachine(Machine):
         self.__punchingMachineMoveUp = False
         self.__punchingMachineMoveDown = False
         self.__packageProcessed = False
+        self.clock = clock
+        # the phase of punchCycle() the package is in, None while waiting for a package
+        self.__phase = None
+        self.__phaseStart = self.__cycleStart = 0.0
+        # seconds the last package spent in each phase and in the whole 'cycle', by phase name
+        self.phaseTimes = {}
+        self.punched = 0
 
 #self.__packageProcessed is here as a reminder to reset it for the next run
 #of the punching machine.
@@ -177,4 +196,62 @@ class PunchingMachine(Machine):
 #Since it is set to True after the punching machine
 #does the processing.
     def resetMachine(self):
-        self.__packageProcessed = False
\ No newline at end of file
+        self.__packageProcessed = False
+
+    @property
+    def phase(self):
+        """Returns the phase of punchCycle() the package is in, None while waiting for a package"""
+        return self.__phase
+
+    def nextPhase(self, phase):
+        """Records the time of the phase that ended and starts the next one, None once the package was taken"""
+        now = self.clock()
+        if self.__phase is None:
+            self.__cycleStart = now
+        else:
+            self.phaseTimes[self.__phase] = now - self.__phaseStart
+        if phase is None:
+            self.phaseTimes['cycle'] = now - self.__cycleStart
+            self.punched += 1
+            log.debug('package %d punched in %.2f s', self.punched, self.phaseTimes['cycle'])
+        self.__phase = phase
+        self.__phaseStart = now
+
+#Punches one package after the other without resetMachine().
+#The punch is raised as soon as it is down and the belt runs back
+#as soon as the punch has left its lower position. The next package
+#is accepted once the last one was taken from the left sensor, it
+#runs towards the punch while the punch is still being raised.
+    def punchCycle(self):
+        if self.__punchingMachineMoveUp and self.__punchingMachineIsUp:
+            self.__punchingMachineMoveUp = False
+        phase = self.__phase
+        if phase is None:
+            if not self.__punchingSensLeft:
+                self.nextPhase('receive')
+                self.__punchingActForward = True
+        elif phase == 'receive':
+            if not self.__punchingSensRight:
+                self.__punchingActForward = False
+                self.nextPhase('punch')
+        elif phase == 'punch':
+            if not self.__punchingMachineMoveUp:
+                if not self.__punchingMachineIsDown:
+                    self.__punchingMachineMoveDown = True
+                else:
+                    self.__punchingMachineMoveDown = False
+                    self.__punchingMachineMoveUp = True
+                    self.__packageProcessed = True
+                    self.nextPhase('return')
+        elif phase == 'return':
+            if not self.__punchingMachineIsDown:
+                self.__punchingActBackward = True
+            if not self.__punchingSensLeft:
+                self.__punchingActBackward = False
+                self.nextPhase('deliver')
+        elif self.__punchingSensLeft:
+            self.__packageProcessed = False
+            self.nextPhase(None)
+
+    def execute(self, *args):
+        self.punchCycle()
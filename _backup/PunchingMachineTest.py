@@ -0,0 +1,59 @@
+import unittest
+
+from PunchingMachine import PunchingMachine
+
+
+class MyTestCase(unittest.TestCase):
+    def setUp(self):
+        self.now = 0.0
+        self.punching1 = PunchingMachine(1, clock=lambda: self.now)
+        self.punching1.punchingSensLeft = self.punching1.punchingSensRight = True
+        self.punching1.punchingMachineIsUp = True
+
+    def punchPackage(self):
+        machine = self.punching1
+        machine.punchingSensLeft = False
+        machine.punchCycle()
+        self.assertEqual(machine.punchingActForward, True)
+        machine.punchingSensLeft = True
+        self.now += 2.0
+        machine.punchingSensRight = False
+        machine.punchCycle()
+        self.assertEqual(machine.punchingActForward, False)
+        machine.punchCycle()
+        self.assertEqual(machine.punchingMachineMoveDown, True)
+        machine.punchingMachineIsUp = False
+        self.now += 1.0
+        machine.punchingMachineIsDown = True
+        machine.punchCycle()
+        #the punch is raised at once, the belt waits until it has left its lower position
+        self.assertEqual(machine.punchingMachineMoveUp, True)
+        self.assertEqual(machine.punchingActBackward, False)
+        machine.punchingMachineIsDown = False
+        machine.punchCycle()
+        self.assertEqual(machine.punchingActBackward, True)
+        machine.punchingSensRight = True
+        self.now += 2.0
+        machine.punchingSensLeft = False
+        machine.punchCycle()
+        self.assertEqual(machine.punchingActBackward, False)
+        self.assertEqual(machine.phase, 'deliver')
+        self.assertEqual(machine.isExecuting, True)
+        machine.punchingMachineIsUp = True
+        self.now += 0.5
+        machine.punchingSensLeft = True
+        machine.punchCycle()
+
+    def testPunchCycle(self):
+        self.punchPackage()
+        self.assertEqual(self.punching1.phase, None)
+        self.assertEqual(self.punching1.isExecuting, False)
+        self.assertEqual({'receive': 2.0, 'punch': 1.0, 'return': 2.0, 'deliver': 0.5, 'cycle': 5.5},
+                         self.punching1.phaseTimes)
+        #the next package is punched without resetMachine()
+        self.punchPackage()
+        self.assertEqual(2, self.punching1.punched)
+
+
+if __name__ == '__main__':
+    unittest.main()
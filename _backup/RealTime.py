@@ -0,0 +1,146 @@
+import ctypes
+import ctypes.util
+import gc
+import os
+from time import monotonic
+
+# flags of mlockall(2), lock the pages mapped now and all mapped later
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+
+class RealTime:
+    """Opt-in real-time settings for the process running a control loop.
+
+    enter() pins the process to one CPU, requests SCHED_FIFO, locks its memory and freezes and disables the cyclic
+    garbage collector. Settings the system does not allow, e.g. SCHED_FIFO without the permission, are skipped and
+    reported. While the loop runs, idle() collects in the slack of a cycle instead of whenever an allocation happens to
+    trigger it: the young generations once enough objects were allocated, the oldest one once its threshold is reached
+    or fullPeriod passed, so cyclic garbage of all threads of the process is reclaimed and does not pile up in locked
+    memory. exit() restores what enter() changed.
+    """
+
+    def __init__(self, cpu: int = None, priority: int = 50, lockMemory: bool = True, collectThreshold: int = 700,
+                 minSlack: float = 0.005, fullPeriod: float = 60.0, clock=monotonic):
+        """
+        :param int cpu: the CPU to pin the process to, None for the last one
+        :param int priority: the SCHED_FIFO priority, 1 to 99
+        :param bool lockMemory: whether to lock all pages of the process into memory
+        :param int collectThreshold: objects allocated since the last collection before idle() collects
+        :param float minSlack: seconds left in a cycle needed for idle() to collect
+        :param float fullPeriod: seconds after which idle() collects the oldest generation even below its threshold
+        :param clock: returns the current time in seconds
+        """
+        self.cpu = cpu
+        self.priority = priority
+        self.lockMemory = lockMemory
+        self.collectThreshold = collectThreshold
+        self.minSlack = minSlack
+        self.fullPeriod = fullPeriod
+        self.clock = clock
+        # collections done by idle(), and the ones of them of the oldest generation
+        self.collections = 0
+        self.fullCollections = 0
+        self.__lastFull = clock()
+        # the settings found by enter(), None for the ones it did not change
+        self.__affinity = None
+        self.__scheduler = None
+        self.__locked = False
+        self.__gcEnabled = None
+
+    def enter(self) -> dict:
+        """Applies the settings
+
+        :return dict: the result of every setting by name, e.g. to report them at startup
+        """
+        report = {}
+        try:
+            affinity = os.sched_getaffinity(0)
+            cpu = sorted(affinity)[-1] if self.cpu is None else self.cpu
+            os.sched_setaffinity(0, {cpu})
+            self.__affinity = affinity
+            report['affinity'] = 'pinned to CPU %d' % cpu
+        except (AttributeError, OSError) as e:
+            report['affinity'] = 'not pinned: %s' % e
+        try:
+            scheduler = (os.sched_getscheduler(0), os.sched_getparam(0))
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(self.priority))
+            self.__scheduler = scheduler
+            report['scheduler'] = 'SCHED_FIFO priority %d' % self.priority
+        except (AttributeError, OSError) as e:
+            report['scheduler'] = 'not SCHED_FIFO: %s' % e
+        if self.lockMemory:
+            report['memory'] = self.lockAll()
+            self.__locked = report['memory'] == 'locked'
+        else:
+            report['memory'] = 'not locked: disabled'
+        self.__gcEnabled = gc.isenabled()
+        gc.collect()
+        gc.freeze()
+        gc.disable()
+        self.__lastFull = self.clock()
+        report['gc'] = 'frozen %d objects, automatic collection disabled' % gc.get_freeze_count()
+        return report
+
+    @staticmethod
+    def lockAll() -> str:
+        """Locks all current and future pages of the process, returns the result for the report"""
+        name = ctypes.util.find_library('c')
+        if name is None:
+            return 'not locked: no C library'
+        libc = ctypes.CDLL(name, use_errno=True)
+        if libc.mlockall(MCL_CURRENT | MCL_FUTURE) != 0:
+            return 'not locked: %s' % os.strerror(ctypes.get_errno())
+        return 'locked'
+
+    @staticmethod
+    def unlockAll():
+        """Unlocks all pages of the process"""
+        name = ctypes.util.find_library('c')
+        if name is not None:
+            ctypes.CDLL(name, use_errno=True).munlockall()
+
+    def idle(self, slack: float):
+        """Collects a generation that is due if the cycle has slack left
+
+        :param float slack: seconds until the next cycle starts
+        """
+        if slack < self.minSlack:
+            return
+        count = gc.get_count()
+        threshold = gc.get_threshold()
+        now = self.clock()
+        # an older generation is only collected once its own threshold is reached, as gc would do, the oldest one at
+        # least every fullPeriod
+        if count[2] >= threshold[2] or now - self.__lastFull >= self.fullPeriod:
+            gc.collect(2)
+            self.__lastFull = now
+            self.fullCollections += 1
+        elif count[0] >= self.collectThreshold:
+            gc.collect(1 if count[1] >= threshold[1] else 0)
+        else:
+            return
+        self.collections += 1
+
+    def exit(self):
+        """Restores the CPU affinity, scheduler, memory lock and garbage collector found by enter()"""
+        if self.__affinity is not None:
+            try:
+                os.sched_setaffinity(0, self.__affinity)
+            except OSError:
+                pass
+            self.__affinity = None
+        if self.__scheduler is not None:
+            try:
+                os.sched_setscheduler(0, *self.__scheduler)
+            except OSError:
+                pass
+            self.__scheduler = None
+        if self.__locked:
+            self.unlockAll()
+            self.__locked = False
+        if self.__gcEnabled is not None:
+            gc.unfreeze()
+            if self.__gcEnabled:
+                gc.enable()
+            self.__gcEnabled = None
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+
+"""Compares the jitter of the sorting/stirring control loop in normal and in real-time mode, see RealTime.
+
+Runs the cell against its simulated plant at the real cycle time, each mode in a fresh process. Reports how late the
+ticks start against a fixed schedule and how long they take. SCHED_FIFO and locking memory need the permissions, the
+report of RealTime shows what was applied.
+
+    python RealTimeBenchmark.py --cycles 2000
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+from time import perf_counter, sleep
+
+from CellSimulation import sortingStirring
+from RealTime import RealTime
+from SimRevPi import SimRevPi
+
+
+def percentiles(values: list) -> dict:
+    values = sorted(values)
+    return {'p50': values[len(values) // 2] * 1e3, 'p99': values[len(values) * 99 // 100] * 1e3,
+            'max': values[-1] * 1e3}
+
+
+def measure(cycles: int, realTime: RealTime = None) -> dict:
+    """Runs the cell for a number of cycles, returns the lateness and duration of the ticks in milliseconds"""
+    cell, plant, cycleTime = sortingStirring(SimRevPi(), {})
+    report = realTime.enter() if realTime is not None else {}
+    lateness = []
+    durations = []
+    deadline = perf_counter()
+    for i in range(cycles):
+        deadline += cycleTime
+        wait = deadline - perf_counter()
+        if wait > 0:
+            sleep(wait)
+        start = perf_counter()
+        lateness.append(max(0.0, start - deadline))
+        cell.budget.run()
+        plant.step()
+        durations.append(perf_counter() - start)
+        if realTime is not None:
+            realTime.idle(deadline + cycleTime - perf_counter())
+    if realTime is not None:
+        realTime.exit()
+    return {'report': report, 'lateness': percentiles(lateness), 'duration': percentiles(durations),
+            'collections': realTime.collections if realTime is not None else None}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compares the loop jitter in normal and real-time mode')
+    parser.add_argument('--cycles', type=int, default=2000, help='cycles to run per mode')
+    parser.add_argument('--mode', choices=('normal', 'realtime'), help='measure one mode and print it as JSON')
+    args = parser.parse_args()
+
+    if args.mode is not None:
+        print(json.dumps(measure(args.cycles, RealTime() if args.mode == 'realtime' else None)))
+        sys.exit()
+    for mode in ('normal', 'realtime'):
+        output = subprocess.run([sys.executable, __file__, '--mode', mode, '--cycles', str(args.cycles)],
+                                check=True, capture_output=True, text=True).stdout
+        result = json.loads(output.splitlines()[-1])
+        print(mode)
+        for setting, value in result['report'].items():
+            print('  %-9s %s' % (setting, value))
+        for name in ('lateness', 'duration'):
+            print('  %-9s p50 %6.3f ms  p99 %6.3f ms  max %6.3f ms' % ((name,) + tuple(result[name].values())))
+        if result['collections'] is not None:
+            print('  %d collections in the slack of a cycle' % result['collections'])
@@ -0,0 +1,87 @@
+import gc
+import os
+import unittest
+import weakref
+
+from RealTime import RealTime
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.enabled = gc.isenabled()
+        gc.disable()
+
+    def tearDown(self):
+        if self.enabled:
+            gc.enable()
+
+    def testIdleCollectsInSlack(self):
+        realTime = RealTime(collectThreshold=100, minSlack=0.005)
+        garbage = [[] for i in range(200)]
+        realTime.idle(0.001)
+        self.assertEqual(0, realTime.collections)
+        realTime.idle(0.01)
+        self.assertEqual(1, realTime.collections)
+        self.assertLess(gc.get_count()[0], 100)
+        # nothing allocated since, nothing to collect
+        realTime.idle(0.01)
+        self.assertEqual(1, realTime.collections)
+        del garbage
+
+    def testOldestGenerationReclaimed(self):
+        class Node:
+            pass
+        realTime = RealTime(collectThreshold=100)
+        node = Node()
+        node.cycle = node
+        reference = weakref.ref(node)
+        # the cycle survives young collections while still referenced and is promoted to the oldest generation
+        kept = []
+        for i in range(20):
+            kept.append([[] for j in range(200)])
+            realTime.idle(0.01)
+        self.assertEqual(0, realTime.fullCollections)
+        del node
+        for i in range(200):
+            if reference() is None:
+                break
+            kept.append([[] for j in range(200)])
+            realTime.idle(0.01)
+        self.assertIsNone(reference())
+        self.assertGreater(realTime.fullCollections, 0)
+
+    def testFullPeriod(self):
+        now = [0.0]
+        realTime = RealTime(fullPeriod=10.0, clock=lambda: now[0])
+        now[0] = 5.0
+        realTime.idle(0.01)
+        self.assertEqual(0, realTime.fullCollections)
+        now[0] = 11.0
+        realTime.idle(0.001)
+        self.assertEqual(0, realTime.fullCollections)
+        realTime.idle(0.01)
+        self.assertEqual(1, realTime.fullCollections)
+        realTime.idle(0.01)
+        self.assertEqual(1, realTime.fullCollections)
+
+    def testExitRestores(self):
+        affinity = os.sched_getaffinity(0)
+        scheduler = os.sched_getscheduler(0)
+        realTime = RealTime(cpu=min(affinity))
+        realTime.enter()
+        self.assertFalse(gc.isenabled())
+        realTime.exit()
+        self.assertEqual(affinity, os.sched_getaffinity(0))
+        self.assertEqual(scheduler, os.sched_getscheduler(0))
+        self.assertEqual(0, gc.get_freeze_count())
+        # the collector was disabled before enter() in setUp
+        self.assertFalse(gc.isenabled())
+        gc.enable()
+        realTime.enter()
+        realTime.exit()
+        self.assertTrue(gc.isenabled())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,10 +2,36 @@ from MovingMachine import MovingMachine
 from ReachedDirection import ReachedDirection
 from Axis import AxisType, Axis
 from ThreeDRobotConfig import ThreeDRobotConfig
+from ProcessImage import ImageBit, ImageWord
 
 
 class Robot(MovingMachine):
 
+    # sensors and actuators, views onto bits and words of a process image
+    robotSensGripperOpen = ImageBit()
+    robotSensGripperImpulseCounterRaw = ImageWord()
+    robotSensArmEndIn = ImageBit()
+    robotSensArmImpulseCounterRaw = ImageWord()
+    robotSensVerticalEndUp = ImageBit()
+    robotSensVerticalEncoderCounter = ImageWord('i')
+    robotSensRotEnd = ImageBit()
+    robotSensRotEncoderCounter = ImageWord('i')
+    robotActGripperOpen = ImageBit()
+    robotActGripperClose = ImageBit()
+    robotActArmOut = ImageBit()
+    robotActArmIn = ImageBit()
+    robotActVerticalDown = ImageBit()
+    robotActVerticalUp = ImageBit()
+    robotActRotRight = ImageBit()
+    robotActRotLeft = ImageBit()
+
+    #referenzfahrt des Roboters um alle counter korrekt zu setzen - setzen der counter an anderer Stelle, hier aber in Referenzposition
+    #der Arm wird zuerst eingefahren, erst dann bewegen sich die anderen Achsen
+    homingAxes = (('arm', 'robotSensArmEndIn', 'robotActArmIn', ()),
+                  ('vertical', 'robotSensVerticalEndUp', 'robotActVerticalUp', ('arm',)),
+                  ('rot', 'robotSensRotEnd', 'robotActRotRight', ('arm',)),
+                  ('gripper', 'robotSensGripperOpen', 'robotActGripperOpen', ('arm',)))
+
     def generateTransferMoveList(self, numPickup, numPlace):
         offset = 700
         # Greifer öffnen
@@ -52,7 +78,7 @@ class Robot(MovingMachine):
 
     @property
     def isExecuting(self) -> bool:
-        if self.__robotActRotRight or self.__robotActRotLeft or self.__robotActVerticalUp or self.__robotActVerticalDown or self.__robotActGripperOpen or self.__robotActGripperClose or self.__robotActArmOut or self.__robotActArmIn:
+        if self.robotActRotRight or self.robotActRotLeft or self.robotActVerticalUp or self.robotActVerticalDown or self.robotActGripperOpen or self.robotActGripperClose or self.robotActArmOut or self.robotActArmIn:
             return True
         else:
             return False
@@ -60,9 +86,9 @@ class Robot(MovingMachine):
     #list containing all critical points on the robots path
     def __init__(self, id1, placeList):
         super().__init__(id1, placeList)
-        self.__robotSensGripperOpen = self.__robotSensArmEndIn = self.__robotSensVerticalEndUp  = self.__robotSensRotEnd = False
-        self.__robotActGripperOpen = self.__robotActGripperClose = self.__robotActArmOut = self.__robotActArmIn = self.__robotActVerticalDown = self.__robotActVerticalUp = self.__robotActRotRight = self.__robotActRotLeft = False
-        self.__robotSensRotEncoderCounter = self.__robotSensVerticalEncoderCounter = self.__robotSensArmImpulseCounterRaw = self.__robotSensGripperImpulseCounterRaw = 0
+        self.robotSensGripperOpen = self.robotSensArmEndIn = self.robotSensVerticalEndUp  = self.robotSensRotEnd = False
+        self.robotActGripperOpen = self.robotActGripperClose = self.robotActArmOut = self.robotActArmIn = self.robotActVerticalDown = self.robotActVerticalUp = self.robotActRotRight = self.robotActRotLeft = False
+        self.robotSensRotEncoderCounter = self.robotSensVerticalEncoderCounter = self.robotSensArmImpulseCounterRaw = self.robotSensGripperImpulseCounterRaw = 0
         self.__axisArm = Axis(AxisType.Counter, 1)
         self.__axisVertical = Axis(AxisType.Encoder, 20)
         self.__axisRot = Axis(AxisType.Encoder, 20)
@@ -73,134 +99,6 @@ class Robot(MovingMachine):
         #self.__pc = 0
         #self.configGoal = None
 
-    @property
-    def robotSensGripperOpen(self) -> bool:
-        return self.__robotSensGripperOpen
-
-    @robotSensGripperOpen.setter
-    def robotSensGripperOpen(self, value):
-        self.__robotSensGripperOpen = value
-
-    @property
-    def robotSensGripperImpulseCounterRaw(self) -> int:
-        return self.__robotSensGripperImpulseCounterRaw
-
-    @robotSensGripperImpulseCounterRaw.setter
-    def robotSensGripperImpulseCounterRaw(self, value):
-        self.__robotSensGripperImpulseCounterRaw = value
-
-    @property
-    def robotSensArmEndIn(self) -> bool:
-        return self.__robotSensArmEndIn
-
-    @robotSensArmEndIn.setter
-    def robotSensArmEndIn(self, value):
-        self.__robotSensArmEndIn = value
-
-    @property
-    def robotSensArmImpulseCounterRaw(self) -> int:
-        return self.__robotSensArmImpulseCounterRaw
-
-    @robotSensArmImpulseCounterRaw.setter
-    def robotSensArmImpulseCounterRaw(self, value):
-        self.__robotSensArmImpulseCounterRaw = value
-
-    @property
-    def robotSensVerticalEndUp(self) -> bool:
-        return self.__robotSensVerticalEndUp
-
-    @robotSensVerticalEndUp.setter
-    def robotSensVerticalEndUp(self, value):
-        self.__robotSensVerticalEndUp = value
-
-    @property
-    def robotSensVerticalEncoderCounter(self):
-        return self.__robotSensVerticalEncoderCounter
-
-    @robotSensVerticalEncoderCounter.setter
-    def robotSensVerticalEncoderCounter(self, value):
-        self.__robotSensVerticalEncoderCounter = value
-
-    @property
-    def robotSensRotEnd(self):
-        return self.__robotSensRotEnd
-
-    @robotSensRotEnd.setter
-    def robotSensRotEnd(self, value):
-        self.__robotSensRotEnd = value
-
-    @property
-    def robotSensRotEncoderCounter(self):
-        return self.__robotSensRotEncoderCounter
-
-    @robotSensRotEncoderCounter.setter
-    def robotSensRotEncoderCounter(self, value):
-        self.__robotSensRotEncoderCounter = value
-
-    @property
-    def robotActGripperOpen(self):
-        return self.__robotActGripperOpen
-
-    @robotActGripperOpen.setter
-    def robotActGripperOpen(self, value):
-        self.__robotActGripperOpen = value
-
-    @property
-    def robotActGripperClose(self):
-        return self.__robotActGripperClose
-
-    @robotActGripperClose.setter
-    def robotActGripperClose(self, value):
-        self.__robotActGripperClose = value
-
-    @property
-    def robotActArmOut(self):
-        return self.__robotActArmOut
-
-    @robotActArmOut.setter
-    def robotActArmOut(self, value):
-        self.__robotActArmOut = value
-
-    @property
-    def robotActArmIn(self):
-        return self.__robotActArmIn
-
-    @robotActArmIn.setter
-    def robotActArmIn(self, value):
-        self.__robotActArmIn = value
-
-    @property
-    def robotActVerticalDown(self):
-        return self.__robotActVerticalDown
-
-    @robotActVerticalDown.setter
-    def robotActVerticalDown(self, value):
-        self.__robotActVerticalDown = value
-
-    @property
-    def robotActVerticalUp(self):
-        return self.__robotActVerticalUp
-
-    @robotActVerticalUp.setter
-    def robotActVerticalUp(self, value):
-        self.__robotActVerticalUp = value
-
-    @property
-    def robotActRotRight(self):
-        return self.__robotActRotRight
-
-    @robotActRotRight.setter
-    def robotActRotRight(self, value):
-        self.__robotActRotRight = value
-
-    @property
-    def robotActRotLeft(self):
-        return self.__robotActRotLeft
-
-    @robotActRotLeft.setter
-    def robotActRotLeft(self, value):
-        self.__robotActRotLeft = value
-
     def executeHelper(self):
         if self.setupFinishedHelper:
             self.setupFinishedHelper = False
@@ -208,6 +106,13 @@ class Robot(MovingMachine):
         else:
             return False, False
 
+    @property
+    def axes(self) -> dict:
+        return {'vertical': (self.__axisVertical, self.robotSensVerticalEndUp, self.robotSensVerticalEncoderCounter),
+                'rot': (self.__axisRot, self.robotSensRotEnd, self.robotSensRotEncoderCounter),
+                'arm': (self.__axisArm, self.robotSensArmEndIn, self.robotSensArmImpulseCounterRaw),
+                'gripper': (self.__axisGripper, self.robotSensGripperOpen, self.robotSensGripperImpulseCounterRaw)}
+
     def gotoConfig(self, config):
         t1 = t2 = t3 = t4 = False
         d3 = d4 = None
@@ -233,35 +138,3 @@ class Robot(MovingMachine):
         self.robotActGripperClose = self.__axisGripper.outputplus
         return t1 and t2 and t3 and t4
         #return ReachedDirection(t1 and t2 and t3 and t4, d3, d4)
-
-    #referenzfahrt des Roboters um alle counter korrekt zu setzen - setzen der counter an anderer Stelle, hier aber in Referenzposition
-    #von execute bereits berücksichtigt
-    def setup(self):
-        print("setup")
-        t1 = t2 = t3 = t4 = False
-        if self.robotSensArmEndIn:
-            self.robotActArmIn = False
-            t3 = True
-        else:
-            self.robotActArmIn = True
-
-        if self.robotSensVerticalEndUp:
-            self.robotActVerticalUp = False
-            t1 = True
-        elif t3:
-            self.robotActVerticalUp = True
-
-        if self.robotSensRotEnd:
-            self.robotActRotRight = False
-            t2 = True
-        elif t3:
-            self.robotActRotRight = True
-
-        if self.robotSensGripperOpen:
-            self.robotActGripperOpen = False
-            t4 = True
-        elif t3:
-            self.robotActGripperOpen = True
-
-        return (t1 and t2 and t3 and t4)
-
@@ -3,14 +3,29 @@ from typing import List
 from Machine import Machine
 from CyclicWaiter import CyclicWaiter
 from copy import deepcopy
+from ControlLog import ControlLog
+from Kpi import KpiEngine, WORKING, STARVED, BLOCKED
+
+log = ControlLog.getLogger('SequenceManager')
 
 
 class SequenceManager:
 
-    def __init__(self, id1, *managedStations: Machine):
+    def __init__(self, id1, *managedStations: Machine, settleCycles: dict = None, kpi: KpiEngine = None):
+        """Hands each station over to the next one on the tick its done signal is raised
+
+        :param id1: the isle id
+        :param managedStations: the stations in the order of the station list
+        :param dict settleCycles: minimum cycles to wait after a station is done, by (sub-list, position) with sub-list
+            1 or 2 and the position of the station in that sub-list, only needed where the physics needs time to settle
+            (e.g. a package sliding onto the next station). A station in both sub-lists settles only where configured.
+        :param KpiEngine kpi: is told when a station works, when it is done but can not hand its part on yet (blocked
+            while it settles) and when it finishes a part, the stations are named by stationName()
+        """
         self.__isleId = id1
         self.__stationList = []
-        self.wait = CyclicWaiter(15)
+        self.__settleCycles = settleCycles if settleCycles is not None else {}
+        self.kpi = kpi
         self.__first = True
         self.__go = []
         self.__go2 = []
@@ -18,9 +33,13 @@ class SequenceManager:
         self.__t2 = False
         for m in managedStations:
             self.__stationList.append(m)
+        # names are built once, reporting a station every tick should not format a new string
+        self.__names = {m: self.stationName(m) for m in self.__stationList}
         #TODO list creation in methoden mit try auslagern
         self.__subStationList1 = []
         self.__subStationList2 = []
+        self.__settleList1 = []
+        self.__settleList2 = []
         self.buildGraph()
 
     # maschine vllt mit "ein/Ausgängen", Materialquelle an stellen wo turtlebot anliefert/Senken wo abgeholt wird
@@ -34,6 +53,35 @@ class SequenceManager:
         self.__subStationList2.append(self.__stationList[5])
         self.__subStationList2.append(self.__stationList[6])
         self.__subStationList2.append(self.__stationList[7])
+        self.__settleList1 = [self.settleWaiter(1, i) for i in range(len(self.__subStationList1))]
+        self.__settleList2 = [self.settleWaiter(2, i) for i in range(len(self.__subStationList2))]
+
+    def settleWaiter(self, subList: int, position: int) -> CyclicWaiter:
+        """Creates the waiter for the settle time configured for a position in a sub-list, zero cycles if none is
+        configured"""
+        return CyclicWaiter(self.__settleCycles.get((subList, position), 0))
+
+    @staticmethod
+    def stationName(station: Machine) -> str:
+        """Returns the name a station is reported to the KpiEngine with, e.g. Robot1"""
+        return '%s%d' % (station.__class__.__name__, station.id)
+
+    def working(self, station: Machine):
+        """Reports that a station works on a package"""
+        if self.kpi is not None:
+            self.kpi.transition(self.__names[station], WORKING)
+
+    def blocked(self, station: Machine):
+        """Reports that a station is done but can not hand its package on yet"""
+        if self.kpi is not None:
+            self.kpi.transition(self.__names[station], BLOCKED)
+
+    def finished(self, station: Machine):
+        """Reports that a station handed its package over and waits for the next one"""
+        if self.kpi is not None:
+            name = self.__names[station]
+            self.kpi.part(name)
+            self.kpi.transition(name, STARVED)
 
     def inOrderExecutor(self, orderedList: List[Machine], goList: List[bool]):
         if self.__first:
@@ -81,7 +129,7 @@ class SequenceManager:
             if index == 4:
                 start = 0
                 fin = 1
-            print(self.__subStationList1[index].__class__.__name__)
+            log.debug('list 1 executes %s', self.__subStationList1[index].__class__.__name__)
             try:
                 self.__subStationList1[index].execute(start,fin)
             except TypeError as e:
@@ -92,19 +140,24 @@ class SequenceManager:
             except Exception as e:
                 pass
 
-            if not self.__subStationList1[index].isExecuting and self.wait.wait():
-                self.wait.reset()
+            if not self.__subStationList1[index].isDone:
+                self.working(self.__subStationList1[index])
+            elif self.__settleList1[index].wait():
+                self.__settleList1[index].reset()
+                self.finished(self.__subStationList1[index])
                 self.inOrderExecutor(self.__subStationList1, self.__go)
-                print(self.__go)
+                log.debug('go %s', self.__go)
+            else:
+                self.blocked(self.__subStationList1[index])
         elif not self.__t2:
             self.inOrderExecutor(self.__subStationList1, self.__go)
 
         if self.__go[5] and not self.__t2:
             self.__t2 = True
-            print("print now list 2")
+            log.info('now list 2')
             self.__first = True
-            self.__subStationList1[2].once = True
-            self.__go2 = []
+            self.__subStationList1[2].reset()
+            self.__go2.clear()
             
             self.index = 0
         if self.__t2:
@@ -121,7 +174,7 @@ class SequenceManager:
                 if index == 3:
                     start = 0
                     fin = 1
-                print(self.__subStationList2[index].__class__.__name__)
+                log.debug('list 2 executes %s', self.__subStationList2[index].__class__.__name__)
                 try:
                     self.__subStationList2[index].execute(start,fin)
                 except TypeError as e:
@@ -133,11 +186,15 @@ class SequenceManager:
                     pass
 
                 #print(self.__stationList[index].isExecuting)
-                if not self.__subStationList2[index].isExecuting and self.wait.wait():
-                    self.wait.reset()
+                if not self.__subStationList2[index].isDone:
+                    self.working(self.__subStationList2[index])
+                elif self.__settleList2[index].wait():
+                    self.__settleList2[index].reset()
+                    self.finished(self.__subStationList2[index])
                     self.inOrderExecutor(self.__subStationList2, self.__go2)
-                    print("go2")
-                    print(self.__go2)
+                    log.debug('go2 %s', self.__go2)
+                else:
+                    self.blocked(self.__subStationList2[index])
 
                 if self.__go2[5] and self.__t2:
                     try:
@@ -145,14 +202,26 @@ class SequenceManager:
                     except Exception as e:
                         pass
                     self.__t2 = False
-                    print("now list 1 again")
+                    log.info('now list 1 again')
                     self.__first = True
-                    self.__go = []
+                    self.__go.clear()
             else:
                 self.inOrderExecutor(self.__subStationList2, self.__go2)
-                print("go2")
-                print(self.__go2)
+                log.debug('go2 %s', self.__go2)
+
+
+    def snapshot(self) -> dict:
+        """Returns the progress through the station lists, settle times restart after a restore"""
+        return {'first': self.__first, 'go': list(self.__go), 'go2': list(self.__go2), 'index': self.index,
+                't2': self.__t2}
 
+    def restore(self, state: dict) -> None:
+        """Continues the sequence from a snapshot"""
+        self.__first = state['first']
+        self.__go = list(state['go'])
+        self.__go2 = list(state['go2'])
+        self.index = state['index']
+        self.__t2 = state['t2']
 
     @property
     def go(self):
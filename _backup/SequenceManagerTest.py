@@ -2,6 +2,7 @@ import unittest
 
 from DummyMachine import DummyMachine
 from SequenceManager import SequenceManager
+from Kpi import KpiEngine
 
 
 class MyTestCase(unittest.TestCase):
@@ -45,67 +46,84 @@ class MyTestCase(unittest.TestCase):
 
         self.s.executeSortingStirring()
         self.assertEqual(self.s.go[0], True)
-        self.s.stationList[0].isExecuting = True
 
-        for i in range(15):
+        stations = [self.robot1, self.robot2, self.robot3, self.robot4, self.robot5]
+        for i, station in enumerate(stations):
+            station.isExecuting = True
+            for j in range(15):
+                self.s.executeSortingStirring()
+                self.assertEqual(self.s.go[i], True)
+            #hand off on the tick the station reports done
+            station.isExecuting = False
             self.s.executeSortingStirring()
-            self.assertEqual(self.s.go[0], True)
-            self.s.stationList[0].isExecuting = False
-
-        self.s.executeSortingStirring()
-        self.assertEqual(self.s.go[1], True)
-        self.s.stationList[1].isExecuting = True
-
-        for i in range(15):
-            self.s.executeSortingStirring()
-            self.assertEqual(self.s.go[1], True)
-            self.s.stationList[1].isExecuting = False
-
-        self.s.executeSortingStirring()
-        self.assertEqual(self.s.go[2], True)
-        self.s.stationList[2].isExecuting = True
-
-        for i in range(15):
-            self.s.executeSortingStirring()
-            self.assertEqual(self.s.go[2], True)
-            self.s.stationList[2].isExecuting = False
-
-        self.s.executeSortingStirring()
-        self.assertEqual(self.s.go[3], True)
-        self.s.stationList[3].isExecuting = True
-
-        for i in range(15):
-            self.s.executeSortingStirring()
-            self.assertEqual(self.s.go[3], True)
-            self.s.stationList[3].isExecuting = False
-
-        self.s.executeSortingStirring()
-        self.assertEqual(self.s.go[4], True)
-        self.s.stationList[4].isExecuting = True
-
-        for i in range(15):
-            self.s.executeSortingStirring()
-            self.assertEqual(self.s.go[4], True)
-            self.s.stationList[4].isExecuting = False
-
-        self.s.executeSortingStirring()
-        self.assertEqual(self.s.go[5], True)
+            self.assertEqual(self.s.go[i], False)
+            self.assertEqual(self.s.go[i + 1], True)
 
         self.s.executeSortingStirring()
         self.assertEqual(self.s.go2[0], True)
 
+        self.robot5.isExecuting = True
         for i in range(15):
             self.s.executeSortingStirring()
             self.assertEqual(self.s.go2[0], True)
-            self.s.stationList[4].isExecuting = False
+        self.robot5.isExecuting = False
 
         self.s.executeSortingStirring()
         self.assertEqual(self.s.go2[1], True)
 
-        for i in range(15):
-            self.s.executeSortingStirring()
-            self.assertEqual(self.s.go2[1], True)
-            self.s.stationList[5].isExecuting = False
+    def testSettleCycles(self):
+        s = SequenceManager(1, self.robot1, self.robot2, self.robot3, self.robot4, self.robot5, self.robot6, self.robot7, self.robot8, settleCycles={(1, 0): 3})
+        s.executeSortingStirring()
+        s.executeSortingStirring()
+        self.assertEqual(s.go[0], True)
+        #robot1 is done, but has to settle for 3 cycles
+        for i in range(3):
+            s.executeSortingStirring()
+            self.assertEqual(s.go[0], True)
+        s.executeSortingStirring()
+        self.assertEqual(s.go[1], True)
+        #no settle time configured for robot2
+        s.executeSortingStirring()
+        self.assertEqual(s.go[2], True)
+
+    def testKpiBlocked(self):
+        #robot1 works for 2 seconds, then it is blocked while it settles for 3 cycles of a second
+        now = [0.0]
+        robots = [self.robot1, self.robot2, self.robot3, self.robot4, self.robot5, self.robot6, self.robot7, self.robot8]
+        kpi = KpiEngine({SequenceManager.stationName(r): None for r in robots}, last='DummyMachine8', clock=lambda: now[0])
+        s = SequenceManager(1, *robots, settleCycles={(1, 0): 3}, kpi=kpi)
+        s.executeSortingStirring()
+        s.executeSortingStirring()
+        self.robot1.isExecuting = True
+        for i in range(2):
+            s.executeSortingStirring()
+            now[0] += 1
+        self.robot1.isExecuting = False
+        for i in range(4):
+            s.executeSortingStirring()
+            now[0] += 1
+        self.assertEqual(s.go[1], True)
+        kpi.update()
+        kpis = kpi.stations['DummyMachine1'].kpis('minute')
+        self.assertEqual((kpis['utilization'] * 6, kpis['blocked']), (2.0, 3.0))
+        self.assertEqual(kpis['cycleTime'], 6.0)
+
+    def testSettleCyclesPerSubList(self):
+        #robot4 is in both sub-lists, it settles only at position 1 of list 2
+        s = SequenceManager(1, self.robot1, self.robot2, self.robot3, self.robot4, self.robot5, self.robot6, self.robot7, self.robot8, settleCycles={(2, 1): 3})
+        s.executeSortingStirring()
+        for i in range(6):
+            s.executeSortingStirring()
+            self.assertEqual(s.go[i], True)
+        s.executeSortingStirring()
+        self.assertEqual(s.go2[0], True)
+        s.executeSortingStirring()
+        self.assertEqual(s.go2[1], True)
+        for i in range(3):
+            s.executeSortingStirring()
+            self.assertEqual(s.go2[1], True)
+        s.executeSortingStirring()
+        self.assertEqual(s.go2[2], True)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,58 @@
+import threading
+
+
+class SimIo:
+    """One simulated IO, holds its value like a revpimodio2 IO object"""
+
+    def __init__(self, value=0):
+        self.value = value
+        # called by reset(), e.g. by a plant model zeroing its encoder
+        self.onReset = None
+
+    def reset(self):
+        """Resets a counter input to zero"""
+        self.value = 0
+        if self.onReset is not None:
+            self.onReset()
+
+
+class SimIoList:
+    """The IOs of a SimRevPi, reachable by attribute (rpi.io.dio1_I_3) and by item (rpi.io['I_3'])
+
+    IOs are created on first access, so a plant model and the control code can address them in any order.
+    """
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        io = SimIo()
+        setattr(self, name, io)
+        return io
+
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+class SimRevPi:
+    """Stands in for a RevPiModIO instance when a cell runs against a simulated plant instead of the hardware.
+
+    Only what the cells use is provided: io, core.a1green, handlesignalend(), mainloop() and exitsignal.
+    """
+
+    def __init__(self):
+        self.io = SimIoList()
+        self.core = SimIoList()
+        self.exitsignal = threading.Event()
+        self.__cleanup = None
+
+    def handlesignalend(self, cleanup):
+        self.__cleanup = cleanup
+
+    def mainloop(self, blocking=True):
+        pass
+
+    def exit(self):
+        """Ends the loop of the cell like SIGTERM would"""
+        self.exitsignal.set()
+        if self.__cleanup is not None:
+            self.__cleanup()
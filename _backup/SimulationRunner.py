@@ -0,0 +1,89 @@
+#!/usr/bin/env python
+
+"""Simulates many cells at the same time, one worker process per CPU core, see CellSimulation.
+
+    python SimulationRunner.py --oven 8 --sorting 8 --ticks 20000
+
+Every cell is printed as soon as it is finished, then the throughput of all cells of a kind.
+"""
+
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from time import perf_counter
+
+from CellSimulation import simulate
+
+
+class SimulationRunner:
+    """Runs simulation jobs on a pool of worker processes and merges their results"""
+
+    def __init__(self, workers: int = None, simulate=simulate):
+        """
+        :param int workers: number of worker processes, None for one per CPU core
+        :param simulate: the module level function simulating one job, e.g. PlantEvents.simulateShift
+        """
+        self.workers = workers
+        self.simulate = simulate
+        # wall clock seconds of the last run()
+        self.elapsed = 0.0
+
+    def run(self, jobs: list, done=None) -> list:
+        """Simulates every job, see CellSimulation.simulate()
+
+        :param list jobs: the jobs
+        :param done: called with each result as soon as its job is finished, e.g. to print it
+        :return list: the results in the order the jobs finished
+        """
+        start = perf_counter()
+        results = []
+        with ProcessPoolExecutor(max_workers=self.workers) as pool:
+            for future in as_completed([pool.submit(self.simulate, job) for job in jobs]):
+                result = future.result()
+                results.append(result)
+                if done is not None:
+                    done(result)
+        self.elapsed = perf_counter() - start
+        return results
+
+    @staticmethod
+    def report(results: list, elapsed: float = 0.0) -> dict:
+        """Merges the results of a run
+
+        :param list results: the results of run()
+        :param float elapsed: the wall clock seconds of the run, to compute the speedup over running the cells one by one
+        :return dict: per kind the 'cells', the 'produced' and 'dropped' packages, the 'simulatedSeconds' of all cells
+            together and the 'productsPerHour' of one cell, and the 'speedup' over all kinds
+        """
+        kinds = {}
+        for result in results:
+            kind = kinds.setdefault(result['kind'], {'cells': 0, 'produced': 0, 'dropped': 0, 'simulatedSeconds': 0.0})
+            kind['cells'] += 1
+            kind['produced'] += result['produced']
+            kind['dropped'] += result['dropped']
+            kind['simulatedSeconds'] += result['simulatedSeconds']
+        for kind in kinds.values():
+            seconds = kind['simulatedSeconds']
+            kind['productsPerHour'] = kind['produced'] * 3600 / seconds if seconds else 0.0
+        wallSeconds = sum(result['wallSeconds'] for result in results)
+        return {'kinds': kinds, 'speedup': wallSeconds / elapsed if elapsed else 0.0}
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulates oven and sorting/stirring cells in parallel')
+    parser.add_argument('--oven', type=int, default=4, help='number of oven stations')
+    parser.add_argument('--sorting', type=int, default=4, help='number of sorting/stirring cells')
+    parser.add_argument('--ticks', type=int, default=20000, help='cycles to simulate per cell')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per CPU core')
+    args = parser.parse_args()
+
+    jobs = [{'kind': 'oven', 'ticks': args.ticks}] * args.oven
+    jobs += [{'kind': 'sortingStirring', 'ticks': args.ticks}] * args.sorting
+    runner = SimulationRunner(args.workers)
+    results = runner.run(jobs, lambda result: print('%-16s %5d products %8.1f products/h %6.2f s'
+                                                    % (result['kind'], result['produced'], result['productsPerHour'],
+                                                       result['wallSeconds'])))
+    report = SimulationRunner.report(results, runner.elapsed)
+    for name, kind in report['kinds'].items():
+        print('%-16s %d cells, %d products, %d dropped, %.1f products/h per cell'
+              % (name, kind['cells'], kind['produced'], kind['dropped'], kind['productsPerHour']))
+    print('%.2f s for %d cells, %.1fx faster than one by one' % (runner.elapsed, len(results), report['speedup']))
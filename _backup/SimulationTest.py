@@ -0,0 +1,78 @@
+import unittest
+
+from CellSimulation import simulate, CELLS
+from SimRevPi import SimRevPi
+from SimulationRunner import SimulationRunner
+
+
+class MyTestCase(unittest.TestCase):
+
+    def testOvenProduces(self):
+        result = simulate({'kind': 'oven', 'ticks': 2000})
+        self.assertGreater(result['produced'], 0)
+        self.assertAlmostEqual(result['simulatedSeconds'], 2000 * 0.05)
+        self.assertGreater(result['productsPerHour'], 0)
+
+    def testSortingStirringProduces(self):
+        # the first package runs through all stations in about 4000 cycles
+        result = simulate({'kind': 'sortingStirring', 'ticks': 5000})
+        self.assertEqual(1, result['produced'])
+        self.assertEqual(0, result['dropped'])
+
+    def testSortingStirringKpis(self):
+        # the key metrics move on with the simulated time, the vacuum gripper is blocked while its drop settles
+        cell, plant, cycleTime = CELLS['sortingStirring'](SimRevPi(), {})
+        start = cell.kpi.clock()
+        ticks = [0]
+        cell.kpi.clock = lambda: start + ticks[0] * cycleTime
+        while plant.produced == 0:
+            cell.tick()
+            plant.step()
+            ticks[0] += 1
+        self.assertAlmostEqual(15 * cycleTime, cell.kpi.stations['VacuumGripper4'].kpis('shift')['blocked'])
+        self.assertEqual(0.0, cell.kpi.stations['Robot1'].kpis('shift')['blocked'])
+        cell.queryKpis()
+        cell.publish()
+        kpi = cell.state.latest()['state']['kpi']
+        self.assertEqual(kpi, cell.kpi.query())
+        self.assertGreater(kpi['line']['partsPerHour'], 0)
+
+    def testMetricsPublishedDuringOverruns(self):
+        # with no budget at all every tick overruns, the state still carries the sheds
+        cell, plant, cycleTime = CELLS['sortingStirring'](SimRevPi(), {})
+        cell.budget.budget = -1.0
+        for i in range(3):
+            cell.budget.run()
+            plant.step()
+        budget = cell.state.latest()['state']['budget']
+        self.assertEqual((3, 2, 2), (budget['ticks'] + 1, budget['overruns'], budget['shed']['led']))
+        self.assertEqual(0, budget['shed']['publish'])
+        self.assertEqual({'read', 'sequence', 'write', 'publish', 'checkpoint', 'kpi', 'led'}, set(budget['seconds']))
+
+    def testUnknownKind(self):
+        with self.assertRaises(KeyError):
+            simulate({'kind': 'unknown', 'ticks': 1})
+
+    def testRunnerReturnsEveryJob(self):
+        jobs = [{'kind': 'oven', 'ticks': 500}, {'kind': 'oven', 'ticks': 1000, 'params': {'loadTicks': 20}}]
+        done = []
+        runner = SimulationRunner(workers=2)
+        results = runner.run(jobs, done.append)
+        self.assertEqual(results, done)
+        self.assertEqual([500, 1000], sorted(result['ticks'] for result in results))
+        self.assertGreater(runner.elapsed, 0)
+
+    def testReport(self):
+        results = [{'kind': 'oven', 'produced': 3, 'dropped': 0, 'simulatedSeconds': 1800.0, 'wallSeconds': 1.0},
+                   {'kind': 'oven', 'produced': 5, 'dropped': 1, 'simulatedSeconds': 1800.0, 'wallSeconds': 1.0},
+                   {'kind': 'sortingStirring', 'produced': 1, 'dropped': 0, 'simulatedSeconds': 360.0,
+                    'wallSeconds': 2.0}]
+        report = SimulationRunner.report(results, elapsed=2.0)
+        self.assertEqual({'cells': 2, 'produced': 8, 'dropped': 1, 'simulatedSeconds': 3600.0, 'productsPerHour': 8.0},
+                         report['kinds']['oven'])
+        self.assertEqual(10.0, report['kinds']['sortingStirring']['productsPerHour'])
+        self.assertEqual(2.0, report['speedup'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,174 +1,187 @@
+from collections import deque
+
 from Machine import Machine
 from ImpulseCounter import ImpulseCounter
 from PlusMinusStop import PlusMinusStop
 from Colour import Colour
+from ColourClassifier import ColourClassifier, ColourStage
 from CyclicWaiter import CyclicWaiter
+from ControlLog import ControlLog
+from ProcessImage import ImageBit, ImageWord
 
+log = ControlLog.getLogger('SortingLine')
 
-class SortingLine(Machine):
-
-    #TODO self.once: implement reset possibility from execute
-
-    @property
-    def isExecuting(self) -> bool:
-        return self.__packageOnLine
-
-    def __init__(self, id1):
-        super().__init__(id1)
-        self.__sortingLineSensImpulseCounterRaw = 0
-        self.__sortingLineSensInputLightBarrier = self.__sortingLineSensMiddleLightBarrier = self.__sortingLineSensWhiteLightBarrier = self.__sortingLineSensBlueLightBarrier = self.__sortingLineSensRedLightBarrier = True
-        self.__sortingLineActMotorConveyor = self.__sortingLineActCompressorOn = self.__sortingLineActWhiteEjector = self.__sortingLineActRedEjector = self.__sortingLineActBlueEjector = False
-        self.__counter = ImpulseCounter()
-        self.__packageOnLine = self.__packageCountSteps = False
-        self.once = True
-
-    @property
-    def sortingLineSensImpulseCounterRaw(self):
-        return self.__sortingLineSensImpulseCounterRaw
-
-    @sortingLineSensImpulseCounterRaw.setter
-    def sortingLineSensImpulseCounterRaw(self, value):
-        self.__sortingLineSensImpulseCounterRaw = value
-
-    @property
-    def sortingLineSensInputLightBarrier(self):
-        return self.__sortingLineSensInputLightBarrier
-
-    @sortingLineSensInputLightBarrier.setter
-    def sortingLineSensInputLightBarrier(self, value):
-        self.__sortingLineSensInputLightBarrier = value
-
-    @property
-    def sortingLineSensMiddleLightBarrier(self):
-        return self.__sortingLineSensMiddleLightBarrier
-
-    @sortingLineSensMiddleLightBarrier.setter
-    def sortingLineSensMiddleLightBarrier(self, value):
-        self.__sortingLineSensMiddleLightBarrier = value
-
-    @property
-    def sortingLineSensWhiteLightBarrier(self):
-        return self.__sortingLineSensWhiteLightBarrier
-
-    @sortingLineSensWhiteLightBarrier.setter
-    def sortingLineSensWhiteLightBarrier(self, value):
-        self.__sortingLineSensWhiteLightBarrier = value
-
-    @property
-    def sortingLineSensRedLightBarrier(self):
-        return self.__sortingLineSensRedLightBarrier
-
-    @sortingLineSensRedLightBarrier.setter
-    def sortingLineSensRedLightBarrier(self, value):
-        self.__sortingLineSensRedLightBarrier = value
 
-    @property
-    def sortingLineSensBlueLightBarrier(self):
-        return self.__sortingLineSensBlueLightBarrier
+class Piece:
+    """A piece on the sorting line, tracked by the impulse counter from the input light barrier on"""
 
-    @sortingLineSensBlueLightBarrier.setter
-    def sortingLineSensBlueLightBarrier(self, value):
-        self.__sortingLineSensBlueLightBarrier = value
+    __slots__ = ('entry', 'middle', 'colour', 'reading', 'ejecting', 'stage')
 
-    @property
-    def sortingLineActMotorConveyor(self):
-        return self.__sortingLineActMotorConveyor
+    def __init__(self, entry: int, stage: ColourStage = None):
+        """
+        :param int entry: the counter value the piece entered the line at
+        :param ColourStage stage: measures the colour of the piece, None if it is not measured
+        """
+        self.entry = entry
+        self.stage = stage
+        # the counter value the piece passed the middle light barrier at, None until then
+        self.middle = None
+        self.colour = None
+        # the reading of the colour sensor the colour was classified from, None if it was not measured
+        self.reading = None
+        self.ejecting = False
 
-    @sortingLineActMotorConveyor.setter
-    def sortingLineActMotorConveyor(self, value):
-        self.__sortingLineActMotorConveyor = value
 
-    @property
-    def sortingLineActCompressorOn(self):
-        return self.__sortingLineActCompressorOn
+class SortingLine(Machine):
 
-    @sortingLineActCompressorOn.setter
-    def sortingLineActCompressorOn(self, value):
-        self.__sortingLineActCompressorOn = value
+    # sensors and actuators, views onto bits and words of a process image
+    sortingLineSensImpulseCounterRaw = ImageWord()
+    sortingLineSensInputLightBarrier = ImageBit()
+    sortingLineSensMiddleLightBarrier = ImageBit()
+    sortingLineSensWhiteLightBarrier = ImageBit()
+    sortingLineSensRedLightBarrier = ImageBit()
+    sortingLineSensBlueLightBarrier = ImageBit()
+    sortingLineSensColour = ImageWord('H')
+    sortingLineActMotorConveyor = ImageBit()
+    sortingLineActCompressorOn = ImageBit()
+    sortingLineActWhiteEjector = ImageBit()
+    sortingLineActRedEjector = ImageBit()
+    sortingLineActBlueEjector = ImageBit()
+
+    # the impulses after it interrupted the input light barrier a piece is in front of the colour sensor
+    colourWindow = (4, 8)
+
+    # per colour the ejector, the light barrier in its chute and the impulses from the middle light barrier after which
+    # the piece is in front of the ejector
+    ejectors = {Colour.WHITE: ('sortingLineActWhiteEjector', 'sortingLineSensWhiteLightBarrier', 1),
+                Colour.RED: ('sortingLineActRedEjector', 'sortingLineSensRedLightBarrier', 7),
+                Colour.BLUE: ('sortingLineActBlueEjector', 'sortingLineSensBlueLightBarrier', 12)}
 
     @property
-    def sortingLineActWhiteEjector(self):
-        return self.__sortingLineActWhiteEjector
-
-    @sortingLineActWhiteEjector.setter
-    def sortingLineActWhiteEjector(self, value):
-        self.__sortingLineActWhiteEjector = value
+    def isExecuting(self) -> bool:
+        return len(self.__pieces) > 0
 
     @property
-    def sortingLineActRedEjector(self):
-        return self.__sortingLineActRedEjector
+    def isDone(self) -> bool:
+        """Returns whether the pieces have been ejected, cleared by reset()"""
+        return not self.once and not self.__pieces
+
+    def __init__(self, id1, classifier: ColourClassifier = None):
+        """
+        :param id1: the machine id
+        :param ColourClassifier classifier: classifies the readings of the colour sensor, None to sort all pieces as
+            the colour handed to ejectColour()
+        """
+        super().__init__(id1)
+        self.sortingLineSensImpulseCounterRaw = self.sortingLineSensColour = 0
+        self.sortingLineSensInputLightBarrier = self.sortingLineSensMiddleLightBarrier = self.sortingLineSensWhiteLightBarrier = self.sortingLineSensBlueLightBarrier = self.sortingLineSensRedLightBarrier = True
+        self.sortingLineActMotorConveyor = self.sortingLineActCompressorOn = self.sortingLineActWhiteEjector = self.sortingLineActRedEjector = self.sortingLineActBlueEjector = False
+        self.__counter = ImpulseCounter()
+        # pieces on the line in the order they entered it, the counter keeps running, each piece holds its own positions
+        self.__pieces = deque()
+        self.__inputFree = self.__middleFree = True
+        self.classifier = classifier
+        # armed for a batch, the belt runs and the line is not done until a piece was ejected
+        self.once = True
 
-    @sortingLineActRedEjector.setter
-    def sortingLineActRedEjector(self, value):
-        self.__sortingLineActRedEjector = value
+    def reset(self):
+        """Arms the line for the next batch, it runs the belt and is not done until one more piece was ejected"""
+        self.once = True
 
     @property
-    def sortingLineActBlueEjector(self):
-        return self.__sortingLineActBlueEjector
-
-    @sortingLineActBlueEjector.setter
-    def sortingLineActBlueEjector(self, value):
-        self.__sortingLineActBlueEjector = value
+    def sortingLineCounterValue(self):
+        """Returns the impulses the first piece moved since it passed the middle light barrier, 0 if none passed it"""
+        for piece in self.__pieces:
+            if piece.middle is not None:
+                return self.__counter.counter - piece.middle
+        return 0
 
     @property
-    def sortingLineCounterValue(self):
-        return self.__counter.counter
-
-    def startOfProcess(self, packageIncoming):
-        if not self.__sortingLineSensInputLightBarrier and not self.__packageOnLine:
-            self.__packageOnLine = True
-            print("packageOnLine True")
-        if self.__packageOnLine or packageIncoming:
-            self.__packageOnLine = True
-            print("packageOnLine True")
-            self.__sortingLineActMotorConveyor = True
-            if not self.__sortingLineSensMiddleLightBarrier:
-                self.__packageCountSteps = True
+    def pieces(self) -> tuple:
+        """Returns the pieces on the line, the first one entered it first"""
+        return tuple(self.__pieces)
+
+    def startOfProcess(self, previous: int, colour):
+        """Adds a piece interrupting the input light barrier to the queue and starts counting for the first piece that
+        interrupts the middle light barrier, that piece gets the colour measured on its way there. The colour sensor is
+        sampled for the piece in front of it only, so each piece keeps its own reading.
+
+        :param int previous: the counter value of the last cycle, the piece passed the middle light barrier after it
+        :param colour: the colour of a piece that passed the middle light barrier without one of its own
+        :return Piece: the piece that passed the middle light barrier in this cycle, None if none did
+        """
+        pieces = self.__pieces
+        passed = None
+        counter = self.__counter.counter
+        if self.classifier is not None:
+            low, high = self.colourWindow
+            for piece in pieces:
+                if piece.stage is not None and low <= counter - piece.entry <= high:
+                    piece.stage.sample(self.sortingLineSensColour)
+        if not self.sortingLineSensInputLightBarrier and self.__inputFree:
+            pieces.append(Piece(counter, ColourStage(self.classifier) if self.classifier is not None else None))
+            log.debug('piece entered, %d on line', len(pieces))
+        self.__inputFree = self.sortingLineSensInputLightBarrier
+        if not self.sortingLineSensMiddleLightBarrier and self.__middleFree:
+            for piece in pieces:
+                if piece.middle is None:
+                    break
+            else:
+                # the piece passed the input light barrier unseen, e.g. before a restart
+                piece = Piece(previous)
+                pieces.append(piece)
+            piece.middle = previous
+            if piece.stage is not None:
+                piece.colour, piece.reading = piece.stage.classify()
+            if piece.colour is None:
+                piece.colour = colour
+            log.debug('piece passed middle light barrier as %s', piece.colour)
+            passed = piece
+        self.__middleFree = self.sortingLineSensMiddleLightBarrier
+        return passed
 
     def ejectColour(self, colour):
-        whiteCounter = 1
-        redCounter = 7
-        blueCounter = 12
-        current = self.__counter.compute(self.__sortingLineSensImpulseCounterRaw, PlusMinusStop.PLUS)
-        if not self.__packageCountSteps and self.once:
-            self.startOfProcess(True)
-            if not self.__packageCountSteps:
-                self.__counter.counter = 0
-        else:
-            if current > blueCounter and colour == Colour.BLUE:
-                self.__sortingLineActMotorConveyor = False
-                self.__sortingLineActCompressorOn = True
-                self.__sortingLineActBlueEjector = True
-                if not self.__sortingLineSensBlueLightBarrier:
-                    self.__packageOnLine = self.__packageCountSteps = False
-                    print("packageOnLine False")
-                    self.__sortingLineActCompressorOn = False
-                    self.__sortingLineActBlueEjector = False
-                    self.once = False
-                    return
-            if current > redCounter and colour == Colour.RED:
-                self.__sortingLineActMotorConveyor = False
-                self.__sortingLineActCompressorOn = True
-                self.__sortingLineActRedEjector = True
-                if not self.__sortingLineSensRedLightBarrier:
-                    self.__packageOnLine = False
-                    self.__packageCountSteps = False
-                    print("packageOnLine False")
-                    self.__sortingLineActCompressorOn = False
-                    self.__sortingLineActRedEjector = False
-                    self.once = False
-                    return
-            if current > whiteCounter and colour == Colour.WHITE:
-                self.__sortingLineActMotorConveyor = False
-                self.__sortingLineActCompressorOn = True
-                self.__sortingLineActWhiteEjector = True
-                if not self.__sortingLineSensWhiteLightBarrier:
-                    self.__packageOnLine = self.__packageCountSteps = False
-                    print("packageOnLine False")
-                    self.__sortingLineActCompressorOn = False
-                    self.__sortingLineActWhiteEjector = False
-                    self.once = False
-                    return
+        """Runs one cycle of the line, every piece is ejected once its own counter target comes up
+
+        The belt keeps running while a piece is ejected as long as pieces behind it are still on their way, a piece
+        ejected on its own is stopped in front of its ejector.
+
+        :param colour: the colour of a piece that passed the middle light barrier without one of its own
+        """
+        previous = self.__counter.counter
+        current = self.__counter.compute(self.sortingLineSensImpulseCounterRaw, PlusMinusStop.PLUS)
+        passed = self.startOfProcess(previous, colour)
+        pieces = self.__pieces
+        waiting = 0
+        for piece in pieces:
+            # counting starts with the cycle after the one the piece passed the middle light barrier in
+            if piece.middle is None or piece is passed:
+                waiting += 1
+                continue
+            ejector, barrier, target = self.ejectors[piece.colour]
+            if current - piece.middle > target:
+                piece.ejecting = True
+                setattr(self, ejector, True)
+            else:
+                waiting += 1
+        # a piece is off the line once the light barrier in its chute sees it
+        for chute in self.ejectors:
+            ejector, barrier, target = self.ejectors[chute]
+            if getattr(self, ejector) and not getattr(self, barrier):
+                self.ejected(chute)
+        self.sortingLineActCompressorOn = self.sortingLineActWhiteEjector or self.sortingLineActRedEjector or self.sortingLineActBlueEjector
+        self.sortingLineActMotorConveyor = (self.once or len(pieces) > 0) and (waiting > 0 or not self.sortingLineActCompressorOn)
+
+    def ejected(self, colour):
+        """Removes the first piece of colour that is being ejected and switches its ejector off"""
+        ejector, barrier, target = self.ejectors[colour]
+        setattr(self, ejector, False)
+        for piece in self.__pieces:
+            if piece.ejecting and piece.colour == colour:
+                self.__pieces.remove(piece)
+                log.debug('piece ejected as %s, %d on line', colour, len(self.__pieces))
+                break
+        self.once = False
 
     def execute(self):
         self.ejectColour(Colour.RED)
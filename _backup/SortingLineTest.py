@@ -35,5 +35,58 @@ class MyTestCase(unittest.TestCase):
         self.assertEqual(self.sorting1.sortingLineActCompressorOn, True)
         self.assertEqual(self.sorting1.sortingLineActBlueEjector,True)
 
+    def testTwoPieces(self):
+        line = self.sorting1
+        line.ejectColour(Colour.BLUE)
+        line.sortingLineSensInputLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 10
+        line.ejectColour(Colour.BLUE)
+        line.sortingLineSensInputLightBarrier = True
+        line.sortingLineSensImpulseCounterRaw = 20
+        line.ejectColour(Colour.BLUE)
+        #first piece passes the middle light barrier, second one enters behind it
+        line.sortingLineSensMiddleLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 30
+        line.ejectColour(Colour.BLUE)
+        line.sortingLineSensMiddleLightBarrier = True
+        line.sortingLineSensInputLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 31
+        line.ejectColour(Colour.WHITE)
+        self.assertEqual(2, len(line.pieces))
+        self.assertEqual(line.sortingLineCounterValue, 11)
+        #first piece is ejected, the belt keeps running for the second one
+        line.sortingLineSensImpulseCounterRaw = 33
+        line.ejectColour(Colour.WHITE)
+        self.assertEqual(line.sortingLineActBlueEjector, True)
+        self.assertEqual(line.sortingLineActCompressorOn, True)
+        self.assertEqual(line.sortingLineActMotorConveyor, True)
+        line.sortingLineSensBlueLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 34
+        line.ejectColour(Colour.WHITE)
+        self.assertEqual(1, len(line.pieces))
+        self.assertEqual(line.sortingLineActBlueEjector, False)
+        self.assertEqual(line.sortingLineActMotorConveyor, True)
+        self.assertEqual(line.isDone, False)
+        #second piece is ejected on its own, the belt stops for it
+        line.sortingLineSensBlueLightBarrier = line.sortingLineSensInputLightBarrier = True
+        line.sortingLineSensMiddleLightBarrier = False
+        line.sortingLineSensImpulseCounterRaw = 40
+        line.ejectColour(Colour.WHITE)
+        line.sortingLineSensMiddleLightBarrier = True
+        line.sortingLineSensImpulseCounterRaw = 42
+        line.ejectColour(Colour.BLUE)
+        self.assertEqual(line.sortingLineActWhiteEjector, True)
+        self.assertEqual(line.sortingLineActMotorConveyor, False)
+        line.sortingLineSensWhiteLightBarrier = False
+        line.ejectColour(Colour.BLUE)
+        self.assertEqual(line.sortingLineActWhiteEjector, False)
+        self.assertEqual(line.sortingLineActCompressorOn, False)
+        self.assertEqual(line.isDone, True)
+        #armed for the next batch, the empty line runs its belt until a piece was ejected
+        line.reset()
+        line.ejectColour(Colour.BLUE)
+        self.assertEqual(line.isDone, False)
+        self.assertEqual(line.sortingLineActMotorConveyor, True)
+
 if __name__ == '__main__':
     unittest.main()
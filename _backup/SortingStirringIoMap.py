@@ -0,0 +1,127 @@
+"""IO mapping of the sorting/stirring cell, (module, pin, machine, field) per IO, compiled by IoMap"""
+
+INPUTS = [
+    #warehouse
+    ('dio2', 'I_7', 'warehouse1', 'warehouseSensHorizontalEnd'),
+    ('dio2', 'I_8', 'warehouse1', 'warehouseSensLightBarrierIn'),
+    ('dio2', 'I_9', 'warehouse1', 'warehouseSensLightBarrierOut'),
+    ('dio2', 'I_10', 'warehouse1', 'warehouseSensVerticalEnd'),
+    ('dio2', 'Counter_11', 'warehouse1', 'warehouseSensEncoderHorizontal'),
+    ('dio2', 'Counter_13', 'warehouse1', 'warehouseSensEncoderVertical'),
+    ('dio3', 'I_1', 'warehouse1', 'warehouseSensArmOut'),
+    ('dio3', 'I_2', 'warehouse1', 'warehouseSensArmIn'),
+    #sortingLine
+    ('dio2', 'Counter_1', 'sortingLine1', 'sortingLineSensImpulseCounterRaw'),
+    ('dio2', 'I_2', 'sortingLine1', 'sortingLineSensInputLightBarrier'),
+    ('dio2', 'I_3', 'sortingLine1', 'sortingLineSensMiddleLightBarrier'),
+    ('dio2', 'I_4', 'sortingLine1', 'sortingLineSensWhiteLightBarrier'),
+    ('dio2', 'I_5', 'sortingLine1', 'sortingLineSensRedLightBarrier'),
+    ('dio2', 'I_6', 'sortingLine1', 'sortingLineSensBlueLightBarrier'),
+    ('aio1', 'InputValue_1', 'sortingLine1', 'sortingLineSensColour'),
+    #conveyor - Anfang
+    ('dio1', 'I_11', 'conveyor1', 'conveyorSensLeft'),
+    ('dio1', 'I_12', 'conveyor1', 'conveyorSensRight'),
+    ('dio1', 'Counter_13', 'conveyor1', 'conveyorSensImpulse'),
+    #3DRobot - Anfang
+    ('dio1', 'I_1', 'robot1', 'robotSensGripperOpen'),
+    ('dio1', 'Counter_2', 'robot1', 'robotSensGripperImpulseCounterRaw'),
+    ('dio1', 'I_3', 'robot1', 'robotSensArmEndIn'),
+    ('dio1', 'Counter_4', 'robot1', 'robotSensArmImpulseCounterRaw'),
+    ('dio1', 'I_5', 'robot1', 'robotSensVerticalEndUp'),
+    ('dio1', 'I_6', 'robot1', 'robotSensRotEnd'),
+    ('dio1', 'Counter_7', 'robot1', 'robotSensVerticalEncoderCounter'),
+    ('dio1', 'Counter_9', 'robot1', 'robotSensRotEncoderCounter'),
+    #VacuumGripper
+    ('dio3', 'I_3', 'vacuum1', 'vacuumSensVerticalEndUp'),
+    ('dio3', 'I_4', 'vacuum1', 'vacuumSensArmEndIn'),
+    ('dio3', 'I_5', 'vacuum1', 'vacuumSensRotEnd'),
+    ('dio3', 'Counter_7', 'vacuum1', 'vacuumSensVerticalEncoderCounter'),
+    ('dio3', 'Counter_9', 'vacuum1', 'vacuumSensArmEncoderCounter'),
+    ('dio3', 'Counter_11', 'vacuum1', 'vacuumSensRotEncoderCounter'),
+    #conveyor - Ende
+    ('dio3', 'I_13', 'conveyor2', 'conveyorSensLeft'),
+    ('dio3', 'I_14', 'conveyor2', 'conveyorSensRight'),
+    ('dio3', 'Counter_6', 'conveyor2', 'conveyorSensImpulse'),
+    #indexedLine
+    #Warning: backward and forward slider are swapped on the sheet.
+    ('dio4', 'I_1', 'indexedLine', 'pushButton1Front'),
+    ('dio4', 'I_2', 'indexedLine', 'pushButton1Back'),
+    ('dio4', 'I_3', 'indexedLine', 'pushButton2Front'),
+    ('dio4', 'I_4', 'indexedLine', 'pushButton2Back'),
+    ('dio4', 'I_5', 'indexedLine', 'indexSensSlider1'),
+    ('dio4', 'I_6', 'indexedLine', 'indexSensMilling'),
+    ('dio4', 'I_7', 'indexedLine', 'indexSensLoading'),
+    ('dio4', 'I_8', 'indexedLine', 'indexSensDrilling'),
+    ('dio4', 'I_9', 'indexedLine', 'indexSensConveyorSwap'),
+    #3DRobot - Ende
+    ('dio5', 'I_1', 'robot2', 'robotSensGripperOpen'),
+    ('dio5', 'Counter_2', 'robot2', 'robotSensGripperImpulseCounterRaw'),
+    ('dio5', 'I_3', 'robot2', 'robotSensArmEndIn'),
+    ('dio5', 'Counter_4', 'robot2', 'robotSensArmImpulseCounterRaw'),
+    ('dio5', 'I_5', 'robot2', 'robotSensVerticalEndUp'),
+    ('dio5', 'I_6', 'robot2', 'robotSensRotEnd'),
+    ('dio5', 'Counter_7', 'robot2', 'robotSensVerticalEncoderCounter'),
+    ('dio5', 'Counter_9', 'robot2', 'robotSensRotEncoderCounter'),
+]
+
+OUTPUTS = [
+    #warehouse
+    ('dio2', 'O_7', 'warehouse1', 'warehouseActConveyorOut'),
+    ('dio2', 'O_8', 'warehouse1', 'warehouseActConveyorIn'),
+    ('dio2', 'O_9', 'warehouse1', 'warehouseActHorizontalToRack'),
+    ('dio2', 'O_10', 'warehouse1', 'warehouseActHorizontalToConveyor'),
+    ('dio2', 'O_11', 'warehouse1', 'warehouseActVerticalDown'),
+    ('dio2', 'O_12', 'warehouse1', 'warehouseActVerticalUp'),
+    ('dio2', 'O_13', 'warehouse1', 'warehouseActArmOut'),
+    ('dio2', 'O_14', 'warehouse1', 'warehouseActArmIn'),
+    #sortingLine
+    ('dio2', 'O_1', 'sortingLine1', 'sortingLineActMotorConveyor'),
+    ('dio2', 'O_2', 'sortingLine1', 'sortingLineActCompressorOn'),
+    ('dio2', 'O_3', 'sortingLine1', 'sortingLineActWhiteEjector'),
+    ('dio2', 'O_4', 'sortingLine1', 'sortingLineActRedEjector'),
+    ('dio2', 'O_5', 'sortingLine1', 'sortingLineActBlueEjector'),
+    #conveyor
+    ('dio1', 'O_9', 'conveyor1', 'conveyorActForward'),
+    ('dio1', 'O_10', 'conveyor1', 'conveyorActBackward'),
+    #3DRobot - Anfang
+    ('dio1', 'O_1', 'robot1', 'robotActGripperOpen'),
+    ('dio1', 'O_2', 'robot1', 'robotActGripperClose'),
+    ('dio1', 'O_3', 'robot1', 'robotActArmOut'),
+    ('dio1', 'O_4', 'robot1', 'robotActArmIn'),
+    ('dio1', 'O_5', 'robot1', 'robotActVerticalDown'),
+    ('dio1', 'O_6', 'robot1', 'robotActVerticalUp'),
+    ('dio1', 'O_7', 'robot1', 'robotActRotRight'),
+    ('dio1', 'O_8', 'robot1', 'robotActRotLeft'),
+    #VacuumGripper
+    ('dio3', 'O_1', 'vacuum1', 'vacuumActVerticalUp'),
+    ('dio3', 'O_2', 'vacuum1', 'vacuumActVerticalDown'),
+    ('dio3', 'O_3', 'vacuum1', 'vacuumActArmIn'),
+    ('dio3', 'O_4', 'vacuum1', 'vacuumActArmOut'),
+    ('dio3', 'O_5', 'vacuum1', 'vacuumActRotRight'),
+    ('dio3', 'O_6', 'vacuum1', 'vacuumActRotLeft'),
+    ('dio3', 'O_7', 'vacuum1', 'vacuumActCompressorOn'),
+    ('dio3', 'O_8', 'vacuum1', 'vacuumActValve'),
+    #conveyor - Ende
+    ('dio3', 'O_9', 'conveyor2', 'conveyorActForward'),
+    ('dio3', 'O_10', 'conveyor2', 'conveyorActBackward'),
+    #indexedLine
+    ('dio4', 'O_2', 'indexedLine', 'motorSlider1Backward'),
+    ('dio4', 'O_1', 'indexedLine', 'motorSlider1Forward'),
+    ('dio4', 'O_4', 'indexedLine', 'motorSlider2Backward'),
+    ('dio4', 'O_3', 'indexedLine', 'motorSlider2Forward'),
+    ('dio4', 'O_5', 'indexedLine', 'conveyorBeltFeed'),
+    ('dio4', 'O_6', 'indexedLine', 'conveyorBeltMilling'),
+    ('dio4', 'O_7', 'indexedLine', 'millingMachine'),
+    ('dio4', 'O_8', 'indexedLine', 'conveyorBeltDrilling'),
+    ('dio4', 'O_9', 'indexedLine', 'drillingMachine'),
+    ('dio4', 'O_10', 'indexedLine', 'conveyorBeltSwap'),
+    #3DRobot - Ende
+    ('dio5', 'O_1', 'robot2', 'robotActGripperOpen'),
+    ('dio5', 'O_2', 'robot2', 'robotActGripperClose'),
+    ('dio5', 'O_3', 'robot2', 'robotActArmOut'),
+    ('dio5', 'O_4', 'robot2', 'robotActArmIn'),
+    ('dio5', 'O_5', 'robot2', 'robotActVerticalDown'),
+    ('dio5', 'O_6', 'robot2', 'robotActVerticalUp'),
+    ('dio5', 'O_7', 'robot2', 'robotActRotRight'),
+    ('dio5', 'O_8', 'robot2', 'robotActRotLeft'),
+]
@@ -0,0 +1,230 @@
+import SortingStirringIoMap
+from IoMap import IoMap
+from PlantModel import MotorAxis, Slot, Belt, BeltEnd, Places, Supply, Sink, Gripper
+
+
+class SortingStirringPlant:
+    """Simulated hardware of the sorting/stirring cell, driven through the IOs of a SimRevPi.
+
+    The IOs are found through SortingStirringIoMap, the places the robots and the vacuum gripper pick up and put down
+    at are taken from the machines of the cell. A package is taken from the supply by robot 1, runs over conveyor 1 and
+    the sorting line, is stored in the warehouse, processed on the indexed line and leaves the plant over conveyor 2.
+    """
+
+    # readings of the analog colour sensor of the sorting line, on the belt and on a package, all packages are red
+    beltReading = 1900
+    packageReading = 1300
+
+    def __init__(self, rpi, cell, speed: float = 1.0, supplyTicks: int = 20, coastTicks: int = 0):
+        """
+        :param rpi: the SimRevPi the cell is controlled through
+        :param cell: the cell, its machines hold the place lists
+        :param float speed: factor on the speed of all axes, above 2 the encoder axes overshoot their stop window
+        :param int supplyTicks: ticks the operator needs to put a new package at the pickup place of robot 1
+        :param int coastTicks: ticks of its speed an encoder axis coasts on after its motor stopped
+        """
+        self.rpi = rpi
+        self.ios = {(machine, field): getattr(rpi.io, IoMap.ioName(module, pin))
+                    for module, pin, machine, field in SortingStirringIoMap.INPUTS + SortingStirringIoMap.OUTPUTS}
+        self.speed = speed
+        self.coastTicks = coastTicks
+        self.axes = []
+        self.supply = Supply('supply', supplyTicks)
+        self.sink = Sink('sink')
+        self.chutes = {}
+
+        # conveyor 1 hands the package to the sorting line, conveyor 2 out of the plant
+        self.sortingLine = Belt(40)
+        self.conveyor1 = Belt(30, exitLow=lambda package: self.sortingLine.put(package, 0))
+        self.conveyor2 = Belt(30)
+        self.conveyorCounters = {'conveyor1': self.conveyor1, 'conveyor2': self.conveyor2}
+        self.redSlot, self.whiteSlot, self.blueSlot = Slot('red'), Slot('white'), Slot('blue')
+        # ejector, the positions on the sorting line it reaches, its chute and the light barrier in it
+        self.ejectors = [('sortingLineActWhiteEjector', 11, 14, self.whiteSlot, 'sortingLineSensWhiteLightBarrier'),
+                         ('sortingLineActRedEjector', 16, 21, self.redSlot, 'sortingLineSensRedLightBarrier'),
+                         ('sortingLineActBlueEjector', 22, 27, self.blueSlot, 'sortingLineSensBlueLightBarrier')]
+        self.warehouseBelt = Belt(20)
+        # indexed line: feed belt, milling belt, drilling belt and the swap conveyor at its end
+        self.feed = Belt(10)
+        self.drilling = Belt(12)
+        self.milling = Belt(13, exitHigh=lambda package: self.drilling.put(package, 0))
+        self.swap = Belt(10)
+
+        self.robot1 = self.robot('robot1', cell.robot1.placeList,
+                                 [self.supply, BeltEnd(self.conveyor1, 25, 30, 29)])
+        self.robot2 = self.robot('robot2', cell.robot2.placeList,
+                                 [BeltEnd(self.swap, 7, 10, 10), BeltEnd(self.conveyor2, 25, 30, 29), self.sink])
+        self.vacuum = self.vacuumGripper(cell.vacuum1.placeList,
+                                         [BeltEnd(self.warehouseBelt, 15, 20, 19), self.whiteSlot, self.blueSlot,
+                                          self.redSlot, BeltEnd(self.feed, 0, 2, 0)])
+        self.warehouse()
+        self.slider1 = self.axis(self.io('indexedLine', 'motorSlider1Forward'),
+                                 self.io('indexedLine', 'motorSlider1Backward'),
+                                 end=self.io('indexedLine', 'pushButton1Front'),
+                                 farEnd=self.io('indexedLine', 'pushButton1Back'), speed=1, limit=8)
+        self.slider2 = self.axis(self.io('indexedLine', 'motorSlider2Forward'),
+                                 self.io('indexedLine', 'motorSlider2Backward'),
+                                 end=self.io('indexedLine', 'pushButton2Front'),
+                                 farEnd=self.io('indexedLine', 'pushButton2Back'), speed=1, limit=8)
+        self.update()
+
+    @property
+    def produced(self) -> int:
+        """Returns the number of packages that left the plant over conveyor 2"""
+        return self.sink.count
+
+    @property
+    def dropped(self) -> int:
+        """Returns the number of packages put down where there was no room for them"""
+        return self.robot1.dropped + self.robot2.dropped + self.vacuum.dropped
+
+    def io(self, machine: str, field: str):
+        """Returns the IO a field of a machine of the cell is mapped to"""
+        return self.ios[(machine, field)]
+
+    def axis(self, minus, plus, **kwargs) -> MotorAxis:
+        if 'counter' in kwargs and not kwargs.get('impulse'):
+            kwargs['coast'] = kwargs['speed'] * self.coastTicks
+        axis = MotorAxis(minus, plus, **kwargs)
+        self.axes.append(axis)
+        return axis
+
+    def encoderSpeed(self, tolerance: int) -> int:
+        """Returns the encoder steps per tick, less than the window an Axis with tolerance stops in"""
+        return max(1, int(tolerance * 0.75 * self.speed))
+
+    def robot(self, name: str, places: list, slots: list) -> Gripper:
+        """Creates the axes of a 3D robot and returns its gripper"""
+        vertical = self.axis(self.io(name, 'robotActVerticalUp'), self.io(name, 'robotActVerticalDown'),
+                             end=self.io(name, 'robotSensVerticalEndUp'),
+                             counter=self.io(name, 'robotSensVerticalEncoderCounter'),
+                             speed=self.encoderSpeed(20), limit=4000, position=300)
+        rot = self.axis(self.io(name, 'robotActRotRight'), self.io(name, 'robotActRotLeft'),
+                        end=self.io(name, 'robotSensRotEnd'), counter=self.io(name, 'robotSensRotEncoderCounter'),
+                        speed=self.encoderSpeed(20), limit=4500, position=500)
+        arm = self.axis(self.io(name, 'robotActArmIn'), self.io(name, 'robotActArmOut'),
+                        end=self.io(name, 'robotSensArmEndIn'), counter=self.io(name, 'robotSensArmImpulseCounterRaw'),
+                        speed=2, limit=100, position=20, impulse=True)
+        gripper = self.axis(self.io(name, 'robotActGripperOpen'), self.io(name, 'robotActGripperClose'),
+                            end=self.io(name, 'robotSensGripperOpen'),
+                            counter=self.io(name, 'robotSensGripperImpulseCounterRaw'),
+                            speed=1, limit=20, impulse=True)
+        # the impulse counts of the control drift towards the end switches over the rounds, so the gripper grips while
+        # it closes and releases while it opens, both only with the robot standing at a place told by its encoder axes
+        return Gripper(Places([vertical, rot], places, [60, 60]), slots,
+                       lambda: gripper.moved > 0 if gripper.moved and not vertical.moved and not rot.moved else None)
+
+    def vacuumGripper(self, places: list, slots: list) -> Gripper:
+        """Creates the axes of the vacuum gripper and returns its gripper"""
+        vertical = self.axis(self.io('vacuum1', 'vacuumActVerticalUp'), self.io('vacuum1', 'vacuumActVerticalDown'),
+                             end=self.io('vacuum1', 'vacuumSensVerticalEndUp'),
+                             counter=self.io('vacuum1', 'vacuumSensVerticalEncoderCounter'),
+                             speed=self.encoderSpeed(20), limit=3000, position=200)
+        rot = self.axis(self.io('vacuum1', 'vacuumActRotRight'), self.io('vacuum1', 'vacuumActRotLeft'),
+                        end=self.io('vacuum1', 'vacuumSensRotEnd'),
+                        counter=self.io('vacuum1', 'vacuumSensRotEncoderCounter'),
+                        speed=self.encoderSpeed(20), limit=4000, position=400)
+        arm = self.axis(self.io('vacuum1', 'vacuumActArmIn'), self.io('vacuum1', 'vacuumActArmOut'),
+                        end=self.io('vacuum1', 'vacuumSensArmEndIn'),
+                        counter=self.io('vacuum1', 'vacuumSensArmEncoderCounter'),
+                        speed=self.encoderSpeed(20), limit=3000, position=100)
+        # the gripper is lowered onto the package, the vertical position differs from the place by the offset
+        valve = self.io('vacuum1', 'vacuumActValve')
+        return Gripper(Places([vertical, rot, arm], places, [300, 60, 60]), slots, lambda: valve.value)
+
+    def warehouse(self):
+        """Creates the axes of the warehouse, its rack is not simulated, packages wait on its belt"""
+        self.axis(self.io('warehouse1', 'warehouseActVerticalUp'), self.io('warehouse1', 'warehouseActVerticalDown'),
+                  end=self.io('warehouse1', 'warehouseSensVerticalEnd'),
+                  counter=self.io('warehouse1', 'warehouseSensEncoderVertical'),
+                  speed=self.encoderSpeed(13), limit=2000, position=150)
+        self.axis(self.io('warehouse1', 'warehouseActHorizontalToConveyor'),
+                  self.io('warehouse1', 'warehouseActHorizontalToRack'),
+                  end=self.io('warehouse1', 'warehouseSensHorizontalEnd'),
+                  counter=self.io('warehouse1', 'warehouseSensEncoderHorizontal'),
+                  speed=self.encoderSpeed(13), limit=4000, position=300)
+        self.axis(self.io('warehouse1', 'warehouseActArmIn'), self.io('warehouse1', 'warehouseActArmOut'),
+                  end=self.io('warehouse1', 'warehouseSensArmIn'), farEnd=self.io('warehouse1', 'warehouseSensArmOut'),
+                  speed=1, limit=10, position=3)
+
+    def direction(self, machine: str, plus: str, minus: str) -> int:
+        """Returns 1 if the output plus is on, -1 if minus is on, 0 otherwise"""
+        return int(bool(self.io(machine, plus).value)) - int(bool(self.io(machine, minus).value))
+
+    def step(self):
+        """Simulates one tick, call after the control wrote its outputs"""
+        for axis in self.axes:
+            axis.step()
+        self.supply.step()
+        for gripper in (self.robot1, self.robot2, self.vacuum):
+            gripper.step()
+        # the package at the left light barrier of conveyor 2 is taken over by the next station
+        if self.conveyor2.occupied(0, 2):
+            self.sink.put(self.conveyor2.take(0, 2))
+        for name, belt in self.conveyorCounters.items():
+            direction = self.direction(name, 'conveyorActForward', 'conveyorActBackward')
+            if direction:
+                self.io(name, 'conveyorSensImpulse').value += 1
+            belt.step(direction)
+        self.stepSortingLine()
+        self.warehouseBelt.step(self.direction('warehouse1', 'warehouseActConveyorOut', 'warehouseActConveyorIn'))
+        self.stepIndexedLine()
+        self.update()
+
+    def stepSortingLine(self):
+        if self.io('sortingLine1', 'sortingLineActMotorConveyor').value:
+            self.io('sortingLine1', 'sortingLineSensImpulseCounterRaw').value += 1
+            self.sortingLine.step(1)
+            # a package stopped at the left light barrier of conveyor 1 lies over its end and is pulled in
+            if self.conveyor1.occupied(0, 2):
+                self.sortingLine.put(self.conveyor1.take(0, 2), 0)
+        # a package is in front of the light barrier of its chute for a few ticks before it lands in the slot
+        for name in list(self.chutes):
+            package, ticks = self.chutes[name]
+            if ticks <= 0:
+                self.chutes.pop(name)[1]
+                slot = next(slot for ejector, low, high, slot, barrier in self.ejectors if barrier == name)
+                slot.put(package)
+            else:
+                self.chutes[name] = (package, ticks - 1)
+        for ejector, low, high, slot, barrier in self.ejectors:
+            if self.io('sortingLine1', ejector).value and self.sortingLine.occupied(low, high):
+                self.chutes[barrier] = (self.sortingLine.take(low, high), 3)
+
+    def stepIndexedLine(self):
+        line = 'indexedLine'
+        if self.io(line, 'conveyorBeltFeed').value:
+            self.feed.step(1)
+        if self.io(line, 'conveyorBeltMilling').value:
+            self.milling.step(1)
+        if self.io(line, 'conveyorBeltDrilling').value:
+            self.drilling.step(1)
+        if self.io(line, 'conveyorBeltSwap').value:
+            self.swap.step(1)
+        # the sliders take the package along as soon as they leave the back button towards the front button
+        if self.io(line, 'motorSlider1Forward').value and self.slider1.position < self.slider1.limit \
+                and self.feed.occupied(9, 10):
+            self.milling.put(self.feed.take(9, 10), 0)
+        if self.io(line, 'motorSlider2Forward').value and self.slider2.position < self.slider2.limit \
+                and self.drilling.occupied(11, 12):
+            self.swap.put(self.drilling.take(11, 12), 0)
+
+    def update(self):
+        """Writes the light barriers, they are interrupted (False) while a package is in front of them"""
+        for name, belt in self.conveyorCounters.items():
+            self.io(name, 'conveyorSensLeft').value = not belt.occupied(0, 2)
+            self.io(name, 'conveyorSensRight').value = not belt.occupied(belt.length - 2, belt.length)
+        self.io('sortingLine1', 'sortingLineSensInputLightBarrier').value = not self.sortingLine.occupied(0, 2)
+        self.io('sortingLine1', 'sortingLineSensMiddleLightBarrier').value = not self.sortingLine.occupied(10, 12)
+        # the colour sensor sits between the input and the middle light barrier
+        self.io('sortingLine1', 'sortingLineSensColour').value = \
+            self.packageReading if self.sortingLine.occupied(4, 8) else self.beltReading
+        for ejector, low, high, slot, barrier in self.ejectors:
+            self.io('sortingLine1', barrier).value = barrier not in self.chutes
+        self.io('warehouse1', 'warehouseSensLightBarrierIn').value = not self.warehouseBelt.occupied(0, 2)
+        self.io('warehouse1', 'warehouseSensLightBarrierOut').value = not self.warehouseBelt.occupied(18, 20)
+        self.io('indexedLine', 'indexSensLoading').value = not self.feed.occupied(0, 2)
+        self.io('indexedLine', 'indexSensSlider1').value = not self.feed.occupied(9, 10)
+        self.io('indexedLine', 'indexSensMilling').value = not self.milling.occupied(6, 7)
+        self.io('indexedLine', 'indexSensDrilling').value = not self.drilling.occupied(5, 6)
+        self.io('indexedLine', 'indexSensConveyorSwap').value = not self.swap.occupied(8, 10)
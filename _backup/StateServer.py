@@ -0,0 +1,147 @@
+import base64
+import hashlib
+import json
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from time import time
+
+# appended to the key of a WebSocket handshake, RFC 6455
+WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+
+class StatePublisher:
+    """Hands the state of the control loop over to readers on other threads without a lock.
+
+    Once per tick the loop publishes a new immutable state, e.g. bytes of the process image, and swaps it for the
+    previous one with a single reference assignment. A reader takes the reference once and works on that state, the
+    loop never waits for it and never changes it. Decoding the state into fields and encoding them as JSON happens on
+    the reader thread, once per tick however many clients ask.
+    """
+
+    def __init__(self, decode=None):
+        """
+        :param decode: turns a published state into a JSON serialisable value, None if it already is one
+        """
+        self.decode = decode
+        self.__front = None
+        self.__decoded = None
+        self.__encoded = None
+        self.tick = 0
+
+    def publish(self, state):
+        """Publishes the state of this tick, the state must not be changed afterwards"""
+        self.tick += 1
+        self.__front = (self.tick, time(), state)
+
+    def latest(self):
+        """Returns the last published state as 'tick', 'time' and decoded 'state', None before the first tick"""
+        front = self.__front
+        if front is None:
+            return None
+        decoded = self.__decoded
+        if decoded is None or decoded['tick'] != front[0]:
+            tick, published, state = front
+            decoded = {'tick': tick, 'time': published,
+                       'state': self.decode(state) if self.decode is not None else state}
+            # readers racing here decode the same state, whichever assignment wins is correct
+            self.__decoded = decoded
+        return decoded
+
+    def encoded(self):
+        """Returns the last published state as the bytes of its JSON, encoded once per tick, None before the first tick"""
+        latest = self.latest()
+        if latest is None:
+            return None
+        encoded = self.__encoded
+        if encoded is None or encoded[0] is not latest:
+            encoded = (latest, json.dumps(latest).encode())
+            self.__encoded = encoded
+        return encoded[1]
+
+
+class StateRequestHandler(BaseHTTPRequestHandler):
+    """GET /state returns the latest state as JSON, GET /ws streams it to a WebSocket every interval"""
+
+    def do_GET(self):
+        if self.path == '/state':
+            body = self.server.publisher.encoded() or b'null'
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif self.path == '/ws' and self.headers.get('Upgrade', '').lower() == 'websocket':
+            self.stream()
+        else:
+            self.send_error(404)
+
+    def stream(self):
+        """Completes the WebSocket handshake, then sends every new state as a text frame until the client is gone"""
+        key = self.headers.get('Sec-WebSocket-Key', '') + WEBSOCKET_GUID
+        self.send_response(101)
+        self.send_header('Upgrade', 'websocket')
+        self.send_header('Connection', 'Upgrade')
+        self.send_header('Sec-WebSocket-Accept', base64.b64encode(hashlib.sha1(key.encode()).digest()).decode())
+        self.end_headers()
+        self.wfile.flush()
+        sent = None
+        try:
+            while not self.server.stopped.wait(self.server.interval):
+                encoded = self.server.publisher.encoded()
+                if encoded is None or encoded is sent:
+                    continue
+                self.wfile.write(frame(encoded))
+                self.wfile.flush()
+                sent = encoded
+        except OSError:
+            pass
+        self.close_connection = True
+
+    def log_message(self, format, *args):
+        # requests are not logged, a polling dashboard would flood the log
+        pass
+
+
+def frame(payload: bytes) -> bytes:
+    """Returns payload as an unmasked WebSocket text frame"""
+    length = len(payload)
+    if length < 126:
+        header = bytes((0x81, length))
+    elif length < 1 << 16:
+        header = bytes((0x81, 126)) + length.to_bytes(2, 'big')
+    else:
+        header = bytes((0x81, 127)) + length.to_bytes(8, 'big')
+    return header + payload
+
+
+class StateServer:
+    """Serves the state published by the control loop over HTTP and WebSocket from its own threads"""
+
+    def __init__(self, publisher: StatePublisher, host: str = '127.0.0.1', port: int = 8080, interval: float = 0.1):
+        """
+        :param StatePublisher publisher: the publisher the control loop publishes to
+        :param str host: the address to listen on, local only by default
+        :param int port: the port to listen on, 0 for any free port
+        :param float interval: seconds between two states sent to a WebSocket
+        """
+        self.__server = ThreadingHTTPServer((host, port), StateRequestHandler)
+        self.__server.daemon_threads = True
+        self.__server.publisher = publisher
+        self.__server.interval = interval
+        self.__server.stopped = threading.Event()
+        self.__thread = threading.Thread(target=self.__server.serve_forever, name='state server', daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.__server.server_address[1]
+
+    def start(self):
+        """Starts the thread serving the requests"""
+        self.__thread.start()
+        return self
+
+    def stop(self):
+        """Closes the WebSockets and stops serving"""
+        self.__server.stopped.set()
+        self.__server.shutdown()
+        self.__server.server_close()
@@ -0,0 +1,80 @@
+import base64
+import hashlib
+import json
+import socket
+import unittest
+from urllib.request import urlopen
+
+from StateServer import StatePublisher, StateServer, WEBSOCKET_GUID, frame
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.decoded = []
+        self.publisher = StatePublisher(self.decode)
+
+    def decode(self, state):
+        self.decoded.append(state)
+        return {'value': state}
+
+    def testLatest(self):
+        self.assertIsNone(self.publisher.latest())
+        self.publisher.publish(1)
+        self.publisher.publish(2)
+        latest = self.publisher.latest()
+        self.assertEqual((2, {'value': 2}), (latest['tick'], latest['state']))
+        # many readers of the same tick decode it once
+        self.assertIs(latest, self.publisher.latest())
+        self.assertEqual([2], self.decoded)
+
+    def testEncoded(self):
+        self.assertIsNone(self.publisher.encoded())
+        self.publisher.publish(4)
+        encoded = self.publisher.encoded()
+        self.assertEqual({'value': 4}, json.loads(encoded)['state'])
+        # every client of the same tick is sent the same bytes
+        self.assertIs(encoded, self.publisher.encoded())
+        self.publisher.publish(5)
+        self.assertEqual({'value': 5}, json.loads(self.publisher.encoded())['state'])
+        self.assertEqual([4, 5], self.decoded)
+
+    def testFrame(self):
+        self.assertEqual(b'\x81\x02{}', frame(b'{}'))
+        self.assertEqual(b'\x81\x7e\x01\x00', frame(b'a' * 256)[:4])
+
+    def testHttp(self):
+        server = StateServer(self.publisher, port=0).start()
+        try:
+            self.publisher.publish(7)
+            with urlopen('http://127.0.0.1:%d/state' % server.port) as response:
+                self.assertEqual({'value': 7}, json.load(response)['state'])
+        finally:
+            server.stop()
+
+    def testWebSocket(self):
+        server = StateServer(self.publisher, port=0, interval=0.01).start()
+        try:
+            self.publisher.publish(3)
+            key = base64.b64encode(b'0123456789abcdef').decode()
+            with socket.create_connection(('127.0.0.1', server.port), timeout=5) as client:
+                client.sendall(('GET /ws HTTP/1.1\r\nHost: localhost\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n'
+                                'Sec-WebSocket-Key: %s\r\nSec-WebSocket-Version: 13\r\n\r\n' % key).encode())
+                stream = client.makefile('rb')
+                headers = []
+                line = stream.readline()
+                while line not in (b'\r\n', b''):
+                    headers.append(line.decode().strip())
+                    line = stream.readline()
+                self.assertIn('101', headers[0])
+                accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode()).digest()).decode()
+                self.assertIn('Sec-WebSocket-Accept: ' + accept, headers)
+                opcode, length = stream.read(2)
+                self.assertEqual(0x81, opcode)
+                self.assertEqual({'value': 3}, json.loads(stream.read(length))['state'])
+        finally:
+            server.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
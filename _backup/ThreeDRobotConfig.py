@@ -1,53 +1,65 @@
+from ConfigPool import ConfigPool
+
+
 class ThreeDRobotConfig:
 
-    def __init__(self, counterVertical, counterRot, counterArm, counterGripper, endVertical=False, endRot=False, endArm=False, endGripper=False):
-        self.__counterVertical = counterVertical
-        self.__counterRot = counterRot
-        self.__counterArm = counterArm
-        self.__counterGripper = counterGripper
-        self.__endVertical = endVertical
-        self.__endRot = endRot
-        self.__endArm = endArm
-        self.__endGripper = endGripper
+    __slots__ = ('__key',)
+    pool = ConfigPool()
+
+    def __new__(cls, counterVertical, counterRot, counterArm, counterGripper, endVertical=False, endRot=False, endArm=False, endGripper=False):
+        """Returns the pooled config with these values, only creates a new one if there is none yet
+
+        The values are only held in the key tuple, the properties index into it.
+        """
+        key = (counterVertical, counterRot, counterArm, counterGripper, endVertical, endRot, endArm, endGripper)
+        self = cls.pool.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            self.__key = key
+            cls.pool.add(key, self)
+        return self
 
     def __eq__(self, other):
-        return (self.__endArm == other.endArm and
-                self.__endGripper == other.endGripper and
-                self.__endRot == other.endRot and
-                self.__endVertical == other.endVertical and
-                self.counterArm == other.counterArm and
-                self.counterGripper == other.counterGripper and
-                self.counterRot == other.counterRot and
-                self.counterVertical == other.counterVertical)
+        if self is other:
+            return True
+        if not isinstance(other, ThreeDRobotConfig):
+            return NotImplemented
+        return self.__key == other.__key
+
+    def __hash__(self):
+        return hash(self.__key)
+
+    def __reduce__(self):
+        return self.__class__, self.__key
 
     @property
     def counterVertical(self):
-        return self.__counterVertical
+        return self.__key[0]
 
     @property
     def counterRot(self):
-        return self.__counterRot
+        return self.__key[1]
 
     @property
     def counterArm(self):
-        return self.__counterArm
+        return self.__key[2]
 
     @property
     def counterGripper(self):
-        return self.__counterGripper
+        return self.__key[3]
 
     @property
     def endVertical(self):
-        return self.__endVertical
+        return self.__key[4]
 
     @property
     def endRot(self):
-        return self.__endRot
+        return self.__key[5]
 
     @property
     def endArm(self):
-        return self.__endArm
+        return self.__key[6]
 
     @property
     def endGripper(self):
-        return self.__endGripper
+        return self.__key[7]
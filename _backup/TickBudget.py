@@ -0,0 +1,84 @@
+from array import array
+from collections import deque
+from time import perf_counter
+
+# priority classes, critical work always runs, the others only while the tick is within its budget
+CRITICAL, NORMAL, LOW = range(3)
+
+
+class TickBudget:
+    """Runs the work of one tick by priority and sheds what does not fit into the time budget.
+
+    Work registered with every() runs each tick, critical first, then normal, then low, each class in the order it was
+    registered. Once the budget of the tick is used up, every() work of lower classes is skipped for this tick and work
+    queued with once() stays queued for the next one. Each shed is counted by name, and the seconds every() work took
+    in its last and in its longest run are kept by name, in arrays so timing a tick does not allocate.
+    """
+
+    def __init__(self, budget: float, clock=perf_counter):
+        """
+        :param float budget: seconds the work of one tick may take before non-critical work is shed
+        :param clock: returns the current time in seconds
+        """
+        self.budget = budget
+        self.clock = clock
+        self.__tasks = []
+        self.__queued = deque()
+        # ticks run, ticks that took longer than the budget and sheds by name
+        self.ticks = 0
+        self.overruns = 0
+        self.shed = {}
+        # seconds of the last and of the longest run of every() work, by the slot of its name
+        self.__slots = {}
+        self.__last = array('d')
+        self.__worst = array('d')
+
+    def every(self, name: str, work, priority: int = CRITICAL):
+        """Runs work each tick"""
+        slot = self.__slots[name] = len(self.__last)
+        self.__last.append(0.0)
+        self.__worst.append(0.0)
+        self.__tasks.append((priority, name, work, slot))
+        self.__tasks.sort(key=lambda task: task[0])
+        self.shed.setdefault(name, 0)
+
+    def once(self, name: str, work, priority: int = LOW):
+        """Runs work once, in the first tick with budget left after the every() work"""
+        self.__queued.append((priority, name, work))
+        self.shed.setdefault(name, 0)
+
+    def run(self):
+        """Runs the work of one tick"""
+        clock = self.clock
+        start = clock()
+        budget = self.budget
+        shed = self.shed
+        queued = self.__queued
+        last = self.__last
+        worst = self.__worst
+        for priority, name, work, slot in self.__tasks:
+            begin = clock()
+            if priority == CRITICAL or begin - start <= budget:
+                work()
+                last[slot] = clock() - begin
+                if last[slot] > worst[slot]:
+                    worst[slot] = last[slot]
+            else:
+                shed[name] += 1
+        for i in range(len(queued)):
+            priority, name, work = queued.popleft()
+            if priority == CRITICAL or self.clock() - start <= budget:
+                work()
+            else:
+                shed[name] += 1
+                queued.append((priority, name, work))
+        self.ticks += 1
+        if self.clock() - start > budget:
+            self.overruns += 1
+
+    def metrics(self) -> dict:
+        """Returns the 'ticks', 'overruns', the 'shed' work by name, the work still 'queued' and the 'seconds' of the
+        last and the 'worst' seconds of the longest run of every() work by name"""
+        return {'ticks': self.ticks, 'overruns': self.overruns, 'shed': dict(self.shed), 'queued': len(self.__queued),
+                'seconds': {name: self.__last[slot] for name, slot in self.__slots.items()},
+                'worst': {name: self.__worst[slot] for name, slot in self.__slots.items()}}
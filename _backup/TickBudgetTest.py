@@ -0,0 +1,77 @@
+import unittest
+
+from TickBudget import TickBudget, CRITICAL, NORMAL, LOW
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.now = 0.0
+        self.ran = []
+        self.budget = TickBudget(10, clock=lambda: self.now)
+
+    def work(self, name, seconds):
+        def run():
+            self.ran.append(name)
+            self.now += seconds
+        return run
+
+    def testPriorityOrder(self):
+        self.budget.every('led', self.work('led', 1), LOW)
+        self.budget.every('checkpoint', self.work('checkpoint', 1), NORMAL)
+        self.budget.every('read', self.work('read', 1), CRITICAL)
+        self.budget.every('write', self.work('write', 1), CRITICAL)
+        self.budget.run()
+        self.assertEqual(['read', 'write', 'checkpoint', 'led'], self.ran)
+        self.assertEqual({'ticks': 1, 'overruns': 0, 'shed': {'led': 0, 'checkpoint': 0, 'read': 0, 'write': 0},
+                          'queued': 0, 'seconds': {'led': 1, 'checkpoint': 1, 'read': 1, 'write': 1},
+                          'worst': {'led': 1, 'checkpoint': 1, 'read': 1, 'write': 1}}, self.budget.metrics())
+
+    def testSecondsByName(self):
+        seconds = {'read': 1, 'sequence': 5}
+        self.budget.every('read', lambda: self.work('read', seconds['read'])(), CRITICAL)
+        self.budget.every('sequence', lambda: self.work('sequence', seconds['sequence'])(), CRITICAL)
+        self.budget.run()
+        seconds['sequence'] = 2
+        self.budget.run()
+        metrics = self.budget.metrics()
+        self.assertEqual({'read': 1, 'sequence': 2}, metrics['seconds'])
+        self.assertEqual({'read': 1, 'sequence': 5}, metrics['worst'])
+
+    def testShedsOverBudget(self):
+        self.budget.every('tick', self.work('tick', 12), CRITICAL)
+        self.budget.every('write', self.work('write', 1), CRITICAL)
+        self.budget.every('checkpoint', self.work('checkpoint', 1), NORMAL)
+        self.budget.every('led', self.work('led', 1), LOW)
+        self.budget.run()
+        # critical work runs however long the tick already took
+        self.assertEqual(['tick', 'write'], self.ran)
+        self.assertEqual({'tick': 0, 'write': 0, 'checkpoint': 1, 'led': 1}, self.budget.shed)
+        self.assertEqual(1, self.budget.overruns)
+
+    def testLowShedFirst(self):
+        self.budget.every('tick', self.work('tick', 8), CRITICAL)
+        self.budget.every('led', self.work('led', 1), LOW)
+        self.budget.every('checkpoint', self.work('checkpoint', 3), NORMAL)
+        self.budget.run()
+        self.assertEqual(['tick', 'checkpoint'], self.ran)
+        self.assertEqual(1, self.budget.shed['led'])
+
+    def testOnceIsDeferred(self):
+        busy = [12]
+        self.budget.every('tick', lambda: self.work('tick', busy[0])(), CRITICAL)
+        self.budget.once('telemetry', self.work('telemetry', 1))
+        self.budget.run()
+        self.assertEqual(['tick'], self.ran)
+        metrics = self.budget.metrics()
+        self.assertEqual((1, 1, {'tick': 0, 'telemetry': 1}, 1),
+                         (metrics['ticks'], metrics['overruns'], metrics['shed'], metrics['queued']))
+        busy[0] = 1
+        self.budget.run()
+        self.budget.run()
+        self.assertEqual(['tick', 'tick', 'telemetry', 'tick'], self.ran)
+        self.assertEqual(0, self.budget.metrics()['queued'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+
+"""Sweeps the timing constants of the controls and reports the timings with the best trade-off between throughput and
+distance from the timing in the control, every combination is a shift of PlantEvents simulated on its own worker
+process.
+
+    python TimingSweep.py oven --range oven=20:40:5 --range saw=30:50:10 --cache oven.sweep
+
+The distance from default of a timing is how far its most shortened constant is cut below its value in the control, 0.0
+for the timing of today, 0.5 if one constant got half the time it has now. PlantEvents does not model failures, every
+shorter constant is simply faster, so the distance says how far a timing strays from the tested one, not whether it is
+safe. Results are kept in the cache file, a second sweep only simulates combinations not evaluated before.
+"""
+
+import argparse
+import json
+from itertools import product
+
+from Checkpoint import Checkpoint
+from PlantEvents import simulateShift, OVEN_TIMING, SORTING_STIRRING_TIMING
+from SimulationRunner import SimulationRunner
+
+# the constants that can be swept by kind, with their value in the control
+PARAMETERS = {'oven': {name: OVEN_TIMING[name] for name in ('oven', 'saw', 'pusher', 'vacuumLower', 'vacuumGrip',
+                                                             'vacuumRaise', 'releaseLower', 'release')},
+              'sortingStirring': {name: SORTING_STIRRING_TIMING[name] for name in ('milling', 'drilling', 'delivery',
+                                                                                   'settle')}}
+
+
+class TimingSweep:
+    """Simulates every combination of timing constants of one kind of cell"""
+
+    def __init__(self, kind: str, hours: float = 8, workers: int = None, cache: str = None):
+        """
+        :param str kind: the kind of cell, see PARAMETERS
+        :param float hours: simulated hours per combination
+        :param int workers: number of worker processes, None for one per CPU core
+        :param str cache: the file evaluated combinations are kept in, None to keep them in memory only
+        :raises KeyError: if the kind is unknown
+        """
+        self.kind = kind
+        self.defaults = PARAMETERS[kind]
+        self.hours = hours
+        self.runner = SimulationRunner(workers, simulateShift)
+        self.__cache = Checkpoint(cache) if cache is not None else None
+        self.__results = (self.__cache.load() if self.__cache is not None else None) or {}
+        # number of combinations simulated by the last run(), the others came from the cache
+        self.evaluated = 0
+
+    def points(self, ranges: dict) -> list:
+        """Returns every combination of the ranges
+
+        :param dict ranges: the values to try by constant, constants not given keep their value in the control
+        :return list: the timings
+        :raises KeyError: if a constant can not be swept for the kind
+        """
+        for name in ranges:
+            if name not in self.defaults:
+                raise KeyError('%s can not be swept for %s' % (name, self.kind))
+        names = list(ranges)
+        return [dict(zip(names, values)) for values in product(*(ranges[name] for name in names))]
+
+    def distance(self, timing: dict) -> float:
+        """Returns how far the most shortened constant of the timing is cut below its value in the control, as a
+        fraction of that value, 0.0 if no constant is shorter"""
+        return max([0.0] + [1.0 - value / self.defaults[name] for name, value in timing.items()])
+
+    def key(self, timing: dict) -> str:
+        return json.dumps([self.kind, self.hours, sorted(timing.items())])
+
+    def run(self, ranges: dict, done=None) -> list:
+        """Evaluates every combination of the ranges, see points()
+
+        :param done: called with each result as soon as it is simulated, e.g. to print it
+        :return list: per combination the 'timing', the 'productsPerHour' and the 'distance' from default
+        """
+        timings = self.points(ranges)
+        jobs = [{'kind': self.kind, 'hours': self.hours, 'params': {'timing': timing}}
+                for timing in timings if self.key(timing) not in self.__results]
+        self.evaluated = len(jobs)
+        if jobs:
+            for result in self.runner.run(jobs, done):
+                self.__results[self.key(result['params']['timing'])] = result['productsPerHour']
+            if self.__cache is not None:
+                self.__cache.write(self.__results)
+        return [{'timing': timing, 'productsPerHour': self.__results[self.key(timing)],
+                 'distance': self.distance(timing)} for timing in timings]
+
+    @staticmethod
+    def paretoFront(results: list) -> list:
+        """Returns the results no other result beats in throughput and distance from default at the same time
+
+        :param list results: the results of run()
+        :return list: the front, fastest first
+        """
+        front = []
+        for result in sorted(results, key=lambda r: (-r['productsPerHour'], r['distance'])):
+            if not front or result['distance'] < front[-1]['distance']:
+                front.append(result)
+        return front
+
+
+def parseRange(text: str):
+    """Parses name=start:stop:step into the name and the values from start to stop inclusive"""
+    name, values = text.split('=')
+    start, stop, step = (int(value) for value in values.split(':'))
+    return name, range(start, stop + 1, step)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweeps timing constants against throughput and distance from '
+                                                 'the timing in the control')
+    parser.add_argument('kind', choices=sorted(PARAMETERS), help='kind of cell')
+    parser.add_argument('--range', action='append', type=parseRange, default=[], dest='ranges',
+                        help='name=start:stop:step, one of %s' % ', '.join(sorted(set().union(*PARAMETERS.values()))))
+    parser.add_argument('--hours', type=float, default=8, help='simulated hours per combination')
+    parser.add_argument('--workers', type=int, default=None, help='worker processes, default one per CPU core')
+    parser.add_argument('--cache', default=None, help='file to keep evaluated combinations in')
+    args = parser.parse_args()
+
+    sweep = TimingSweep(args.kind, args.hours, args.workers, args.cache)
+    results = sweep.run(dict(args.ranges))
+    print('%d combinations, %d simulated, %d from the cache'
+          % (len(results), sweep.evaluated, len(results) - sweep.evaluated))
+    for result in TimingSweep.paretoFront(results):
+        print('%8.1f products/h  distance from default %.2f  %s'
+              % (result['productsPerHour'], result['distance'], result['timing']))
@@ -0,0 +1,60 @@
+import os
+import tempfile
+import unittest
+
+from TimingSweep import TimingSweep, parseRange
+
+
+class MyTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache = os.path.join(self.directory.name, 'oven.sweep')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testPoints(self):
+        sweep = TimingSweep('oven')
+        self.assertEqual([{'oven': 20, 'saw': 30}, {'oven': 20, 'saw': 40}, {'oven': 30, 'saw': 30},
+                          {'oven': 30, 'saw': 40}], sweep.points({'oven': [20, 30], 'saw': [30, 40]}))
+        with self.assertRaises(KeyError):
+            sweep.points({'milling': [10]})
+
+    def testDistance(self):
+        sweep = TimingSweep('oven')
+        self.assertEqual(0.5, sweep.distance({'oven': 15, 'saw': 40}))
+        self.assertEqual(0.0, sweep.distance({'oven': 45}))
+        self.assertEqual(0.0, sweep.distance({}))
+
+    def testShorterTimingsProduceMore(self):
+        results = TimingSweep('oven', hours=1, workers=1).run({'oven': [15, 30]})
+        fast, default = results
+        self.assertGreater(fast['productsPerHour'], default['productsPerHour'])
+        self.assertEqual((0.5, 0.0), (fast['distance'], default['distance']))
+
+    def testCache(self):
+        first = TimingSweep('oven', hours=1, workers=1, cache=self.cache)
+        results = first.run({'oven': [20, 30]})
+        self.assertEqual(2, first.evaluated)
+        second = TimingSweep('oven', hours=1, workers=1, cache=self.cache)
+        self.assertEqual(results, second.run({'oven': [20, 30]}))
+        self.assertEqual(0, second.evaluated)
+        second.run({'oven': [20, 30, 40]})
+        self.assertEqual(1, second.evaluated)
+
+    def testParetoFront(self):
+        results = [{'productsPerHour': 300, 'distance': 0.5},
+                   {'productsPerHour': 300, 'distance': 0.6},
+                   {'productsPerHour': 280, 'distance': 0.2},
+                   {'productsPerHour': 270, 'distance': 0.4},
+                   {'productsPerHour': 250, 'distance': 0.0}]
+        self.assertEqual([results[0], results[2], results[4]], TimingSweep.paretoFront(results))
+
+    def testParseRange(self):
+        name, values = parseRange('saw=30:50:10')
+        self.assertEqual(('saw', [30, 40, 50]), (name, list(values)))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,151 @@
+from Checkpoint import Checkpoint
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('VacuumDwell')
+
+
+class DwellTimes:
+    """The cycles a vacuum gripper dwells in each step of picking up a part: lowering onto it, gripping it with the
+    valve open and lifting it.
+
+    Calibrated dwell times are kept in a file by station, so each station is calibrated once.
+    """
+
+    __slots__ = ('lower', 'grip', 'lift')
+
+    # the steps of a pick in their order
+    STEPS = ('lower', 'grip', 'lift')
+
+    def __init__(self, lower: int, grip: int, lift: int):
+        """
+        :param int lower: cycles the gripper is lowered before the valve opens
+        :param int grip: cycles the valve is open while the gripper is down
+        :param int lift: cycles the gripper is lifted before the carrier moves
+        """
+        self.lower = lower
+        self.grip = grip
+        self.lift = lift
+
+    def __eq__(self, other):
+        return isinstance(other, DwellTimes) and self.asDict() == other.asDict()
+
+    # dwell times compare by value but their steps can be assigned, so they are not hashable
+    __hash__ = None
+
+    def __repr__(self):
+        return 'DwellTimes(lower=%d, grip=%d, lift=%d)' % (self.lower, self.grip, self.lift)
+
+    @property
+    def pick(self) -> int:
+        """Returns the cycles of the whole pick"""
+        return self.lower + self.grip + self.lift
+
+    def asDict(self) -> dict:
+        return {step: getattr(self, step) for step in self.STEPS}
+
+    def replace(self, step: str, cycles: int):
+        """Returns a copy with the cycles of one step replaced"""
+        times = self.asDict()
+        times[step] = cycles
+        return DwellTimes(**times)
+
+    def save(self, filename: str, station: str):
+        """Writes the dwell times of a station to a file, the ones of other stations in it are kept"""
+        checkpoint = Checkpoint(filename)
+        stations = checkpoint.load() or {}
+        stations[station] = self.asDict()
+        checkpoint.write(stations)
+
+    @classmethod
+    def load(cls, filename: str, station: str):
+        """Returns the dwell times of a station written to a file, None if there are none"""
+        stations = Checkpoint(filename).load()
+        if not stations or station not in stations:
+            return None
+        return cls(**stations[station])
+
+
+class DwellCalibration:
+    """Finds the shortest reliable dwell times of a vacuum gripper from repeated picks.
+
+    Every pick while calibrating is a trial. A trial succeeds if the confirmation signal of the station shows the part
+    was lifted, e.g. the light barrier under the gripper no longer sees it. The steps are calibrated one after the
+    other, each by a binary search between one cycle and its default, with the steps calibrated before it already
+    shortened. A dwell time counts as reliable once it succeeded in every one of trials picks. The result adds margin
+    cycles to every step calibrated this way. Every trial is recorded in trace.
+    """
+
+    def __init__(self, defaults: DwellTimes, steps: tuple = ('grip', 'lower'), trials: int = 3, margin: int = 1,
+                 filename: str = None, station: str = None):
+        """
+        :param DwellTimes defaults: the dwell times known to work, steps not calibrated keep them
+        :param tuple steps: the steps to calibrate, only steps the confirmation signal can tell apart
+        :param int trials: the picks a dwell time has to succeed in
+        :param int margin: the cycles added to every calibrated step
+        :param str filename: the file the result is written to once the calibration is done, None to not write it
+        :param str station: the station the result is written for
+        """
+        self.defaults = defaults
+        self.steps = list(steps)
+        self.trials = trials
+        self.margin = margin
+        self.filename = filename
+        self.station = station
+        # (step, cycles tried, success) of every trial
+        self.trace = []
+        self.result = None
+        self.__calibrated = defaults
+        self.__successes = 0
+        self.__low = self.__high = 0
+        self.startStep()
+
+    @property
+    def done(self) -> bool:
+        return self.result is not None
+
+    def startStep(self):
+        """Starts the search of the next step, sets the result once all steps are calibrated"""
+        while self.steps:
+            step = self.steps[0]
+            # a dwell of low cycles is known to fail, one of high cycles to work
+            self.__low, self.__high = 0, getattr(self.defaults, step)
+            if self.__high - self.__low > 1:
+                return
+            self.steps.pop(0)
+        times = self.__calibrated
+        for step in DwellTimes.STEPS:
+            if getattr(times, step) != getattr(self.defaults, step):
+                times = times.replace(step, min(getattr(times, step) + self.margin, getattr(self.defaults, step)))
+        self.result = times
+        log.info('vacuum gripper calibrated to %s in %d trials', times, len(self.trace))
+        if self.filename is not None:
+            times.save(self.filename, self.station)
+
+    def next(self) -> DwellTimes:
+        """Returns the dwell times of the next trial, the result once the calibration is done"""
+        if self.done:
+            return self.result
+        step = self.steps[0]
+        return self.__calibrated.replace(step, (self.__low + self.__high) // 2)
+
+    def report(self, times: DwellTimes, success: bool):
+        """Adds the result of a trial with times from next()"""
+        if self.done:
+            return
+        step = self.steps[0]
+        cycles = getattr(times, step)
+        self.trace.append((step, cycles, success))
+        if not success:
+            self.__successes = 0
+            self.__low = cycles
+        else:
+            self.__successes += 1
+            if self.__successes < self.trials:
+                return
+            self.__successes = 0
+            self.__high = cycles
+            self.__calibrated = self.__calibrated.replace(step, cycles)
+        if self.__high - self.__low <= 1:
+            self.__calibrated = self.__calibrated.replace(step, self.__high)
+            self.steps.pop(0)
+            self.startStep()
@@ -0,0 +1,78 @@
+import os
+import tempfile
+import unittest
+
+from CellSimulation import CELLS
+from SimRevPi import SimRevPi
+from VacuumDwell import DwellTimes, DwellCalibration
+from machine_group import MachineGroup
+
+
+def runOven(ticks: int, dwell: DwellTimes = None):
+    cell, plant, cycleTime = CELLS['oven'](SimRevPi(), {})
+    if dwell is not None:
+        cell.machine_group.dwell = dwell
+    for tick in range(ticks):
+        cell.tick()
+        plant.step()
+    return cell.machine_group, plant
+
+
+class MyTestCase(unittest.TestCase):
+    def testSearch(self):
+        #the part is held once lowered for 4 cycles and gripped for 2
+        calibration = DwellCalibration(DwellTimes(lower=10, grip=5, lift=10), trials=2)
+        while not calibration.done:
+            times = calibration.next()
+            calibration.report(times, times.lower >= 4 and times.grip >= 2)
+        self.assertEqual(DwellTimes(lower=5, grip=3, lift=10), calibration.result)
+        self.assertEqual(calibration.result, calibration.next())
+        self.assertEqual('grip', calibration.trace[0][0])
+        self.assertEqual('lower', calibration.trace[-1][0])
+
+    def testSaveLoad(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'oven.dwell')
+            self.assertIsNone(DwellTimes.load(filename, 'oven'))
+            DwellTimes(7, 4, 10).save(filename, 'oven')
+            DwellTimes(3, 2, 8).save(filename, 'highBay')
+            self.assertEqual(DwellTimes(7, 4, 10), DwellTimes.load(filename, 'oven'))
+            self.assertEqual(DwellTimes(3, 2, 8), DwellTimes.load(filename, 'highBay'))
+            self.assertIsNone(DwellTimes.load(filename, 'sorting'))
+
+    def testEqual(self):
+        self.assertEqual(DwellTimes(7, 4, 10), DwellTimes(7, 4, 10))
+        self.assertNotEqual(DwellTimes(7, 4, 10), DwellTimes(7, 4, 10).replace('grip', 5))
+        self.assertRaises(TypeError, hash, DwellTimes(7, 4, 10))
+
+    def testCalibrateOven(self):
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, 'oven.dwell')
+            calibration = DwellCalibration(MachineGroup.default_dwell, filename=filename, station='oven')
+            cell, plant, cycleTime = CELLS['oven'](SimRevPi(), {})
+            cell.machine_group.calibration = calibration
+            for tick in range(10000):
+                cell.tick()
+                plant.step()
+                if calibration.done:
+                    break
+            self.assertTrue(calibration.done)
+            self.assertEqual(calibration.result, DwellTimes.load(filename, 'oven'))
+        #the plant needs 6 ticks to lower and 3 to grip, plus the margin
+        self.assertEqual(DwellTimes(lower=7, grip=4, lift=10), calibration.result)
+        self.assertTrue(any(not success for step, cycles, success in calibration.trace))
+
+    def testFasterPick(self):
+        default = runOven(8000)[1].produced
+        calibrated = runOven(8000, dwell=DwellTimes(lower=7, grip=4, lift=10))[1].produced
+        self.assertGreaterEqual(calibrated, default)
+
+    def testFallback(self):
+        #a gripper that got slower than its calibration misses the part, then picks it with the default dwell times
+        machineGroup, plant = runOven(4000, dwell=DwellTimes(lower=3, grip=2, lift=10))
+        self.assertEqual(MachineGroup.default_dwell, machineGroup.dwell)
+        self.assertGreater(plant.produced, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
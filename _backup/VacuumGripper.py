@@ -3,10 +3,32 @@ from Axis import AxisType, Axis
 from VacuumGripperConfig import VacuumGripperConfig
 from CyclicWaiter import CyclicWaiter
 from math import isclose
+from ProcessImage import ImageBit, ImageWord
 
 
 class VacuumGripper(MovingMachine):
 
+    # sensors and actuators, views onto bits and words of a process image
+    vacuumActCompressorOn = ImageBit()
+    vacuumActValve = ImageBit()
+    vacuumSensVerticalEndUp = ImageBit()
+    vacuumSensVerticalEncoderCounter = ImageWord('i')
+    vacuumSensArmEndIn = ImageBit()
+    vacuumSensArmEncoderCounter = ImageWord('i')
+    vacuumSensRotEnd = ImageBit()
+    vacuumSensRotEncoderCounter = ImageWord('i')
+    vacuumActArmOut = ImageBit()
+    vacuumActArmIn = ImageBit()
+    vacuumActVerticalDown = ImageBit()
+    vacuumActVerticalUp = ImageBit()
+    vacuumActRotRight = ImageBit()
+    vacuumActRotLeft = ImageBit()
+
+    #referenzfahrt des vacuumers um alle counter korrekt zu setzen - setzen der counter an anderer Stelle, hier aber in Referenzposition
+    homingAxes = (('arm', 'vacuumSensArmEndIn', 'vacuumActArmIn', ()),
+                  ('vertical', 'vacuumSensVerticalEndUp', 'vacuumActVerticalUp', ('arm',)),
+                  ('rot', 'vacuumSensRotEnd', 'vacuumActRotRight', ('arm',)))
+
     def generateTransferMoveList(self, numPickup, numPlace):
         offset = 250
         # Arm einfahren
@@ -52,16 +74,16 @@ class VacuumGripper(MovingMachine):
 
     @property
     def isExecuting(self) -> bool:
-        if self.__vacuumActRotRight or self.__vacuumActRotLeft or self.__vacuumActVerticalUp or self.__vacuumActVerticalDown or self.__vacuumActCompressorOn or self.__vacuumActValve or self.__vacuumActArmOut or self.__vacuumActArmIn:
+        if self.vacuumActRotRight or self.vacuumActRotLeft or self.vacuumActVerticalUp or self.vacuumActVerticalDown or self.vacuumActCompressorOn or self.vacuumActValve or self.vacuumActArmOut or self.vacuumActArmIn:
             return True
         else:
             return False
 
     def __init__(self, id1, placeList):
         super().__init__(id1, placeList)
-        self.__vacuumSensArmEndIn = self.__vacuumSensVerticalEndUp  = self.__vacuumSensRotEnd = False
-        self.__vacuumActArmOut = self.__vacuumActArmIn = self.__vacuumActVerticalDown = self.__vacuumActVerticalUp = self.__vacuumActRotRight = self.__vacuumActRotLeft = self.__vacuumActCompressorOn = self.__vacuumActValve = False
-        self.__vacuumSensRotEncoderCounter = self.__vacuumSensVerticalEncoderCounter = self.__vacuumSensArmEncoderCounter = 0
+        self.vacuumSensArmEndIn = self.vacuumSensVerticalEndUp  = self.vacuumSensRotEnd = False
+        self.vacuumActArmOut = self.vacuumActArmIn = self.vacuumActVerticalDown = self.vacuumActVerticalUp = self.vacuumActRotRight = self.vacuumActRotLeft = self.vacuumActCompressorOn = self.vacuumActValve = False
+        self.vacuumSensRotEncoderCounter = self.vacuumSensVerticalEncoderCounter = self.vacuumSensArmEncoderCounter = 0
         self.__axisArm = Axis(AxisType.Encoder, 20)
         self.__axisVertical = Axis(AxisType.Encoder, 20)
         self.__axisRot = Axis(AxisType.Encoder, 20)
@@ -72,119 +94,6 @@ class VacuumGripper(MovingMachine):
         self.__pc = 0
         self.configGoal = None
 
-
-    @property
-    def vacuumActCompressorOn(self):
-        return self.__vacuumActCompressorOn
-
-    @vacuumActCompressorOn.setter
-    def vacuumActCompressorOn(self, value):
-        self.__vacuumActCompressorOn = value
-
-    @property
-    def vacuumActValve(self):
-        return self.__vacuumActValve
-
-    @vacuumActValve.setter
-    def vacuumActValve(self, value):
-        self.__vacuumActValve = value
-
-    @property
-    def vacuumSensVerticalEndUp(self) -> bool:
-        return self.__vacuumSensVerticalEndUp
-
-    @vacuumSensVerticalEndUp.setter
-    def vacuumSensVerticalEndUp(self, value):
-        self.__vacuumSensVerticalEndUp = value
-
-    @property
-    def vacuumSensVerticalEncoderCounter(self):
-        return self.__vacuumSensVerticalEncoderCounter
-
-    @vacuumSensVerticalEncoderCounter.setter
-    def vacuumSensVerticalEncoderCounter(self, value):
-        self.__vacuumSensVerticalEncoderCounter = value
-
-    @property
-    def vacuumSensArmEndIn(self) -> bool:
-        return self.__vacuumSensArmEndIn
-
-    @vacuumSensArmEndIn.setter
-    def vacuumSensArmEndIn(self, value):
-        self.__vacuumSensArmEndIn = value
-
-    @property
-    def vacuumSensArmEncoderCounter(self):
-        return self.__vacuumSensArmEncoderCounter
-
-    @vacuumSensArmEncoderCounter.setter
-    def vacuumSensArmEncoderCounter(self, value):
-        self.__vacuumSensArmEncoderCounter = value
-
-    @property
-    def vacuumSensRotEnd(self):
-        return self.__vacuumSensRotEnd
-
-    @vacuumSensRotEnd.setter
-    def vacuumSensRotEnd(self, value):
-        self.__vacuumSensRotEnd = value
-
-    @property
-    def vacuumSensRotEncoderCounter(self):
-        return self.__vacuumSensRotEncoderCounter
-
-    @vacuumSensRotEncoderCounter.setter
-    def vacuumSensRotEncoderCounter(self, value):
-        self.__vacuumSensRotEncoderCounter = value
-
-    @property
-    def vacuumActArmOut(self):
-        return self.__vacuumActArmOut
-
-    @vacuumActArmOut.setter
-    def vacuumActArmOut(self, value):
-        self.__vacuumActArmOut = value
-
-    @property
-    def vacuumActArmIn(self):
-        return self.__vacuumActArmIn
-
-    @vacuumActArmIn.setter
-    def vacuumActArmIn(self, value):
-        self.__vacuumActArmIn = value
-
-    @property
-    def vacuumActVerticalDown(self):
-        return self.__vacuumActVerticalDown
-
-    @vacuumActVerticalDown.setter
-    def vacuumActVerticalDown(self, value):
-        self.__vacuumActVerticalDown = value
-
-    @property
-    def vacuumActVerticalUp(self):
-        return self.__vacuumActVerticalUp
-
-    @vacuumActVerticalUp.setter
-    def vacuumActVerticalUp(self, value):
-        self.__vacuumActVerticalUp = value
-
-    @property
-    def vacuumActRotRight(self):
-        return self.__vacuumActRotRight
-
-    @vacuumActRotRight.setter
-    def vacuumActRotRight(self, value):
-        self.__vacuumActRotRight = value
-
-    @property
-    def vacuumActRotLeft(self):
-        return self.__vacuumActRotLeft
-
-    @vacuumActRotLeft.setter
-    def vacuumActRotLeft(self, value):
-        self.__vacuumActRotLeft = value
-
     def executeHelper(self):
         if self.setupFinishedHelper:
             self.setupFinishedHelper = False
@@ -192,6 +101,12 @@ class VacuumGripper(MovingMachine):
         else:
             return False, False, True
 
+    @property
+    def axes(self) -> dict:
+        return {'vertical': (self.__axisVertical, self.vacuumSensVerticalEndUp, self.vacuumSensVerticalEncoderCounter),
+                'rot': (self.__axisRot, self.vacuumSensRotEnd, self.vacuumSensRotEncoderCounter),
+                'arm': (self.__axisArm, self.vacuumSensArmEndIn, self.vacuumSensArmEncoderCounter)}
+
     def gotoConfig(self, config):
         t1 = t2 = t3 = t4 = False
         d3 = None
@@ -212,40 +127,17 @@ class VacuumGripper(MovingMachine):
         self.vacuumActArmOut = self.__axisArm.outputplus
 
         if config.gripperActive:
-            self.__vacuumActCompressorOn = True
-            self.__vacuumActValve = True
+            self.vacuumActCompressorOn = True
+            self.vacuumActValve = True
             t4 = self.__gripperWaiter.wait()
         else:
-            self.__vacuumActCompressorOn = False
-            self.__vacuumActValve = False
+            self.vacuumActCompressorOn = False
+            self.vacuumActValve = False
             t4 = True
 
         return (t1 and t2 and t3 and t4)
 
-    #referenzfahrt des vacuumers um alle counter korrekt zu setzen - setzen der counter an anderer Stelle, hier aber in Referenzposition
-    #von execute bereits berücksichtigt
     def setup(self):
-        t1 = t2 = t3 = False
-        if self.vacuumSensArmEndIn:
-            self.vacuumActArmIn = False
-            t3 = True
-        else:
-            self.vacuumActArmIn = True
-
-        if self.vacuumSensVerticalEndUp:
-            self.vacuumActVerticalUp = False
-            t1 = True
-        elif t3:
-            self.vacuumActVerticalUp = True
-
-        if self.vacuumSensRotEnd:
-            self.vacuumActRotRight = False
-            t2 = True
-        elif t3:
-            self.vacuumActRotRight = True
-
         self.vacuumActCompressorOn = False
         self.vacuumActValve = False
-
-        return (t1 and t2 and t3)
-
+        return super().setup()
@@ -1,48 +1,61 @@
+from ConfigPool import ConfigPool
+
+
 class VacuumGripperConfig:
 
-    def __init__(self, counterVertical, counterRot, counterArm, gripperActive, endVertical=False, endRot=False, endArm=False):
-        self.__counterVertical = counterVertical
-        self.__counterRot = counterRot
-        self.__counterArm = counterArm
-        self.__gripperActive = gripperActive
-        self.__endVertical = endVertical
-        self.__endRot = endRot
-        self.__endArm = endArm
+    __slots__ = ('__key',)
+    pool = ConfigPool()
+
+    def __new__(cls, counterVertical, counterRot, counterArm, gripperActive, endVertical=False, endRot=False, endArm=False):
+        """Returns the pooled config with these values, only creates a new one if there is none yet
+
+        The values are only held in the key tuple, the properties index into it.
+        """
+        key = (counterVertical, counterRot, counterArm, gripperActive, endVertical, endRot, endArm)
+        self = cls.pool.get(key)
+        if self is None:
+            self = object.__new__(cls)
+            self.__key = key
+            cls.pool.add(key, self)
+        return self
 
     def __eq__(self, other):
-        return (self.__endArm == other.endArm and
-                self.__endRot == other.endRot and
-                self.__endVertical == other.endVertical and
-                self.counterArm == other.counterArm and
-                self.gripperActive == other.gripperActive and
-                self.counterRot == other.counterRot and
-                self.counterVertical == other.counterVertical)
+        if self is other:
+            return True
+        if not isinstance(other, VacuumGripperConfig):
+            return NotImplemented
+        return self.__key == other.__key
+
+    def __hash__(self):
+        return hash(self.__key)
+
+    def __reduce__(self):
+        return self.__class__, self.__key
 
     @property
     def counterVertical(self):
-        return self.__counterVertical
+        return self.__key[0]
 
     @property
     def counterRot(self):
-        return self.__counterRot
+        return self.__key[1]
 
     @property
     def counterArm(self):
-        return self.__counterArm
+        return self.__key[2]
 
     @property
     def gripperActive(self):
-        return self.__gripperActive
+        return self.__key[3]
 
     @property
     def endVertical(self):
-        return self.__endVertical
+        return self.__key[4]
 
     @property
     def endRot(self):
-        return self.__endRot
+        return self.__key[5]
 
     @property
     def endArm(self):
-        return self.__endArm
-
+        return self.__key[6]
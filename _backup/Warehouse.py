@@ -2,10 +2,34 @@ from Machine import Machine
 from MovingMachine import MovingMachine
 from WarehouseConfig import WarehouseConfig
 from Axis import AxisType, Axis
+from ProcessImage import ImageBit, ImageWord
 
 
 class Warehouse(MovingMachine):
 
+    # sensors and actuators, views onto bits and words of a process image
+    warehouseSensHorizontalEnd = ImageBit()
+    warehouseSensLightBarrierIn = ImageBit()
+    warehouseSensLightBarrierOut = ImageBit()
+    warehouseSensVerticalEnd = ImageBit()
+    warehouseSensArmIn = ImageBit()
+    warehouseSensArmOut = ImageBit()
+    warehouseSensEncoderHorizontal = ImageWord('i')
+    warehouseSensEncoderVertical = ImageWord('i')
+    warehouseActConveyorIn = ImageBit()
+    warehouseActConveyorOut = ImageBit()
+    warehouseActHorizontalToRack = ImageBit()
+    warehouseActHorizontalToConveyor = ImageBit()
+    warehouseActVerticalDown = ImageBit()
+    warehouseActVerticalUp = ImageBit()
+    warehouseActArmIn = ImageBit()
+    warehouseActArmOut = ImageBit()
+
+    #only move after arm is in secure position
+    homingAxes = (('arm', 'warehouseSensArmIn', 'warehouseActArmIn', ()),
+                  ('vertical', 'warehouseSensVerticalEnd', 'warehouseActVerticalUp', ('arm',)),
+                  ('horizontal', 'warehouseSensHorizontalEnd', 'warehouseActHorizontalToConveyor', ('arm',)))
+
     def generateTransferMoveList(self, numPickup, numPlace):
         offset = 50
         # (sicherheitshalber) Arm einfahren
@@ -51,7 +75,7 @@ class Warehouse(MovingMachine):
 
     @property
     def isExecuting(self) -> bool:
-        if self.__warehouseActConveyorIn or self.__warehouseActConveyorOut or self.__warehouseActHorizontalToRack or self.__warehouseActHorizontalToConveyor or self.__warehouseActVerticalUp or self.__warehouseActVerticalDown or self.__warehouseActArmIn or self.__warehouseActArmOut:
+        if self.warehouseActConveyorIn or self.warehouseActConveyorOut or self.warehouseActHorizontalToRack or self.warehouseActHorizontalToConveyor or self.warehouseActVerticalUp or self.warehouseActVerticalDown or self.warehouseActArmIn or self.warehouseActArmOut:
             return True
         else:
             return False
@@ -68,141 +92,12 @@ class Warehouse(MovingMachine):
         box8 = [1630, 2620]
         box9 = [1630, 3780]
         super().__init__(id1, [conveyor, box1, box2, box3, box4, box5, box6, box7, box8, box9])
-        self.__warehouseSensHorizontalEnd = self.__warehouseSensLightBarrierIn = self.__warehouseSensLightBarrierOut = self.__warehouseSensVerticalEnd = self.__warehouseSensArmIn = self.__warehouseSensArmOut = False
-        self.__warehouseSensEncoderHorizontal = self.__warehouseSensEncoderVertical = 0
-        self.__warehouseActConveyorIn = self.__warehouseActConveyorOut = self.__warehouseActHorizontalToRack = self.__warehouseActHorizontalToConveyor = self.__warehouseActVerticalUp = self.__warehouseActVerticalDown = self.__warehouseActArmIn = self.__warehouseActArmOut = False
+        self.warehouseSensHorizontalEnd = self.warehouseSensLightBarrierIn = self.warehouseSensLightBarrierOut = self.warehouseSensVerticalEnd = self.warehouseSensArmIn = self.warehouseSensArmOut = False
+        self.warehouseSensEncoderHorizontal = self.warehouseSensEncoderVertical = 0
+        self.warehouseActConveyorIn = self.warehouseActConveyorOut = self.warehouseActHorizontalToRack = self.warehouseActHorizontalToConveyor = self.warehouseActVerticalUp = self.warehouseActVerticalDown = self.warehouseActArmIn = self.warehouseActArmOut = False
         self.__axisVertical = Axis(AxisType.Encoder, 13)
         self.__axisHorizontal = Axis(AxisType.Encoder, 13)
 
-
-    @property
-    def warehouseSensHorizontalEnd(self) -> bool:
-        return self.__warehouseSensHorizontalEnd
-
-    @warehouseSensHorizontalEnd.setter
-    def warehouseSensHorizontalEnd(self, value: bool):
-        self.__warehouseSensHorizontalEnd = value
-
-    @property
-    def warehouseSensLightBarrierIn(self):
-        return self.__warehouseSensLightBarrierIn
-
-    @warehouseSensLightBarrierIn.setter
-    def warehouseSensLightBarrierIn(self, value):
-        self.__warehouseSensLightBarrierIn = value
-
-    @property
-    def warehouseSensLightBarrierOut(self):
-        return self.__warehouseSensLightBarrierOut
-
-    @warehouseSensLightBarrierOut.setter
-    def warehouseSensLightBarrierOut(self, value):
-        self.__warehouseSensLightBarrierOut = value
-
-    @property
-    def warehouseSensVerticalEnd(self):
-        return self.__warehouseSensVerticalEnd
-
-    @warehouseSensVerticalEnd.setter
-    def warehouseSensVerticalEnd(self, value):
-        self.__warehouseSensVerticalEnd = value
-
-    @property
-    def warehouseSensArmIn(self):
-        return self.__warehouseSensArmIn
-
-    @warehouseSensArmIn.setter
-    def warehouseSensArmIn(self, value):
-        self.__warehouseSensArmIn = value
-
-    @property
-    def warehouseSensArmOut(self):
-        return self.__warehouseSensArmOut
-
-    @warehouseSensArmOut.setter
-    def warehouseSensArmOut(self, value):
-        self.__warehouseSensArmOut = value
-
-    @property
-    def warehouseSensEncoderHorizontal(self):
-        return self.__warehouseSensEncoderHorizontal
-
-    @warehouseSensEncoderHorizontal.setter
-    def warehouseSensEncoderHorizontal(self, value):
-        self.__warehouseSensEncoderHorizontal = value
-
-    @property
-    def warehouseSensEncoderVertical(self):
-        return self.__warehouseSensEncoderVertical
-
-    @warehouseSensEncoderVertical.setter
-    def warehouseSensEncoderVertical(self, value):
-        self.__warehouseSensEncoderVertical = value
-
-    @property
-    def warehouseActConveyorIn(self):
-        return self.__warehouseActConveyorIn
-
-    @warehouseActConveyorIn.setter
-    def warehouseActConveyorIn(self, value):
-        self.__warehouseActConveyorIn = value
-
-    @property
-    def warehouseActConveyorOut(self):
-        return self.__warehouseActConveyorOut
-
-    @warehouseActConveyorOut.setter
-    def warehouseActConveyorOut(self, value):
-        self.__warehouseActConveyorOut = value
-
-    @property
-    def warehouseActHorizontalToRack(self):
-        return self.__warehouseActHorizontalToRack
-
-    @warehouseActHorizontalToRack.setter
-    def warehouseActHorizontalToRack(self, value):
-        self.__warehouseActHorizontalToRack = value
-
-    @property
-    def warehouseActHorizontalToConveyor(self):
-        return self.__warehouseActHorizontalToConveyor
-
-    @warehouseActHorizontalToConveyor.setter
-    def warehouseActHorizontalToConveyor(self, value):
-        self.__warehouseActHorizontalToConveyor = value
-
-    @property
-    def warehouseActVerticalDown(self):
-        return self.__warehouseActVerticalDown
-
-    @warehouseActVerticalDown.setter
-    def warehouseActVerticalDown(self, value):
-        self.__warehouseActVerticalDown = value
-
-    @property
-    def warehouseActVerticalUp(self):
-        return self.__warehouseActVerticalUp
-
-    @warehouseActVerticalUp.setter
-    def warehouseActVerticalUp(self, value):
-        self.__warehouseActVerticalUp = value
-
-    @property
-    def warehouseActArmIn(self):
-        return self.__warehouseActArmIn
-
-    @warehouseActArmIn.setter
-    def warehouseActArmIn(self, value):
-        self.__warehouseActArmIn = value
-
-    @property
-    def warehouseActArmOut(self):
-        return self.__warehouseActArmOut
-
-    @warehouseActArmOut.setter
-    def warehouseActArmOut(self, value):
-        self.__warehouseActArmOut = value
-
     #TODO execute-Logik
 
     #TODO speichermechanismus für Belegung des Regals
@@ -246,28 +141,6 @@ class Warehouse(MovingMachine):
             t4 = True
         return t1 and t2 and t3 and t4
 
-    def setup(self):
-        t1 = t2 = t3 = False
-        if self.warehouseSensArmIn:
-            self.warehouseActArmIn = False
-            t1 = True
-        else:
-            self.warehouseActArmIn = True
-
-        if self.warehouseSensVerticalEnd:
-            self.warehouseActVerticalUp = False
-            t2 = True
-        elif t1: #only move after arm is in secure position
-            self.warehouseActVerticalUp = True
-
-        if self.warehouseSensHorizontalEnd:
-            self.warehouseActHorizontalToConveyor = False
-            t3 = True
-        elif t1:
-            self.warehouseActHorizontalToConveyor = True
-
-        return (t1 and t2 and t3)
-
     def executeHelper(self):
         """Used to manage reset of encoder counters end of setup
 
@@ -279,3 +152,7 @@ class Warehouse(MovingMachine):
         else:
             return False, False
 
+    @property
+    def axes(self) -> dict:
+        return {'vertical': (self.__axisVertical, self.warehouseSensVerticalEnd, self.warehouseSensEncoderVertical),
+                'horizontal': (self.__axisHorizontal, self.warehouseSensHorizontalEnd, self.warehouseSensEncoderHorizontal)}
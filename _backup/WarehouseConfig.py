@@ -1,57 +1,69 @@
+from ConfigPool import ConfigPool
+
+
 class WarehouseConfig:
 
-    def __init__(self,counterVertical,counterHorizontal,armEndIn,armEndOut,conveyorIn,conveyorOut,horizontalEnd=False,verticalEnd=False):
-        self.__counterVertical = counterVertical
-        self.__counterHorizontal = counterHorizontal
-        self.__armEndIn = armEndIn
-        self.__armEndOut = armEndOut
-        if armEndOut and armEndIn:
-            raise ValueError("both cant be true at the same time")
-        self.__conveyorIn = conveyorIn
-        self.__conveyorOut = conveyorOut
-        if conveyorOut and conveyorIn:
-            raise ValueError("both cant be true at the same time")
-        self.__horizontalEnd = horizontalEnd
-        self.__verticalEnd = verticalEnd
+    __slots__ = ('__key',)
+    pool = ConfigPool()
+
+    def __new__(cls,counterVertical,counterHorizontal,armEndIn,armEndOut,conveyorIn,conveyorOut,horizontalEnd=False,verticalEnd=False):
+        """Returns the pooled config with these values, only creates a new one if there is none yet
+
+        The values are only held in the key tuple, the properties index into it.
+        """
+        key = (counterVertical, counterHorizontal, armEndIn, armEndOut, conveyorIn, conveyorOut, horizontalEnd, verticalEnd)
+        self = cls.pool.get(key)
+        if self is None:
+            if armEndOut and armEndIn:
+                raise ValueError("both cant be true at the same time")
+            if conveyorOut and conveyorIn:
+                raise ValueError("both cant be true at the same time")
+            self = object.__new__(cls)
+            self.__key = key
+            cls.pool.add(key, self)
+        return self
 
     def __eq__(self, other):
-        return (self.__counterVertical == other.counterVertical and
-                self.__counterHorizontal == other.counterHorizontal and
-                self.__armEndIn == other.armEndIn and
-                self.__armEndOut == other.armEndOut and
-                self.__conveyorIn == other.conveyorIn and
-                self.__conveyorOut == other.conveyorOut and
-                self.__horizontalEnd == other.horizontalEnd and
-                self.__verticalEnd == other.verticalEnd)
+        if self is other:
+            return True
+        if not isinstance(other, WarehouseConfig):
+            return NotImplemented
+        return self.__key == other.__key
+
+    def __hash__(self):
+        return hash(self.__key)
+
+    def __reduce__(self):
+        return self.__class__, self.__key
 
     @property
     def counterVertical(self):
-        return self.__counterVertical
+        return self.__key[0]
 
     @property
     def counterHorizontal(self):
-        return self.__counterHorizontal
+        return self.__key[1]
 
     @property
     def armEndIn(self):
-        return self.__armEndIn
+        return self.__key[2]
 
     @property
     def armEndOut(self):
-        return self.__armEndOut
+        return self.__key[3]
 
     @property
     def conveyorIn(self):
-        return self.__conveyorIn
+        return self.__key[4]
 
     @property
     def conveyorOut(self):
-        return self.__conveyorOut
+        return self.__key[5]
 
     @property
     def horizontalEnd(self):
-        return self.__horizontalEnd
+        return self.__key[6]
 
     @property
     def verticalEnd(self):
-        return self.__verticalEnd
+        return self.__key[7]
@@ -9,21 +9,78 @@ blocking, with a personalised while loop next to the event system.
 """
 
 
-import revpimodio2
+import os
+import sys
 from machine_group import MachineGroup
+from ProcessImage import ProcessImage
+from IoMap import IoMap
+import oven_io_map
+from VacuumDwell import DwellTimes, DwellCalibration
+from ControlLog import ControlLog
 from time import sleep
+from StateServer import StatePublisher, StateServer
+from TickBudget import TickBudget, CRITICAL, LOW
+
+log = ControlLog.getLogger('cycle_event_manager')
 
 class CycleEventManager():
     """Entry point for Fischertechnik Multiprocess Station with Oven control 
     over RevPi."""
-    def __init__(self):
-        # Instantiate RevPiModIO controlling library
-        self.rpi = revpimodio2.RevPiModIO(autorefresh=True)
+    # Seconds the loop waits between two cycles
+    cycle_time = 0.05
+    # Seconds of work per cycle, beyond them publishing the state and the
+    # LED are shed
+    tick_budget = 0.03
+
+    # File the calibrated dwell times of the vacuum gripper are kept in, by
+    # station
+    dwell_file = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'oven.dwell')
+
+    def __init__(self, rpi=None, calibrate: bool = False):
+        # Instantiate RevPiModIO controlling library, unless an IO image
+        # is handed over, e.g. a simulated one
+        if rpi is None:
+            import revpimodio2
+            rpi = revpimodio2.RevPiModIO(autorefresh=True)
+        self.rpi = rpi
         # Handle SIGINT / SIGTERM to exit program cleanly
         self.rpi.handlesignalend(self.cleanup_revpi)
         #create multiprocessing object (not the Python Multiprocessing lib!)
         #self.machine_group = MachineGroup(1)
-        self.machine_group = MachineGroup()
+        # The vacuum gripper dwells as calibrated, if it was. With
+        # calibrate, every pick is a trial until the shortest reliable dwell
+        # times are found and written
+        dwell = DwellTimes.load(self.dwell_file, 'oven')
+        if dwell is None:
+            log.info('vacuum gripper not calibrated, using %s',
+                     MachineGroup.default_dwell)
+        calibration = (DwellCalibration(MachineGroup.default_dwell,
+                                        filename=self.dwell_file,
+                                        station='oven')
+                       if calibrate else None)
+        self.machine_group = MachineGroup(self.cycle_time, dwell, calibration)
+        # All sensor and actuator variables of the machine group in one
+        # bit-packed image, attached before the IoMap binds them
+        mapping = oven_io_map.INPUTS + oven_io_map.OUTPUTS
+        self.image = ProcessImage.fromLayout(self, ProcessImage.layout(mapping))
+        # The IO mapping is compiled once, read and write then copy the
+        # whole image in one pass
+        self.io_map = IoMap(self.rpi, self, oven_io_map.INPUTS,
+                            oven_io_map.OUTPUTS)
+        # The state of the station is published every cycle for readers on
+        # other threads, see StateServer
+        self.state = StatePublisher(self.decode_state)
+        # The work of one cycle by priority, the IO, the process and
+        # publishing the state always run, so the metrics of the budget reach
+        # the readers during overruns as well
+        self.budget = TickBudget(self.tick_budget)
+        self.budget.every('read', self.read, CRITICAL)
+        self.budget.every('process', self.machine_group.process_product,
+                          CRITICAL)
+        self.budget.every('write', self.write, CRITICAL)
+        self.budget.every('publish', self.publish, CRITICAL)
+        self.budget.every('led', self.toggle_led, LOW)
 
 
     def cleanup_revpi(self):
@@ -47,83 +104,67 @@ class CycleEventManager():
         self.rpi.mainloop(blocking=False)
         # My own loop to do some work next to the event system. We will stay
         # here till self.rpi.exitsignal.wait returns True after SIGINT/SIGTERM
-        # The loop does 3 things, continuously: 
-        #   0. Sets the Rpi a1 light
+        # The loop does these things, continuously, by priority: 
         #   1. Reads the sensors states
         #   2. Calls the .process_product function
         #   3. Writes the actuators desired states
+        #   4. Publishes the state
+        #   5. Sets the Rpi a1 light, if the cycle is still within its budget
         # TODO: import here the whole cycle, reorder and reorganise it, test with while loops and then rearrange in single objects.
-        while not self.rpi.exitsignal.wait(0.05):
-            # Sets the Rpi a1 light: switch on / off green part of LED A1 | or 
-            # do other things
-            self.rpi.core.a1green.value = not self.rpi.core.a1green.value
+        while not self.rpi.exitsignal.wait(self.cycle_time):
+            self.budget.run()
+
+    def toggle_led(self):
+        """Sets the Rpi a1 light: switch on / off green part of LED A1"""
+        self.rpi.core.a1green.value = not self.rpi.core.a1green.value
+
+    def tick(self):
+        """Runs one cycle of the station: read, process, write"""
+        # 1. Reads the sensors states
+        self.read()
+
+        # 2. Calls the machine_group.process_product process description
+        self.machine_group.process_product()
+
+        # 3. Writes the actuators desired states
+        self.write()
 
-            # 1. Reads the sensors states
-            self.read()
+    def publish(self):
+        """Publishes a copy of the process image and the metrics of the
+        tick budget for the StateServer"""
+        # the metrics are taken in the same tick as the image, a reader
+        # decoding later must not mix in newer counters
+        self.state.publish((bytes(self.image), self.budget.metrics()))
 
-            # 2. Calls the machine_group.process_product process description
-            self.machine_group.process_product()
-            
-            # 3. Writes the actuators desired states
-            self.write()
+    def decode_state(self, state):
+        """Returns the sensors and actuators states of a published process
+        image by variable name and the metrics of the tick budget published
+        with it"""
+        image, budget = state
+        fields = self.image.decode(image)['machine_group']
+        fields['budget'] = budget
+        return fields
 
     def read(self):
-        """Reads the input sensors states"""
-        # Assigning to a the relative variable, the sensor value
-        # Reference switch - Turntable under vacuum carrier
-        self.machine_group.turntable_pos_vacuum = self.rpi.io['I_1'].value
-        # Reference switch - Turntable aligned to position conveyor
-        self.machine_group.turntable_pos_conveyor = self.rpi.io['I_2'].value
-        # Light sensor - Conveyor belt
-        self.machine_group.sens_delivery= self.rpi.io['I_3'].value
-        # Reference switch - Turn-table under saw
-        self.machine_group.turntable_pos_saw  = self.rpi.io['I_4'].value
-        # Reference switch - Vacuum carrier aligned to turn-table
-        self.machine_group.vacuum_gripper_at_turntable = self.rpi.io['I_5'].value
-        # Reference switch - Oven carrier inside the oven
-        self.machine_group.oven_feeder_in = self.rpi.io['I_6'].value
-        # Reference switch - Oven carrier outside the oven
-        self.machine_group.oven_feeder_out  = self.rpi.io['I_7'].value
-        # Reference switch - Vacuum carrier aligned to oven
-        self.machine_group.vacuum_gripper_at_oven = self.rpi.io['I_8'].value
-        # Light sensor - Oven
-        self.machine_group.sens_oven = self.rpi.io['I_9'].value
+        """Reads the input sensors states into the process image"""
+        self.io_map.read()
 
     def write(self):
-        """Writes the output actuators states"""
-        # Assigning to a the relative sensor, the variable value
-        # Turn-table - Motor clock wise        
-        self.rpi.io['O_1'].value = self.machine_group.act_rot_clockwise
-        # Turn-table - Motor counter-clock wise
-        self.rpi.io['O_2'].value = self.machine_group.act_rot_counterclockwise
-        # Conveyor belt - Motor forward
-        self.rpi.io['O_3'].value = self.machine_group.act_conveyor_forward
-        # Saw - Motor activation
-        self.rpi.io['O_4'].value = self.machine_group.act_saw
-        # Oven - Carrier oven motor move inside
-        self.rpi.io['O_5'].value = self.machine_group.act_oven_inward
-        # Oven - Carrier oven motor move outside
-        self.rpi.io['O_6'].value = self.machine_group.act_oven_outward
-        # Vacuum carrier - Motor move towards oven
-        self.rpi.io['O_7'].value = self.machine_group.act_gripper_to_oven
-        # Vacuum carrier - Move towards turn-table
-        self.rpi.io['O_8'].value = self.machine_group.act_gripper_to_turntable
-        # Oven - Processing light
-        self.rpi.io['O_9'].value = self.machine_group.oven_light
-        # Compressor - activation
-        self.rpi.io['O_10'].value = self.machine_group.compressor
-        # Vacuum carrier - Vacuum valve grip activation
-        self.rpi.io['O_11'].value = self.machine_group.valve
-        # Vacuum carrier - Vacuum valve lowering activation
-        self.rpi.io['O_12'].value = self.machine_group.act_lower_valve
-        # Oven - Door opening activation
-        self.rpi.io['O_13'].value = self.machine_group.valve_oven_door
-        # Turn-table - Pusher valve activation
-        self.rpi.io['O_14'].value = self.machine_group.valve_feeder
+        """Writes the output actuators states from the process image"""
+        self.io_map.write()
 
 
 if __name__ == "__main__":
-    # Instantiating the controlling class
-    root = CycleEventManager()
+    # Log messages are written to stdout by a background thread, so the loop
+    # never waits on the console
+    control_log = ControlLog().start()
+    # Instantiating the controlling class, --calibrate calibrates the dwell
+    # times of the vacuum gripper with the parts it picks
+    root = CycleEventManager(calibrate='--calibrate' in sys.argv)
+    # Serving the station state on http://localhost:8080/state and
+    # ws://localhost:8080/ws
+    state_server = StateServer(root.state).start()
     # Launch the start function of the RevPi event control system
     root.start()
+    state_server.stop()
+    control_log.stop()
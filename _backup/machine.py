@@ -30,6 +30,26 @@ class Machine:
         if value:
             self.__lastExecutionTime = time()
 
+    @property
+    def isReady(self) -> bool:
+        """Returns whether the machine can be handed a new job
+
+        :return bool: the ready signal
+        """
+        return not self.isExecuting
+
+    @property
+    def isDone(self) -> bool:
+        """Returns whether the machine finished the job it was handed, machines with an explicit end of job override this
+
+        :return bool: the done signal
+        """
+        return not self.isExecuting
+
+    def reset(self):
+        """Arms the machine for its next job, machines that latch their end of job override this"""
+        pass
+
     def timeSinceExecution(self):
         if self.__isExecuting:
             return 0
@@ -9,50 +9,105 @@ Each rpi.mainloop cycle lasts for 50ms, standard (to be verified).
 """
 
 from machine import Machine
+from Anticipation import Anticipator
+from VacuumDwell import DwellTimes, DwellCalibration
+from ControlLog import ControlLog
+from ProcessImage import ImageBit
 import time
 
+log = ControlLog.getLogger('machine_group')
+
 
 #class MachineGroup(Machine):
 class MachineGroup(object):
+    # Sensors and actuators, views onto the bits of a process image
+    turntable_pos_vacuum = ImageBit()
+    turntable_pos_saw = ImageBit()
+    turntable_pos_conveyor = ImageBit()
+    sens_delivery = ImageBit()
+    sens_oven = ImageBit()
+    vacuum_gripper_at_oven = ImageBit()
+    vacuum_gripper_at_turntable = ImageBit()
+    oven_feeder_out = ImageBit()
+    oven_feeder_in = ImageBit()
+    act_rot_clockwise = ImageBit()
+    act_rot_counterclockwise = ImageBit()
+    act_conveyor_forward = ImageBit()
+    act_saw = ImageBit()
+    act_oven_inward = ImageBit()
+    act_oven_outward = ImageBit()
+    act_gripper_to_oven = ImageBit()
+    act_gripper_to_turntable = ImageBit()
+    oven_light = ImageBit()
+    compressor = ImageBit()
+    valve = ImageBit()
+    act_lower_valve = ImageBit()
+    valve_oven_door = ImageBit()
+    valve_feeder = ImageBit()
+    # Seconds the saw needs to spin up, it is started this long before the
+    # turntable is predicted to arrive under it
+    saw_lead = 0.25
+    # Cycles the vacuum gripper dwells lowered, gripping and lifting when it
+    # picks the product from the oven feeder, known to work
+    default_dwell = DwellTimes(lower=10, grip=5, lift=10)
+
     #def __init__(self, id1):   # TODO: TO BE DELETED
-    def __init__(self):
+    def __init__(self, cycle_time: float = 0.05, dwell: DwellTimes = None,
+                 calibration: DwellCalibration = None):
         #super().__init__(id1)  # TODO: TO BE DELETED
-        self.__turntable_pos_vacuum = False
-        self.__turntable_pos_conveyor  = False
-        self.__processing_sens_delivery = False
-        self.__turntable_pos_saw = False
-        self.__vacuum_gripper_at_turntable  = False
-        self.__oven_feeder_in = False
-        self.__oven_feeder_out  = False
-        self.__vacuum_gripper_at_oven = False
-        self.__sens_oven = False
+        self.turntable_pos_vacuum = False
+        self.turntable_pos_conveyor  = False
+        self.sens_delivery = False
+        self.turntable_pos_saw = False
+        self.vacuum_gripper_at_turntable  = False
+        self.oven_feeder_in = False
+        self.oven_feeder_out  = False
+        self.vacuum_gripper_at_oven = False
+        self.sens_oven = False
         
-        self.__act_rot_clockwise = False
-        self.__act_rot_counter_clockwise = False
-        self.__act_conveyor_Forward = False
-        self.__act_saw = False
-        self.__act_oven_inward = False        
-        self.__act_oven_outward = False
-        self.__act_gripper_to_oven = False
-        self.__act_gripper_to_turntable = False
-        self.__oven_light = False
-        self.__compressor = False
-        self.__valve = False
-        self.__act_lower_valve = False
-        self.__valve_oven_door = False
-        self.__valve_feeder = False
+        self.act_rot_clockwise = False
+        self.act_rot_counterclockwise = False
+        self.act_conveyor_forward = False
+        self.act_saw = False
+        self.act_oven_inward = False        
+        self.act_oven_outward = False
+        self.act_gripper_to_oven = False
+        self.act_gripper_to_turntable = False
+        self.oven_light = False
+        self.compressor = False
+        self.valve = False
+        self.act_lower_valve = False
+        self.valve_oven_door = False
+        self.valve_feeder = False
         
         self.saw_count = 0          # Saw process time counter
+        self.saw_spin_up_count = 0  # Saw cycles before the turntable arrived
         self.oven_count = 0         # Oven process time counter
         self.vacuum_count = 0       # Vacuum process time counter
         self.delivery_count = 0     # Delivery process time counter
         self.oven_ready = False     # Oven ready variable
 
+        # Actions started ahead of the sensor event they wait for, timed in
+        # cycles, so a prediction does not depend on how long the work of a
+        # cycle took
+        self.cycle_time = cycle_time
+        self.cycle = 0
+        self.anticipator = Anticipator(lambda: self.cycle * self.cycle_time)
+        self.saw_spin_up = self.anticipator.declare(
+            'saw spin-up before turntable under saw', self.saw_lead)
+
+        # Dwell times of the vacuum gripper, calibrated ones if there are
+        # any. While calibrating, every pick is a trial of the calibration
+        self.dwell = dwell if dwell is not None else self.default_dwell
+        self.calibration = calibration
+        self.trial = None           # Dwell times of the running trial
+        self.retry = False          # Pick repeated after a failed trial
+        self.lifted = False         # Oven light sensor cleared in this pick
+
         # My fields
         #self.initial_time = 0
         #self.final_time = 0
 
-
     # Extendend from the abc of the Ancestor Machine class
     # modify after the ancestor method
     # TODO: TO BE DELETED
@@ -61,199 +116,14 @@ class MachineGroup(object):
     def isExecuting(self):
         # Returns whether the machine is currently performing actions
         # Extension of the Machine abstract method.        
-        if (self.__act_rot_clockwise or 
-            self.__act_rot_counter_clockwise or 
-            self.__act_conveyor_Forward):
+        if (self.act_rot_clockwise or 
+            self.act_rot_counterclockwise or 
+            self.act_conveyor_forward):
             return True
         else:
             return False
     """
 
-    # Getters, setters
-    @property
-    def turntable_pos_vacuum(self) -> bool:
-        return self.__turntable_pos_vacuum
-
-    @turntable_pos_vacuum.setter
-    def turntable_pos_vacuum(self, value: bool):
-        self.__turntable_pos_vacuum = value
-        
-    @property
-    def turntable_pos_saw(self) -> bool:
-        return self.__turntable_pos_saw
-
-    @turntable_pos_saw.setter
-    def turntable_pos_saw(self, value: bool):
-        self.__turntable_pos_saw = value
-
-    @property
-    def turntable_pos_conveyor(self) -> bool:
-        return self.__turntable_pos_conveyor
-
-    @turntable_pos_conveyor.setter
-    def turntable_pos_conveyor(self, value: bool):
-        self.__turntable_pos_conveyor = value
-        
-    @property
-    def sens_delivery(self) -> bool:
-        return self.__processing_sens_delivery
-
-    @sens_delivery.setter
-    def sens_delivery(self, value: bool):
-        self.__processing_sens_delivery = value
-
-    @property
-    def sens_oven(self) -> bool:
-        return self.__sens_oven
-
-    @sens_oven.setter
-    def sens_oven(self, value: bool):
-        self.__sens_oven = value
-        
-    @property
-    def vacuum_gripper_at_oven(self) -> bool:
-        return self.__vacuum_gripper_at_oven
-
-    @vacuum_gripper_at_oven.setter
-    def vacuum_gripper_at_oven(self, value: bool):
-        self.__vacuum_gripper_at_oven = value
-
-    @property
-    def vacuum_gripper_at_turntable(self) -> bool:
-        return self.__vacuum_gripper_at_turntable
-
-    @vacuum_gripper_at_turntable.setter
-    def vacuum_gripper_at_turntable(self, value: bool):
-        self.__vacuum_gripper_at_turntable = value
-        
-    @property
-    def oven_feeder_out(self) -> bool:
-        return self.__oven_feeder_out
-
-    @oven_feeder_out.setter
-    def oven_feeder_out(self, value: bool):
-        self.__oven_feeder_out = value
-
-    @property
-    def oven_feeder_in(self) -> bool:
-        return self.__oven_feeder_in
-
-    @oven_feeder_in.setter
-    def oven_feeder_in(self, value: bool):
-        self.__oven_feeder_in = value
-        
-    @property
-    def act_rot_clockwise(self) -> bool:
-        return self.__act_rot_clockwise
-
-    @act_rot_clockwise.setter
-    def act_rot_clockwise(self, value: bool):
-        self.__act_rot_clockwise = value
-        
-    @property
-    def act_rot_counterclockwise(self) -> bool:
-        return self.__act_rot_counter_clockwise
-
-    @act_rot_counterclockwise.setter
-    def act_rot_counterclockwise(self, value: bool):
-        self.__act_rot_counter_clockwise = value
-
-    @property
-    def act_conveyor_forward(self) -> bool:
-        return self.__act_conveyor_Forward
-
-    @act_conveyor_forward.setter
-    def act_conveyor_forward(self, value: bool):
-        self.__act_conveyor_Forward = value    
-    
-    @property
-    def act_saw(self) -> bool:
-        return self.__act_saw
-
-    @act_saw.setter
-    def act_saw(self, value: bool):
-        self.__act_saw = value
-
-    @property
-    def act_oven_inward(self) -> bool:
-        return self.__act_oven_inward
-
-    @act_oven_inward.setter
-    def act_oven_inward(self, value: bool):
-        self.__act_oven_inward = value
-        
-    @property
-    def act_oven_outward(self) -> bool:
-        return self.__act_oven_outward
-
-    @act_oven_outward.setter
-    def act_oven_outward(self, value: bool):
-        self.__act_oven_outward = value
-
-    @property
-    def act_gripper_to_oven(self) -> bool:
-        return self.__act_gripper_to_oven
-
-    @act_gripper_to_oven.setter
-    def act_gripper_to_oven(self, value: bool):
-        self.__act_gripper_to_oven = value
-        
-    @property
-    def act_gripper_to_turntable(self) -> bool:
-        return self.__act_gripper_to_turntable
-
-    @act_gripper_to_turntable.setter
-    def act_gripper_to_turntable(self, value: bool):
-        self.__act_gripper_to_turntable = value
-
-    @property
-    def oven_light(self) -> bool:
-        return self.__oven_light
-
-    @oven_light.setter
-    def oven_light(self, value: bool):
-        self.__oven_light = value
-        
-    @property
-    def compressor(self) -> bool:
-        return self.__compressor
-
-    @compressor.setter
-    def compressor(self, value: bool):
-        self.__compressor = value
-        
-    @property
-    def valve(self) -> bool:
-        return self.__valve
-
-    @valve.setter
-    def valve(self, value: bool):
-        self.__valve = value
-
-    @property
-    def act_lower_valve(self) -> bool:
-        return self.__act_lower_valve
-
-    @act_lower_valve.setter
-    def act_lower_valve(self, value: bool):
-        self.__act_lower_valve = value
-        
-    @property
-    def valve_oven_door(self) -> bool:
-        return self.__valve_oven_door
-
-    @valve_oven_door.setter
-    def valve_oven_door(self, value: bool):
-        self.__valve_oven_door = value
-        
-    @property
-    def valve_feeder(self) -> bool:
-        return self.__valve_feeder
-
-    @valve_feeder.setter
-    def valve_feeder(self, value: bool):
-        self.__valve_feeder = value
-
     # Starting position is as follows:
     # The feeder is out, the oven door is closed,
     # the vacuum gripper is at the turntable. Turntable is pointing at the 
@@ -274,69 +144,90 @@ class MachineGroup(object):
         # turntable_pos_conveyor is False that is
         # if the turn-table is not aligned under the saw and is not at the 
         # conveyor
-        if not self.__turntable_pos_saw and not self.__turntable_pos_conveyor:
+        if not self.turntable_pos_saw and not self.turntable_pos_conveyor:
             # Activate the turn-table rotation clockwise
-            self.__act_rot_clockwise = True 
+            self.act_rot_clockwise = True 
         else:
             # Deactivate the turn-table rotation clockwise
-            self.__act_rot_clockwise = False    
+            self.act_rot_clockwise = False    
         
     # Rotates the turntable to conveyor.
     # TODO: refactor it in a way that it takes the target place where to be rotate, and then rotates until the position is reached
     def turntable_to_conveyor(self):
         # If the turntable_pos_conveyor sensor is False
-        if not self.__turntable_pos_conveyor:
+        if not self.turntable_pos_conveyor:
             # Activate the turntable rotation clockwise
-            self.__act_rot_clockwise = True
+            self.act_rot_clockwise = True
         else:
             # Deactivate the turntable rotation clockwise
-            self.__act_rot_clockwise = False
+            self.act_rot_clockwise = False
       
     # Rotates the turntable to the vacuum.
     # TODO: refactor it in a way that it takes the target place where to be rotate, and then rotates until the position is reached
     def turntable_to_vacuum(self):
         # If the turntable_pos_vacuum sensor is False, that is 
         # if the turntable is not at the vacuum gripper carrier
-        if not self.__turntable_pos_vacuum:
+        if not self.turntable_pos_vacuum:
             # Activate the conveyor rotation clockwise
-            self.__act_rot_counter_clockwise = True
+            self.act_rot_counterclockwise = True
         # Otherwise, if the turntable_pos_vacuum sensor is True, that is 
         # if the turntable is at the vacuum gripper carrier
         else:
             # Deactivate the conveyor rotation clockwise
-            self.__act_rot_counter_clockwise = False
+            self.act_rot_counterclockwise = False
             
+    # Returns whether the saw ran for its processing time, the cycles it spun
+    # up before the turntable arrived included
+    @property
+    def saw_done(self) -> bool:
+        return self.saw_count + self.saw_spin_up_count >= 20
+
     # Uses the saw on the package. sawCount >= 20 is an artbitrary number.
+    # The saw is started while the turntable is still on its way, once it is
+    # predicted saw_lead seconds away, up to saw_lead of these cycles count
+    # towards the processing time.
     def use_saw(self):
+        spin_up = self.saw_spin_up.update(self.act_rot_clockwise,
+                                          self.turntable_pos_saw)
         # If the turntable_pos_saw sensor is True and saw counter is not 
         # greater than 20 that is
         # if turntable_pos_saw is under the saw and saw counter is not greater 
         # than 20
-        if self.__turntable_pos_saw and not self.saw_count >= 20:
-            self.__act_saw  = True  # Activate the saw
+        if self.turntable_pos_saw and not self.saw_done:
+            self.act_saw  = True  # Activate the saw
             self.saw_count += 1     # Add 1 to the saw counter
+        # If the turntable is about to arrive under the saw
+        elif spin_up and not self.turntable_pos_saw and self.saw_count == 0:
+            self.act_saw  = True  # Spin up the saw
+            if self.saw_spin_up_count * self.cycle_time < self.saw_lead:
+                self.saw_spin_up_count += 1
+        # If the turntable stalled or stopped short of the saw, the spin-up
+        # is lost
+        elif not self.turntable_pos_saw and self.saw_count == 0:
+            self.act_saw  = False # Deactivate the saw
+            self.saw_spin_up_count = 0
         else:
-            self.__act_saw  = False # Deactivate the saw
+            self.act_saw  = False # Deactivate the saw
             
     # Moves the vacuum carrier gripper to the oven.
     # TODO: refactor it in a way that it takes the target place where to move, and then moves until the position is reached
     def vacuum_to_oven(self):
         #print('vacuumToOven')
         # If the carrier is not in front of the oven
-        if not self.__vacuum_gripper_at_oven:
+        if not self.vacuum_gripper_at_oven:
             # Activate it towards the oven
-            self.__act_gripper_to_oven = True
+            self.act_gripper_to_oven = True
         else:
             # Dectivate it towards the oven
-            self.__act_gripper_to_oven = False
+            self.act_gripper_to_oven = False
             
     # Moves the vacuum gripper to the turntable.
     def vacuum_to_turntable(self):
         #print('vacuumToTurntable')
-        if not self.__vacuum_gripper_at_turntable:
-            self.__act_gripper_to_turntable = True
+        if not self.vacuum_gripper_at_turntable:
+            self.act_gripper_to_turntable = True
         else:
-            self.__act_gripper_to_turntable = False
+            self.act_gripper_to_turntable = False
             
     # Brings the feeder inside the oven and initiates the cooking process. 
     # self.ovenCount >= 30 is an arbitrary number.
@@ -344,61 +235,61 @@ class MachineGroup(object):
         #print('startOven')
         # If the oven is not ready and the vacuum carrier grip sensor is True, 
         # that is the carrier grip sensor is at the oven: 
-        if not self.oven_ready and self.__vacuum_gripper_at_oven:
+        if not self.oven_ready and self.vacuum_gripper_at_oven:
             # If the oven feeder inside sensor si False, that is the oven 
             # carrier  is outside the oven
-            if not self.__oven_feeder_in:
-                self.__compressor = True        # Acivate the compressor
-                self.__valve_oven_door = True   # Open the door
-                self.__act_oven_inward = True   # Move the feeder in the oven
+            if not self.oven_feeder_in:
+                self.compressor = True        # Acivate the compressor
+                self.valve_oven_door = True   # Open the door
+                self.act_oven_inward = True   # Move the feeder in the oven
             # If the oven feeder is inside the oven
             else:
-                self.__act_oven_inward = False  # Deactivate the inward oven
-                self.__compressor = False       # Deactivate the compressor
-                self.__valve_oven_door = False  # Close the door
+                self.act_oven_inward = False  # Deactivate the inward oven
+                self.compressor = False       # Deactivate the compressor
+                self.valve_oven_door = False  # Close the door
                 
                 #haha, flashing lights go brrrr
                 if self.oven_count % 2 == 1:    # For making the light flash
-                    self.__oven_light = True    # Activate the process light
+                    self.oven_light = True    # Activate the process light
                 else:
-                    self.__oven_light = False   # Deactivate the process light
+                    self.oven_light = False   # Deactivate the process light
             
                 self.oven_count += 1            # Time counter
 
             # If the counter reaches 30, stop the process
             if self.oven_count >= 30:       
-                self.__oven_light = False       # Deactivate the light
+                self.oven_light = False       # Deactivate the light
                 self.oven_ready = True          # Set the oven to ready
                 self.oven_count = 0             # Set the oven counter to 0
 
     def oven_process(self):
         # If the oven is not ready and the vacuum carrier grip sensor is True, 
         # that is the carrier grip sensor is at the oven: 
-        if not self.oven_ready and self.__vacuum_gripper_at_oven:
+        if not self.oven_ready and self.vacuum_gripper_at_oven:
             # If the oven feeder inside sensor si False, that is the oven 
             # carrier  is outside the oven
-            if not self.__oven_feeder_in:
-                self.__compressor = True        # Acivate the compressor
+            if not self.oven_feeder_in:
+                self.compressor = True        # Acivate the compressor
                 # TODO: FROM HERE WRAP INTO A SINGLE FUNCTION
-                self.__valve_oven_door = True   # Open the door
-                self.__act_oven_inward = True   # Move the feeder in the oven
+                self.valve_oven_door = True   # Open the door
+                self.act_oven_inward = True   # Move the feeder in the oven
             # If the oven feeder is inside the oven
             else:
-                self.__act_oven_inward = False  # Deactivate the inward oven
-                self.__compressor = False       # Deactivate the compressor
-                self.__valve_oven_door = False  # Close the door
+                self.act_oven_inward = False  # Deactivate the inward oven
+                self.compressor = False       # Deactivate the compressor
+                self.valve_oven_door = False  # Close the door
                 
                 #haha, flashing lights go brrrr
                 if self.oven_count % 2 == 1:    # For making the light flash
-                    self.__oven_light = True    # Activate the process light
+                    self.oven_light = True    # Activate the process light
                 else:
-                    self.__oven_light = False   # Deactivate the process light
+                    self.oven_light = False   # Deactivate the process light
             
                 self.oven_count += 1            # Time counter
 
             # If the counter reaches 30, stop the process
             if self.oven_count >= 30:       
-                self.__oven_light = False       # Deactivate the light
+                self.oven_light = False       # Deactivate the light
                 self.oven_ready = True          # Set the oven to ready
                 self.oven_count = 0             # Set the oven counter to 0
         # If the oven is ready
@@ -420,29 +311,29 @@ class MachineGroup(object):
     """
     def move_feeder_in(self):
         #print('moveFeederIn')
-        if not self.__oven_feeder_in:
-            self.__compressor = True
-            self.__valve_oven_door = True
-            self.__act_oven_inward = True
+        if not self.oven_feeder_in:
+            self.compressor = True
+            self.valve_oven_door = True
+            self.act_oven_inward = True
         else:
-            self.__act_oven_inward = False
-            self.__oven_light = True
-            self.__compressor = False
-            self.__valve_oven_door = False
+            self.act_oven_inward = False
+            self.oven_light = True
+            self.compressor = False
+            self.valve_oven_door = False
     """
 
     # Moves the feeder outside of the oven.
     def move_feeder_out(self):
         #print('moveFeederOut')
         # If oven_feeder_out sensor is False = the carrier is not out
-        if not self.__oven_feeder_out:
-            self.__compressor = True        # Activate the compressor
-            self.__valve_oven_door = True   # Open the door
-            self.__act_oven_outward = True  # Move the oven outside
+        if not self.oven_feeder_out:
+            self.compressor = True        # Activate the compressor
+            self.valve_oven_door = True   # Open the door
+            self.act_oven_outward = True  # Move the oven outside
         else:
-            self.__act_oven_outward = False # Stop moving the oven carrier
-            self.__compressor = False       # Deactivate the compressor
-            self.__valve_oven_door = False  # Close the door
+            self.act_oven_outward = False # Stop moving the oven carrier
+            self.compressor = False       # Deactivate the compressor
+            self.valve_oven_door = False  # Close the door
 
     # Takes the product with the vacuum gripper. The vacuum gripper should be
     # at oven and the product must have been inside of it.
@@ -455,32 +346,82 @@ class MachineGroup(object):
         # if the oven feeder is out from the oven and the oven is in ready 
         # state and the vacuum carrieer gripper is at the oven and the vacuum 
         # counter is less than 10 
-        if (self.__oven_feeder_out and self.oven_ready and 
-        self.__vacuum_gripper_at_oven and self.vacuum_count < 10):
-            print('vacuum count ' + str(self.vacuum_count))
-            self.__compressor = True        # Activate the compressor
-            self.__act_lower_valve = True   # Lower the carrier vacuum gripper
+        if (self.oven_feeder_out and self.oven_ready and 
+        self.vacuum_gripper_at_oven and self.vacuum_count < self.dwell.lower):
+            log.debug('vacuum count %d', self.vacuum_count)
+            if self.vacuum_count == 0:
+                self.start_pick()
+            self.compressor = True        # Activate the compressor
+            self.act_lower_valve = True   # Lower the carrier vacuum gripper
             self.vacuum_count += 1          # Add 1 to the vacuum counter
   
+    # Cycles from lowering the vacuum gripper at the oven until the carrier
+    # leaves with the product, 5 of them with the compressor off
+    @property
+    def pick_cycles(self) -> int:
+        return self.dwell.pick + 5
+
+    # Takes the dwell times of the pick that starts, the next trial while
+    # calibrating.
+    def start_pick(self):
+        self.lifted = False
+        if self.retry:
+            # The failed trial is repeated with the default dwell times
+            self.retry = False
+        elif self.calibration is not None:
+            self.dwell = self.calibration.next()
+            if self.calibration.done:
+                self.calibration = None
+            else:
+                self.trial = self.dwell
+
+    # Checks that the product was lifted off the oven feeder, the oven light
+    # sensor stopped seeing it during the pick. The next product may be put
+    # on the feeder right after. If the sensor never cleared, the pick is
+    # repeated with the default dwell times, which are kept from then on
+    # unless it was a trial of the calibration.
+    def confirm_pick(self):
+        picked = self.lifted
+        if self.trial is not None:
+            self.calibration.report(self.trial, picked)
+            self.trial = None
+        if not picked:
+            if self.calibration is not None:
+                self.retry = True
+            else:
+                log.warning('grip failed with %s, falling back to %s',
+                            self.dwell, self.default_dwell)
+            self.dwell = self.default_dwell
+            self.valve = False      # Release the vacuum
+            self.vacuum_count = 0   # Pick the product again
+
     # The gripper brings the product to Turntable. The time required to grip 
     # it is simulated with the self.vacuumCount count.
     # TODO: TO BE CHANGED
     def move_product_to_turntable(self):
         #print('moveProductToTurntable')
-        # If vacuum count is greater than 10 and less than 15
-        if self.vacuum_count >= 10 and self.vacuum_count < 15:
-            self.__valve = True     # Activate the carrier vacuum gripper 
+        gripped = self.dwell.lower + self.dwell.grip
+        lifted = self.dwell.pick
+        if 0 < self.vacuum_count <= lifted and self.sens_oven:
+            self.lifted = True
+        # If vacuum count is between the lowering and the lifting
+        if self.vacuum_count >= self.dwell.lower and self.vacuum_count < gripped:
+            self.valve = True     # Activate the carrier vacuum gripper 
             self.vacuum_count += 1  # Add 1 to the vacuum count
-        # If vacuum count is greater than 15 and less than 25
-        elif self.vacuum_count >= 15 and self.vacuum_count < 25:
-            self.__act_lower_valve = False  # Upper the carrier vacuum gripper
+        # If vacuum count is between the gripping and the lifted gripper
+        elif self.vacuum_count >= gripped and self.vacuum_count < lifted:
+            self.act_lower_valve = False  # Upper the carrier vacuum gripper
             self.vacuum_count += 1          # Add 1 to the vacuum counter
-        # If vacuum count is greater than 25 and less than 30
-        elif self.vacuum_count >= 25 and self.vacuum_count < 30:
-                self.__compressor = False   # Deactivate the compressor
+        # If the gripper is lifted
+        elif self.vacuum_count >= lifted and self.vacuum_count < lifted + 5:
+                if self.vacuum_count == lifted:
+                    self.confirm_pick()
+                    if self.vacuum_count == 0:
+                        return
+                self.compressor = False   # Deactivate the compressor
                 self.vacuum_count += 1      # Add 1 to the vacuum count
-        # If vacuum count is greater than 30
-        elif self.vacuum_count >= 30:
+        # If vacuum count is greater than the pick
+        elif self.vacuum_count >= self.pick_cycles:
             # Bring the carrier vacuum gripper to the turn-table
             self.vacuum_to_turntable()
 
@@ -497,21 +438,21 @@ class MachineGroup(object):
         # if the processing sensor delivery have no product and the vacuum 
         # counter is greater that 30 and the vacuum gripper carrier is at the 
         # turntable
-        if (self.__processing_sens_delivery and self.vacuum_count >= 30 and 
-            self.__vacuum_gripper_at_turntable):
+        if (self.sens_delivery and self.vacuum_count >= self.pick_cycles and 
+            self.vacuum_gripper_at_turntable):
             # if the delivery count is smaller than 15
             if self.delivery_count < 15:
-                self.__compressor = True        # Activate the compressor
-                self.__act_lower_valve = True   # Lower the carrier vacuum grip
+                self.compressor = True        # Activate the compressor
+                self.act_lower_valve = True   # Lower the carrier vacuum grip
                 self.delivery_count += 1        # Add 1 to the delivery count
             # if the delivery count is greater than 15 and smaller that 25
             elif self.delivery_count < 25 and self.delivery_count >= 15:
-                self.__valve = False            # Deactivate the gripper valve
+                self.valve = False            # Deactivate the gripper valve
                 self.delivery_count += 1        # Add 1 to the delivery count
             # if the delivery count is greater than 25 and smaller that 35
             elif self.delivery_count < 35 and self.delivery_count >= 25:
-                self.__compressor = False       # Deactivate the compressor
-                self.__act_lower_valve = False  # Upper the carrier vacuum valve
+                self.compressor = False       # Deactivate the compressor
+                self.act_lower_valve = False  # Upper the carrier vacuum valve
                 self.delivery_count += 1        # Add 1 to the delivery count
             else:
                 # If the saw count is 0
@@ -521,21 +462,22 @@ class MachineGroup(object):
                 # Activate the saw
                 self.use_saw()
                 # If the saw conter is greater than 20
-                if self.saw_count >= 20:
+                if self.saw_done:
                     # Rotate the turn-table toward the conveyor
                     self.turntable_to_conveyor()
                 # If the turntable_pos_conveyor is True
-                if self.__turntable_pos_conveyor:
-                    self.__compressor = True    # Activate the conveyor
-                    self.__valve_feeder = True  # Activate the turntable pusher
+                if self.turntable_pos_conveyor:
+                    self.compressor = True    # Activate the conveyor
+                    self.valve_feeder = True  # Activate the turntable pusher
                     # Activate the conveyor
-                    self.__act_conveyor_Forward = True
+                    self.act_conveyor_forward = True
 
     # Sets all valuables and the ovenReady flag to the
     # starting values.
     def reset_station(self):
         #print('resetStation')
         self.saw_count = 0          # Resets all counters
+        self.saw_spin_up_count = 0
         self.oven_count = 0
         self.vacuum_count = 0
         self.delivery_count = 0
@@ -547,11 +489,12 @@ class MachineGroup(object):
     # The machine resets once the product reaches the sensor.
     def process_product(self):
         #print('processProduct')
+        self.cycle += 1
         # If the conveyor-light sensor is True = there is no product
-        print('Conveyor sensor state: ' + str(self.__processing_sens_delivery))
-        if self.__processing_sens_delivery:
+        log.debug('Conveyor sensor state: %s', self.sens_delivery)
+        if self.sens_delivery:
             # If oven_ready == False
-            print('Oven ready state: ' + str(self.oven_ready))
+            log.debug('Oven ready state: %s', self.oven_ready)
             if not self.oven_ready:
                 # Move the carrier towards the oven
                 self.vacuum_to_oven()
@@ -576,13 +519,13 @@ class MachineGroup(object):
         # Otherwise, if there is the product in front of the light sensor
         else:
                 # Turn off the compressor
-                self.__compressor = False
+                self.compressor = False
                 # Turn off the valve feeder
-                self.__valve_feeder = False
+                self.valve_feeder = False
                 # Turn off the conveyor belt
-                self.__act_conveyor_Forward = False
+                self.act_conveyor_forward = False
                 # Turn the turn-table towards the carrier
                 self.turntable_to_vacuum()
                 # If the turntable faces the carrier
-                if self.__turntable_pos_vacuum:
+                if self.turntable_pos_vacuum:
                     self.reset_station()    # Resent all the station
@@ -7,18 +7,24 @@ from pixtendlib.pixtendv2l import PiXtendV2L
 #use this import for running on raspi
 #from pixtendv2l import PiXtendV2L
 
+import sys
 from time import sleep
 from time import time
 
 from Robot import Robot
 from RobotMovementManager import RobotMovementManager
+from RealTime import RealTime
+from ControlLog import ControlLog
+
+log = ControlLog.getLogger('main')
 
 # VAR
 
 #robot1 = Robot(1, RobotMovementManager.listForRobot1())
 
-inputs = []
-outputs = []
+# filled in place every cycle, so reading and writing do not allocate new lists
+inputs = [False] * 16
+outputs = [False] * 12
 #ENDVAR
 
 
@@ -26,24 +32,23 @@ outputs = []
 # the p object delivers and takes the values ON and OFF, so for use in Python they should be converted to True and False
 def read():
     #read all inputs
-    inputs.clear()
-    inputs.append(p.digital_in0)
-    inputs.append(p.digital_in1)
-    inputs.append(p.digital_in2)
-    inputs.append(p.digital_in3)
-    inputs.append(p.digital_in4)
-    inputs.append(p.digital_in5)
-    inputs.append(p.digital_in6)
-    inputs.append(p.digital_in7)
-    inputs.append(p.digital_in8)
-    inputs.append(p.digital_in9)
-    inputs.append(p.digital_in10)
-    inputs.append(p.digital_in11)
-    inputs.append(p.digital_in12)
-    inputs.append(p.digital_in13)
-    inputs.append(p.digital_in14)
-    inputs.append(p.digital_in15)
-    print(inputs)
+    inputs[0] = p.digital_in0
+    inputs[1] = p.digital_in1
+    inputs[2] = p.digital_in2
+    inputs[3] = p.digital_in3
+    inputs[4] = p.digital_in4
+    inputs[5] = p.digital_in5
+    inputs[6] = p.digital_in6
+    inputs[7] = p.digital_in7
+    inputs[8] = p.digital_in8
+    inputs[9] = p.digital_in9
+    inputs[10] = p.digital_in10
+    inputs[11] = p.digital_in11
+    inputs[12] = p.digital_in12
+    inputs[13] = p.digital_in13
+    inputs[14] = p.digital_in14
+    inputs[15] = p.digital_in15
+    log.debug('inputs %s', inputs)
     #set all attributes to work with in class
     i = 0
     robot1.robotSensGripperOpen = inputs[i]
@@ -81,20 +86,19 @@ def write():
     p.digital_out9 = False
     p.digital_out10 = False
     p.digital_out11 = False
-    outputs.clear()
-    outputs.append(robot1.robotActGripperOpen)
-    outputs.append(robot1.robotActGripperClose)
-    outputs.append(robot1.robotActArmOut)
-    outputs.append(robot1.robotActArmIn)
-    outputs.append(robot1.robotActVerticalDown)
-    outputs.append(robot1.robotActVerticalUp)
-    outputs.append(robot1.robotActRotRight)
-    outputs.append(robot1.robotActRotLeft)
-    outputs.append(False)
-    outputs.append(False)
-    outputs.append(False)
-    outputs.append(False)
-    print(outputs)
+    outputs[0] = robot1.robotActGripperOpen
+    outputs[1] = robot1.robotActGripperClose
+    outputs[2] = robot1.robotActArmOut
+    outputs[3] = robot1.robotActArmIn
+    outputs[4] = robot1.robotActVerticalDown
+    outputs[5] = robot1.robotActVerticalUp
+    outputs[6] = robot1.robotActRotRight
+    outputs[7] = robot1.robotActRotLeft
+    outputs[8] = False
+    outputs[9] = False
+    outputs[10] = False
+    outputs[11] = False
+    log.debug('outputs %s', outputs)
 
 
 def gotoSaveState():
@@ -121,15 +125,29 @@ if __name__ == '__main__':
     global p
     p = PiXtendV2L()
     robot1 = Robot(1, [])
+    # --realtime: pin to a CPU, SCHED_FIFO, lock memory and collect garbage only in the slack of a cycle
+    realTime = RealTime() if '--realtime' in sys.argv else None
+    if realTime is not None:
+        for setting, result in realTime.enter().items():
+            print('real-time %s: %s' % (setting, result))
     try:
         while True:
-            print(time())
+            start = time()
+            log.debug('cycle %f', start)
             read()
             robot1.executeDummy()
             write()
-            sleep(0.03)
+            if realTime is None:
+                sleep(0.03)
+            else:
+                # the cycle only sleeps the slack idle() left, so collecting does not lengthen it
+                realTime.idle(0.03 - (time() - start))
+                sleep(max(0.0, 0.03 - (time() - start)))
     except KeyboardInterrupt:
         gotoSaveState()
     except Exception:
         gotoSaveState()
         raise Exception
+    finally:
+        if realTime is not None:
+            realTime.exit()
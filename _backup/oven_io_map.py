@@ -0,0 +1,55 @@
+"""IO mapping of the oven station, (module, pin, machine, field) per IO,
+compiled by IoMap. The station has a single DIO module, its IOs are named by
+pin only."""
+
+INPUTS = [
+    # Reference switch - Turntable under vacuum carrier
+    ('', 'I_1', 'machine_group', 'turntable_pos_vacuum'),
+    # Reference switch - Turntable aligned to position conveyor
+    ('', 'I_2', 'machine_group', 'turntable_pos_conveyor'),
+    # Light sensor - Conveyor belt
+    ('', 'I_3', 'machine_group', 'sens_delivery'),
+    # Reference switch - Turn-table under saw
+    ('', 'I_4', 'machine_group', 'turntable_pos_saw'),
+    # Reference switch - Vacuum carrier aligned to turn-table
+    ('', 'I_5', 'machine_group', 'vacuum_gripper_at_turntable'),
+    # Reference switch - Oven carrier inside the oven
+    ('', 'I_6', 'machine_group', 'oven_feeder_in'),
+    # Reference switch - Oven carrier outside the oven
+    ('', 'I_7', 'machine_group', 'oven_feeder_out'),
+    # Reference switch - Vacuum carrier aligned to oven
+    ('', 'I_8', 'machine_group', 'vacuum_gripper_at_oven'),
+    # Light sensor - Oven
+    ('', 'I_9', 'machine_group', 'sens_oven'),
+]
+
+OUTPUTS = [
+    # Turn-table - Motor clock wise
+    ('', 'O_1', 'machine_group', 'act_rot_clockwise'),
+    # Turn-table - Motor counter-clock wise
+    ('', 'O_2', 'machine_group', 'act_rot_counterclockwise'),
+    # Conveyor belt - Motor forward
+    ('', 'O_3', 'machine_group', 'act_conveyor_forward'),
+    # Saw - Motor activation
+    ('', 'O_4', 'machine_group', 'act_saw'),
+    # Oven - Carrier oven motor move inside
+    ('', 'O_5', 'machine_group', 'act_oven_inward'),
+    # Oven - Carrier oven motor move outside
+    ('', 'O_6', 'machine_group', 'act_oven_outward'),
+    # Vacuum carrier - Motor move towards oven
+    ('', 'O_7', 'machine_group', 'act_gripper_to_oven'),
+    # Vacuum carrier - Move towards turn-table
+    ('', 'O_8', 'machine_group', 'act_gripper_to_turntable'),
+    # Oven - Processing light
+    ('', 'O_9', 'machine_group', 'oven_light'),
+    # Compressor - activation
+    ('', 'O_10', 'machine_group', 'compressor'),
+    # Vacuum carrier - Vacuum valve grip activation
+    ('', 'O_11', 'machine_group', 'valve'),
+    # Vacuum carrier - Vacuum valve lowering activation
+    ('', 'O_12', 'machine_group', 'act_lower_valve'),
+    # Oven - Door opening activation
+    ('', 'O_13', 'machine_group', 'valve_oven_door'),
+    # Turn-table - Pusher valve activation
+    ('', 'O_14', 'machine_group', 'valve_feeder'),
+]